@@ -1,12 +1,14 @@
 import re
-from datetime import datetime, timezone, timedelta
+from datetime import date, datetime, timezone
 
 import discord
 from discord import app_commands
 from discord.app_commands import locale_str
-from discord.ext import commands
+from discord.ext import commands, tasks
 
 from bot.utils import AchievementDatabaseManager, check_channel_validity, config
+from bot.utils.achievement_import import AdjustmentImportError, parse_adjustments
+from bot.utils.leaderboard_cache import TTLCache
 from bot.utils.achievement_visibility import (
     filter_visible_achievement_rankings,
     filter_visible_achievement_type_names,
@@ -21,6 +23,7 @@ from .views import (
     AchievementOperationView,
     AchievementRankingView,
     AchievementRefreshView,
+    BulkConfirmationView,
     ConfirmationView,
     RankView,
 )
@@ -41,6 +44,9 @@ class AchievementCog(commands.Cog):
         
         # Initialize database manager
         self.db = AchievementDatabaseManager(self.db_path, self.achievement_config)
+        # Rendered /rank pages, shared by every open panel.
+        cache_config = self.achievement_config.get('leaderboard_cache') or {}
+        self.rank_pages = TTLCache(float(cache_config.get('page_ttl_seconds', 30)))
 
     def _resolve_hidden_achievement_types(self) -> set[str]:
         return resolve_hidden_achievement_types()
@@ -97,6 +103,31 @@ class AchievementCog(commands.Cog):
     async def cog_load(self):
         await self.db.initialize_database()
 
+        if self.flush_counters_task.seconds != self.db.counter_flush_interval:
+            self.flush_counters_task.change_interval(seconds=self.db.counter_flush_interval)
+        if not self.flush_counters_task.is_running():
+            self.flush_counters_task.start()
+        if not self.compact_rollups_task.is_running():
+            self.compact_rollups_task.start()
+
+    def cog_unload(self):
+        # Bot.close() closes the DB manager afterwards, which drains the
+        # remaining buffered counters.
+        if self.flush_counters_task.is_running():
+            self.flush_counters_task.cancel()
+        if self.compact_rollups_task.is_running():
+            self.compact_rollups_task.cancel()
+
+    @tasks.loop(seconds=5)
+    async def flush_counters_task(self):
+        """Flush buffered achievement counters even when chat goes quiet."""
+        await self.db.flush_pending_counts()
+
+    @tasks.loop(hours=24)
+    async def compact_rollups_task(self):
+        """Fold daily achievement rollups past the retention window into months."""
+        await self.db.compact_daily_achievements()
+
     @commands.Cog.listener()
     async def on_message(self, message):
         if message.author.bot:
@@ -124,26 +155,18 @@ class AchievementCog(commands.Cog):
         if member.bot:
             return
 
-        # When the member leaves a channel
-        if before.channel is not None:
-            # End voice session and get time spent
-            time_spent = await self.db.end_voice_session(member.id, before.channel.id)
-            
-            if time_spent > 0:
-                # Get start time for monthly calculation (approximate using current time)
-                current_time = datetime.now(timezone.utc)
-                start_time = current_time - timedelta(seconds=time_spent)
-                start_month = start_time.month
-                start_year = start_time.year
-                
-                # Update achievements
-                await self.db.update_achievement_count(member.id, "time_spent", int(time_spent))
-                await self.db.update_monthly_achievement_count(member.id, "time_spent", int(time_spent), start_year, start_month)
-
-        # Handle joining a new channel
-        if after.channel is not None:
-            # Start new voice session
-            await self.db.start_voice_session(member.id, after.channel.id)
+        before_id = before.channel.id if before.channel is not None else None
+        after_id = after.channel.id if after.channel is not None else None
+        # Mute, deafen, stream and video changes keep the same channel.
+        if before_id == after_id:
+            return
+
+        # Sessions live in memory; the time of an ended session goes into
+        # the write-behind counter buffer.
+        if before_id is not None:
+            await self.db.end_voice_session(member.id, before_id)
+        if after_id is not None:
+            await self.db.start_voice_session(member.id, after_id)
 
     @app_commands.command(
         name="achievements",
@@ -283,6 +306,54 @@ class AchievementCog(commands.Cog):
         embed.add_field(name="Time to Subtract (seconds)", value=str(time_spent), inline=True)
         view.message = await interaction.edit_original_response(embed=embed, view=view)
 
+    @app_commands.command(
+        name="import_achievements",
+        description=locale_str(
+            "Adjust the achievement progress of many members from a CSV file",
+            key="achievements.import_achievements.description",
+        ),
+    )
+    @app_commands.describe(
+        file=locale_str(
+            "CSV with user_id and messages, reactions or time_spent (seconds) columns",
+            key="achievements.import_achievements.params.file",
+        ),
+        decrease=locale_str(
+            "Subtract the amounts instead of adding them",
+            key="achievements.import_achievements.params.decrease",
+        ),
+    )
+    async def import_achievements(self, interaction: discord.Interaction, file: discord.Attachment,
+                                  decrease: bool = False):
+        if not await check_channel_validity(interaction):
+            return
+
+        await interaction.response.defer()
+
+        try:
+            adjustments = parse_adjustments((await file.read()).decode('utf-8-sig'))
+        except UnicodeDecodeError:
+            await interaction.edit_original_response(content="The file must be UTF-8 encoded CSV.")
+            return
+        except AdjustmentImportError as e:
+            await interaction.edit_original_response(content=f"Nothing was imported:\n{e}")
+            return
+
+        operation = 'decrease' if decrease else 'increase'
+        view = BulkConfirmationView(self.bot, adjustments, operation, self.db)
+        embed = discord.Embed(title=f"Bulk {operation.capitalize()} Achievement Progress",
+                              description=f"You will {operation} the achievement progress of "
+                                          f"{len(adjustments)} members from {file.filename}.",
+                              color=discord.Color.blue())
+        embed.add_field(name="Reactions",
+                        value=str(sum(changes['reaction_count'] for _, changes in adjustments)), inline=True)
+        embed.add_field(name="Messages",
+                        value=str(sum(changes['message_count'] for _, changes in adjustments)), inline=True)
+        embed.add_field(name="", value="\u200b", inline=False)
+        embed.add_field(name="Time (seconds)",
+                        value=str(sum(changes['time_spent'] for _, changes in adjustments)), inline=True)
+        view.message = await interaction.edit_original_response(embed=embed, view=view)
+
     @app_commands.command(
         name="achievement_ranking",
         description=locale_str(
@@ -341,21 +412,6 @@ class AchievementCog(commands.Cog):
         view.message = message
 
 
-    async def fetch_extended_rankings(self, year=None, month=None):
-        """Fetch top 40 users for each achievement type using database manager"""
-        # Define result structure based on achievement_ranking config
-        achievement_types = []
-        for achievement in self.get_visible_achievement_rankings():
-            achievement_types.append(achievement.get('type'))
-
-        if year is None and month is None:
-            # Get all-time rankings
-            return await self.db.get_all_leaderboards(achievement_types, 40)
-        else:
-            # Get monthly rankings  
-            return await self.db.get_all_monthly_leaderboards(year, month, achievement_types, 40)
-
-
     @app_commands.command(
         name="rank",
         description=locale_str(
@@ -368,8 +424,16 @@ class AchievementCog(commands.Cog):
             "Optional lookup date in format YYYY-MM (eg. 2024-07)",
             key="achievements.rank.params.date",
         ),
+        start=locale_str(
+            "Optional first day of a date range in format YYYY-MM-DD (eg. 2024-07-01)",
+            key="achievements.rank.params.start",
+        ),
+        end=locale_str(
+            "Optional last day of the date range in format YYYY-MM-DD, defaults to today",
+            key="achievements.rank.params.end",
+        ),
     )
-    async def rank(self, interaction: discord.Interaction, date: str = None):
+    async def rank(self, interaction: discord.Interaction, date: str = None, start: str = None, end: str = None):
         """Interactive command to view achievement rankings with filtering options"""
         # Defer the interaction
         await interaction.response.defer()
@@ -383,11 +447,28 @@ class AchievementCog(commands.Cog):
                 return
             year, month = date.split("-")
 
-        # Pre-fetch rankings for all categories (top 40 for each)
-        rankings = await self.fetch_extended_rankings(year, month)
+        start_day = end_day = None
+        if start or end:
+            start_day, end_day = self.parse_rank_range(start, end)
+            if date or start_day is None:
+                await interaction.followup.send(
+                    "Invalid date range. Please use YYYY-MM-DD for start and end, "
+                    "with start on or before end, and do not combine it with date.",
+                    ephemeral=True,
+                )
+                return
+            # Older days are only kept as whole-month totals.
+            earliest = self.db.daily_compaction_cutoff()
+            if start_day < earliest:
+                await interaction.followup.send(
+                    f"Daily counts are only kept from {earliest.isoformat()}. "
+                    "Please start the range on or after that day, or use date for older months.",
+                    ephemeral=True,
+                )
+                return
 
-        # Create the view with all pre-fetched data
-        view = RankView(self.bot, year, month, rankings)
+        # Rankings are fetched page by page as the buttons are used.
+        view = RankView(self.bot, year, month, start=start_day, end=end_day)
 
         # Create an intro embed that explains the command functionality
         intro_embed = discord.Embed(
@@ -443,6 +524,23 @@ class AchievementCog(commands.Cog):
         message = await interaction.followup.send(embed=intro_embed, view=view)
         view.message = message
 
+    @staticmethod
+    def parse_rank_range(start: str | None, end: str | None) -> tuple[date | None, date | None]:
+        """Parse ``/rank`` start and end days; ``(None, None)`` if invalid.
+
+        ``end`` defaults to today (UTC).
+        """
+        if not start:
+            return None, None
+        try:
+            start_day = date.fromisoformat(start)
+            end_day = date.fromisoformat(end) if end else datetime.now(timezone.utc).date()
+        except ValueError:
+            return None, None
+        if start_day > end_day:
+            return None, None
+        return start_day, end_day
+
     @commands.Cog.listener()
     async def on_ready(self):
         # Clean up invalid voice sessions
@@ -1,3 +1,5 @@
+from datetime import timedelta
+
 import discord
 from discord.ui import Button, View
 
@@ -6,6 +8,9 @@ from bot.utils.i18n import t
 
 from .rank_locale import rank_button_parts, rank_type_button_labels
 
+# Counters a member's own rank is shown for on the achievements page.
+RANKED_ACHIEVEMENT_TYPES = ('reaction', 'message', 'time_spent')
+
 
 def resolve_achievement_avatar_url(user, bot_user) -> str:
     if user.avatar is not None:
@@ -63,6 +68,9 @@ class AchievementRefreshView(discord.ui.LayoutView):
             completed_achievements=completed_achievements,
             total_achievements=len(achievements),
         )
+        rank_summary = await self.format_rank_summary()
+        if rank_summary:
+            description = f"{description}\n{rank_summary}"
         achievements_finish_emoji = t('achievements.achievements_finish_emoji')
         avatar_url = resolve_achievement_avatar_url(user, self.bot.user)
         container_items: list[discord.ui.Item] = [
@@ -109,6 +117,25 @@ class AchievementRefreshView(discord.ui.LayoutView):
         ))
         return self
 
+    async def format_rank_summary(self, year=None, month=None) -> str:
+        """One line with the member's rank for each visible counter, or ''."""
+        type_names = self.bot.get_cog('AchievementCog').get_visible_achievement_type_names()
+        entries = []
+        for achievement_type in RANKED_ACHIEVEMENT_TYPES:
+            if achievement_type not in type_names:
+                continue
+            rank, total = await self.db.get_user_rank(self.user_id, achievement_type, year, month)
+            # Members with no count yet are not ranked.
+            if total and rank <= total:
+                entries.append(t(
+                    'achievements.achievements_rank_entry',
+                    type_name=type_names[achievement_type],
+                    rank=rank,
+                    total=total,
+                ))
+        if not entries:
+            return ''
+        return t('achievements.achievements_rank_line', ranks=' · '.join(entries))
 
     async def format_page_monthly(self, date):
         year, month = date.split("-")
@@ -125,7 +152,11 @@ class AchievementRefreshView(discord.ui.LayoutView):
         title = t('achievements.achievements_progress_title', date=date)
         type_names = achievement_cog.get_visible_achievement_type_names()
 
-        embed = discord.Embed(title=title, color=discord.Color.blue())
+        embed = discord.Embed(
+            title=title,
+            description=await self.format_rank_summary(int(year), int(month)) or None,
+            color=discord.Color.blue(),
+        )
         embed.set_author(icon_url=user.display_avatar.url, name=user.name)
 
         for type_name, value in achievement_cog.get_monthly_progress_items(user_achievements):
@@ -183,6 +214,43 @@ class ConfirmationView(View):
         await interaction.response.edit_message(content="**Operation cancelled!**", view=self)
 
 
+class BulkConfirmationView(View):
+    def __init__(self, bot, adjustments, operation, db_manager):
+        super().__init__(timeout=120.0)
+        self.bot = bot
+        self.adjustments = adjustments
+        self.operation = operation
+        self.db = db_manager
+        self.message = None
+
+    async def on_timeout(self):
+        for item in self.children:
+            item.disabled = True
+        self.stop()
+        if self.message is None:
+            return
+        await self.message.edit(content="**Timeout: No longer accepting interactions.**", view=self)
+
+    @discord.ui.button(label="Confirm", style=discord.ButtonStyle.green)
+    async def confirm(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await interaction.response.edit_message(content="**Processing your request...**", view=None)
+
+        # All rows are applied and logged in one transaction
+        batch_id = await self.db.apply_bulk_changes(interaction.user.id, self.adjustments, self.operation)
+
+        if batch_id:
+            await interaction.edit_original_response(
+                content=f"**Operation bulk_{self.operation} complete for {len(self.adjustments)} members!**",
+                view=None,
+            )
+        else:
+            await interaction.edit_original_response(content="**Error processing request!**", view=None)
+
+    @discord.ui.button(label="Cancel", style=discord.ButtonStyle.red)
+    async def cancel(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await interaction.response.edit_message(content="**Operation cancelled!**", view=self)
+
+
 class AchievementRankingView(View):
     def __init__(self, bot, db_manager, year=None, month=None):
         super().__init__(timeout=180.0)
@@ -277,7 +345,12 @@ class AchievementOperationView(discord.ui.View):
 
         for record in records:
             user = await self.bot.fetch_user(record[0])
-            target_user = await self.bot.fetch_user(record[1])
+            batch_size = record[8]
+            if batch_size:
+                # Bulk imports are logged once, with the number of members
+                target_name = f"{batch_size} members"
+            else:
+                target_name = (await self.bot.fetch_user(record[1])).name
             operation = record[2]
             message_count = record[3]
             reaction_count = record[4]
@@ -291,7 +364,7 @@ class AchievementOperationView(discord.ui.View):
                 f"Time Spent: {time_spent}",
             ]
 
-            embed.add_field(name=f"{timestamp} - {user.name} -> {target_user.name}",
+            embed.add_field(name=f"{timestamp} - {user.name} -> {target_name}",
                             value="\n".join(operation_lines),
                             inline=False)
 
@@ -314,12 +387,24 @@ class AchievementOperationView(discord.ui.View):
 
 
 class RankView(discord.ui.View):
-    def __init__(self, bot, year=None, month=None, all_rankings=None):
+    """Ranking panel that loads one page of one category at a time.
+
+    Pages are fetched with keyset pagination: ``self.cursors[type][page]`` is
+    the ``(score, user_id)`` that page starts after. Rendered pages are shared
+    between panels for a short TTL through the cog's ``rank_pages`` cache,
+    keyed by (category, period, page).
+    """
+
+    PAGE_SIZE = 40
+
+    def __init__(self, bot, year=None, month=None, *, start=None, end=None):
         super().__init__(timeout=180.0)
         self.bot = bot
         self.year = year
         self.month = month
-        self.all_rankings = all_rankings  # Store all pre-fetched rankings
+        # Inclusive day range, used instead of year/month when set.
+        self.start = start
+        self.end = end
         self.message = None  # Will hold reference to the message
 
         self.achievement_config = config.get_config('achievements')
@@ -328,6 +413,10 @@ class RankView(discord.ui.View):
         self.visible_type_names = self.achievement_cog.get_visible_achievement_type_names()
         self.type_button_labels = rank_type_button_labels()
 
+        self.current_type = None  # Category on screen; None for all rankings
+        self.page = 0
+        self.cursors = {}
+
         # Add buttons for category selection
         all_emoji, all_label = rank_button_parts('all', t('achievements.rank.all_button_label'))
         self.all_button = discord.ui.Button(
@@ -355,10 +444,27 @@ class RankView(discord.ui.View):
             button.callback = self.type_button_callback
             self.type_buttons.append(button)
 
+        self.previous_button = discord.ui.Button(
+            style=discord.ButtonStyle.secondary,
+            label=t('achievements.rank.previous_page_label'),
+            custom_id="page_previous",
+            disabled=True,
+        )
+        self.next_button = discord.ui.Button(
+            style=discord.ButtonStyle.secondary,
+            label=t('achievements.rank.next_page_label'),
+            custom_id="page_next",
+            disabled=True,
+        )
+        self.previous_button.callback = self.previous_page
+        self.next_button.callback = self.next_page
+
         # Add all buttons to the view
         self.add_item(self.all_button)
         for button in self.type_buttons:
             self.add_item(button)
+        self.add_item(self.previous_button)
+        self.add_item(self.next_button)
 
     async def interaction_check(self, interaction: discord.Interaction) -> bool:
         # Allow anyone to interact with the buttons
@@ -369,7 +475,8 @@ class RankView(discord.ui.View):
         await interaction.response.defer()
 
         # Format and display all rankings (like the original achievement_ranking)
-        embed = self.format_all_rankings_embed()
+        self.current_type = None
+        embed = await self.format_all_rankings_embed()
         await interaction.edit_original_response(embed=embed, view=self)
 
     async def type_button_callback(self, interaction: discord.Interaction):
@@ -380,27 +487,68 @@ class RankView(discord.ui.View):
         type_name_parts = interaction.data['custom_id'].split('_')[1:]  # Get everything after "type"
         type_name = "_".join(type_name_parts)  # Reconstruct full name
 
-        # print(f"Fetching ranking for: {type_name}")  # Debugging log
+        self.current_type = type_name
+        self.page = 0
+        embed = await self.format_single_type_embed(type_name)
+        await interaction.edit_original_response(embed=embed, view=self)
 
-        # Now it should correctly fetch "time_spent" instead of "time"
-        embed = self.format_single_type_embed(type_name)
+    async def previous_page(self, interaction: discord.Interaction):
+        await interaction.response.defer()
+        self.page = max(0, self.page - 1)
+        embed = await self.format_single_type_embed(self.current_type, self.page)
         await interaction.edit_original_response(embed=embed, view=self)
 
-    def format_all_rankings_embed(self):
-        """Format embed showing all rankings (limited to 10 per type)"""
-        title = t('achievements.achievements_ranking_title')
+    async def next_page(self, interaction: discord.Interaction):
+        await interaction.response.defer()
+        self.page += 1
+        embed = await self.format_single_type_embed(self.current_type, self.page)
+        await interaction.edit_original_response(embed=embed, view=self)
+
+    @property
+    def period(self):
+        """Keyword arguments selecting this panel's period in the database."""
+        return {'year': self.year, 'month': self.month, 'start': self.start, 'end': self.end}
+
+    def page_cache_key(self, type_name, page):
+        period = (self.year, self.month, self.start, self.end)
+        return type_name, tuple(str(part) if part is not None else None for part in period), page
+
+    def format_period_title(self, title):
+        """Append the selected month or day range to ``title``."""
+        if self.start is not None:
+            return t(
+                'achievements.rank.embed_title_range_format',
+                title=title,
+                start=self.start.isoformat(),
+                end=self.end.isoformat(),
+            )
         if self.year is not None and self.month is not None:
-            embed = discord.Embed(
-                title=t(
-                    'achievements.rank.embed_title_date_format',
-                    title=title,
-                    year=self.year,
-                    month=self.month,
-                ),
-                color=discord.Color.blue()
+            return t(
+                'achievements.rank.embed_title_date_format',
+                title=title,
+                year=self.year,
+                month=self.month,
             )
-        else:
-            embed = discord.Embed(title=title, color=discord.Color.blue())
+        return title
+
+    async def fetch_rankings(self, type_name, limit, after=None):
+        period = dict(self.period)
+        if period['end'] is not None:
+            # The database takes a half-open day range.
+            period['end'] += timedelta(days=1)
+        return await self.achievement_cog.db.get_leaderboard_page(type_name, limit, after, **period)
+
+    async def format_all_rankings_embed(self):
+        """Format embed showing all rankings (limited to 10 per type)"""
+        self.previous_button.disabled = True
+        self.next_button.disabled = True
+        cache_key = self.page_cache_key('all', 0)
+        cached = self.achievement_cog.rank_pages.get(cache_key)
+        if cached is not None:
+            return discord.Embed.from_dict(cached[0])
+
+        title = self.format_period_title(t('achievements.achievements_ranking_title'))
+        embed = discord.Embed(title=title, color=discord.Color.blue())
 
         # Define the emojis for the ranks
         rank_emojis = self.achievement_config['achievements_ranking_emoji']
@@ -410,13 +558,11 @@ class RankView(discord.ui.View):
             type_name = achievement.get('type')
             display_name = achievement.get('name', type_name)
 
-            # Get the top 10 users for this type
-            top_users = self.all_rankings.get(type_name, [])[:10]  # Limit to first 10
+            # Get the top users for this type, at most one per rank emoji
+            top_users = await self.fetch_rankings(type_name, min(10, len(rank_emojis)))
 
             ranking = ""
             for i, (user_id, count) in enumerate(top_users):
-                if i >= len(rank_emojis):
-                    break
                 user = self.bot.get_user(int(user_id))
                 if type_name == "time_spent":
                     count /= 60  # Convert seconds to minutes
@@ -428,36 +574,45 @@ class RankView(discord.ui.View):
                 inline=False
             )
 
+        self.achievement_cog.rank_pages.put(cache_key, (embed.to_dict(), None))
         return embed
 
-    def format_single_type_embed(self, type_name):
-        """Format embed showing extended rankings (up to 40) for a single type"""
-        # Find the achievement ranking configuration for this type
-        achievement_info = next(
-            (a for a in self.visible_rankings if a.get('type') == type_name),
-            {}
-        )
-
-        display_name = achievement_info.get('name', type_name)
+    async def format_single_type_embed(self, type_name, page=0):
+        """Format embed showing one page (up to 40 ranks) of a single type"""
+        cursors = self.cursors.setdefault(type_name, [None])
+        cache_key = self.page_cache_key(type_name, page)
+        cached = self.achievement_cog.rank_pages.get(cache_key)
+        if cached is not None:
+            embed_data, next_cursor = cached
+        else:
+            # Fetch one extra row to learn whether another page follows.
+            rows = await self.fetch_rankings(type_name, self.PAGE_SIZE + 1, cursors[page])
+            top_users = rows[:self.PAGE_SIZE]
+            next_cursor = None
+            if len(rows) > self.PAGE_SIZE:
+                last_user_id, last_count = top_users[-1]
+                next_cursor = (last_count, last_user_id)
+            embed_data = self.render_single_type_embed(type_name, page, top_users).to_dict()
+            self.achievement_cog.rank_pages.put(cache_key, (embed_data, next_cursor))
+
+        del cursors[page + 1:]
+        if next_cursor is not None:
+            cursors.append(next_cursor)
+        self.previous_button.disabled = page == 0
+        self.next_button.disabled = next_cursor is None
+        return discord.Embed.from_dict(embed_data)
+
+    def render_single_type_embed(self, type_name, page, top_users):
         type_display_name = self.visible_type_names.get(type_name, type_name)
 
         # Create the embed title
         title = t('achievements.rank.embed_title_single', type_name=type_display_name)
 
         # Add date to title if provided
-        if self.year is not None and self.month is not None:
-            title = t(
-                'achievements.rank.embed_title_date_format',
-                title=title,
-                year=self.year,
-                month=self.month
-            )
+        title = self.format_period_title(title)
 
         embed = discord.Embed(title=title, color=discord.Color.blue())
 
-        # Get the extended top users for this type (up to 40)
-        top_users = self.all_rankings.get(type_name, [])[:40]  # Get up to 40 users
-
         if not top_users:
             embed.description = t('achievements.rank.no_data_message')
             return embed
@@ -469,7 +624,7 @@ class RankView(discord.ui.View):
         chunks = [top_users[i:i + 10] for i in range(0, len(top_users), 10)]
 
         for chunk_index, chunk in enumerate(chunks):
-            start_rank = chunk_index * 10 + 1
+            start_rank = page * self.PAGE_SIZE + chunk_index * 10 + 1
             end_rank = start_rank + len(chunk) - 1
 
             ranking = ""
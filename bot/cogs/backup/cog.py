@@ -4,8 +4,9 @@
 # ========================================
 
 import discord
-import shutil
 import asyncio
+import io
+from dataclasses import replace
 from discord.ext import commands, tasks
 from discord import app_commands
 from discord.app_commands import locale_str
@@ -13,7 +14,32 @@ from datetime import datetime, timedelta
 import logging
 
 from bot.utils import config, check_channel_validity
+from bot.utils.db_backup import (
+    DEFAULT_COMPRESSION,
+    DEFAULT_PAGES_PER_STEP,
+    DEFAULT_STEP_PAUSE_SECONDS,
+    DataVersionWatcher,
+    RetentionPolicy,
+    create_backup,
+    format_size,
+    hash_backup_file,
+    list_backups,
+    prune_backups,
+    quarantine_backup,
+    record_verification,
+    resolve_compression,
+    verify_backup,
+)
+from bot.utils.db_metrics import QueryMetrics, format_query_report
 from bot.utils.paths import project_path, resolve_project_path
+from bot.utils.wal_archive import (
+    DEFAULT_ARCHIVE_INTERVAL_SECONDS,
+    DEFAULT_BASE_INTERVAL_HOURS,
+    DEFAULT_KEEP_GENERATIONS,
+    WalArchiveGapError,
+    WalArchiver,
+    continuous_backup_enabled,
+)
 
 
 class BackupCog(commands.Cog):
@@ -23,45 +49,190 @@ class BackupCog(commands.Cog):
         self.db_path = resolve_project_path(self.conf['db_path'])
         self.backup_folder = project_path('backup', 'db_backup')
         self.backup_folder_manual = project_path('backup', 'db_backup_manual')
-        self.file_limit = 20
+        self.archive_folder = project_path('backup', 'wal_archive')
+        self.verification_log = project_path('backup', 'verification.jsonl')
+
+        backup_conf = self.conf.get('backup') or {}
+        self.interval_hours = min(24, max(1, int(backup_conf.get('interval_hours', 6))))
+        self.pages_per_step = int(backup_conf.get('pages_per_step', DEFAULT_PAGES_PER_STEP))
+        self.step_pause = float(backup_conf.get('step_pause_seconds', DEFAULT_STEP_PAUSE_SECONDS))
+        self.compression = resolve_compression(backup_conf.get('compression', DEFAULT_COMPRESSION))
+        self.compression_level = backup_conf.get('compression_level')
+        self.skip_unchanged = bool(backup_conf.get('skip_unchanged', True))
+        self.retention = RetentionPolicy.from_config(backup_conf.get('retention'))
+        self.file_limit = max(1, int(backup_conf.get('manual_keep', 20)))
+        self.verify = bool(backup_conf.get('verify', True))
+
+        # Change detection for scheduled backups: data_version catches commits
+        # while the bot runs, the content hash covers the first backup after
+        # a restart.
+        self._change_watcher = DataVersionWatcher(self.db_path)
+        self._backed_up_data_version = None
+        self._last_backup_sha256 = None
+        self._last_backup_sha256_loaded = False
+
+        # Continuous backup: ship committed WAL frames every few seconds on
+        # top of a periodic base snapshot, for point-in-time restore.
+        continuous_conf = backup_conf.get('continuous') or {}
+        self._wal_archiver = None
+        if continuous_backup_enabled(backup_conf):
+            self._wal_archiver = WalArchiver(
+                self.db_path,
+                self.archive_folder,
+                compression=self.compression,
+                keep_generations=int(continuous_conf.get('keep_generations', DEFAULT_KEEP_GENERATIONS)),
+            )
+            self.base_interval = timedelta(
+                hours=max(1, int(continuous_conf.get('base_interval_hours', DEFAULT_BASE_INTERVAL_HOURS)))
+            )
+            archive_seconds = max(1, int(continuous_conf.get('interval_seconds', DEFAULT_ARCHIVE_INTERVAL_SECONDS)))
+            if self.archive_wal.seconds != archive_seconds:
+                self.archive_wal.change_interval(seconds=archive_seconds)
+            self.archive_wal.start()
+
+        if self.backup_database.hours != self.interval_hours:
+            self.backup_database.change_interval(hours=self.interval_hours)
         self.backup_database.start()
 
+    def cog_unload(self):
+        if self.backup_database.is_running():
+            self.backup_database.cancel()
+        self._change_watcher.close()
+        if self._wal_archiver is not None:
+            if self.archive_wal.is_running():
+                self.archive_wal.cancel()
+            # Ship the last frames before the pools close: SQLite checkpoints
+            # and deletes the WAL when its last connection goes away.
+            try:
+                if self._wal_archiver.generation is not None:
+                    self._wal_archiver.archive()
+            except Exception as e:
+                logging.error(f"Final WAL archive pass failed: {e}")
+            self._wal_archiver.close()
+
     @tasks.loop(hours=6)
     async def backup_database(self, manual=False):
         folder = self.backup_folder_manual if manual else self.backup_folder
 
         folder.mkdir(parents=True, exist_ok=True)
 
-        # Copy the database to the backup folder with the current time appended to the name
-        backup_name = f"database_{datetime.now().strftime('%Y%m%d_%H%M%S')}.db"
-        backup_path = folder / backup_name
+        data_version = None
+        previous_sha256 = None
+        if not manual and self.skip_unchanged:
+            data_version = await asyncio.to_thread(self._change_watcher.current)
+            if data_version == self._backed_up_data_version:
+                logging.info("Database unchanged since the last backup; skipping scheduled backup")
+                return None
+            previous_sha256 = await self._get_last_backup_sha256(folder)
 
-        shutil.copy2(self.db_path, backup_path)
-        logging.info(f"Database backup created: {backup_path}")
+        # The online backup API copies a consistent snapshot (WAL contents
+        # included) while other connections keep writing; the worker thread
+        # keeps the event loop free for the copy and the compression.
+        result = await asyncio.to_thread(
+            create_backup,
+            self.db_path,
+            folder,
+            compression=self.compression,
+            compression_level=self.compression_level,
+            pages_per_step=self.pages_per_step,
+            step_pause=self.step_pause,
+            previous_sha256=previous_sha256,
+        )
+        if result.skipped:
+            if not manual:
+                self._backed_up_data_version = data_version
+            logging.info("Database contents match the last backup; discarded the new snapshot")
+            return result
 
-        # Get a list of all backup files sorted by modification time
-        backups = sorted(
-            (path for path in folder.iterdir() if path.is_file() and path.name != '.gitkeep'),
-            key=lambda path: path.stat().st_mtime,
+        logging.info(
+            f"Database backup created: {result.path} "
+            f"({format_size(result.size_bytes)}, {result.duration_seconds:.2f}s)"
         )
 
-        # If there are too many backups, delete the oldest one
-        while len(backups) > self.file_limit:
-            oldest_backup = backups.pop(0)
-            oldest_backup.unlink()
-            logging.info(f"Deleted the oldest backup file: {oldest_backup}")
+        if self.verify:
+            result = replace(result, verification=await self._verify_backup(result.path))
+            if not result.verification.ok:
+                # A broken backup must not take the place of a good one in a
+                # retention bucket, nor be the reference for skip-unchanged.
+                quarantined = await asyncio.to_thread(quarantine_backup, result.path)
+                logging.error(f"Moved the failed backup aside as {quarantined}")
+                return replace(result, path=quarantined)
+
+        if not manual:
+            self._backed_up_data_version = data_version
+            self._last_backup_sha256 = result.sha256
+
+        if manual:
+            # Manual backups are deliberate restore points: keep the newest N.
+            for oldest_backup in list_backups(folder)[:-self.file_limit]:
+                oldest_backup.unlink()
+                logging.info(f"Deleted the oldest backup file: {oldest_backup}")
+        else:
+            removed = await asyncio.to_thread(prune_backups, folder, self.retention)
+            for path in removed:
+                logging.info(f"Deleted backup outside the retention policy: {path}")
+
+        return result
+
+    async def _verify_backup(self, path):
+        # Decompressing and checking a large backup takes a while; keep it off
+        # the event loop like the backup itself.
+        verification = await asyncio.to_thread(verify_backup, path)
+        try:
+            await asyncio.to_thread(record_verification, self.verification_log, path, verification)
+        except OSError as e:
+            logging.warning(f"Could not record backup verification in {self.verification_log}: {e}")
+        if verification.ok:
+            logging.info(f"Backup verified with quick_check: {path} ({verification.duration_seconds:.2f}s)")
+        else:
+            logging.error(f"Backup failed verification: {path}: {verification.detail}")
+        return verification
+
+    async def _get_last_backup_sha256(self, folder):
+        if not self._last_backup_sha256_loaded:
+            self._last_backup_sha256_loaded = True
+            backups = list_backups(folder)
+            if backups:
+                try:
+                    self._last_backup_sha256 = await asyncio.to_thread(hash_backup_file, backups[-1])
+                except Exception as e:
+                    logging.warning(f"Could not hash the latest backup {backups[-1]}: {e}")
+        return self._last_backup_sha256
+
+    @tasks.loop(seconds=DEFAULT_ARCHIVE_INTERVAL_SECONDS)
+    async def archive_wal(self):
+        try:
+            segment = await asyncio.to_thread(self._archive_wal_once)
+        except Exception as e:
+            logging.error(f"WAL archive pass failed: {e}")
+            return
+        if segment is not None:
+            logging.debug(f"Archived WAL segment: {segment}")
+
+    def _archive_wal_once(self):
+        archiver = self._wal_archiver
+        now = datetime.now()
+        if archiver.generation is None:
+            archiver.start_generation(now)
+            return None
+        try:
+            segment = archiver.archive(now)
+        except WalArchiveGapError as e:
+            logging.warning(f"{e}; taking a new base snapshot")
+            archiver.start_generation(now)
+            return None
+        if now - archiver.generation_started_at >= self.base_interval:
+            # A fresh base bounds how many segments a restore has to replay.
+            archiver.start_generation(now)
+        return segment
 
     @backup_database.before_loop
     async def before_backup(self):
+        # Run on hour boundaries that are multiples of the interval, counted
+        # from local midnight (00:00, 06:00, 12:00 and 18:00 by default).
         now = datetime.now()
-        if now.hour < 6:
-            next_run = now.replace(hour=6, minute=0, second=0)
-        elif now.hour < 12:
-            next_run = now.replace(hour=12, minute=0, second=0)
-        elif now.hour < 18:
-            next_run = now.replace(hour=18, minute=0, second=0)
-        else:
-            next_run = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0)
+        next_hour = (now.hour // self.interval_hours + 1) * self.interval_hours
+        next_run = now.replace(minute=0, second=0, microsecond=0) + timedelta(hours=next_hour - now.hour)
         await asyncio.sleep((next_run - now).total_seconds())
 
     @app_commands.command(
@@ -75,5 +246,60 @@ class BackupCog(commands.Cog):
         if not await check_channel_validity(interaction):
             return
 
-        await self.backup_database(manual=True)
-        await interaction.response.send_message("Database backup created")
+        # Large databases can take longer than Discord's 3-second response
+        # window, so acknowledge first and report the result as a follow-up.
+        await interaction.response.defer()
+        try:
+            result = await self.backup_database(manual=True)
+        except Exception as e:
+            logging.error(f"Manual database backup failed: {e}")
+            await interaction.followup.send(f"Database backup failed: {e}")
+            return
+        message = (
+            f"Database backup created: {result.path.name} "
+            f"({format_size(result.size_bytes)}, {result.duration_seconds:.2f}s)"
+        )
+        if result.verification is not None:
+            if result.verification.ok:
+                message += f"\nquick_check: ok ({result.verification.duration_seconds:.2f}s)"
+            else:
+                message += f"\nquick_check FAILED: {result.verification.detail}"
+        await interaction.followup.send(message)
+
+    @app_commands.command(
+        name='db_stats',
+        description=locale_str(
+            'Show the slowest and busiest database statements',
+            key='backup.db_stats.description',
+        ),
+    )
+    @app_commands.describe(
+        sort=locale_str(
+            'Order by total, p95, p99, count, rows or lock_wait. Defaults to total.',
+            key='backup.db_stats.params.sort',
+        ),
+        limit=locale_str(
+            'Number of statements to show (1-50). Defaults to 10.',
+            key='backup.db_stats.params.limit',
+        ),
+    )
+    async def db_stats(self, interaction: discord.Interaction, sort: str = 'total', limit: int = 10):
+        if not await check_channel_validity(interaction):
+            return
+
+        sort = sort.lower()
+        if sort not in QueryMetrics.SORT_KEYS:
+            await interaction.response.send_message(
+                f"Unknown sort {sort!r}; use one of: {', '.join(QueryMetrics.SORT_KEYS)}",
+                ephemeral=True,
+            )
+            return
+
+        report = format_query_report(sort, min(50, max(1, limit)))
+        if len(report) > 1900:
+            await interaction.response.send_message(
+                "Query metrics report attached.",
+                file=discord.File(io.BytesIO(report.encode('utf-8')), filename='db_stats.txt'),
+            )
+        else:
+            await interaction.response.send_message(f"```\n{report}\n```")
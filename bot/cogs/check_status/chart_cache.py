@@ -0,0 +1,187 @@
+"""Cache of rendered /print_voice_status charts.
+
+Charts of completed periods never change, so their PNGs are kept on disk
+under a name derived from ``(mode, period, locale, style version, scope)`` and
+evicted least recently used once the directory outgrows its byte budget.
+Charts of a period that is still being sampled are kept in memory for a
+short TTL only. Concurrent requests for the same chart share one render.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from bot.utils.date_ranges import prefix_range
+from bot.utils.leaderboard_cache import TTLCache
+
+DEFAULT_CHART_CACHE_DIR = './data/chart_cache'
+DEFAULT_CHART_CACHE_MAX_MB = 64
+DEFAULT_CURRENT_PERIOD_TTL_SECONDS = 60
+# Samples are buffered and written in batches, so a period only counts as
+# complete a little after it ends.
+COMPLETION_GRACE = timedelta(minutes=15)
+
+ChartPair = Tuple[bytes, bytes]
+_CHART_NAMES = ('people', 'channels')
+
+
+def chart_cache_key(mode: str, period: str, locale: str, style_version: int, scope: str = '') -> str:
+    """Hex digest naming the cached files of one chart pair."""
+    return hashlib.sha256(f'{mode}|{period}|{locale}|{style_version}|{scope}'.encode()).hexdigest()
+
+
+def is_period_complete(period: str, now: Optional[datetime] = None) -> bool:
+    """Whether every sample of ``period`` has been recorded (timestamps are UTC).
+
+    Invalid dates such as ``2025-02-30`` are never complete, so they are not
+    written to disk.
+    """
+    now = now or datetime.now(timezone.utc)
+    try:
+        _, end = prefix_range(period)
+    except ValueError:
+        return False
+    return end <= (now - COMPLETION_GRACE).strftime('%Y-%m-%d %H:%M:%S')
+
+
+class ChartCache:
+    """Rendered chart pairs: completed periods on disk, the current one in memory."""
+
+    def __init__(
+        self,
+        directory: str,
+        max_bytes: int = DEFAULT_CHART_CACHE_MAX_MB * 1024 * 1024,
+        current_ttl: float = DEFAULT_CURRENT_PERIOD_TTL_SECONDS,
+    ):
+        self.directory = directory
+        self.max_bytes = max(0, int(max_bytes))
+        self._current = TTLCache(current_ttl, max_entries=32)
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        # key -> (last use, bytes); rebuilt from the directory on first use.
+        self._index: Optional[Dict[str, Tuple[float, int]]] = None
+
+    async def get_or_render(
+        self,
+        mode: str,
+        period: str,
+        locale: str,
+        style_version: int,
+        render: Callable[[], Awaitable[Optional[ChartPair]]],
+        scope: str = '',
+    ) -> Optional[ChartPair]:
+        """The cached chart pair, or the result of ``render()``.
+
+        ``render`` returns None when there is nothing to draw; that result
+        is not cached. ``scope`` separates charts of the same period drawn
+        from different data, such as one category.
+        """
+        key = chart_cache_key(mode, period, locale, style_version, scope)
+        complete = is_period_complete(period)
+
+        cached = self._current.get(key) if not complete else await asyncio.to_thread(self._read, key)
+        if cached is not None:
+            return cached
+
+        pending = self._in_flight.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            charts = await render()
+            if charts is not None:
+                if complete:
+                    await asyncio.to_thread(self._write, key, charts)
+                else:
+                    self._current.put(key, charts)
+            future.set_result(charts)
+            return charts
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark the exception retrieved when nobody else was waiting.
+            future.exception()
+            raise
+        finally:
+            del self._in_flight[key]
+
+    def _path(self, key: str, name: str) -> str:
+        return os.path.join(self.directory, f'{key}.{name}.png')
+
+    def _load_index(self) -> Dict[str, Tuple[float, int]]:
+        if self._index is None:
+            self._index = {}
+            os.makedirs(self.directory, exist_ok=True)
+            sizes: Dict[str, list] = {}
+            for entry in os.scandir(self.directory):
+                key, _, suffix = entry.name.partition('.')
+                if suffix not in (f'{name}.png' for name in _CHART_NAMES):
+                    continue
+                stat = entry.stat()
+                last_used, size, parts = sizes.setdefault(key, [0.0, 0, 0])
+                sizes[key] = [max(last_used, stat.st_mtime), size + stat.st_size, parts + 1]
+            for key, (last_used, size, parts) in sizes.items():
+                if parts == len(_CHART_NAMES):
+                    self._index[key] = (last_used, size)
+                else:
+                    self._remove(key)
+        return self._index
+
+    def _read(self, key: str) -> Optional[ChartPair]:
+        index = self._load_index()
+        if key not in index:
+            return None
+        try:
+            charts = []
+            for name in _CHART_NAMES:
+                with open(self._path(key, name), 'rb') as f:
+                    charts.append(f.read())
+                os.utime(self._path(key, name))
+        except OSError as e:
+            logging.warning(f"Dropping unreadable cached chart {key}: {e}")
+            del index[key]
+            self._remove(key)
+            return None
+        index[key] = (time.time(), index[key][1])
+        return charts[0], charts[1]
+
+    def _write(self, key: str, charts: ChartPair) -> None:
+        index = self._load_index()
+        size = sum(len(png) for png in charts)
+        if size > self.max_bytes:
+            return
+        try:
+            for name, png in zip(_CHART_NAMES, charts):
+                fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(png)
+                os.replace(tmp_path, self._path(key, name))
+        except OSError as e:
+            logging.warning(f"Could not cache chart {key}: {e}")
+            self._remove(key)
+            return
+        index[key] = (time.time(), size)
+        self._evict(index)
+
+    def _evict(self, index: Dict[str, Tuple[float, int]]) -> None:
+        total = sum(size for _, size in index.values())
+        for key in sorted(index, key=lambda entry: index[entry][0]):
+            if total <= self.max_bytes:
+                break
+            total -= index.pop(key, (0, 0))[1]
+            self._remove(key)
+
+    def _remove(self, key: str) -> None:
+        for name in _CHART_NAMES:
+            try:
+                os.remove(self._path(key, name))
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,187 @@
+"""Voice status charts for /print_voice_status, rendered in worker processes.
+
+The cog reduces the stored samples to plain series with
+:func:`summarize_samples`; :class:`ChartRenderer` draws them in a process
+pool and returns PNG bytes, so matplotlib never runs on the event loop.
+Rendering uses ``matplotlib.figure.Figure`` objects rather than pyplot's
+global state, so concurrent renders cannot draw onto each other's figures.
+"""
+
+import asyncio
+import io
+import multiprocessing
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from matplotlib.figure import Figure
+
+DEFAULT_CHART_WORKERS = 2
+# Part of the chart cache key; bump whenever the rendered images change.
+CHART_STYLE_VERSION = 1
+
+PEOPLE_COLOR = '#4c78a8'
+ROOMS_COLOR = '#72b7b2'
+
+
+def summarize_samples(mode: str, rows: Sequence[Tuple[str, int, int]]) -> Dict[str, List]:
+    """``labels``, ``people`` and ``channels`` series for one chart period.
+
+    ``day`` keeps every sample, labelled with its timestamp; ``month`` and
+    ``year`` keep the peak of each day or month. Rows that are already daily
+    or monthly peaks (the status rollups) pass through unchanged.
+    """
+    if mode == 'day':
+        return {
+            'labels': [row[0] for row in rows],
+            'people': [row[1] for row in rows],
+            'channels': [row[2] for row in rows],
+        }
+
+    key_length = 10 if mode == 'month' else 7  # YYYY-MM-DD or YYYY-MM
+    peak_people: Dict[str, int] = defaultdict(int)
+    peak_channels: Dict[str, int] = defaultdict(int)
+    for timestamp, people, channels in rows:
+        key = timestamp[:key_length]
+        peak_people[key] = max(peak_people[key], people)
+        peak_channels[key] = max(peak_channels[key], channels)
+    keys = sorted(peak_people)
+    return {
+        'labels': keys,
+        'people': [peak_people[key] for key in keys],
+        'channels': [peak_channels[key] for key in keys],
+    }
+
+
+def render_voice_status_charts(
+    mode: str, period: str, series: Dict[str, List], scope: Optional[str] = None
+) -> Tuple[bytes, bytes]:
+    """PNG bytes of the people chart and the rooms chart.
+
+    ``scope`` (a category name) is appended to the chart titles.
+    """
+    # matplotlib titles / axis labels remain in English; extracting them
+    # is a separate follow-up (P1-6 step 1 flagged).
+    labels = series['labels']
+    suffix = f' - {scope}' if scope else ''
+    if mode == 'day':
+        return (
+            _render_day_chart(labels, series['people'], PEOPLE_COLOR, 'People', f'Voice participants{suffix}'),
+            _render_day_chart(labels, series['channels'], ROOMS_COLOR, 'Rooms', f'Voice rooms{suffix}'),
+        )
+    if mode == 'month':
+        return (
+            _render_daily_peaks_chart(period, labels, series['people'], PEOPLE_COLOR, 'People', 'people', suffix),
+            _render_daily_peaks_chart(period, labels, series['channels'], ROOMS_COLOR, 'Rooms', 'rooms', suffix),
+        )
+    month_labels = [label.split('-')[-1] for label in labels]
+    return (
+        _render_monthly_peaks_chart(period, month_labels, series['people'], PEOPLE_COLOR, 'People', 'people', suffix),
+        _render_monthly_peaks_chart(period, month_labels, series['channels'], ROOMS_COLOR, 'Rooms', 'rooms', suffix),
+    )
+
+
+def _new_axes():
+    figure = Figure(figsize=(10, 5))
+    return figure, figure.subplots()
+
+
+def _to_png(figure) -> bytes:
+    buf = io.BytesIO()
+    figure.savefig(buf, format='png', bbox_inches='tight')
+    return buf.getvalue()
+
+
+def _offset_y(y: float) -> float:
+    return y + max(0.02, y * 0.001)
+
+
+def _render_day_chart(labels: List[str], values: List[int], color: str, unit: str, title: str) -> bytes:
+    timestamps = [datetime.strptime(label, '%Y-%m-%d %H:%M:%S') for label in labels]
+    peak = max(values)
+    peak_time = timestamps[values.index(peak)]
+
+    figure, ax = _new_axes()
+    ax.plot(timestamps, values, color=color, alpha=0.75, linewidth=2, marker='o', markersize=4, label=unit)
+    ax.scatter([peak_time], [peak], color='red', zorder=5, label=f'Peak {peak}')
+    ax.text(peak_time, _offset_y(peak), str(peak), ha='center', va='bottom', color='red', fontsize=9)
+    ax.set_title(f'{title} (max {peak} at {peak_time.strftime("%H:%M")})')
+    ax.set_xlabel('Time')
+    ax.set_ylabel(unit)
+    ax.grid(True, alpha=0.3)
+    ax.legend()
+    ax.tick_params(axis='x', labelrotation=45)
+    return _to_png(figure)
+
+
+def _render_daily_peaks_chart(
+    period: str, labels: List[str], values: List[int], color: str, unit: str, noun: str, suffix: str
+) -> bytes:
+    x_idx = list(range(len(labels)))
+
+    figure, ax = _new_axes()
+    ax.plot(x_idx, values, color=color, alpha=0.6, linewidth=2, marker='o', markersize=4,
+            label=f'Daily peak {noun}')
+    ax.scatter(x_idx, values, color='red', zorder=5)
+    for x, y in zip(x_idx, values):
+        ax.text(x, _offset_y(y), str(y), ha='center', va='bottom', color='red', fontsize=8)
+    ax.set_title(f'{period} daily voice peaks ({noun}){suffix}')
+    ax.set_xlabel('Day')
+    ax.set_ylabel(unit)
+    ax.grid(True, alpha=0.3)
+    ax.legend()
+    ax.set_xticks(x_idx, labels, rotation=45)
+    return _to_png(figure)
+
+
+def _render_monthly_peaks_chart(
+    period: str, labels: List[str], values: List[int], color: str, unit: str, noun: str, suffix: str
+) -> bytes:
+    x_idx = list(range(len(labels)))
+
+    figure, ax = _new_axes()
+    ax.bar(x_idx, values, color=color, alpha=0.75, label=f'Monthly peak {noun}')
+    for x, y in zip(x_idx, values):
+        ax.text(x, y, str(y), ha='center', va='bottom', color='#333', fontsize=8)
+    ax.set_title(f'{period} monthly voice peaks ({noun}){suffix}')
+    ax.set_xlabel('Month')
+    ax.set_ylabel(unit)
+    ax.grid(axis='y', alpha=0.3)
+    ax.set_xticks(x_idx, labels, rotation=0)
+    ax.legend()
+    return _to_png(figure)
+
+
+class ChartRenderer:
+    """A process pool for :func:`render_voice_status_charts`.
+
+    Workers are spawned on first use, not forked, so they do not inherit the
+    bot's event loop or database threads. A pool broken by a crashed worker
+    is replaced on the next render.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_CHART_WORKERS):
+        self.max_workers = max(1, int(max_workers))
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    async def render(
+        self, mode: str, period: str, series: Dict[str, List], scope: Optional[str] = None
+    ) -> Tuple[bytes, bytes]:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context('spawn'),
+            )
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._pool, render_voice_status_charts, mode, period, series, scope)
+        except BrokenProcessPool:
+            self.shutdown()
+            raise
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
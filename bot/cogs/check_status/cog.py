@@ -4,19 +4,30 @@ import logging
 import os
 import re
 import tempfile
-from collections import defaultdict
 from datetime import datetime, timedelta, timezone
 
 import discord
-import matplotlib.pyplot as plt
 from discord.app_commands import locale_str
 from discord.ext import commands, tasks
 
 from bot.utils import CheckStatusDatabaseManager, check_channel_validity, config, fmt_user
+from bot.utils.check_status_db import (
+    DEFAULT_CATEGORY_RETENTION_DAYS,
+    DEFAULT_SAMPLE_INTERVAL_MINUTES,
+    DEFAULT_STATUS_BATCH_SIZE,
+)
 from bot.utils.i18n import t
 from bot.utils.paths import resolve_project_path_string
 from bot.utils.task_helpers import wait_until_ready_or_stop
 
+from .chart_cache import (
+    DEFAULT_CHART_CACHE_DIR,
+    DEFAULT_CHART_CACHE_MAX_MB,
+    DEFAULT_CURRENT_PERIOD_TTL_SECONDS,
+    ChartCache,
+)
+from .charts import CHART_STYLE_VERSION, DEFAULT_CHART_WORKERS, ChartRenderer, summarize_samples
+from .occupancy import VoiceOccupancyIndex
 from .views import MemberPositionView
 
 
@@ -39,51 +50,118 @@ class CheckStatusCog(commands.Cog):
         self.room_log_file = resolve_project_path_string(
             main_config.get('room_log_file') or './data/room_activity.log'
         )
+        chart_config = main_config.get('charts') or {}
+        self.chart_renderer = ChartRenderer(chart_config.get('workers', DEFAULT_CHART_WORKERS))
+        self.chart_cache = ChartCache(
+            resolve_project_path_string(chart_config.get('cache_dir') or DEFAULT_CHART_CACHE_DIR),
+            max_bytes=int(chart_config.get('cache_max_mb', DEFAULT_CHART_CACHE_MAX_MB) * 1024 * 1024),
+            current_ttl=chart_config.get('current_ttl_seconds', DEFAULT_CURRENT_PERIOD_TTL_SECONDS),
+        )
+        self.locale = main_config.get('locale') or 'zh_CN'
+        voice_status_config = main_config.get('voice_status') or {}
+        self.category_retention_days = voice_status_config.get(
+            'category_retention_days', DEFAULT_CATEGORY_RETENTION_DAYS,
+        )
+        self._last_category_prune = None
+        self.sample_interval_minutes = max(
+            1, int(voice_status_config.get('sample_interval_minutes', DEFAULT_SAMPLE_INTERVAL_MINUTES)),
+        )
+        self.status_batch_size = max(1, int(voice_status_config.get('batch_size', DEFAULT_STATUS_BATCH_SIZE)))
+        self.occupancy = VoiceOccupancyIndex()
 
         self.bot.tree.add_command(self.where_is_menu)
+        self.check_voice_status_task.change_interval(minutes=self.sample_interval_minutes)
         self.check_voice_status_task.start()
 
     async def cog_load(self):
-        # Table must be built before the 10-minute task fires; see P0-3a notes.
+        # Table must be built before the sampling task fires; see P0-3a notes.
         await self.db.initialize_database()
 
-    def cog_unload(self):
+    async def cog_unload(self):
         self.check_voice_status_task.cancel()
+        self.chart_renderer.shutdown()
         self.bot.tree.remove_command(self.where_is_menu.name, type=self.where_is_menu.type)
-
-    @tasks.loop(minutes=10)
+        try:
+            await self.db.flush_pending_status()
+        except Exception as e:
+            logging.error(f"Could not write buffered voice status samples: {e}")
+
+    def _voice_occupancy(self):
+        """``(total people, total active channels, per-category counts)`` from the occupancy index."""
+        if self.occupancy.due_for_rebuild():
+            # Check the event-maintained counts against the guild cache.
+            before = self.occupancy.counts() if self.occupancy.ready else None
+            self.occupancy.rebuild(self.bot.guilds)
+            if before is not None and before != self.occupancy.counts():
+                logging.warning("Voice occupancy drifted from the guild state; rebuilt it")
+        return self.occupancy.snapshot()
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        # Also runs after a reconnect, when events may have been missed.
+        self.occupancy.rebuild(self.bot.guilds)
+
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild):
+        self.occupancy.rebuild(self.bot.guilds)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild):
+        # The channels of a guild the bot left no longer count.
+        self.occupancy.rebuild(g for g in self.bot.guilds if g.id != guild.id)
+
+    @commands.Cog.listener()
+    async def on_voice_state_update(self, member, before, after):
+        if self.occupancy.ready:
+            self.occupancy.member_moved(before.channel, after.channel)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_create(self, channel):
+        if self.occupancy.ready:
+            self.occupancy.channel_created(channel)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_update(self, before, after):
+        if self.occupancy.ready:
+            self.occupancy.channel_updated(after)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel):
+        if self.occupancy.ready:
+            self.occupancy.channel_deleted(channel)
+
+    @tasks.loop(minutes=DEFAULT_SAMPLE_INTERVAL_MINUTES)
     async def check_voice_status_task(self):
-        """Record voice-channel occupancy every 10 minutes."""
+        """Sample voice-channel occupancy; samples are written in batches."""
         try:
-            category_counts = {}
-            total_people = 0
-            total_channels = 0
-            for guild in self.bot.guilds:
-                for channel in guild.voice_channels:
-                    if channel.category is not None:
-                        if channel.category.name not in category_counts:
-                            category_counts[channel.category.name] = {'people': 0, 'channels': 0}
-                        category_counts[channel.category.name]['people'] += len(channel.members)
-                        if len(channel.members) > 0:
-                            category_counts[channel.category.name]['channels'] += 1
-                            total_channels += 1
-                        total_people += len(channel.members)
-            category_counts = {k: v for k, v in category_counts.items() if v['people'] > 0 or v['channels'] > 0}
-
-            await self.db.record_status(
-                datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S'),
-                total_people,
-                total_channels,
-            )
+            # Idle categories are kept as zero rows.
+            total_people, total_channels, categories = self._voice_occupancy()
+
+            now = datetime.now(timezone.utc)
+            self.db.queue_status(now.strftime('%Y-%m-%d %H:%M:%S'), total_people, total_channels, categories)
+            if self.db.pending_status_count >= self.status_batch_size:
+                await self.db.flush_pending_status()
+            await self._prune_category_samples(now)
 
             logging.info(f"Voice status checked at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         except Exception as e:
             logging.error(f"An error occurred while checking voice status: {str(e)}")
 
+    async def _prune_category_samples(self, now: datetime) -> None:
+        """Drop raw category samples past the retention window, once per UTC day."""
+        if self._last_category_prune == now.date():
+            return
+        self._last_category_prune = now.date()
+        cutoff = (now - timedelta(days=self.category_retention_days)).strftime('%Y-%m-%d %H:%M:%S')
+        removed = await self.db.prune_category_samples(cutoff)
+        if removed:
+            logging.info(f"Pruned {removed} category voice samples older than {cutoff}")
+
     @check_voice_status_task.before_loop
     async def before_check_voice_status_task(self):
         now = datetime.now()
-        next_run = (now + timedelta(minutes=10 - now.minute % 10)).replace(second=0, microsecond=0)
+        interval = self.sample_interval_minutes
+        next_run = (now + timedelta(minutes=interval - now.minute % interval)).replace(second=0, microsecond=0)
         await asyncio.sleep((next_run - now).total_seconds())
         await wait_until_ready_or_stop(
             self.bot,
@@ -103,8 +181,17 @@ class CheckStatusCog(commands.Cog):
             "The date in format YYYY-MM-DD, YYYY-MM, or YYYY.",
             key="checkstatus.print_voice_status.params.date",
         ),
+        category=locale_str(
+            "Only count voice channels in this category.",
+            key="checkstatus.print_voice_status.params.category",
+        ),
     )
-    async def print_voice_status(self, interaction: discord.Interaction, date: str):
+    async def print_voice_status(
+        self,
+        interaction: discord.Interaction,
+        date: str,
+        category: discord.CategoryChannel = None,
+    ):
         """Generates line graphs for the number of people and channels on a specific date, month, or year."""
         await interaction.response.defer()
         try:
@@ -118,151 +205,39 @@ class CheckStatusCog(commands.Cog):
                 await interaction.followup.send(t('checkstatus.date_format_error'), ephemeral=True)
                 return
 
-            rows = await self.db.fetch_status_by_date_prefix(date)
+            async def render():
+                if category is not None:
+                    if mode == 'day':
+                        rows = await self.db.fetch_category_status_by_date_prefix(category.id, date)
+                    else:
+                        rows = [row[:3] for row in await self.db.fetch_category_status_rollups(category.id, date)]
+                elif mode == 'day':
+                    rows = await self.db.fetch_status_by_date_prefix(date)
+                else:
+                    # Daily / monthly peaks come straight from the rollup tables.
+                    rows = [row[:3] for row in await self.db.fetch_status_rollups(date)]
+                if not rows:
+                    return None
+                # Rendering runs in worker processes; only the series and PNG bytes cross over.
+                return await self.chart_renderer.render(
+                    mode, date, summarize_samples(mode, rows),
+                    scope=category.name if category is not None else None,
+                )
 
-            if not rows:
+            charts = await self.chart_cache.get_or_render(
+                mode, date, self.locale, CHART_STYLE_VERSION, render,
+                scope=f'{category.id}:{category.name}' if category is not None else '',
+            )
+            if charts is None:
                 await interaction.followup.send(
                     t('checkstatus.no_data_for_date', date=date), ephemeral=True,
                 )
                 return
-
-            timestamps = [datetime.strptime(row[0], '%Y-%m-%d %H:%M:%S') for row in rows]
-            people_counts = [row[1] for row in rows]
-            channel_counts = [row[2] for row in rows]
-
-            def save_fig():
-                buf = io.BytesIO()
-                plt.savefig(buf, format='png', bbox_inches='tight')
-                buf.seek(0)
-                plt.close()
-                return buf
-
-            def offset_y(y: float) -> float:
-                return y + max(0.02, y * 0.001)
-
-            # matplotlib titles / axis labels remain in English; extracting them
-            # is a separate follow-up (P1-6 step 1 flagged; not pulling into
-            # locale this pass to keep the per-cog refactor focused).
-            if mode == "day":
-                max_people = max(people_counts)
-                max_channels = max(channel_counts)
-                max_people_time = timestamps[people_counts.index(max_people)]
-                max_channels_time = timestamps[channel_counts.index(max_channels)]
-
-                plt.figure(figsize=(10, 5))
-                plt.plot(timestamps, people_counts, color='#4c78a8', alpha=0.75, linewidth=2, marker='o',
-                         markersize=4, label='People')
-                plt.scatter([max_people_time], [max_people], color='red', zorder=5, label=f'Peak {max_people}')
-                plt.text(max_people_time, offset_y(max_people), str(max_people), ha='center', va='bottom', color='red',
-                         fontsize=9)
-                plt.title(f'Voice participants (max {max_people} at {max_people_time.strftime("%H:%M")})')
-                plt.xlabel('Time')
-                plt.ylabel('People')
-                plt.grid(True, alpha=0.3)
-                plt.legend()
-                plt.xticks(rotation=45)
-                people_buf = save_fig()
-
-                plt.figure(figsize=(10, 5))
-                plt.plot(timestamps, channel_counts, color='#72b7b2', alpha=0.75, linewidth=2, marker='o',
-                         markersize=4, label='Rooms')
-                plt.scatter([max_channels_time], [max_channels], color='red', zorder=5,
-                            label=f'Peak {max_channels}')
-                plt.text(max_channels_time, offset_y(max_channels), str(max_channels), ha='center', va='bottom', color='red',
-                         fontsize=9)
-                plt.title(f'Voice rooms (max {max_channels} at {max_channels_time.strftime("%H:%M")})')
-                plt.xlabel('Time')
-                plt.ylabel('Rooms')
-                plt.grid(True, alpha=0.3)
-                plt.legend()
-                plt.xticks(rotation=45)
-                channels_buf = save_fig()
-
-            elif mode == "month":
-                daily_people = defaultdict(int)
-                daily_channels = defaultdict(int)
-                for ts, p, c in zip(timestamps, people_counts, channel_counts):
-                    day_key = ts.date().isoformat()
-                    daily_people[day_key] = max(daily_people[day_key], p)
-                    daily_channels[day_key] = max(daily_channels[day_key], c)
-
-                days_sorted = sorted(daily_people.keys())
-                x_idx = list(range(len(days_sorted)))
-                day_labels = [d for d in days_sorted]
-
-                people_series = [daily_people[d] for d in days_sorted]
-                channels_series = [daily_channels[d] for d in days_sorted]
-
-                plt.figure(figsize=(10, 5))
-                plt.plot(x_idx, people_series, color='#4c78a8', alpha=0.6, linewidth=2, marker='o',
-                         markersize=4, label='Daily peak people')
-                plt.scatter(x_idx, people_series, color='red', zorder=5)
-                for x, y in zip(x_idx, people_series):
-                    plt.text(x, offset_y(y), str(y), ha='center', va='bottom', color='red', fontsize=8)
-                plt.title(f'{date} daily voice peaks (people)')
-                plt.xlabel('Day')
-                plt.ylabel('People')
-                plt.grid(True, alpha=0.3)
-                plt.legend()
-                plt.xticks(x_idx, day_labels, rotation=45)
-                people_buf = save_fig()
-
-                plt.figure(figsize=(10, 5))
-                plt.plot(x_idx, channels_series, color='#72b7b2', alpha=0.6, linewidth=2, marker='o',
-                         markersize=4, label='Daily peak rooms')
-                plt.scatter(x_idx, channels_series, color='red', zorder=5)
-                for x, y in zip(x_idx, channels_series):
-                    plt.text(x, offset_y(y), str(y), ha='center', va='bottom', color='red', fontsize=8)
-                plt.title(f'{date} daily voice peaks (rooms)')
-                plt.xlabel('Day')
-                plt.ylabel('Rooms')
-                plt.grid(True, alpha=0.3)
-                plt.legend()
-                plt.xticks(x_idx, day_labels, rotation=45)
-                channels_buf = save_fig()
-
-            else:  # mode == "year"
-                monthly_people = defaultdict(int)
-                monthly_channels = defaultdict(int)
-                for ts, p, c in zip(timestamps, people_counts, channel_counts):
-                    month_key = ts.strftime('%Y-%m')
-                    monthly_people[month_key] = max(monthly_people[month_key], p)
-                    monthly_channels[month_key] = max(monthly_channels[month_key], c)
-
-                months_sorted = sorted(monthly_people.keys())
-                x_idx = list(range(len(months_sorted)))
-                month_labels = [m.split('-')[-1] for m in months_sorted]
-
-                people_series = [monthly_people[m] for m in months_sorted]
-                channels_series = [monthly_channels[m] for m in months_sorted]
-
-                plt.figure(figsize=(10, 5))
-                plt.bar(x_idx, people_series, color='#4c78a8', alpha=0.75, label='Monthly peak people')
-                for x, y in zip(x_idx, people_series):
-                    plt.text(x, y, str(y), ha='center', va='bottom', color='#333', fontsize=8)
-                plt.title(f'{date} monthly voice peaks (people)')
-                plt.xlabel('Month')
-                plt.ylabel('People')
-                plt.grid(axis='y', alpha=0.3)
-                plt.xticks(x_idx, month_labels, rotation=0)
-                plt.legend()
-                people_buf = save_fig()
-
-                plt.figure(figsize=(10, 5))
-                plt.bar(x_idx, channels_series, color='#72b7b2', alpha=0.75, label='Monthly peak rooms')
-                for x, y in zip(x_idx, channels_series):
-                    plt.text(x, y, str(y), ha='center', va='bottom', color='#333', fontsize=8)
-                plt.title(f'{date} monthly voice peaks (rooms)')
-                plt.xlabel('Month')
-                plt.ylabel('Rooms')
-                plt.grid(axis='y', alpha=0.3)
-                plt.xticks(x_idx, month_labels, rotation=0)
-                plt.legend()
-                channels_buf = save_fig()
+            people_png, channels_png = charts
 
             await interaction.followup.send(files=[
-                discord.File(people_buf, filename='people_stats.png'),
-                discord.File(channels_buf, filename='channels_stats.png'),
+                discord.File(io.BytesIO(people_png), filename='people_stats.png'),
+                discord.File(io.BytesIO(channels_png), filename='channels_stats.png'),
             ])
         except Exception as e:
             await interaction.followup.send(
@@ -355,29 +330,18 @@ class CheckStatusCog(commands.Cog):
         """Returns the number of people and active channels in each category and the total numbers."""
         await interaction.response.defer()
         try:
-            category_counts = {}
-            total_people = 0
-            total_channels = 0
-            for guild in self.bot.guilds:
-                for channel in guild.voice_channels:
-                    if channel.category is not None:
-                        if channel.category.name not in category_counts:
-                            category_counts[channel.category.name] = {'people': 0, 'channels': 0}
-                        category_counts[channel.category.name]['people'] += len(channel.members)
-                        if len(channel.members) > 0:
-                            category_counts[channel.category.name]['channels'] += 1
-                            total_channels += 1
-                        total_people += len(channel.members)
-            category_counts = {k: v for k, v in category_counts.items() if v['people'] > 0 or v['channels'] > 0}
+            total_people, total_channels, categories = self._voice_occupancy()
 
             embed = discord.Embed(title=t('checkstatus.voice_stats_title'), color=discord.Color.blue())
-            for category, counts in category_counts.items():
+            for _, name, people, channels in categories:
+                if people == 0 and channels == 0:
+                    continue
                 embed.add_field(
-                    name=category,
+                    name=name,
                     value=t(
                         'checkstatus.voice_stats_category_value',
-                        people=counts['people'],
-                        channels=counts['channels'],
+                        people=people,
+                        channels=channels,
                     ),
                     inline=False,
                 )
@@ -0,0 +1,139 @@
+"""Voice occupancy per category, maintained from gateway events.
+
+:class:`VoiceOccupancyIndex` is rebuilt from the guild cache once the bot is
+ready and then updated from voice state and channel events, so reading the
+current counts costs one step per category instead of a walk over every
+voice channel. As before, only voice channels inside a category are counted.
+The cog also rebuilds it when the bot joins or leaves a guild, and every
+``REBUILD_INTERVAL_SECONDS`` so a missed event cannot skew the counts for long.
+"""
+
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import discord
+
+# (category_id, name, people, active channels)
+CategoryOccupancy = Tuple[int, str, int, int]
+REBUILD_INTERVAL_SECONDS = 3600
+
+
+class VoiceOccupancyIndex:
+    """People and active voice channels per category."""
+
+    def __init__(self):
+        self.ready = False
+        self.rebuilt_at = 0.0
+        # voice channel id -> (category id, people)
+        self._channels: Dict[int, Tuple[int, int]] = {}
+        # category id -> [name, people, active channels, voice channels]
+        self._categories: Dict[int, List] = {}
+
+    def rebuild(self, guilds: Iterable[discord.Guild]) -> None:
+        self._channels = {}
+        self._categories = {}
+        for guild in guilds:
+            for channel in guild.voice_channels:
+                self._add_channel(channel)
+        self.ready = True
+        self.rebuilt_at = time.monotonic()
+
+    def due_for_rebuild(self) -> bool:
+        """Not built yet, or built more than ``REBUILD_INTERVAL_SECONDS`` ago."""
+        return not self.ready or time.monotonic() - self.rebuilt_at >= REBUILD_INTERVAL_SECONDS
+
+    def snapshot(self) -> Tuple[int, int, List[CategoryOccupancy]]:
+        """``(total people, total active channels, per-category counts)``."""
+        categories = [
+            (category_id, name, people, active)
+            for category_id, (name, people, active, _) in self._categories.items()
+        ]
+        return (
+            sum(people for _, _, people, _ in categories),
+            sum(active for _, _, _, active in categories),
+            categories,
+        )
+
+    def counts(self) -> Dict[int, Tuple[str, int, int]]:
+        """``category id -> (name, people, active channels)``, for comparing two states.
+
+        Unlike :meth:`snapshot` it does not depend on the order categories
+        were indexed in.
+        """
+        return {
+            category_id: (name, people, active)
+            for category_id, (name, people, active, _) in self._categories.items()
+        }
+
+    def member_moved(
+        self,
+        before: Optional[discord.abc.GuildChannel],
+        after: Optional[discord.abc.GuildChannel],
+    ) -> None:
+        """Apply a voice state update; channels outside the index are ignored."""
+        if before is not None and after is not None and before.id == after.id:
+            return
+        if before is not None:
+            self._add_people(before.id, -1)
+        if after is not None:
+            self._add_people(after.id, 1)
+
+    def channel_created(self, channel: discord.abc.GuildChannel) -> None:
+        self.channel_updated(channel)
+
+    def channel_updated(self, channel: discord.abc.GuildChannel) -> None:
+        """(Re-)index a channel after it was created, renamed or moved between categories."""
+        if channel.type == discord.ChannelType.category:
+            entry = self._categories.get(channel.id)
+            if entry is not None:
+                entry[0] = channel.name
+        elif channel.type == discord.ChannelType.voice:
+            self._remove_channel(channel.id)
+            self._add_channel(channel)
+
+    def channel_deleted(self, channel: discord.abc.GuildChannel) -> None:
+        if channel.type == discord.ChannelType.category:
+            # Its channels are moved out of the category, so they no longer count.
+            children = [
+                channel_id
+                for channel_id, (category_id, _) in self._channels.items()
+                if category_id == channel.id
+            ]
+            for channel_id in children:
+                self._remove_channel(channel_id)
+        else:
+            self._remove_channel(channel.id)
+
+    def _add_channel(self, channel: discord.VoiceChannel) -> None:
+        category = channel.category
+        if category is None:
+            return
+        entry = self._categories.setdefault(category.id, [category.name, 0, 0, 0])
+        people = len(channel.members)
+        self._channels[channel.id] = (category.id, people)
+        entry[1] += people
+        entry[2] += bool(people)
+        entry[3] += 1
+
+    def _remove_channel(self, channel_id: int) -> None:
+        state = self._channels.pop(channel_id, None)
+        if state is None:
+            return
+        category_id, people = state
+        entry = self._categories[category_id]
+        entry[1] -= people
+        entry[2] -= bool(people)
+        entry[3] -= 1
+        if entry[3] == 0:
+            del self._categories[category_id]
+
+    def _add_people(self, channel_id: int, delta: int) -> None:
+        state = self._channels.get(channel_id)
+        if state is None:
+            return
+        category_id, people = state
+        updated = max(0, people + delta)
+        self._channels[channel_id] = (category_id, updated)
+        entry = self._categories[category_id]
+        entry[1] += updated - people
+        entry[2] += bool(updated) - bool(people)
@@ -11,6 +11,7 @@ from discord.utils import format_dt
 
 from bot.utils import GiveawayDatabaseManager, check_channel_validity, config, fmt_channel, fmt_user
 from bot.utils.i18n import t
+from bot.utils.member_profile import get_member_profile
 from bot.utils.task_helpers import wait_until_ready_or_stop
 
 from .modals import GiveawayCreateModal, GiveawayDraftState
@@ -331,18 +332,10 @@ class GiveawayCog(commands.Cog):
 
         reaction_req, message_req, timespent_req = giveaway_record
 
-        record = await self.db.fetch_user_achievements(participant_id)
-        if record is None:
-            await interaction.response.send_message(
-                f"User {participant_id} does not exist in the achievements table",
-                ephemeral=True,
-            )
-            return False
-
-        _, message_count, reaction_count, time_spent, _giveaway_count = record
-        return (message_count >= message_req
-                and reaction_count >= reaction_req
-                and time_spent >= timespent_req)
+        counts = (await get_member_profile(self.bot, participant_id))['total']
+        return (counts['message_count'] >= message_req
+                and counts['reaction_count'] >= reaction_req
+                and counts['time_spent'] >= timespent_req)
 
     async def fetch_participant_ids(self, giveaway_id):
         return await self.db.fetch_participant_ids(giveaway_id)
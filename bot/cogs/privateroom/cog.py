@@ -17,6 +17,7 @@ from bot.utils import (
 )
 from bot.utils.components_v2 import clear_legacy_message_payload
 from bot.utils.i18n import t
+from bot.utils.member_profile import get_member_profile
 from bot.utils.privateroom_db import PrivateRoomDatabaseManager
 from bot.utils.task_helpers import wait_until_ready_or_stop
 
@@ -571,8 +572,9 @@ class PrivateRoomCog(commands.Cog):
                 last_month = now.month - 1
                 last_year = now.year
 
-            seconds = await self.db.get_user_monthly_voice_seconds(user_id, last_year, last_month)
-            return seconds / 3600
+            # 包含尚未落盘的时长和仍在进行的语音会话
+            profile = await get_member_profile(self.bot, user_id, last_year, last_month)
+            return profile['monthly']['time_spent'] / 3600
         except Exception as e:
             logging.error(f"Error getting last month voice hours: {e}")
             return 0
@@ -11,6 +11,7 @@ from bot.utils.achievement_visibility import (
     resolve_hidden_achievement_types,
 )
 from bot.utils.i18n import t
+from bot.utils.member_profile import get_member_progress
 from bot.utils.role_db import RoleDatabaseManager
 
 from .modals import SignatureModal
@@ -125,6 +126,9 @@ class AchievementRoleView(discord.ui.LayoutView):
             accent_color=discord.Color.blue(),
         ))
 
+    async def get_user_progress(self, user_id: int, achievement_type: str):
+        return await get_member_progress(self.bot, user_id, achievement_type)
+
     async def on_button_click(self, interaction: discord.Interaction):
         # Defer the interaction to avoid timeouts
         await interaction.response.defer()
@@ -141,7 +145,7 @@ class AchievementRoleView(discord.ui.LayoutView):
         )
 
         # Get the user's progress for the achievement type
-        user_progress = await self.role_db.get_user_achievement_progress(user_id, achievement_type)
+        user_progress = await self.get_user_progress(user_id, achievement_type)
         
         # If the user has no progress for this achievement type, do nothing
         if user_progress is None:
@@ -533,9 +537,9 @@ class SignatureView(View):
             if member and any(role.id == helper_role_id for role in member.roles):
                 return True, 0  # 如果是助力成员，直接返回True
 
-        # 如果不是助力成员，检查语音时长
-        role_db = RoleDatabaseManager(self.bot.get_cog('RoleCog').main_config['db_path'])
-        return await role_db.check_voice_time_requirement(user_id, required_time)
+        # 如果不是助力成员，检查语音时长（分钟）；读取失败或尚无记录时按 0 计算
+        current_time = await get_member_progress(self.bot, user_id, 'time_spent') or 0
+        return current_time >= required_time, current_time
 
     async def on_button_click(self, interaction: discord.Interaction):
         sig_cfg = self.bot.get_cog('RoleCog').role_config['signature']
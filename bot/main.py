@@ -12,8 +12,12 @@ from bot.utils import (
     fmt_guild,
     fmt_user,
 )
+from bot.utils.db_connect import configure_connection_profile, read_connection_profile
+from bot.utils.db_lifecycle import configure_connection_pools
+from bot.utils.db_metrics import check_instrumentation, configure_query_metrics
 from bot.utils.paths import ensure_parent_dir
 from bot.utils.slash_translator import SlashTranslator
+from bot.utils.wal_archive import continuous_backup_enabled
 
 
 COG_SPECS = [
@@ -253,6 +257,25 @@ async def setup_bot(bot):
     room_logger.addHandler(_rotating_handler(room_log_file))
     room_logger.propagate = False
 
+    # Pools and connections are created lazily by the first manager that
+    # touches a db_path, so their settings must be in place before any cog
+    # is constructed.
+    configure_connection_pools(conf.get('database'))
+    configure_query_metrics(conf.get('database'))
+    # Fails startup if an aiosqlite upgrade bypasses the metric hooks.
+    await check_instrumentation()
+    database_settings = dict(conf.get('database') or {})
+    if config.is_feature_enabled('backup') and continuous_backup_enabled(conf.get('backup')):
+        # The WAL archiver owns checkpoints; an automatic checkpoint could let
+        # SQLite reuse the WAL before its frames were shipped.
+        database_settings['wal_autocheckpoint'] = 0
+    configure_connection_profile(database_settings)
+    effective_profile = await read_connection_profile(ensure_parent_dir(conf['db_path']))
+    logging.info(
+        "SQLite connection profile: %s",
+        ', '.join(f"{name}={value}" for name, value in effective_profile.items()),
+    )
+
     loaded_cogs = []
 
     for spec in COG_SPECS:
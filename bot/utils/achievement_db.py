@@ -1,30 +1,175 @@
 import asyncio
 import logging
-from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional, Tuple
+import time
+import uuid
+from collections import OrderedDict
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 import aiosqlite
 
-from .db_connect import connect_database
+from .date_ranges import month_range
 from .db_lifecycle import BaseDatabaseManager
-from .log_helpers import fmt_channel, fmt_user
+from .leaderboard_cache import RankIndex, TopNLeaderboard, TTLCache
+from .log_helpers import fmt_user
+from .schema_migrations import SchemaMigration, add_column_if_missing, apply_schema_migrations
+
+
+# Counter columns that the write-behind buffer may accumulate deltas for.
+COUNTER_COLUMNS = ('message_count', 'reaction_count', 'time_spent', 'giveaway_count')
+# Achievement types from the config and the profile keys they are counted in.
+ACHIEVEMENT_TYPE_COLUMNS = {
+    'reaction': 'reaction_count',
+    'message': 'message_count',
+    'time_spent': 'time_spent',
+    'checkin_sum': 'checkin_sum',
+    'checkin_combo': 'checkin_combo',
+}
+DEFAULT_COUNTER_FLUSH_INTERVAL_SECONDS = 5.0
+DEFAULT_COUNTER_FLUSH_MAX_PENDING = 500
+DEFAULT_LEADERBOARD_CACHE_SIZE = 50
+# Months whose boards and rank indexes stay in memory, least recently read dropped first.
+DEFAULT_LEADERBOARD_CACHE_MONTHS = 3
+# Counters also kept per UTC day in ``daily_achievements``.
+DAILY_COLUMNS = ('message_count', 'reaction_count', 'time_spent')
+DEFAULT_DAILY_RETENTION_DAYS = 120
+DEFAULT_PROFILE_CACHE_TTL_SECONDS = 300
+DEFAULT_PROFILE_CACHE_MAX_ENTRIES = 1024
+# Upper bound on user IDs bound into one ``IN (...)`` lookup.
+_USER_ID_CHUNK = 500
+
+
+def split_seconds_by_month(start: datetime, end: datetime) -> List[Tuple[int, int, int]]:
+    """Split ``[start, end)`` into ``(year, month, seconds)`` slices.
+
+    Month boundaries are taken in the timezone of ``start`` (voice sessions
+    use UTC). Slices with no whole second are dropped.
+    """
+    slices = []
+    cursor = start
+    while cursor < end:
+        if cursor.month == 12:
+            boundary = cursor.replace(year=cursor.year + 1, month=1, day=1, hour=0, minute=0, second=0, microsecond=0)
+        else:
+            boundary = cursor.replace(month=cursor.month + 1, day=1, hour=0, minute=0, second=0, microsecond=0)
+        slice_end = min(boundary, end)
+        seconds = int((slice_end - cursor).total_seconds())
+        if seconds > 0:
+            slices.append((cursor.year, cursor.month, seconds))
+        cursor = slice_end
+    return slices
+
+
+def split_seconds_by_day(start: datetime, end: datetime) -> List[Tuple[date, int]]:
+    """Split ``[start, end)`` into ``(day, seconds)`` slices.
+
+    Day boundaries are taken in the timezone of ``start``. Slices with no
+    whole second are dropped.
+    """
+    slices = []
+    cursor = start
+    while cursor < end:
+        boundary = cursor.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+        slice_end = min(boundary, end)
+        seconds = int((slice_end - cursor).total_seconds())
+        if seconds > 0:
+            slices.append((cursor.date(), seconds))
+        cursor = slice_end
+    return slices
 
 
 class AchievementDatabaseManager(BaseDatabaseManager):
+    """Database operations for achievement counters and voice sessions.
+
+    Message / reaction / voice-time increments are write-behind: they are
+    coalesced per user (and per user-month) in memory and flushed in one
+    transaction once ``counter_flush.interval_seconds`` elapses or
+    ``counter_flush.max_pending`` keys are buffered. Per-user reads merge the
+    unflushed deltas; leaderboard and rank reads drain the buffer first.
+    ``close()`` flushes before the persistent connection is released.
+
+    Open voice sessions live in memory. The same flush checkpoints the
+    sessions started or ended since the last one to ``voice_channel_entries``,
+    in the transaction that writes the time of the ended ones, so a crash
+    never loses an open session or counts a closed one twice.
+    ``initialize_database()`` reloads the checkpoint. Reads of
+    ``time_spent`` (per user, per month, leaderboards and ranks) add the time
+    of the sessions still open, so nobody has to leave voice to be counted.
+
+    Counter leaderboards are served from in-memory top-N boards per
+    (counter, period), loaded on first use (the lifetime and current month
+    boards at startup) and updated from the new totals after each flush and
+    manual change. Requests for more than ``leaderboard_cache.size`` rows go
+    to SQLite. ``get_user_rank()`` uses a sorted rank index per (counter,
+    period) that is loaded in the background on first use; until it is
+    ready, ranks are counted in SQLite. Lifetime boards and indexes stay
+    loaded; monthly ones are kept for the ``leaderboard_cache.months`` most
+    recently read months and reloaded if an older month is read again.
+
+    Message, reaction and voice counts are also buffered per UTC day and
+    flushed into ``daily_achievements``, which answers leaderboards over
+    arbitrary date ranges. Days older than ``daily_rollup.retention_days``
+    are compacted into one row per user and month, dated the first of the
+    month, by :meth:`compact_daily_achievements`. ``/rank`` refuses ranges
+    starting before :meth:`daily_compaction_cutoff`, which it could only
+    count in whole months.
+
+    Per-user reads go through :meth:`get_user_profile`, which reads a user's
+    lifetime and monthly counters and check-in stats in one query and caches
+    the stored values per user. Flushes and manual changes drop the entries
+    of the users they touch, and so do check-ins: the shop manager reports
+    them through the connection pool's user change listeners.
+    """
+
     def __init__(self, db_path: str, config: dict = None):
         self.db_path = db_path
         self.config = config or {}
-        self._persistent_connection: Optional[aiosqlite.Connection] = None
-        self._persistent_connection_lock = asyncio.Lock()
+
+        flush_config = self.config.get('counter_flush') or {}
+        self.counter_flush_interval = float(
+            flush_config.get('interval_seconds', DEFAULT_COUNTER_FLUSH_INTERVAL_SECONDS)
+        )
+        self.counter_flush_max_pending = int(
+            flush_config.get('max_pending', DEFAULT_COUNTER_FLUSH_MAX_PENDING)
+        )
+        # user_id -> {column: delta} and (user_id, year, month) -> {column: delta}.
+        # Only mutated synchronously, so no lock is needed to enqueue.
+        self._pending_counts: Dict[int, Dict[str, int]] = {}
+        self._pending_monthly_counts: Dict[Tuple[int, int, int], Dict[str, int]] = {}
+        # (user_id, 'YYYY-MM-DD') -> {column: delta}, days in UTC.
+        self._pending_daily_counts: Dict[Tuple[int, str], Dict[str, int]] = {}
+        self._last_counter_flush = time.monotonic()
+        # user_id -> {channel_id: session start (UTC)}, and the
+        # (user_id, channel_id) keys started or ended since the last checkpoint.
+        self._voice_sessions: Dict[int, Dict[int, datetime]] = {}
+        self._dirty_voice_sessions: Set[Tuple[int, int]] = set()
+
+        cache_config = self.config.get('leaderboard_cache') or {}
+        self.leaderboard_cache_size = int(cache_config.get('size', DEFAULT_LEADERBOARD_CACHE_SIZE))
+        # (column, year, month) -> board; year and month are None for lifetime.
+        self._leaderboards: Dict[Tuple[str, Optional[int], Optional[int]], TopNLeaderboard] = {}
+        self._rank_indexes: Dict[Tuple[str, Optional[int], Optional[int]], RankIndex] = {}
+        self._rank_index_loads: Dict[Tuple[str, Optional[int], Optional[int]], asyncio.Task] = {}
+        # (year, month) of the months above, least recently read first.
+        self.leaderboard_cache_months = int(
+            cache_config.get('months', DEFAULT_LEADERBOARD_CACHE_MONTHS)
+        )
+        self._cached_months: 'OrderedDict[Tuple[int, int], None]' = OrderedDict()
+        rollup_config = self.config.get('daily_rollup') or {}
+        self.daily_retention_days = int(
+            rollup_config.get('retention_days', DEFAULT_DAILY_RETENTION_DAYS)
+        )
+        # (year, month) -> (check-in records in that month, streak ranking).
+        self._monthly_checkin_combos: Dict[Tuple[int, int], Tuple[int, List[Tuple[int, int]]]] = {}
+        profile_config = self.config.get('profile_cache') or {}
+        # user_id -> {(year, month) or None: stored profile row}.
+        self._profiles = TTLCache(
+            float(profile_config.get('ttl_seconds', DEFAULT_PROFILE_CACHE_TTL_SECONDS)),
+            int(profile_config.get('max_entries', DEFAULT_PROFILE_CACHE_MAX_ENTRIES)),
+        )
 
         # Map achievement types from config to database column names
-        self.type_mapping = {
-            'reaction': 'reaction_count',
-            'message': 'message_count',
-            'time_spent': 'time_spent',
-            'checkin_sum': 'checkin_sum',
-            'checkin_combo': 'checkin_combo'
-        }
+        self.type_mapping = dict(ACHIEVEMENT_TYPE_COLUMNS)
 
     async def _execute_on_connection(
         self,
@@ -59,6 +204,15 @@ class AchievementDatabaseManager(BaseDatabaseManager):
         finally:
             await cursor.close()
 
+    async def _executemany_on_connection(
+        self,
+        db: aiosqlite.Connection,
+        sql: str,
+        parameters: List[Tuple[Any, ...]],
+    ) -> None:
+        cursor = await db.executemany(sql, parameters)
+        await cursor.close()
+
     async def _execute_write(self, sql: str, parameters: Tuple[Any, ...] = ()) -> None:
         async with self._get_persistent_connection_lock():
             db = await self._get_persistent_connection()
@@ -72,13 +226,11 @@ class AchievementDatabaseManager(BaseDatabaseManager):
     async def _fetchone(
         self, sql: str, parameters: Tuple[Any, ...] = ()
     ) -> Optional[Tuple]:
-        async with self._get_persistent_connection_lock():
-            db = await self._get_persistent_connection()
+        async with self._read_connection() as db:
             return await self._fetchone_on_connection(db, sql, parameters)
 
     async def _fetchall(self, sql: str, parameters: Tuple[Any, ...] = ()) -> List[Tuple]:
-        async with self._get_persistent_connection_lock():
-            db = await self._get_persistent_connection()
+        async with self._read_connection() as db:
             return await self._fetchall_on_connection(db, sql, parameters)
 
     async def initialize_database(self) -> None:
@@ -111,6 +263,19 @@ class AchievementDatabaseManager(BaseDatabaseManager):
                     )
                 ''')
 
+                # Daily rollups; the day-first key keeps every date range
+                # contiguous and covers the counters.
+                await self._execute_on_connection(db, '''
+                    CREATE TABLE IF NOT EXISTS daily_achievements (
+                        day TEXT NOT NULL,
+                        user_id INTEGER NOT NULL,
+                        message_count INTEGER DEFAULT 0,
+                        reaction_count INTEGER DEFAULT 0,
+                        time_spent INTEGER DEFAULT 0,
+                        PRIMARY KEY (day, user_id)
+                    ) WITHOUT ROWID
+                ''')
+
                 # Voice channel entries table
                 await self._execute_on_connection(db, '''
                     CREATE TABLE IF NOT EXISTS voice_channel_entries (
@@ -134,6 +299,17 @@ class AchievementDatabaseManager(BaseDatabaseManager):
                         timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                     )
                 ''')
+                await apply_schema_migrations(
+                    db,
+                    namespace='achievements',
+                    migrations=[
+                        SchemaMigration(
+                            version=1,
+                            description='log bulk imports as one operation with per-user items',
+                            migrate=self._migrate_operation_batches,
+                        ),
+                    ],
+                )
 
                 # Create indexes for better performance
                 await self._execute_on_connection(
@@ -161,6 +337,18 @@ class AchievementDatabaseManager(BaseDatabaseManager):
                     "CREATE INDEX IF NOT EXISTS idx_monthly_achievements_date "
                     "ON monthly_achievements(year, month)",
                 )
+                # Monthly leaderboard pages walk these in score order.
+                for column_name in ('message_count', 'reaction_count', 'time_spent'):
+                    await self._execute_on_connection(
+                        db,
+                        f"CREATE INDEX IF NOT EXISTS idx_monthly_achievements_{column_name} "
+                        f"ON monthly_achievements(year, month, {column_name} DESC, user_id)",
+                    )
+                await self._execute_on_connection(
+                    db,
+                    "CREATE INDEX IF NOT EXISTS idx_daily_achievements_user "
+                    "ON daily_achievements(user_id, day, time_spent)",
+                )
                 await self._execute_on_connection(
                     db,
                     "CREATE INDEX IF NOT EXISTS idx_voice_entries_user_channel "
@@ -168,9 +356,38 @@ class AchievementDatabaseManager(BaseDatabaseManager):
                 )
 
                 await db.commit()
+
+                # Resume the sessions that were open at the last checkpoint.
+                for user_id, channel_id, start_time in await self._fetchall_on_connection(
+                    db,
+                    "SELECT user_id, channel_id, start_time FROM voice_channel_entries",
+                ):
+                    self._voice_sessions.setdefault(user_id, {}).setdefault(
+                        channel_id, self._parse_session_start(start_time)
+                    )
+
+                now = datetime.now()
+                for column_name in COUNTER_COLUMNS:
+                    await self._load_leaderboard_locked(db, column_name)
+                    await self._load_leaderboard_locked(db, column_name, now.year, now.month)
             except Exception:
                 await db.rollback()
                 raise
+        # Check-ins are written by the shop manager on the same pool.
+        self._get_connection_pool().add_user_change_listener(self.invalidate_user_profile)
+
+    async def _migrate_operation_batches(self, db: aiosqlite.Connection) -> None:
+        await add_column_if_missing(db, 'achievement_operation', 'batch_id', 'TEXT')
+        await self._execute_on_connection(db, '''
+            CREATE TABLE IF NOT EXISTS achievement_operation_items (
+                batch_id TEXT NOT NULL,
+                target_user_id INTEGER NOT NULL,
+                message_count INTEGER DEFAULT 0,
+                reaction_count INTEGER DEFAULT 0,
+                time_spent INTEGER DEFAULT 0,
+                PRIMARY KEY (batch_id, target_user_id)
+            ) WITHOUT ROWID
+        ''')
 
     def _get_column_name(self, achievement_type: str) -> str:
         """Convert achievement type from config to database column name."""
@@ -183,36 +400,107 @@ class AchievementDatabaseManager(BaseDatabaseManager):
             types.add(achievement.get('type'))
         return list(types)
 
-    async def get_user_achievements(self, user_id: int) -> Dict[str, int]:
-        """Get user's achievement counts."""
-        try:
-            result = await self._fetchone(
-                "SELECT message_count, reaction_count, time_spent, giveaway_count "
-                "FROM achievements WHERE user_id = ?",
-                (user_id,),
+    async def get_user_profile(
+        self,
+        user_id: int,
+        year: Optional[int] = None,
+        month: Optional[int] = None,
+    ) -> Dict[str, Dict[str, int]]:
+        """Lifetime (``'total'``) and, for a month, ``'monthly'`` counts of a user.
+
+        Both have the keys of :meth:`get_user_achievements`. Buffered deltas
+        and live voice time are merged on every read; only the stored values
+        are cached.
+        """
+        period = None if year is None else (int(year), int(month))
+        async with self._get_persistent_connection_lock():
+            cached = self._profiles.get(user_id) or {}
+            row = cached.get(period)
+            if row is None:
+                db = await self._get_persistent_connection()
+                row = await self._fetch_profile_on_connection(db, user_id, period)
+                self._profiles.put(user_id, {**cached, period: row})
+            # Read the buffer under the same lock so a concurrent flush
+            # cannot make a delta count twice or not at all.
+            pending = dict(self._pending_counts.get(user_id, {}))
+            pending_monthly = (
+                dict(self._pending_monthly_counts.get((user_id, *period), {})) if period else {}
             )
 
-            # Get checkin data
-            checkin_data = await self.get_user_checkin_data(user_id)
-
-            if result:
-                return {
-                    'message_count': result[0],
-                    'reaction_count': result[1],
-                    'time_spent': result[2],
-                    'giveaway_count': result[3],
-                    'checkin_sum': checkin_data['checkin_sum'],
-                    'checkin_combo': checkin_data['checkin_combo']
-                }
+        total = self._merge_pending_counts(row[0:4], pending)
+        total['time_spent'] += self.live_voice_seconds(user_id)
+        total['checkin_sum'], total['checkin_combo'] = row[4], row[5]
+        profile = {'total': total}
+        if period is not None:
+            monthly = self._merge_pending_counts(row[6:10], pending_monthly)
+            monthly['time_spent'] += self.live_voice_seconds(user_id, *period)
+            monthly['checkin_sum'], monthly['checkin_combo'] = row[10], row[11]
+            profile['monthly'] = monthly
+        return profile
+
+    async def _fetch_profile_on_connection(
+        self,
+        db: aiosqlite.Connection,
+        user_id: int,
+        period: Optional[Tuple[int, int]],
+    ) -> Tuple[int, ...]:
+        year, month = period or (None, None)
+        # An empty range when no month is asked for.
+        month_start, month_end = month_range(year, month) if period else ('', '')
+        counters = ", ".join(
+            [f"COALESCE(a.{column}, 0)" for column in COUNTER_COLUMNS]
+            + [f"COALESCE(m.{column}, 0)" for column in COUNTER_COLUMNS]
+        )
+        joins = (
+            "FROM (SELECT ? AS user_id) AS u "
+            "LEFT JOIN achievements AS a ON a.user_id = u.user_id "
+            "LEFT JOIN monthly_achievements AS m "
+            "ON m.user_id = u.user_id AND m.year = ? AND m.month = ?"
+        )
+        try:
+            row = await self._fetchone_on_connection(
+                db,
+                f"SELECT {counters}, "
+                "(SELECT COUNT(*) FROM shop_checkin_records WHERE user_id = u.user_id), "
+                "COALESCE((SELECT max_streak FROM shop_user_checkin WHERE user_id = u.user_id), 0), "
+                "(SELECT COUNT(*) FROM shop_checkin_records "
+                " WHERE user_id = u.user_id AND checkin_date >= ? AND checkin_date < ?), "
+                # Longest run of consecutive days in the month, as in
+                # _checkin_combo_ranking_on_connection.
+                "(SELECT COALESCE(MAX(days), 0) FROM ("
+                "  SELECT COUNT(*) AS days FROM ("
+                "    SELECT julianday(checkin_date) - ROW_NUMBER() OVER (ORDER BY checkin_date) AS run"
+                "    FROM shop_checkin_records"
+                "    WHERE user_id = ? AND checkin_date >= ? AND checkin_date < ?"
+                "  ) GROUP BY run"
+                ")) "
+                f"{joins}",
+                (month_start, month_end, user_id, month_start, month_end, user_id, year, month),
+            )
+        except aiosqlite.OperationalError:
+            # The shop tables are created by the shop cog; without them
+            # nobody has checked in.
+            row = await self._fetchone_on_connection(
+                db,
+                f"SELECT {counters} {joins}",
+                (user_id, year, month),
+            )
+            row = (*row, 0, 0, 0, 0)
+        lifetime, monthly = row[0:4], row[4:8]
+        checkin_sum, checkin_combo, monthly_checkin_sum, monthly_checkin_combo = row[8:12]
+        return (
+            *lifetime, checkin_sum, checkin_combo,
+            *monthly, monthly_checkin_sum, monthly_checkin_combo,
+        )
+
+    def invalidate_user_profile(self, user_id: int) -> None:
+        """Drop the cached profile of a user whose stored stats changed."""
+        self._profiles.pop(user_id)
 
-            return {
-                'message_count': 0,
-                'reaction_count': 0,
-                'time_spent': 0,
-                'giveaway_count': 0,
-                'checkin_sum': checkin_data['checkin_sum'],
-                'checkin_combo': checkin_data['checkin_combo']
-            }
+    async def get_user_achievements(self, user_id: int) -> Dict[str, int]:
+        """Get user's achievement counts."""
+        try:
+            return (await self.get_user_profile(user_id))['total']
         except Exception as e:
             logging.error("Error getting user achievements for %s: %s", fmt_user(user_id), e)
             return {
@@ -227,36 +515,7 @@ class AchievementDatabaseManager(BaseDatabaseManager):
     async def get_monthly_achievements(self, user_id: int, year: int, month: int) -> Dict[str, int]:
         """Get user's monthly achievement counts."""
         try:
-            result = await self._fetchone(
-                "SELECT message_count, reaction_count, time_spent, giveaway_count "
-                "FROM monthly_achievements "
-                "WHERE user_id = ? AND year = ? AND month = ?",
-                (user_id, year, month),
-            )
-
-            # Get monthly checkin data
-            monthly_checkin_data = await self.get_monthly_checkin_data(
-                user_id, year, month
-            )
-
-            if result:
-                return {
-                    'message_count': result[0],
-                    'reaction_count': result[1],
-                    'time_spent': result[2],
-                    'giveaway_count': result[3],
-                    'checkin_sum': monthly_checkin_data['checkin_sum'],
-                    'checkin_combo': monthly_checkin_data['checkin_combo']
-                }
-
-            return {
-                'message_count': 0,
-                'reaction_count': 0,
-                'time_spent': 0,
-                'giveaway_count': 0,
-                'checkin_sum': monthly_checkin_data['checkin_sum'],
-                'checkin_combo': monthly_checkin_data['checkin_combo']
-            }
+            return (await self.get_user_profile(user_id, year, month))['monthly']
         except Exception as e:
             logging.error(
                 "Error getting monthly achievements for %s (%s-%s): %s",
@@ -274,6 +533,11 @@ class AchievementDatabaseManager(BaseDatabaseManager):
                 'checkin_combo': 0
             }
 
+    async def get_monthly_voice_seconds(self, user_id: int, year: int, month: int) -> int:
+        """Voice seconds of a user in a month, including buffered and live time."""
+        profile = await self.get_user_profile(user_id, year, month)
+        return profile['monthly']['time_spent']
+
     async def create_user_if_not_exists(self, user_id: int) -> bool:
         """Create a user record if it doesn't exist."""
         try:
@@ -310,32 +574,32 @@ class AchievementDatabaseManager(BaseDatabaseManager):
         user_id: int,
         achievement_type: str,
         amount: int,
+        *,
+        now: Optional[datetime] = None,
     ) -> bool:
-        """Update user's achievement count."""
+        """Buffer a delta for user's achievement count.
+
+        The delta is written by the next counter flush; see
+        :meth:`flush_pending_counts`. Message and reaction deltas are also
+        added to the current UTC day's rollup.
+        """
         column_name = self._get_column_name(achievement_type)
-        async with self._get_persistent_connection_lock():
-            db = await self._get_persistent_connection()
-            try:
-                # Create user if not exists
-                await self._execute_on_connection(
-                    db,
-                    "INSERT OR IGNORE INTO achievements (user_id) VALUES (?)",
-                    (user_id,),
-                )
+        if column_name not in COUNTER_COLUMNS:
+            logging.error(
+                "Error updating achievement count for %s: unknown counter %s",
+                fmt_user(user_id),
+                achievement_type,
+            )
+            return False
 
-                # Update achievement count
-                await self._execute_on_connection(
-                    db,
-                    f"UPDATE achievements SET {column_name} = {column_name} + ? "
-                    "WHERE user_id = ?",
-                    (amount, user_id),
-                )
-                await db.commit()
-                return True
-            except Exception as e:
-                await db.rollback()
-                logging.error("Error updating achievement count for %s: %s", fmt_user(user_id), e)
-                return False
+        self._add_pending_delta(self._pending_counts, user_id, column_name, amount)
+        if column_name in DAILY_COLUMNS:
+            day = (now or datetime.now(timezone.utc)).astimezone(timezone.utc).date()
+            self._add_pending_delta(
+                self._pending_daily_counts, (user_id, day.isoformat()), column_name, amount
+            )
+        await self._flush_pending_counts_if_due()
+        return True
 
     async def update_monthly_achievement_count(
         self,
@@ -345,38 +609,332 @@ class AchievementDatabaseManager(BaseDatabaseManager):
         year: int,
         month: int,
     ) -> bool:
-        """Update user's monthly achievement count."""
+        """Buffer a delta for user's monthly achievement count."""
         column_name = self._get_column_name(achievement_type)
+        if column_name not in COUNTER_COLUMNS:
+            logging.error(
+                "Error updating monthly achievement count for %s (%s-%s): unknown counter %s",
+                fmt_user(user_id),
+                year,
+                month,
+                achievement_type,
+            )
+            return False
+
+        self._add_pending_delta(
+            self._pending_monthly_counts,
+            (user_id, int(year), int(month)),
+            column_name,
+            amount,
+        )
+        await self._flush_pending_counts_if_due()
+        return True
+
+    @staticmethod
+    def _add_pending_delta(
+        pending: Dict[Any, Dict[str, int]],
+        key: Any,
+        column_name: str,
+        amount: int,
+    ) -> None:
+        deltas = pending.setdefault(key, {})
+        deltas[column_name] = deltas.get(column_name, 0) + amount
+
+    @staticmethod
+    def _merge_pending_counts(
+        row: Optional[Tuple],
+        pending: Dict[str, int],
+    ) -> Dict[str, int]:
+        counts = {
+            'message_count': row[0] if row else 0,
+            'reaction_count': row[1] if row else 0,
+            'time_spent': row[2] if row else 0,
+            'giveaway_count': row[3] if row else 0,
+        }
+        for column_name, delta in pending.items():
+            counts[column_name] = (counts.get(column_name) or 0) + delta
+        return counts
+
+    def pending_counter_keys(self) -> int:
+        """Number of buffered (user) and (user, month) keys awaiting a flush.
+
+        Daily keys are not counted: each tracks a lifetime key of the same
+        user, so they grow together.
+        """
+        return len(self._pending_counts) + len(self._pending_monthly_counts)
+
+    def _has_pending_writes(self) -> bool:
+        return bool(
+            self._pending_counts
+            or self._pending_monthly_counts
+            or self._pending_daily_counts
+            or self._dirty_voice_sessions
+        )
+
+    async def _flush_pending_counts_if_due(self) -> None:
+        if not self._has_pending_writes():
+            return
+        size_due = self.pending_counter_keys() >= self.counter_flush_max_pending
+        interval_due = time.monotonic() - self._last_counter_flush >= self.counter_flush_interval
+        if size_due or interval_due:
+            await self.flush_pending_counts()
+
+    async def flush_pending_counts(self) -> bool:
+        """Write every buffered counter delta in a single transaction.
+
+        The transaction also checkpoints the voice sessions that changed since
+        the last flush. On failure the deltas and session changes are put back
+        so the next flush retries them instead of dropping counts.
+        """
         async with self._get_persistent_connection_lock():
-            db = await self._get_persistent_connection()
-            try:
-                # Create monthly user if not exists
-                await self._execute_on_connection(
+            return await self._flush_pending_counts_locked()
+
+    async def _flush_pending_counts_locked(self) -> bool:
+        self._last_counter_flush = time.monotonic()
+        if not self._has_pending_writes():
+            return True
+
+        pending = self._pending_counts
+        pending_monthly = self._pending_monthly_counts
+        pending_daily = self._pending_daily_counts
+        dirty_sessions = self._dirty_voice_sessions
+        self._pending_counts = {}
+        self._pending_monthly_counts = {}
+        self._pending_daily_counts = {}
+        self._dirty_voice_sessions = set()
+
+        counter_list = ", ".join(COUNTER_COLUMNS)
+        placeholders = ", ".join("?" for _ in COUNTER_COLUMNS)
+        increments = ", ".join(
+            f"{column} = {column} + excluded.{column}" for column in COUNTER_COLUMNS
+        )
+        lifetime_rows = [
+            (user_id, *(deltas.get(column, 0) for column in COUNTER_COLUMNS))
+            for user_id, deltas in pending.items()
+        ]
+        monthly_rows = [
+            (user_id, year, month, *(deltas.get(column, 0) for column in COUNTER_COLUMNS))
+            for (user_id, year, month), deltas in pending_monthly.items()
+        ]
+        daily_list = ", ".join(DAILY_COLUMNS)
+        daily_placeholders = ", ".join("?" for _ in DAILY_COLUMNS)
+        daily_increments = ", ".join(
+            f"{column} = {column} + excluded.{column}" for column in DAILY_COLUMNS
+        )
+        daily_rows = [
+            (day, user_id, *(deltas.get(column, 0) for column in DAILY_COLUMNS))
+            for (user_id, day), deltas in pending_daily.items()
+        ]
+        open_sessions = []
+        closed_sessions = []
+        for user_id, channel_id in dirty_sessions:
+            start_time = self._voice_sessions.get(user_id, {}).get(channel_id)
+            if start_time is None:
+                closed_sessions.append((user_id, channel_id))
+            else:
+                open_sessions.append((user_id, channel_id, start_time.isoformat()))
+
+        db = await self._get_persistent_connection()
+        try:
+            if lifetime_rows:
+                await self._executemany_on_connection(
+                    db,
+                    f"INSERT INTO achievements (user_id, {counter_list}) "
+                    f"VALUES (?, {placeholders}) "
+                    f"ON CONFLICT(user_id) DO UPDATE SET {increments}",
+                    lifetime_rows,
+                )
+            if monthly_rows:
+                await self._executemany_on_connection(
+                    db,
+                    f"INSERT INTO monthly_achievements (user_id, year, month, {counter_list}) "
+                    f"VALUES (?, ?, ?, {placeholders}) "
+                    f"ON CONFLICT(user_id, year, month) DO UPDATE SET {increments}",
+                    monthly_rows,
+                )
+            if daily_rows:
+                await self._executemany_on_connection(
+                    db,
+                    f"INSERT INTO daily_achievements (day, user_id, {daily_list}) "
+                    f"VALUES (?, ?, {daily_placeholders}) "
+                    f"ON CONFLICT(day, user_id) DO UPDATE SET {daily_increments}",
+                    daily_rows,
+                )
+            if closed_sessions:
+                await self._executemany_on_connection(
+                    db,
+                    "DELETE FROM voice_channel_entries WHERE user_id = ? AND channel_id = ?",
+                    closed_sessions,
+                )
+            if open_sessions:
+                await self._executemany_on_connection(
                     db,
-                    "INSERT OR IGNORE INTO monthly_achievements "
-                    "(user_id, year, month) VALUES (?, ?, ?)",
-                    (user_id, year, month),
+                    "REPLACE INTO voice_channel_entries "
+                    "(user_id, channel_id, start_time) VALUES (?, ?, ?)",
+                    open_sessions,
                 )
+            await db.commit()
+        except Exception as e:
+            await db.rollback()
+            self._dirty_voice_sessions |= dirty_sessions
+            for user_id, deltas in pending.items():
+                for column_name, delta in deltas.items():
+                    self._add_pending_delta(self._pending_counts, user_id, column_name, delta)
+            for key, deltas in pending_monthly.items():
+                for column_name, delta in deltas.items():
+                    self._add_pending_delta(self._pending_monthly_counts, key, column_name, delta)
+            for key, deltas in pending_daily.items():
+                for column_name, delta in deltas.items():
+                    self._add_pending_delta(self._pending_daily_counts, key, column_name, delta)
+            logging.error(
+                "Error flushing %s buffered achievement counters and %s voice session changes: %s",
+                len(lifetime_rows) + len(monthly_rows) + len(daily_rows),
+                len(dirty_sessions),
+                e,
+            )
+            return False
 
-                # Update monthly achievement count
-                await self._execute_on_connection(
+        for user_id in {*pending, *(key[0] for key in pending_monthly)}:
+            self.invalidate_user_profile(user_id)
+        await self._refresh_leaderboards_locked(db, pending, pending_monthly)
+        return True
+
+    async def _load_leaderboard_locked(
+        self,
+        db: aiosqlite.Connection,
+        column_name: str,
+        year: Optional[int] = None,
+        month: Optional[int] = None,
+    ) -> TopNLeaderboard:
+        self._touch_cached_month(year, month)
+        board = self._leaderboards.get((column_name, year, month))
+        if board is None:
+            board = self._leaderboards[(column_name, year, month)] = TopNLeaderboard(
+                self.leaderboard_cache_size
+            )
+        if year is None:
+            rows = await self._fetchall_on_connection(
+                db,
+                f"SELECT user_id, {column_name} FROM achievements "
+                f"WHERE {column_name} > 0 ORDER BY {column_name} DESC, user_id LIMIT ?",
+                (board.size,),
+            )
+        else:
+            rows = await self._fetchall_on_connection(
+                db,
+                f"SELECT user_id, {column_name} FROM monthly_achievements "
+                f"WHERE year = ? AND month = ? AND {column_name} > 0 "
+                f"ORDER BY {column_name} DESC, user_id LIMIT ?",
+                (year, month, board.size),
+            )
+        board.load(rows)
+        return board
+
+    async def _cached_leaderboard(
+        self,
+        column_name: str,
+        limit: int,
+        year: Optional[int] = None,
+        month: Optional[int] = None,
+    ) -> Optional[List[Tuple[int, int]]]:
+        """Top ``limit`` rows from the in-memory board, or None if too large."""
+        if limit > self.leaderboard_cache_size:
+            return None
+        self._touch_cached_month(year, month)
+        board = self._leaderboards.get((column_name, year, month))
+        if board is None or board.stale:
+            # Load under the writer lock so no flush can commit between the
+            # query and the board going live.
+            async with self._get_persistent_connection_lock():
+                db = await self._get_persistent_connection()
+                board = await self._load_leaderboard_locked(db, column_name, year, month)
+        return board.top(limit)
+
+    def _touch_cached_month(self, year: Optional[int], month: Optional[int]) -> None:
+        """Mark a month as just read and drop the boards of the oldest ones."""
+        if year is None:
+            return
+        self._cached_months[(year, month)] = None
+        self._cached_months.move_to_end((year, month))
+        while len(self._cached_months) > max(1, self.leaderboard_cache_months):
+            old_year, old_month = self._cached_months.popitem(last=False)[0]
+            for column_name in COUNTER_COLUMNS:
+                self._leaderboards.pop((column_name, old_year, old_month), None)
+                self._rank_indexes.pop((column_name, old_year, old_month), None)
+
+    async def _refresh_leaderboards_locked(
+        self,
+        db: aiosqlite.Connection,
+        pending: Dict[int, Dict[str, int]],
+        pending_monthly: Dict[Tuple[int, int, int], Dict[str, int]],
+    ) -> None:
+        """Feed the new totals of just-flushed users into the loaded boards."""
+        tracked = {(year, month) for _, year, month in [*self._leaderboards, *self._rank_indexes]}
+        if not tracked:
+            return
+        try:
+            if pending and (None, None) in tracked:
+                await self._refresh_leaderboard_users_locked(db, list(pending))
+            periods: Dict[Tuple[int, int], List[int]] = {}
+            for user_id, year, month in pending_monthly:
+                if (year, month) in tracked:
+                    periods.setdefault((year, month), []).append(user_id)
+            for (year, month), user_ids in periods.items():
+                await self._refresh_leaderboard_users_locked(db, user_ids, year, month)
+        except Exception as e:
+            for board in self._leaderboards.values():
+                board.invalidate()
+            self._rank_indexes.clear()
+            logging.error("Error refreshing cached leaderboards, reloading on next read: %s", e)
+
+    async def _refresh_leaderboard_users_locked(
+        self,
+        db: aiosqlite.Connection,
+        user_ids: List[int],
+        year: Optional[int] = None,
+        month: Optional[int] = None,
+    ) -> None:
+        counter_list = ", ".join(COUNTER_COLUMNS)
+        for offset in range(0, len(user_ids), _USER_ID_CHUNK):
+            chunk = user_ids[offset:offset + _USER_ID_CHUNK]
+            placeholders = ", ".join("?" for _ in chunk)
+            if year is None:
+                rows = await self._fetchall_on_connection(
                     db,
-                    f"UPDATE monthly_achievements SET {column_name} = {column_name} + ? "
-                    "WHERE user_id = ? AND year = ? AND month = ?",
-                    (amount, user_id, year, month),
+                    f"SELECT user_id, {counter_list} FROM achievements "
+                    f"WHERE user_id IN ({placeholders})",
+                    tuple(chunk),
                 )
-                await db.commit()
-                return True
-            except Exception as e:
-                await db.rollback()
-                logging.error(
-                    "Error updating monthly achievement count for %s (%s-%s): %s",
-                    fmt_user(user_id),
-                    year,
-                    month,
-                    e,
+            else:
+                rows = await self._fetchall_on_connection(
+                    db,
+                    f"SELECT user_id, {counter_list} FROM monthly_achievements "
+                    f"WHERE year = ? AND month = ? AND user_id IN ({placeholders})",
+                    (year, month, *chunk),
                 )
-                return False
+            for user_id, *values in rows:
+                for column_name, value in zip(COUNTER_COLUMNS, values):
+                    board = self._leaderboards.get((column_name, year, month))
+                    if board is not None:
+                        board.update(user_id, value)
+                    index = self._rank_indexes.get((column_name, year, month))
+                    if index is not None:
+                        index.update(user_id, value)
+
+    async def close(self) -> None:
+        # Drain the write-behind buffer before the connection goes away so
+        # shutdown does not lose counts.
+        loads = list(self._rank_index_loads.values())
+        for task in loads:
+            task.cancel()
+        await asyncio.gather(*loads, return_exceptions=True)
+        try:
+            await self.flush_pending_counts()
+        finally:
+            pool = getattr(self, "_connection_pool", None)
+            if pool is not None:
+                pool.remove_user_change_listener(self.invalidate_user_profile)
+            await super().close()
 
     async def get_leaderboard(
         self,
@@ -390,11 +948,19 @@ class AchievementDatabaseManager(BaseDatabaseManager):
 
         column_name = self._get_column_name(achievement_type)
         try:
-            return await self._fetchall(
-                f"SELECT user_id, {column_name} FROM achievements "
-                f"WHERE {column_name} > 0 ORDER BY {column_name} DESC LIMIT ?",
-                (limit,),
-            )
+            await self.flush_pending_counts()
+            rows = None
+            if column_name in COUNTER_COLUMNS:
+                rows = await self._cached_leaderboard(column_name, limit)
+            if rows is None:
+                rows = await self._fetchall(
+                    f"SELECT user_id, {column_name} FROM achievements "
+                    f"WHERE {column_name} > 0 ORDER BY {column_name} DESC, user_id LIMIT ?",
+                    (limit,),
+                )
+            if column_name == 'time_spent':
+                rows = await self._merge_live_voice_leaderboard(rows, limit)
+            return rows
         except Exception as e:
             logging.error(f"Error getting leaderboard for {achievement_type}: {e}")
             return []
@@ -413,12 +979,21 @@ class AchievementDatabaseManager(BaseDatabaseManager):
 
         column_name = self._get_column_name(achievement_type)
         try:
-            return await self._fetchall(
-                f"SELECT user_id, {column_name} FROM monthly_achievements "
-                f"WHERE year = ? AND month = ? AND {column_name} > 0 "
-                f"ORDER BY {column_name} DESC LIMIT ?",
-                (year, month, limit),
-            )
+            year, month = int(year), int(month)
+            await self.flush_pending_counts()
+            rows = None
+            if column_name in COUNTER_COLUMNS:
+                rows = await self._cached_leaderboard(column_name, limit, year, month)
+            if rows is None:
+                rows = await self._fetchall(
+                    f"SELECT user_id, {column_name} FROM monthly_achievements "
+                    f"WHERE year = ? AND month = ? AND {column_name} > 0 "
+                    f"ORDER BY {column_name} DESC, user_id LIMIT ?",
+                    (year, month, limit),
+                )
+            if column_name == 'time_spent':
+                rows = await self._merge_live_voice_leaderboard(rows, limit, year, month)
+            return rows
         except Exception as e:
             logging.error(
                 f"Error getting monthly leaderboard for {achievement_type} "
@@ -426,109 +1001,309 @@ class AchievementDatabaseManager(BaseDatabaseManager):
             )
             return []
 
-    async def get_user_rank(self, user_id: int, achievement_type: str) -> Tuple[int, int]:
-        """Get user's rank and total participants for a specific achievement type."""
+    async def get_user_rank(
+        self,
+        user_id: int,
+        achievement_type: str,
+        year: Optional[int] = None,
+        month: Optional[int] = None,
+    ) -> Tuple[int, int]:
+        """Get user's rank and total participants for a specific achievement type.
+
+        Pass ``year`` and ``month`` for the monthly rank.
+        """
         column_name = self._get_column_name(achievement_type)
-        async with self._get_persistent_connection_lock():
-            db = await self._get_persistent_connection()
+        if year is not None:
+            year, month = int(year), int(month)
+        # Rank compares against every user, so buffered deltas must be in
+        # the table first.
+        await self.flush_pending_counts()
+        live = self._live_voice_by_user(year, month) if column_name == 'time_spent' else {}
+
+        self._touch_cached_month(year, month)
+        index = self._rank_indexes.get((column_name, year, month))
+        if index is None:
+            if column_name in COUNTER_COLUMNS:
+                self._start_rank_index_load(column_name, year, month)
+            return await self._get_user_rank_from_sql(user_id, column_name, live, year, month)
+
+        stored_count = index.value(user_id)
+        user_count = stored_count + live.get(user_id, 0)
+        rank = index.count_above(user_count) + 1
+        stored = {other_id: index.value(other_id) for other_id in live if other_id != user_id}
+        return self._adjust_rank_for_live_voice(
+            rank, index.total, user_id, stored_count, user_count, live, stored
+        )
+
+    @staticmethod
+    def _adjust_rank_for_live_voice(
+        rank: int,
+        total: int,
+        user_id: int,
+        stored_count: int,
+        user_count: int,
+        live: Dict[int, int],
+        stored: Dict[int, int],
+    ) -> Tuple[int, int]:
+        # Users still in voice may pass the user or reach > 0 only through
+        # their live time; neither shows up in the stored counts.
+        for other_id, stored_seconds in stored.items():
+            current = stored_seconds + live[other_id]
+            if stored_seconds <= user_count < current:
+                rank += 1
+            if stored_seconds <= 0 < current:
+                total += 1
+        if user_id in live and stored_count <= 0:
+            total += 1
+        return rank, total
+
+    async def _get_user_rank_from_sql(
+        self,
+        user_id: int,
+        column_name: str,
+        live: Dict[int, int],
+        year: Optional[int],
+        month: Optional[int],
+    ) -> Tuple[int, int]:
+        if year is None:
+            table, period_filter, period = "achievements", "", ()
+        else:
+            table, period_filter, period = "monthly_achievements", "year = ? AND month = ? AND ", (year, month)
+        async with self._read_connection() as db:
             try:
                 # Get user's count
                 user_result = await self._fetchone_on_connection(
                     db,
-                    f"SELECT {column_name} FROM achievements WHERE user_id = ?",
-                    (user_id,),
+                    f"SELECT {column_name} FROM {table} WHERE {period_filter}user_id = ?",
+                    (*period, user_id),
                 )
-                user_count = user_result[0] if user_result else 0
+                stored_count = user_result[0] if user_result and user_result[0] else 0
+                user_count = stored_count + live.get(user_id, 0)
 
                 # Get rank
                 rank_result = await self._fetchone_on_connection(
                     db,
-                    f"SELECT COUNT(*) FROM achievements WHERE {column_name} > ?",
-                    (user_count,),
+                    f"SELECT COUNT(*) FROM {table} WHERE {period_filter}{column_name} > ?",
+                    (*period, user_count),
                 )
                 rank = rank_result[0] + 1 if rank_result else 1
 
                 # Get total participants
                 total_result = await self._fetchone_on_connection(
                     db,
-                    f"SELECT COUNT(*) FROM achievements WHERE {column_name} > 0",
+                    f"SELECT COUNT(*) FROM {table} WHERE {period_filter}{column_name} > 0",
+                    period,
                 )
                 total = total_result[0] if total_result else 0
 
-                return rank, total
+                stored = await self._stored_voice_seconds(
+                    db, [other_id for other_id in live if other_id != user_id], year, month
+                )
+                return self._adjust_rank_for_live_voice(
+                    rank, total, user_id, stored_count, user_count, live, stored
+                )
             except Exception as e:
                 logging.error("Error getting user rank for %s: %s", fmt_user(user_id), e)
                 return 0, 0
 
-    async def start_voice_session(self, user_id: int, channel_id: int) -> bool:
-        """Start a voice session for a user."""
+    def _start_rank_index_load(self, column_name: str, year: Optional[int], month: Optional[int]) -> None:
+        key = (column_name, year, month)
+        if key not in self._rank_index_loads:
+            self._rank_index_loads[key] = asyncio.create_task(self._load_rank_index(key))
+
+    async def _load_rank_index(self, key: Tuple[str, Optional[int], Optional[int]]) -> None:
+        column_name, year, month = key
         try:
-            current_time = datetime.now(timezone.utc)
-            await self._execute_write(
-                "REPLACE INTO voice_channel_entries "
-                "(user_id, channel_id, start_time) VALUES (?, ?, ?)",
-                (user_id, channel_id, current_time.isoformat()),
-            )
-            return True
+            # Load under the writer lock so no flush can commit between the
+            # scan and the index going live.
+            async with self._get_persistent_connection_lock():
+                db = await self._get_persistent_connection()
+                if year is None:
+                    rows = await self._fetchall_on_connection(
+                        db,
+                        f"SELECT user_id, {column_name} FROM achievements WHERE {column_name} > 0",
+                    )
+                else:
+                    rows = await self._fetchall_on_connection(
+                        db,
+                        f"SELECT user_id, {column_name} FROM monthly_achievements "
+                        f"WHERE year = ? AND month = ? AND {column_name} > 0",
+                        (year, month),
+                    )
+                index = RankIndex()
+                index.load(rows)
+                # The month may have been dropped from the cache while loading.
+                if year is None or (year, month) in self._cached_months:
+                    self._rank_indexes[key] = index
         except Exception as e:
-            logging.error(
-                "Error starting voice session for %s in %s: %s",
-                fmt_user(user_id),
-                fmt_channel(channel_id),
-                e,
-            )
-            return False
-
-    async def end_voice_session(self, user_id: int, channel_id: int) -> int:
-        """End a voice session and return time spent in seconds."""
-        async with self._get_persistent_connection_lock():
-            db = await self._get_persistent_connection()
-            try:
-                # Get session start time
-                entry = await self._fetchone_on_connection(
-                    db,
-                    "SELECT start_time FROM voice_channel_entries "
-                    "WHERE user_id = ? AND channel_id = ?",
-                    (user_id, channel_id),
-                )
-
-                if not entry:
-                    return 0
+            logging.error("Error loading the %s rank index (%s-%s): %s", column_name, year, month, e)
+        finally:
+            self._rank_index_loads.pop(key, None)
 
-                start_time = datetime.fromisoformat(entry[0])
-                current_time = datetime.now(timezone.utc)
-                time_spent = int((current_time - start_time).total_seconds())
+    async def start_voice_session(
+        self,
+        user_id: int,
+        channel_id: int,
+        *,
+        now: Optional[datetime] = None,
+    ) -> bool:
+        """Start a voice session for a user.
+
+        Starting a session that is already open keeps its original start.
+        """
+        sessions = self._voice_sessions.setdefault(user_id, {})
+        if channel_id not in sessions:
+            sessions[channel_id] = now or datetime.now(timezone.utc)
+            self._dirty_voice_sessions.add((user_id, channel_id))
+            await self._flush_pending_counts_if_due()
+        return True
+
+    async def end_voice_session(
+        self,
+        user_id: int,
+        channel_id: int,
+        *,
+        now: Optional[datetime] = None,
+    ) -> int:
+        """End a voice session, buffer its time and return it in seconds.
+
+        The time is added to the lifetime ``time_spent`` counter and, split at
+        month and day boundaries (UTC), to the monthly counter and daily
+        rollup of each month and day the session covered.
+        """
+        sessions = self._voice_sessions.get(user_id, {})
+        start_time = sessions.pop(channel_id, None)
+        if not sessions:
+            self._voice_sessions.pop(user_id, None)
+        if start_time is None:
+            return 0
+        self._dirty_voice_sessions.add((user_id, channel_id))
+
+        current_time = now or datetime.now(timezone.utc)
+        time_spent = 0
+        for year, month, seconds in split_seconds_by_month(start_time, current_time):
+            self._add_pending_delta(self._pending_monthly_counts, (user_id, year, month), 'time_spent', seconds)
+            time_spent += seconds
+        for day, seconds in split_seconds_by_day(start_time, current_time):
+            self._add_pending_delta(self._pending_daily_counts, (user_id, day.isoformat()), 'time_spent', seconds)
+        if time_spent > 0:
+            self._add_pending_delta(self._pending_counts, user_id, 'time_spent', time_spent)
+        await self._flush_pending_counts_if_due()
+        return time_spent
 
-                # Delete the entry
-                await self._execute_on_connection(
+    async def get_active_voice_sessions(self, user_id: int) -> List[Tuple[int, str]]:
+        """Get all active voice sessions for a user."""
+        return [
+            (channel_id, start_time.isoformat())
+            for channel_id, start_time in self._voice_sessions.get(user_id, {}).items()
+        ]
+
+    @staticmethod
+    def _parse_session_start(value: str) -> datetime:
+        start_time = datetime.fromisoformat(value)
+        if start_time.tzinfo is None:
+            start_time = start_time.replace(tzinfo=timezone.utc)
+        return start_time
+
+    @staticmethod
+    def _session_seconds(
+        start_time: datetime,
+        now: datetime,
+        year: Optional[int],
+        month: Optional[int],
+    ) -> int:
+        if year is None:
+            return max(0, int((now - start_time).total_seconds()))
+        return sum(
+            seconds
+            for slice_year, slice_month, seconds in split_seconds_by_month(start_time, now)
+            if (slice_year, slice_month) == (year, month)
+        )
+
+    def live_voice_seconds(
+        self,
+        user_id: int,
+        year: Optional[int] = None,
+        month: Optional[int] = None,
+        *,
+        now: Optional[datetime] = None,
+    ) -> int:
+        """Seconds a user has spent in still-open sessions, optionally in one month."""
+        sessions = self._voice_sessions.get(user_id)
+        if not sessions:
+            return 0
+        now = now or datetime.now(timezone.utc)
+        return sum(
+            self._session_seconds(start_time, now, year, month)
+            for start_time in sessions.values()
+        )
+
+    def _live_voice_by_user(
+        self,
+        year: Optional[int] = None,
+        month: Optional[int] = None,
+    ) -> Dict[int, int]:
+        now = datetime.now(timezone.utc)
+        live = {}
+        for user_id in self._voice_sessions:
+            seconds = self.live_voice_seconds(user_id, year, month, now=now)
+            if seconds > 0:
+                live[user_id] = seconds
+        return live
+
+    async def _stored_voice_seconds(
+        self,
+        db: aiosqlite.Connection,
+        user_ids: List[int],
+        year: Optional[int] = None,
+        month: Optional[int] = None,
+    ) -> Dict[int, int]:
+        """Stored ``time_spent`` per user; users without a row map to 0."""
+        stored = {user_id: 0 for user_id in user_ids}
+        for offset in range(0, len(user_ids), _USER_ID_CHUNK):
+            chunk = user_ids[offset:offset + _USER_ID_CHUNK]
+            placeholders = ", ".join("?" for _ in chunk)
+            if year is None:
+                rows = await self._fetchall_on_connection(
                     db,
-                    "DELETE FROM voice_channel_entries "
-                    "WHERE user_id = ? AND channel_id = ?",
-                    (user_id, channel_id),
+                    f"SELECT user_id, time_spent FROM achievements WHERE user_id IN ({placeholders})",
+                    tuple(chunk),
                 )
-                await db.commit()
-
-                return time_spent
-            except Exception as e:
-                await db.rollback()
-                logging.error(
-                    "Error ending voice session for %s in %s: %s",
-                    fmt_user(user_id),
-                    fmt_channel(channel_id),
-                    e,
+            else:
+                rows = await self._fetchall_on_connection(
+                    db,
+                    "SELECT user_id, time_spent FROM monthly_achievements "
+                    f"WHERE year = ? AND month = ? AND user_id IN ({placeholders})",
+                    (year, month, *chunk),
                 )
-                return 0
+            for user_id, time_spent in rows:
+                stored[user_id] = time_spent or 0
+        return stored
 
-    async def get_active_voice_sessions(self, user_id: int) -> List[Tuple[int, str]]:
-        """Get all active voice sessions for a user."""
-        try:
-            return await self._fetchall(
-                "SELECT channel_id, start_time FROM voice_channel_entries WHERE user_id = ?",
-                (user_id,),
-            )
-        except Exception as e:
-            logging.error("Error getting active voice sessions for %s: %s", fmt_user(user_id), e)
-            return []
+    async def _merge_live_voice_leaderboard(
+        self,
+        rows: List[Tuple[int, int]],
+        limit: int,
+        year: Optional[int] = None,
+        month: Optional[int] = None,
+    ) -> List[Tuple[int, int]]:
+        """Add live session time to a flushed ``time_spent`` leaderboard.
+
+        Only the stored top ``limit`` and the users in voice can make the
+        merged top ``limit``: everyone else keeps a stored value no higher
+        than the last stored row.
+        """
+        live = self._live_voice_by_user(year, month)
+        if not live:
+            return rows
+        totals = dict(rows)
+        missing = [user_id for user_id in live if user_id not in totals]
+        if missing:
+            async with self._read_connection() as db:
+                totals.update(await self._stored_voice_seconds(db, missing, year, month))
+        for user_id, seconds in live.items():
+            totals[user_id] += seconds
+        return sorted(totals.items(), key=lambda item: (-item[1], item[0]))[:limit]
 
     async def log_manual_operation(
         self,
@@ -608,18 +1383,85 @@ class AchievementDatabaseManager(BaseDatabaseManager):
                     )
 
                 await db.commit()
-                return True
             except Exception as e:
                 await db.rollback()
                 logging.error(f"Error applying manual changes: {e}")
                 return False
 
+            self.invalidate_user_profile(target_id)
+            await self._refresh_leaderboards_locked(db, {target_id: changes}, {})
+            return True
+
+    async def apply_bulk_changes(
+        self,
+        operator_id: int,
+        adjustments: List[Tuple[int, Dict[str, int]]],
+        operation: str,
+    ) -> Optional[str]:
+        """Apply ``[(user_id, changes)]`` from an import in one transaction.
+
+        ``operation`` is ``'increase'`` or ``'decrease'``. The import is
+        logged as one ``bulk_<operation>`` entry holding the totals, with
+        each user's changes in ``achievement_operation_items``. Returns the
+        batch ID, or None if nothing was applied.
+        """
+        sign = {'increase': 1, 'decrease': -1}[operation]
+        columns = ('message_count', 'reaction_count', 'time_spent')
+        column_list = ", ".join(columns)
+        increments = ", ".join(f"{column} = {column} + excluded.{column}" for column in columns)
+        batch_id = uuid.uuid4().hex
+        totals = {column: sum(changes.get(column, 0) for _, changes in adjustments) for column in columns}
+
+        async with self._get_persistent_connection_lock():
+            db = await self._get_persistent_connection()
+            try:
+                await self._executemany_on_connection(
+                    db,
+                    f"INSERT INTO achievements (user_id, {column_list}) VALUES (?, ?, ?, ?) "
+                    f"ON CONFLICT(user_id) DO UPDATE SET {increments}",
+                    [
+                        (user_id, *(sign * changes.get(column, 0) for column in columns))
+                        for user_id, changes in adjustments
+                    ],
+                )
+                await self._execute_on_connection(
+                    db,
+                    f"INSERT INTO achievement_operation "
+                    f"(user_id, target_user_id, operation, {column_list}, batch_id) "
+                    f"VALUES (?, 0, ?, ?, ?, ?, ?)",
+                    (operator_id, f"bulk_{operation}", *(totals[column] for column in columns), batch_id),
+                )
+                await self._executemany_on_connection(
+                    db,
+                    f"INSERT INTO achievement_operation_items "
+                    f"(batch_id, target_user_id, {column_list}) VALUES (?, ?, ?, ?, ?)",
+                    [
+                        (batch_id, user_id, *(changes.get(column, 0) for column in columns))
+                        for user_id, changes in adjustments
+                    ],
+                )
+                await db.commit()
+            except Exception as e:
+                await db.rollback()
+                logging.error("Error applying %s bulk achievement changes: %s", len(adjustments), e)
+                return None
+
+            for user_id, _ in adjustments:
+                self.invalidate_user_profile(user_id)
+            await self._refresh_leaderboards_locked(db, dict(adjustments), {})
+            return batch_id
+
     async def get_all_operations(self) -> List[Tuple]:
-        """Get all manual operations, ordered by timestamp DESC."""
+        """Get all manual operations, ordered by timestamp DESC.
+
+        The last column is the number of users of a bulk import, else 0.
+        """
         try:
             return await self._fetchall(
                 "SELECT user_id, target_user_id, operation, message_count, "
-                "reaction_count, time_spent, timestamp, giveaway_count "
+                "reaction_count, time_spent, timestamp, giveaway_count, "
+                "(SELECT COUNT(*) FROM achievement_operation_items AS items "
+                " WHERE items.batch_id = achievement_operation.batch_id) "
                 "FROM achievement_operation ORDER BY timestamp DESC"
             )
         except Exception as e:
@@ -627,34 +1469,15 @@ class AchievementDatabaseManager(BaseDatabaseManager):
             return []
 
     async def cleanup_invalid_voice_sessions(self, valid_sessions: List[Tuple[int, int]]) -> bool:
-        """Clean up voice sessions that are no longer valid."""
-        async with self._get_persistent_connection_lock():
-            db = await self._get_persistent_connection()
-            try:
-                # Get all current sessions
-                all_sessions = await self._fetchall_on_connection(
-                    db,
-                    "SELECT user_id, channel_id FROM voice_channel_entries",
-                )
-
-                # Find sessions to remove
-                valid_set = set(valid_sessions)
-                to_remove = [session for session in all_sessions if session not in valid_set]
-
-                # Remove invalid sessions
-                for user_id, channel_id in to_remove:
-                    await self._execute_on_connection(
-                        db,
-                        "DELETE FROM voice_channel_entries WHERE user_id = ? AND channel_id = ?",
-                        (user_id, channel_id),
-                    )
-
-                await db.commit()
-                return True
-            except Exception as e:
-                await db.rollback()
-                logging.error(f"Error cleaning up voice sessions: {e}")
-                return False
+        """Drop voice sessions that are no longer valid without crediting them."""
+        valid_set = set(valid_sessions)
+        for user_id, sessions in list(self._voice_sessions.items()):
+            for channel_id in [channel_id for channel_id in sessions if (user_id, channel_id) not in valid_set]:
+                del sessions[channel_id]
+                self._dirty_voice_sessions.add((user_id, channel_id))
+            if not sessions:
+                del self._voice_sessions[user_id]
+        return await self.flush_pending_counts()
 
     async def get_extended_leaderboard(
         self,
@@ -700,10 +1523,348 @@ class AchievementDatabaseManager(BaseDatabaseManager):
             )
         return result
 
-    async def get_user_checkin_data(self, user_id: int) -> Dict[str, int]:
-        """Get user's checkin data from shop tables."""
+    async def get_range_leaderboard(
+        self,
+        achievement_type: str,
+        start: date,
+        end: date,
+        limit: int = 10,
+    ) -> List[Tuple[int, int]]:
+        """Get the leaderboard over the UTC days ``[start, end)``.
+
+        Message, reaction and voice counts come from the daily rollups and
+        check-ins from the check-in records. Other types are not kept per
+        day and return an empty list.
+        """
+        column_name = self._get_column_name(achievement_type)
+        start_day, end_day = start.isoformat(), end.isoformat()
+        try:
+            if column_name in DAILY_COLUMNS:
+                await self.flush_pending_counts()
+                rows = await self._fetchall(
+                    f"SELECT user_id, SUM({column_name}) AS total FROM daily_achievements "
+                    f"WHERE day >= ? AND day < ? GROUP BY user_id HAVING total > 0 "
+                    f"ORDER BY total DESC, user_id LIMIT ?",
+                    (start_day, end_day, limit),
+                )
+                if column_name == 'time_spent':
+                    rows = await self._merge_live_voice_range(rows, limit, start, end)
+                return rows
+            if column_name == 'checkin_sum':
+                return await self._fetchall(
+                    "SELECT user_id, COUNT(*) AS count FROM shop_checkin_records "
+                    "WHERE checkin_date >= ? AND checkin_date < ? GROUP BY user_id "
+                    "ORDER BY count DESC, user_id LIMIT ?",
+                    (start_day, end_day, limit),
+                )
+            if column_name == 'checkin_combo':
+                async with self._read_connection() as db:
+                    ranking = await self._checkin_combo_ranking_on_connection(db, start_day, end_day)
+                return ranking[:limit]
+            return []
+        except Exception as e:
+            logging.error(
+                f"Error getting range leaderboard for {achievement_type} "
+                f"({start_day} to {end_day}): {e}"
+            )
+            return []
+
+    def _live_voice_in_range(
+        self,
+        start: date,
+        end: date,
+        *,
+        now: Optional[datetime] = None,
+    ) -> Dict[int, int]:
+        current_time = now or datetime.now(timezone.utc)
+        range_start = datetime(start.year, start.month, start.day, tzinfo=timezone.utc)
+        range_end = min(datetime(end.year, end.month, end.day, tzinfo=timezone.utc), current_time)
+        live = {}
+        for user_id, sessions in self._voice_sessions.items():
+            seconds = sum(
+                max(0, int((range_end - max(start_time, range_start)).total_seconds()))
+                for start_time in sessions.values()
+            )
+            if seconds > 0:
+                live[user_id] = seconds
+        return live
+
+    async def _merge_live_voice_range(
+        self,
+        rows: List[Tuple[int, int]],
+        limit: int,
+        start: date,
+        end: date,
+    ) -> List[Tuple[int, int]]:
+        """Add live session time to a range ``time_spent`` leaderboard."""
+        live = self._live_voice_in_range(start, end)
+        if not live:
+            return rows
+        totals = dict(rows)
+        missing = [user_id for user_id in live if user_id not in totals]
+        async with self._read_connection() as db:
+            totals.update(await self._stored_range_voice_seconds(db, missing, start, end))
+        for user_id, seconds in live.items():
+            totals[user_id] = totals.get(user_id, 0) + seconds
+        return sorted(totals.items(), key=lambda item: (-item[1], item[0]))[:limit]
+
+    async def _stored_range_voice_seconds(
+        self,
+        db: aiosqlite.Connection,
+        user_ids: List[int],
+        start: date,
+        end: date,
+    ) -> Dict[int, int]:
+        stored = {user_id: 0 for user_id in user_ids}
+        for offset in range(0, len(user_ids), _USER_ID_CHUNK):
+            chunk = user_ids[offset:offset + _USER_ID_CHUNK]
+            placeholders = ", ".join("?" for _ in chunk)
+            rows = await self._fetchall_on_connection(
+                db,
+                f"SELECT user_id, SUM(time_spent) FROM daily_achievements "
+                f"WHERE user_id IN ({placeholders}) AND day >= ? AND day < ? "
+                f"GROUP BY user_id",
+                (*chunk, start.isoformat(), end.isoformat()),
+            )
+            stored.update(rows)
+        return stored
+
+    async def get_leaderboard_page(
+        self,
+        achievement_type: str,
+        limit: int = 10,
+        after: Optional[Tuple[int, int]] = None,
+        *,
+        year: Optional[int] = None,
+        month: Optional[int] = None,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+    ) -> List[Tuple[int, int]]:
+        """Get one page of a leaderboard, ordered by score and then user ID.
+
+        ``after`` is the ``(score, user_id)`` of the last row of the previous
+        page, so deep pages are index seeks rather than OFFSET scans. The
+        period is lifetime, one month (``year`` and ``month``) or the UTC
+        days ``[start, end)``. First pages that fit the in-memory boards are
+        served from them.
+        """
+        column_name = self._get_column_name(achievement_type)
+        if year is not None:
+            year, month = int(year), int(month)
+        try:
+            if (
+                after is None
+                and start is None
+                and column_name in COUNTER_COLUMNS
+                and limit <= self.leaderboard_cache_size
+            ):
+                if year is None:
+                    return await self.get_leaderboard(achievement_type, limit)
+                return await self.get_monthly_leaderboard(year, month, achievement_type, limit)
+
+            if column_name == 'checkin_combo' and (year is not None or start is not None):
+                if start is None:
+                    ranking = await self._get_monthly_checkin_combo_ranking(year, month)
+                else:
+                    async with self._read_connection() as db:
+                        ranking = await self._checkin_combo_ranking_on_connection(
+                            db, start.isoformat(), end.isoformat()
+                        )
+                if after is not None:
+                    ranking = [row for row in ranking if (-row[1], row[0]) > (-after[0], after[1])]
+                return ranking[:limit]
+
+            query = self._leaderboard_page_query(column_name, year, month, start, end)
+            if query is None:
+                return []
+            if column_name in COUNTER_COLUMNS:
+                await self.flush_pending_counts()
+            if column_name == 'time_spent':
+                return await self._voice_leaderboard_page(query, limit, after, year, month, start, end)
+            return await self._fetch_leaderboard_page(query, limit, after)
+        except Exception as e:
+            logging.error(f"Error getting leaderboard page for {achievement_type}: {e}")
+            return []
+
+    def _leaderboard_page_query(
+        self,
+        column_name: str,
+        year: Optional[int],
+        month: Optional[int],
+        start: Optional[date],
+        end: Optional[date],
+    ) -> Optional[Tuple[str, Tuple[Any, ...], str]]:
+        """``(sql, parameters, score)`` selecting ``(user_id, score)`` rows.
+
+        ``sql`` ends in a WHERE or HAVING condition on ``score`` that the
+        keyset condition is appended to.
+        """
+        if start is not None:
+            period = (start.isoformat(), end.isoformat())
+            if column_name in DAILY_COLUMNS:
+                return (
+                    f"SELECT user_id, SUM({column_name}) AS score FROM daily_achievements "
+                    f"WHERE day >= ? AND day < ? GROUP BY user_id HAVING SUM({column_name}) > 0",
+                    period,
+                    f"SUM({column_name})",
+                )
+        elif year is not None:
+            period = month_range(year, month)
+            if column_name in COUNTER_COLUMNS:
+                return (
+                    f"SELECT user_id, {column_name} AS score FROM monthly_achievements "
+                    f"WHERE year = ? AND month = ? AND {column_name} > 0",
+                    (year, month),
+                    column_name,
+                )
+        else:
+            period = None
+            if column_name in COUNTER_COLUMNS:
+                return (
+                    f"SELECT user_id, {column_name} AS score FROM achievements "
+                    f"WHERE {column_name} > 0",
+                    (),
+                    column_name,
+                )
+            if column_name == 'checkin_combo':
+                return (
+                    "SELECT user_id, max_streak AS score FROM shop_user_checkin "
+                    "WHERE max_streak > 0",
+                    (),
+                    "max_streak",
+                )
+
+        if column_name == 'checkin_sum':
+            if period is None:
+                return (
+                    "SELECT user_id, COUNT(*) AS score FROM shop_checkin_records "
+                    "GROUP BY user_id HAVING COUNT(*) > 0",
+                    (),
+                    "COUNT(*)",
+                )
+            return (
+                "SELECT user_id, COUNT(*) AS score FROM shop_checkin_records "
+                "WHERE checkin_date >= ? AND checkin_date < ? "
+                "GROUP BY user_id HAVING COUNT(*) > 0",
+                period,
+                "COUNT(*)",
+            )
+        return None
+
+    async def _fetch_leaderboard_page(
+        self,
+        query: Tuple[str, Tuple[Any, ...], str],
+        limit: int,
+        after: Optional[Tuple[int, int]],
+    ) -> List[Tuple[int, int]]:
+        sql, parameters, score = query
+        if after is not None:
+            # The leading bound lets the score index seek to the cursor.
+            sql += f" AND {score} <= ? AND ({score} < ? OR user_id > ?)"
+            parameters = (*parameters, after[0], after[0], after[1])
+        rows = await self._fetchall(
+            f"{sql} ORDER BY score DESC, user_id LIMIT ?",
+            (*parameters, limit),
+        )
+        return [tuple(row) for row in rows]
+
+    async def _voice_leaderboard_page(
+        self,
+        query: Tuple[str, Tuple[Any, ...], str],
+        limit: int,
+        after: Optional[Tuple[int, int]],
+        year: Optional[int],
+        month: Optional[int],
+        start: Optional[date],
+        end: Optional[date],
+    ) -> List[Tuple[int, int]]:
+        """A ``time_spent`` page with the time of open sessions included.
+
+        Users in voice are ranked by stored plus live time in memory; the
+        stored page is over-fetched by their number so that it still holds
+        ``limit`` other users once they are dropped from it.
+        """
+        if start is None:
+            live = self._live_voice_by_user(year, month)
+        else:
+            live = self._live_voice_in_range(start, end)
+        if not live:
+            return await self._fetch_leaderboard_page(query, limit, after)
+
+        rows = await self._fetch_leaderboard_page(query, limit + len(live), after)
+        rows = [row for row in rows if row[0] not in live]
+        async with self._read_connection() as db:
+            if start is None:
+                stored = await self._stored_voice_seconds(db, list(live), year, month)
+            else:
+                stored = await self._stored_range_voice_seconds(db, list(live), start, end)
+        for user_id, seconds in live.items():
+            total = stored.get(user_id, 0) + seconds
+            if after is None or (-total, user_id) > (-after[0], after[1]):
+                rows.append((user_id, total))
+        return sorted(rows, key=lambda row: (-row[1], row[0]))[:limit]
+
+    def daily_compaction_cutoff(self, today: Optional[date] = None) -> date:
+        """First day still kept per day; earlier months are compacted."""
+        today = today or datetime.now(timezone.utc).date()
+        return (today - timedelta(days=self.daily_retention_days)).replace(day=1)
+
+    async def compact_daily_achievements(self, *, today: Optional[date] = None) -> int:
+        """Fold daily rollups older than the retention window into monthly rows.
+
+        Each month that ended more than ``daily_rollup.retention_days`` ago is
+        rewritten as one row per user dated the first of the month. Returns
+        the number of months compacted.
+        """
+        cutoff = self.daily_compaction_cutoff(today)
+        counter_list = ", ".join(DAILY_COLUMNS)
+        sums = ", ".join(f"SUM({column})" for column in DAILY_COLUMNS)
+        placeholders = ", ".join("?" for _ in DAILY_COLUMNS)
         async with self._get_persistent_connection_lock():
+            # Buffered deltas may still belong to the months being compacted.
+            await self._flush_pending_counts_locked()
             db = await self._get_persistent_connection()
+            try:
+                months = [
+                    row[0]
+                    for row in await self._fetchall_on_connection(
+                        db,
+                        "SELECT DISTINCT substr(day, 1, 7) FROM daily_achievements "
+                        "WHERE day < ? AND substr(day, 9) != '01'",
+                        (cutoff.isoformat(),),
+                    )
+                ]
+                for month in months:
+                    month_start, month_end = month_range(*month.split('-'))
+                    totals = await self._fetchall_on_connection(
+                        db,
+                        f"SELECT user_id, {sums} FROM daily_achievements "
+                        f"WHERE day >= ? AND day < ? GROUP BY user_id",
+                        (month_start, month_end),
+                    )
+                    await self._execute_on_connection(
+                        db,
+                        "DELETE FROM daily_achievements WHERE day >= ? AND day < ?",
+                        (month_start, month_end),
+                    )
+                    await self._executemany_on_connection(
+                        db,
+                        f"INSERT INTO daily_achievements (day, user_id, {counter_list}) "
+                        f"VALUES (?, ?, {placeholders})",
+                        [(f"{month}-01", *row) for row in totals],
+                    )
+                await db.commit()
+            except Exception as e:
+                await db.rollback()
+                logging.error("Error compacting daily achievement rollups: %s", e)
+                return 0
+        if months:
+            logging.info("Compacted daily achievement rollups of %s month(s) before %s", len(months), cutoff)
+        return len(months)
+
+    async def get_user_checkin_data(self, user_id: int) -> Dict[str, int]:
+        """Get user's checkin data from shop tables."""
+        async with self._read_connection() as db:
             try:
                 # Get total checkin count (sum)
                 checkin_sum_result = await self._fetchone_on_connection(
@@ -734,17 +1895,16 @@ class AchievementDatabaseManager(BaseDatabaseManager):
 
     async def get_monthly_checkin_data(self, user_id: int, year: int, month: int) -> Dict[str, int]:
         """Get user's monthly checkin data from shop tables."""
-        async with self._get_persistent_connection_lock():
-            db = await self._get_persistent_connection()
+        async with self._read_connection() as db:
             try:
-                month_prefix = f"{year}-{month:02d}-%"
+                month_start, month_end = month_range(year, month)
 
                 # Get monthly checkin count
                 monthly_checkin_result = await self._fetchone_on_connection(
                     db,
                     "SELECT COUNT(*) FROM shop_checkin_records "
-                    "WHERE user_id = ? AND checkin_date LIKE ?",
-                    (user_id, month_prefix),
+                    "WHERE user_id = ? AND checkin_date >= ? AND checkin_date < ?",
+                    (user_id, month_start, month_end),
                 )
                 monthly_checkin = monthly_checkin_result[0] if monthly_checkin_result else 0
 
@@ -752,8 +1912,9 @@ class AchievementDatabaseManager(BaseDatabaseManager):
                 dates = await self._fetchall_on_connection(
                     db,
                     "SELECT checkin_date FROM shop_checkin_records "
-                    "WHERE user_id = ? AND checkin_date LIKE ? ORDER BY checkin_date",
-                    (user_id, month_prefix),
+                    "WHERE user_id = ? AND checkin_date >= ? AND checkin_date < ? "
+                    "ORDER BY checkin_date",
+                    (user_id, month_start, month_end),
                 )
 
                 max_consecutive = 0
@@ -819,6 +1980,55 @@ class AchievementDatabaseManager(BaseDatabaseManager):
             logging.error(f"Error getting checkin leaderboard for {checkin_type}: {e}")
             return []
 
+    async def _get_monthly_checkin_combo_ranking(self, year: int, month: int) -> List[Tuple[int, int]]:
+        """Longest run of consecutive check-in days per user in a month.
+
+        Gaps and islands: within one user's dates in order, the day number
+        minus the row number is constant along a run of consecutive days, so
+        grouping by it yields the runs. The ranking is cached per month and
+        reused while the month's record count is unchanged; records are only
+        ever added, and makeup check-ins can still add them to past months.
+        """
+        month_start, month_end = month_range(year, month)
+        async with self._read_connection() as db:
+            # Count first: a check-in landing between the two queries then
+            # only costs a recomputation on the next read.
+            count_row = await self._fetchone_on_connection(
+                db,
+                "SELECT COUNT(*) FROM shop_checkin_records "
+                "WHERE checkin_date >= ? AND checkin_date < ?",
+                (month_start, month_end),
+            )
+            records = count_row[0] if count_row else 0
+            cached = self._monthly_checkin_combos.get((year, month))
+            if cached is not None and cached[0] == records:
+                return cached[1]
+
+            ranking = await self._checkin_combo_ranking_on_connection(db, month_start, month_end)
+        self._monthly_checkin_combos[(year, month)] = (records, ranking)
+        return ranking
+
+    async def _checkin_combo_ranking_on_connection(
+        self,
+        db: aiosqlite.Connection,
+        start: str,
+        end: str,
+    ) -> List[Tuple[int, int]]:
+        rows = await self._fetchall_on_connection(
+            db,
+            "SELECT user_id, MAX(days) AS combo FROM ("
+            "  SELECT user_id, COUNT(*) AS days FROM ("
+            "    SELECT user_id, julianday(checkin_date) - ROW_NUMBER() OVER ("
+            "      PARTITION BY user_id ORDER BY checkin_date"
+            "    ) AS run"
+            "    FROM shop_checkin_records"
+            "    WHERE checkin_date >= ? AND checkin_date < ?"
+            "  ) GROUP BY user_id, run"
+            ") GROUP BY user_id ORDER BY combo DESC, user_id",
+            (start, end),
+        )
+        return [tuple(row) for row in rows]
+
     async def get_monthly_checkin_leaderboard(
         self,
         year: int,
@@ -828,38 +2038,21 @@ class AchievementDatabaseManager(BaseDatabaseManager):
     ) -> List[Tuple[int, int]]:
         """Get monthly leaderboard for checkin achievements."""
         try:
-            month_prefix = f"{year}-{month:02d}-%"
+            year, month = int(year), int(month)
+            month_start, month_end = month_range(year, month)
 
             if checkin_type == 'checkin_sum':
                 # Get monthly checkin count leaderboard
                 return await self._fetchall(
                     "SELECT user_id, COUNT(*) as count FROM shop_checkin_records "
-                    "WHERE checkin_date LIKE ? GROUP BY user_id "
+                    "WHERE checkin_date >= ? AND checkin_date < ? GROUP BY user_id "
                     "ORDER BY count DESC LIMIT ?",
-                    (month_prefix, limit),
+                    (month_start, month_end, limit),
                 )
 
             if checkin_type == 'checkin_combo':
-                # For monthly combo, calculate max consecutive days per user.
-                users = await self._fetchall(
-                    "SELECT DISTINCT user_id FROM shop_checkin_records "
-                    "WHERE checkin_date LIKE ?",
-                    (month_prefix,),
-                )
-
-                user_combos = []
-                for user_tuple in users:
-                    user_id = user_tuple[0]
-                    monthly_data = await self.get_monthly_checkin_data(
-                        user_id, year, month
-                    )
-                    combo = monthly_data['checkin_combo']
-                    if combo > 0:
-                        user_combos.append((user_id, combo))
-
-                # Sort by combo descending and limit
-                user_combos.sort(key=lambda x: x[1], reverse=True)
-                return user_combos[:limit]
+                ranking = await self._get_monthly_checkin_combo_ranking(year, month)
+                return ranking[:limit]
 
             return []
         except Exception as e:
@@ -0,0 +1,85 @@
+"""Parsing of bulk achievement adjustment CSV files.
+
+Used by ``/import_achievements`` and ``tools/import_achievement_adjustments.py``.
+The file needs a header row with ``user_id`` and at least one of
+``messages``, ``reactions`` and ``time_spent`` (seconds)::
+
+    user_id,messages,reactions,time_spent
+    123456789012345678,50,10,3600
+
+Every row is validated before anything is applied. Empty cells count as 0,
+and rows for the same user are added together.
+"""
+
+import csv
+import io
+from typing import Dict, List, Tuple
+
+# CSV column -> achievements column, in the order of the manual commands.
+CSV_COLUMNS = {
+    'messages': 'message_count',
+    'reactions': 'reaction_count',
+    'time_spent': 'time_spent',
+}
+MAX_REPORTED_ERRORS = 10
+
+
+class AdjustmentImportError(ValueError):
+    """Raised with every problem found in an adjustment file."""
+
+    def __init__(self, errors: List[str]):
+        self.errors = errors
+        shown = errors[:MAX_REPORTED_ERRORS]
+        if len(errors) > len(shown):
+            shown.append(f"... and {len(errors) - len(shown)} more")
+        super().__init__("\n".join(shown))
+
+
+def parse_adjustments(text: str) -> List[Tuple[int, Dict[str, int]]]:
+    """``[(user_id, {column: amount})]`` from CSV text, one entry per user.
+
+    Amounts are non-negative; the caller chooses whether they are added or
+    subtracted. Raises AdjustmentImportError if any row is invalid.
+    """
+    reader = csv.reader(io.StringIO(text.lstrip('\ufeff')))
+    header = [name.strip().lower() for name in next(reader, [])]
+    if 'user_id' not in header:
+        raise AdjustmentImportError(["Header row must contain user_id"])
+    unknown = [name for name in header if name != 'user_id' and name not in CSV_COLUMNS]
+    if unknown:
+        raise AdjustmentImportError([f"Unknown columns: {', '.join(unknown)}"])
+    if len(header) == 1:
+        raise AdjustmentImportError([f"Header row needs one of: {', '.join(CSV_COLUMNS)}"])
+
+    totals: Dict[int, Dict[str, int]] = {}
+    errors = []
+    for line_number, row in enumerate(reader, start=2):
+        if not any(cell.strip() for cell in row):
+            continue
+        if len(row) != len(header):
+            errors.append(f"Line {line_number}: expected {len(header)} values, got {len(row)}")
+            continue
+        values = dict(zip(header, (cell.strip() for cell in row)))
+        try:
+            user_id = int(values.pop('user_id'))
+            if user_id <= 0:
+                raise ValueError
+        except ValueError:
+            errors.append(f"Line {line_number}: invalid user_id")
+            continue
+        changes = totals.setdefault(user_id, {column: 0 for column in CSV_COLUMNS.values()})
+        for name, value in values.items():
+            try:
+                amount = int(value) if value else 0
+                if amount < 0:
+                    raise ValueError
+            except ValueError:
+                errors.append(f"Line {line_number}: {name} must be a non-negative integer")
+                continue
+            changes[CSV_COLUMNS[name]] += amount
+
+    if errors:
+        raise AdjustmentImportError(errors)
+    if not totals:
+        raise AdjustmentImportError(["No rows to import"])
+    return list(totals.items())
@@ -5,7 +5,6 @@ import discord
 from datetime import datetime, timedelta
 from typing import Optional, List, Tuple
 
-from .db_connect import connect_database
 from .db_lifecycle import BaseDatabaseManager
 from .schema_migrations import SchemaMigration, apply_schema_migrations
 
@@ -16,7 +15,7 @@ class BanDatabaseManager(BaseDatabaseManager):
 
     async def initialize_database(self) -> None:
         """Create necessary database tables if they don't exist."""
-        async with connect_database(self.db_path) as db:
+        async with self._write_connection() as db:
             # Create new table with correct schema. Existing tables keep their
             # current definition and are handled by the migrations below.
             await db.execute('''
@@ -112,7 +111,7 @@ class BanDatabaseManager(BaseDatabaseManager):
     async def add_tempban(self, user_id: int, guild_id: int, banned_by: int, 
                          reason: str, unban_at: datetime, delete_message_days: int = 0) -> int:
         """Add a tempban or reactivate the retained user/guild record."""
-        async with connect_database(self.db_path) as db:
+        async with self._write_connection() as db:
             # Convert datetime to ISO format string for consistent storage
             unban_at_str = unban_at.isoformat()
 
@@ -157,7 +156,7 @@ class BanDatabaseManager(BaseDatabaseManager):
         current_time = discord.utils.utcnow()
         current_time_str = current_time.isoformat()
         
-        async with connect_database(self.db_path) as db:
+        async with self._read_connection() as db:
             if guild_id:
                 cursor = await db.execute('''
                     SELECT id, user_id, guild_id, banned_by, reason, banned_at, unban_at, delete_message_days
@@ -177,7 +176,7 @@ class BanDatabaseManager(BaseDatabaseManager):
 
     async def get_all_active_tempbans_including_expired(self, guild_id: Optional[int] = None) -> List[Tuple]:
         """Get all active tempbans including expired ones (for recovery/cleanup)."""
-        async with connect_database(self.db_path) as db:
+        async with self._read_connection() as db:
             if guild_id:
                 cursor = await db.execute('''
                     SELECT id, user_id, guild_id, banned_by, reason, banned_at, unban_at, delete_message_days
@@ -200,7 +199,7 @@ class BanDatabaseManager(BaseDatabaseManager):
         current_time = discord.utils.utcnow()
         current_time_str = current_time.isoformat()
         
-        async with connect_database(self.db_path) as db:
+        async with self._read_connection() as db:
             cursor = await db.execute('''
                 SELECT id, user_id, guild_id, banned_by, reason, banned_at, unban_at, delete_message_days
                 FROM tempbans 
@@ -212,7 +211,7 @@ class BanDatabaseManager(BaseDatabaseManager):
 
     async def deactivate_tempban(self, tempban_id: int) -> bool:
         """Mark a tempban as inactive (completed)."""
-        async with connect_database(self.db_path) as db:
+        async with self._write_connection() as db:
             cursor = await db.execute('''
                 UPDATE tempbans 
                 SET is_active = 0 
@@ -225,7 +224,7 @@ class BanDatabaseManager(BaseDatabaseManager):
 
     async def deactivate_tempban_by_user(self, user_id: int, guild_id: int) -> bool:
         """Mark a user's active tempban as inactive (for manual unban)."""
-        async with connect_database(self.db_path) as db:
+        async with self._write_connection() as db:
             cursor = await db.execute('''
                 UPDATE tempbans 
                 SET is_active = 0 
@@ -237,7 +236,7 @@ class BanDatabaseManager(BaseDatabaseManager):
 
     async def get_user_tempban(self, user_id: int, guild_id: int) -> Optional[Tuple]:
         """Get a user's active tempban record."""
-        async with connect_database(self.db_path) as db:
+        async with self._read_connection() as db:
             cursor = await db.execute('''
                 SELECT id, user_id, guild_id, banned_by, reason, banned_at, unban_at, delete_message_days
                 FROM tempbans 
@@ -251,7 +250,7 @@ class BanDatabaseManager(BaseDatabaseManager):
         cutoff_date = discord.utils.utcnow() - timedelta(days=days_old)
         cutoff_date_str = cutoff_date.isoformat()
         
-        async with connect_database(self.db_path) as db:
+        async with self._write_connection() as db:
             cursor = await db.execute('''
                 DELETE FROM tempbans 
                 WHERE is_active = 0 AND unban_at < ?
@@ -262,7 +261,7 @@ class BanDatabaseManager(BaseDatabaseManager):
 
     async def get_tempban_stats(self, guild_id: int) -> dict:
         """Get tempban statistics for a guild."""
-        async with connect_database(self.db_path) as db:
+        async with self._read_connection() as db:
             # Active tempbans count (not expired)
             current_time_str = discord.utils.utcnow().isoformat()
             cursor = await db.execute('''
@@ -1,24 +1,50 @@
 # bot/utils/check_status_db.py
 import aiosqlite
-from typing import List, Tuple
+from typing import Iterable, List, Optional, Tuple
 
-from .db_connect import connect_database
+from .date_ranges import prefix_range
 from .db_lifecycle import BaseDatabaseManager
+from .schema_migrations import SchemaMigration, apply_schema_migrations
+
+DEFAULT_CATEGORY_RETENTION_DAYS = 30
+DEFAULT_SAMPLE_INTERVAL_MINUTES = 1
+DEFAULT_STATUS_BATCH_SIZE = 10
+
+# (category_id, name, people, channels)
+CategorySample = Tuple[int, str, int, int]
+# (timestamp, people, channels, categories)
+StatusSample = Tuple[str, int, int, List[CategorySample]]
+
+# Rollup table -> length of the timestamp prefix it groups by.
+_ROLLUP_TABLES = (('status_daily', 10), ('status_monthly', 7))
 
 
 class CheckStatusDatabaseManager(BaseDatabaseManager):
     """Voice-channel status samples (table ``status``).
 
-    One row per scheduled sample (every 10 minutes by default) with the total
+    One row per scheduled sample (every minute by default) with the total
     number of people and active voice channels at that moment. Backs the
-    ``/print_voice_status`` command for day/month/year charts.
+    ``/print_voice_status`` command for day/month/year charts. Samples can be
+    buffered with :meth:`queue_status` and written in batches; :meth:`close`
+    writes whatever is still buffered.
+
+    ``status_daily`` and ``status_monthly`` roll the samples up per UTC day
+    and month (peaks, sums and sample count) in the same transaction as each
+    sample, so month and year charts read one row per bar.
+
+    Per-category samples are stored compactly in ``category_status`` (Discord
+    category ID, epoch seconds, counts; ``WITHOUT ROWID``) and rolled up per
+    day into ``category_status_daily``. Raw category samples are only needed
+    for day charts and are pruned after a retention window; the daily rollups
+    are kept.
     """
 
     def __init__(self, db_path: str):
         self.db_path = db_path
+        self._pending_status: List[StatusSample] = []
 
     async def initialize_database(self) -> None:
-        async with connect_database(self.db_path) as db:
+        async with self._write_connection() as db:
             await db.execute('''
                 CREATE TABLE IF NOT EXISTS status (
                     timestamp TEXT NOT NULL,
@@ -26,23 +52,294 @@ class CheckStatusDatabaseManager(BaseDatabaseManager):
                     channels INTEGER DEFAULT 0
                 )
             ''')
+            await apply_schema_migrations(
+                db,
+                namespace='check_status',
+                migrations=[
+                    SchemaMigration(
+                        version=1,
+                        description='index status samples by timestamp',
+                        migrate=self._migrate_status_timestamp_index,
+                    ),
+                    SchemaMigration(
+                        version=2,
+                        description='daily and monthly status rollups',
+                        migrate=self._migrate_status_rollups,
+                    ),
+                    SchemaMigration(
+                        version=3,
+                        description='per-category status samples and daily rollups',
+                        migrate=self._migrate_category_status,
+                    ),
+                ],
+            )
             await db.commit()
 
-    async def record_status(self, timestamp: str, people: int, channels: int) -> None:
-        async with connect_database(self.db_path) as db:
-            await db.execute(
+    async def _migrate_status_timestamp_index(self, db: aiosqlite.Connection) -> None:
+        await db.execute(
+            'CREATE INDEX IF NOT EXISTS idx_status_timestamp ON status(timestamp)'
+        )
+
+    async def _migrate_status_rollups(self, db: aiosqlite.Connection) -> None:
+        for table, key_length in _ROLLUP_TABLES:
+            await db.execute(f'''
+                CREATE TABLE IF NOT EXISTS {table} (
+                    period TEXT PRIMARY KEY,
+                    peak_people INTEGER NOT NULL,
+                    peak_channels INTEGER NOT NULL,
+                    total_people INTEGER NOT NULL,
+                    total_channels INTEGER NOT NULL,
+                    samples INTEGER NOT NULL
+                ) WITHOUT ROWID
+            ''')
+            await db.execute(f'''
+                INSERT OR REPLACE INTO {table}
+                    (period, peak_people, peak_channels, total_people, total_channels, samples)
+                SELECT substr(timestamp, 1, {key_length}), MAX(people), MAX(channels),
+                       SUM(people), SUM(channels), COUNT(*)
+                FROM status
+                GROUP BY substr(timestamp, 1, {key_length})
+            ''')
+
+    async def _migrate_category_status(self, db: aiosqlite.Connection) -> None:
+        await db.execute('''
+            CREATE TABLE IF NOT EXISTS status_categories (
+                category_id INTEGER PRIMARY KEY,
+                name TEXT NOT NULL
+            )
+        ''')
+        await db.execute('''
+            CREATE TABLE IF NOT EXISTS category_status (
+                category_id INTEGER NOT NULL,
+                ts INTEGER NOT NULL,
+                people INTEGER NOT NULL,
+                channels INTEGER NOT NULL,
+                PRIMARY KEY (category_id, ts)
+            ) WITHOUT ROWID
+        ''')
+        await db.execute('''
+            CREATE TABLE IF NOT EXISTS category_status_daily (
+                category_id INTEGER NOT NULL,
+                period TEXT NOT NULL,
+                peak_people INTEGER NOT NULL,
+                peak_channels INTEGER NOT NULL,
+                total_people INTEGER NOT NULL,
+                total_channels INTEGER NOT NULL,
+                samples INTEGER NOT NULL,
+                PRIMARY KEY (category_id, period)
+            ) WITHOUT ROWID
+        ''')
+
+    async def record_status(
+        self,
+        timestamp: str,
+        people: int,
+        channels: int,
+        categories: Optional[Iterable[CategorySample]] = None,
+    ) -> None:
+        """Store one sample, optionally with ``(category_id, name, people, channels)`` per category."""
+        await self.record_statuses([(timestamp, people, channels, list(categories or ()))])
+
+    def queue_status(
+        self,
+        timestamp: str,
+        people: int,
+        channels: int,
+        categories: Optional[Iterable[CategorySample]] = None,
+    ) -> None:
+        """Buffer one sample for the next :meth:`flush_pending_status`."""
+        self._pending_status.append((timestamp, people, channels, list(categories or ())))
+
+    @property
+    def pending_status_count(self) -> int:
+        return len(self._pending_status)
+
+    async def flush_pending_status(self) -> None:
+        """Write every buffered sample in one transaction.
+
+        On failure the samples are put back so the next flush retries them.
+        """
+        pending, self._pending_status = self._pending_status, []
+        if not pending:
+            return
+        try:
+            await self.record_statuses(pending)
+        except Exception:
+            self._pending_status = pending + self._pending_status
+            raise
+
+    async def close(self) -> None:
+        try:
+            await self.flush_pending_status()
+        finally:
+            await super().close()
+
+    async def record_statuses(self, samples: List[StatusSample]) -> None:
+        """Store ``(timestamp, people, channels, categories)`` samples in one transaction."""
+        category_rows = [
+            (timestamp, category)
+            for timestamp, _, _, categories in samples
+            for category in categories
+        ]
+        async with self._write_connection() as db:
+            await db.executemany(
                 'INSERT INTO status (timestamp, people, channels) VALUES (?, ?, ?)',
-                (timestamp, people, channels),
+                [(timestamp, people, channels) for timestamp, people, channels, _ in samples],
             )
+            for table, key_length in _ROLLUP_TABLES:
+                await db.executemany(
+                    f'''
+                    INSERT INTO {table}
+                        (period, peak_people, peak_channels, total_people, total_channels, samples)
+                    VALUES (?, ?, ?, ?, ?, 1)
+                    ON CONFLICT(period) DO UPDATE SET
+                        peak_people = MAX(peak_people, excluded.peak_people),
+                        peak_channels = MAX(peak_channels, excluded.peak_channels),
+                        total_people = total_people + excluded.total_people,
+                        total_channels = total_channels + excluded.total_channels,
+                        samples = samples + 1
+                    ''',
+                    [
+                        (timestamp[:key_length], people, channels, people, channels)
+                        for timestamp, people, channels, _ in samples
+                    ],
+                )
+            if category_rows:
+                names = {category_id: name for _, (category_id, name, _, _) in category_rows}
+                await db.executemany(
+                    'INSERT INTO status_categories (category_id, name) VALUES (?, ?) '
+                    'ON CONFLICT(category_id) DO UPDATE SET name = excluded.name '
+                    'WHERE name != excluded.name',
+                    list(names.items()),
+                )
+                await db.executemany(
+                    "INSERT OR REPLACE INTO category_status (category_id, ts, people, channels) "
+                    "VALUES (?, CAST(strftime('%s', ?) AS INTEGER), ?, ?)",
+                    [(category_id, timestamp, p, c) for timestamp, (category_id, _, p, c) in category_rows],
+                )
+                await db.executemany(
+                    '''
+                    INSERT INTO category_status_daily
+                        (category_id, period, peak_people, peak_channels,
+                         total_people, total_channels, samples)
+                    VALUES (?, ?, ?, ?, ?, ?, 1)
+                    ON CONFLICT(category_id, period) DO UPDATE SET
+                        peak_people = MAX(peak_people, excluded.peak_people),
+                        peak_channels = MAX(peak_channels, excluded.peak_channels),
+                        total_people = total_people + excluded.total_people,
+                        total_channels = total_channels + excluded.total_channels,
+                        samples = samples + 1
+                    ''',
+                    [
+                        (category_id, timestamp[:10], p, c, p, c)
+                        for timestamp, (category_id, _, p, c) in category_rows
+                    ],
+                )
             await db.commit()
 
     async def fetch_status_by_date_prefix(self, date_prefix: str) -> List[Tuple[str, int, int]]:
-        """``date_prefix`` is matched against the leading portion of ``timestamp`` via LIKE ?%."""
-        async with connect_database(self.db_path) as db:
+        """Samples of one ``YYYY``, ``YYYY-MM`` or ``YYYY-MM-DD`` period, oldest first.
+
+        Queried as a ``timestamp`` range so the index is used.
+        """
+        try:
+            start, end = prefix_range(date_prefix)
+        except ValueError:
+            return []
+        async with self._read_connection() as db:
             cursor = await db.execute(
                 'SELECT timestamp, people, channels FROM status '
-                'WHERE timestamp LIKE ? ORDER BY timestamp',
-                (f'{date_prefix}%',),
+                'WHERE timestamp >= ? AND timestamp < ? ORDER BY timestamp',
+                (start, end),
+            )
+            rows = await cursor.fetchall()
+            await cursor.close()
+        return rows
+
+    async def fetch_category_status_by_date_prefix(
+        self, category_id: int, date_prefix: str
+    ) -> List[Tuple[str, int, int]]:
+        """Samples of one category for a ``YYYY-MM-DD`` day, like :meth:`fetch_status_by_date_prefix`.
+
+        Only days within the raw-sample retention window have samples.
+        """
+        try:
+            start, end = prefix_range(date_prefix)
+        except ValueError:
+            return []
+        if len(date_prefix) != 10:
+            return []
+        async with self._read_connection() as db:
+            cursor = await db.execute(
+                "SELECT datetime(ts, 'unixepoch'), people, channels FROM category_status "
+                "WHERE category_id = ? AND ts >= CAST(strftime('%s', ?) AS INTEGER) "
+                "AND ts < CAST(strftime('%s', ?) AS INTEGER) "
+                "ORDER BY ts",
+                (category_id, start, end),
+            )
+            rows = await cursor.fetchall()
+            await cursor.close()
+        return rows
+
+    async def fetch_category_status_rollups(
+        self, category_id: int, date_prefix: str
+    ) -> List[Tuple[str, int, int, float, float]]:
+        """:meth:`fetch_status_rollups` for one category."""
+        try:
+            start, end = prefix_range(date_prefix)
+        except ValueError:
+            return []
+        key_length = 7 if len(date_prefix) == 4 else 10
+        async with self._read_connection() as db:
+            cursor = await db.execute(
+                f'SELECT substr(period, 1, {key_length}), MAX(peak_people), MAX(peak_channels), '
+                f'1.0 * SUM(total_people) / SUM(samples), 1.0 * SUM(total_channels) / SUM(samples) '
+                f'FROM category_status_daily '
+                f'WHERE category_id = ? AND period >= ? AND period < ? '
+                f'GROUP BY substr(period, 1, {key_length}) ORDER BY 1',
+                (category_id, start, end),
+            )
+            rows = await cursor.fetchall()
+            await cursor.close()
+        return rows
+
+    async def prune_category_samples(self, before: str) -> int:
+        """Delete raw category samples taken before the UTC timestamp ``before``.
+
+        Their daily rollups are kept. Returns the number of samples removed.
+        """
+        async with self._write_connection() as db:
+            cursor = await db.execute(
+                "DELETE FROM category_status "
+                "WHERE category_id IN (SELECT category_id FROM status_categories) "
+                "AND ts < CAST(strftime('%s', ?) AS INTEGER)",
+                (before,),
+            )
+            removed = cursor.rowcount
+            await cursor.close()
+            await db.commit()
+        return removed
+
+    async def fetch_status_rollups(
+        self, date_prefix: str
+    ) -> List[Tuple[str, int, int, float, float]]:
+        """Per-period peaks and averages covering one ``YYYY``, ``YYYY-MM`` or ``YYYY-MM-DD``.
+
+        A year is returned per month (``YYYY-MM``); a month or a day per day
+        (``YYYY-MM-DD``). Rows are ``(period, peak_people, peak_channels,
+        avg_people, avg_channels)``, oldest first.
+        """
+        try:
+            start, end = prefix_range(date_prefix)
+        except ValueError:
+            return []
+        table = 'status_monthly' if len(date_prefix) == 4 else 'status_daily'
+        async with self._read_connection() as db:
+            cursor = await db.execute(
+                f'SELECT period, peak_people, peak_channels, '
+                f'1.0 * total_people / samples, 1.0 * total_channels / samples '
+                f'FROM {table} WHERE period >= ? AND period < ? ORDER BY period',
+                (start, end),
             )
             rows = await cursor.fetchall()
             await cursor.close()
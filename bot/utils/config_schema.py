@@ -58,6 +58,18 @@ class MainConfig:
     # per ``Config.is_feature_enabled(feature, default=True)``.
     features: Dict[str, bool] = field(default_factory=dict)
 
+    # Shared SQLite connection settings, see ``bot.utils.db_lifecycle``.
+    database: Dict[str, Any] = field(default_factory=dict)
+
+    # BackupCog settings, see ``bot.utils.db_backup``.
+    backup: Dict[str, Any] = field(default_factory=dict)
+
+    # CheckStatusCog chart rendering, see ``bot.cogs.check_status.charts``.
+    charts: Dict[str, Any] = field(default_factory=dict)
+
+    # CheckStatusCog sampling and retention, see ``bot.utils.check_status_db``.
+    voice_status: Dict[str, Any] = field(default_factory=dict)
+
 
 # Keys the bot cannot sensibly run without.
 _MAIN_REQUIRED: List[str] = [
@@ -88,6 +100,10 @@ _MAIN_TYPES: Dict[str, Any] = {
     'locale': str,
     'log_backup_count': int,
     'features': dict,
+    'database': dict,
+    'backup': dict,
+    'charts': dict,
+    'voice_status': dict,
 }
 
 
@@ -0,0 +1,34 @@
+"""Half-open ranges over ISO date strings for index-friendly SQL predicates.
+
+Dates and timestamps are stored as ``YYYY-MM-DD`` and ``YYYY-MM-DD HH:MM:SS``
+text, which sort in time order, so ``column >= start AND column < end`` is an
+index range scan where ``column LIKE 'prefix%'`` is a full scan.
+"""
+
+from datetime import date, timedelta
+from typing import Tuple
+
+
+def month_range(year: int, month: int) -> Tuple[str, str]:
+    """``(start, end)`` covering every date and timestamp of one month."""
+    year, month = int(year), int(month)
+    if month == 12:
+        return f"{year:04d}-12", f"{year + 1:04d}-01"
+    return f"{year:04d}-{month:02d}", f"{year:04d}-{month + 1:02d}"
+
+
+def prefix_range(prefix: str) -> Tuple[str, str]:
+    """``(start, end)`` for a ``YYYY``, ``YYYY-MM`` or ``YYYY-MM-DD`` prefix.
+
+    Raises ValueError for anything else.
+    """
+    parts = prefix.split('-')
+    if len(parts) == 1 and len(prefix) == 4:
+        year = int(prefix)
+        return f"{year:04d}", f"{year + 1:04d}"
+    if len(parts) == 2:
+        return month_range(int(parts[0]), int(parts[1]))
+    if len(parts) == 3:
+        day = date.fromisoformat(prefix)
+        return day.isoformat(), (day + timedelta(days=1)).isoformat()
+    raise ValueError(f"Unsupported date prefix: {prefix!r}")
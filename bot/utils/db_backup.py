@@ -0,0 +1,555 @@
+"""Online database backups through the SQLite backup API.
+
+The helpers here block on purpose: BackupCog runs them with
+``asyncio.to_thread`` so the event loop keeps handling commands, and tools
+can call them directly. Connections come from
+:func:`bot.utils.db_connect.connect_database_sync`, so SQLCipher databases are
+backed up with the same key and cipher settings and stay encrypted.
+
+Backups can be stream-compressed with gzip or zstd (zstd needs Python 3.14's
+``compression.zstd`` or the optional ``zstandard`` package) and pruned with a
+tiered hourly/daily/weekly/monthly retention policy. A backup is verified by
+restoring it to a scratch file and running ``PRAGMA quick_check`` on that.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import time
+from dataclasses import dataclass, replace
+from datetime import datetime
+from pathlib import Path
+from types import ModuleType
+from typing import BinaryIO, Iterable, Optional
+
+from .db_connect import connect_database_sync
+
+
+DEFAULT_PAGES_PER_STEP = 1024
+DEFAULT_STEP_PAUSE_SECONDS = 0.01
+DEFAULT_COMPRESSION = 'gzip'
+
+COMPRESSION_SUFFIXES = {
+    'none': '',
+    'gzip': '.gz',
+    'zstd': '.zst',
+}
+
+_STREAM_CHUNK_SIZE = 1024 * 1024
+_BACKUP_NAME_PATTERN = re.compile(r'database_(\d{8}_\d{6})\.db')
+FAILED_BACKUP_SUFFIX = '.failed'
+
+
+@dataclass(frozen=True)
+class BackupVerification:
+    ok: bool
+    # "ok", or the problems PRAGMA quick_check (or opening the file) reported.
+    detail: str
+    duration_seconds: float
+
+
+@dataclass(frozen=True)
+class BackupResult:
+    path: Path
+    size_bytes: int
+    duration_seconds: float
+    pages: int
+    sha256: str = ''
+    compression: str = 'none'
+    # True when the snapshot matched ``previous_sha256`` and was discarded.
+    skipped: bool = False
+    verification: Optional[BackupVerification] = None
+
+
+@dataclass(frozen=True)
+class RestoreResult:
+    path: Path
+    size_bytes: int
+    duration_seconds: float
+    verification: Optional[BackupVerification] = None
+
+
+class BackupVerificationError(RuntimeError):
+    """A restored database did not pass ``PRAGMA quick_check``."""
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    """How many distinct hours, days, ISO weeks and months keep a backup.
+
+    Each tier keeps the newest backup of its most recent ``N`` periods; a file
+    kept by any tier survives, and the newest backup is always kept.
+    """
+
+    hourly: int = 24
+    daily: int = 7
+    weekly: int = 4
+    monthly: int = 12
+
+    @classmethod
+    def from_config(cls, settings: Optional[dict]) -> 'RetentionPolicy':
+        settings = settings or {}
+        defaults = cls()
+        return cls(**{
+            tier: max(0, int(settings.get(tier, getattr(defaults, tier))))
+            for tier in ('hourly', 'daily', 'weekly', 'monthly')
+        })
+
+
+def backup_database_file(
+    source: str | Path,
+    destination: str | Path,
+    *,
+    pages_per_step: int = DEFAULT_PAGES_PER_STEP,
+    step_pause: float = DEFAULT_STEP_PAUSE_SECONDS,
+) -> BackupResult:
+    """Copy ``source`` into ``destination`` as a consistent snapshot.
+
+    Pages are copied ``pages_per_step`` at a time with ``step_pause`` seconds
+    between steps, so the copy never holds the database for long. The file is
+    written next to ``destination`` and renamed into place when complete, so
+    a failed or interrupted backup never leaves a truncated file behind.
+    """
+    started = time.perf_counter()
+    destination = Path(destination)
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    partial = destination.with_name(destination.name + '.partial')
+    partial.unlink(missing_ok=True)
+
+    total_pages = 0
+
+    def progress(status: int, remaining: int, total: int) -> None:
+        nonlocal total_pages
+        total_pages = total
+        if remaining and step_pause > 0:
+            time.sleep(step_pause)
+
+    try:
+        source_db = connect_database_sync(source, isolation_level=None)
+        try:
+            snapshot_pinned = _pin_wal_snapshot(source_db)
+            target_db = connect_database_sync(partial)
+            try:
+                source_db.backup(target_db, pages=max(1, pages_per_step), progress=progress)
+                # The copied header still says WAL; switch the copy back to a
+                # rollback journal so it is a single self-contained file.
+                target_db.execute("PRAGMA journal_mode = DELETE").fetchone()
+            finally:
+                target_db.close()
+            if snapshot_pinned:
+                source_db.execute("COMMIT")
+        finally:
+            source_db.close()
+        os.replace(partial, destination)
+    except BaseException:
+        for leftover in (partial, partial.with_name(partial.name + '-wal'), partial.with_name(partial.name + '-shm')):
+            try:
+                leftover.unlink(missing_ok=True)
+            except OSError:
+                logging.exception("Failed to remove partial backup file %s", leftover)
+        raise
+
+    return BackupResult(
+        path=destination,
+        size_bytes=destination.stat().st_size,
+        duration_seconds=time.perf_counter() - started,
+        pages=total_pages,
+    )
+
+
+def _pin_wal_snapshot(connection) -> bool:
+    # In WAL mode an open read transaction pins one snapshot without blocking
+    # writers, so every backup step reads the same version of the database
+    # and concurrent commits never restart the copy. With a rollback journal
+    # the same transaction would block writers for the whole backup, so the
+    # copy runs unpinned and SQLite restarts it if a write lands mid-copy.
+    journal_mode = connection.execute("PRAGMA journal_mode").fetchone()[0]
+    if str(journal_mode).lower() != 'wal':
+        return False
+    connection.execute("BEGIN")
+    connection.execute("SELECT count(*) FROM sqlite_master").fetchone()
+    return True
+
+
+def create_backup(
+    source: str | Path,
+    folder: str | Path,
+    *,
+    taken_at: Optional[datetime] = None,
+    compression: str = DEFAULT_COMPRESSION,
+    compression_level: Optional[int] = None,
+    pages_per_step: int = DEFAULT_PAGES_PER_STEP,
+    step_pause: float = DEFAULT_STEP_PAUSE_SECONDS,
+    previous_sha256: Optional[str] = None,
+) -> BackupResult:
+    """Snapshot ``source`` into ``folder`` and compress it.
+
+    The SHA-256 of the uncompressed snapshot is returned in the result. When
+    it equals ``previous_sha256`` the new file is removed again and the
+    result is marked ``skipped``.
+    """
+    started = time.perf_counter()
+    compression = resolve_compression(compression)
+    taken_at = taken_at or datetime.now()
+    folder = Path(folder)
+    name = f"database_{taken_at.strftime('%Y%m%d_%H%M%S')}.db"
+    destination = folder / (name + COMPRESSION_SUFFIXES[compression])
+
+    # The snapshot name contains ".partial" so retention never picks it up.
+    snapshot = backup_database_file(
+        source,
+        folder / (name + '.partial-snapshot'),
+        pages_per_step=pages_per_step,
+        step_pause=step_pause,
+    )
+    try:
+        size_bytes, sha256 = compress_file(
+            snapshot.path,
+            destination,
+            compression,
+            level=compression_level,
+        )
+    finally:
+        snapshot.path.unlink(missing_ok=True)
+
+    skipped = previous_sha256 is not None and sha256 == previous_sha256
+    if skipped:
+        destination.unlink(missing_ok=True)
+
+    return BackupResult(
+        path=destination,
+        size_bytes=size_bytes,
+        duration_seconds=time.perf_counter() - started,
+        pages=snapshot.pages,
+        sha256=sha256,
+        compression=compression,
+        skipped=skipped,
+    )
+
+
+def quick_check_database(path: str | Path, *, max_errors: int = 10) -> BackupVerification:
+    """Run ``PRAGMA quick_check`` on ``path`` through the bot's connection path.
+
+    SQLCipher files are opened with the configured key. A file that cannot be
+    opened or decrypted is reported as a failed check instead of raising.
+    """
+    started = time.perf_counter()
+    try:
+        connection = connect_database_sync(path)
+        try:
+            rows = connection.execute(f"PRAGMA quick_check({int(max_errors)})").fetchall()
+        finally:
+            connection.close()
+    except Exception as e:
+        return BackupVerification(False, f"{type(e).__name__}: {e}", time.perf_counter() - started)
+    messages = [str(row[0]) for row in rows]
+    return BackupVerification(messages == ['ok'], '; '.join(messages), time.perf_counter() - started)
+
+
+def restore_backup(
+    backup: str | Path,
+    destination: str | Path,
+    *,
+    overwrite: bool = False,
+    verify: bool = True,
+) -> RestoreResult:
+    """Stream ``backup`` (decompressing it if needed) into ``destination``.
+
+    The data is written next to ``destination``, checked with
+    ``PRAGMA quick_check`` when ``verify`` is set and only then renamed over
+    it, so a failed restore leaves the existing database untouched.
+    """
+    started = time.perf_counter()
+    backup = Path(backup)
+    destination = Path(destination)
+    if destination.exists() and not overwrite:
+        raise FileExistsError(f"{destination} already exists; pass overwrite=True to replace it")
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    partial = destination.with_name(destination.name + '.partial')
+
+    verification = None
+    try:
+        with open_backup_stream(backup, 'rb', compression_for_path(backup)) as reader, open(partial, 'wb') as writer:
+            shutil.copyfileobj(reader, writer, _STREAM_CHUNK_SIZE)
+            writer.flush()
+            os.fsync(writer.fileno())
+        if verify:
+            verification = quick_check_database(partial)
+            if not verification.ok:
+                raise BackupVerificationError(f"{backup} failed quick_check: {verification.detail}")
+        replace_database_file(partial, destination)
+    except BaseException:
+        remove_database_files(partial)
+        raise
+
+    return RestoreResult(
+        path=destination,
+        size_bytes=destination.stat().st_size,
+        duration_seconds=time.perf_counter() - started,
+        verification=verification,
+    )
+
+
+def verify_backup(backup: str | Path) -> BackupVerification:
+    """Restore ``backup`` to a scratch file next to it and quick_check that."""
+    started = time.perf_counter()
+    backup = Path(backup)
+    # Hidden and ".partial": retention and list_backups() never see it.
+    scratch = backup.with_name(f'.verify-{backup.name}.partial')
+    try:
+        restore_backup(backup, scratch, overwrite=True, verify=False)
+        verification = quick_check_database(scratch)
+    except Exception as e:
+        # Truncated or corrupt compressed streams fail here.
+        verification = BackupVerification(False, f"{type(e).__name__}: {e}", 0.0)
+    finally:
+        remove_database_files(scratch)
+    return replace(verification, duration_seconds=time.perf_counter() - started)
+
+
+def record_verification(
+    log_path: str | Path,
+    backup: str | Path,
+    verification: BackupVerification,
+    *,
+    checked_at: Optional[datetime] = None,
+) -> None:
+    """Append one JSON line describing a verification run to ``log_path``."""
+    log_path = Path(log_path)
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    entry = {
+        'checked_at': (checked_at or datetime.now()).isoformat(timespec='seconds'),
+        'backup': str(backup),
+        'ok': verification.ok,
+        'detail': verification.detail,
+        'duration_seconds': round(verification.duration_seconds, 3),
+    }
+    with open(log_path, 'a', encoding='utf-8') as log:
+        log.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+
+def replace_database_file(source: Path, destination: Path) -> None:
+    """Atomically move a complete database file over ``destination``.
+
+    A leftover ``-wal`` of the old database would be replayed onto the new
+    file on the next open, so sidecar files are removed first.
+    """
+    for sidecar in ('-wal', '-shm'):
+        source.with_name(source.name + sidecar).unlink(missing_ok=True)
+        destination.with_name(destination.name + sidecar).unlink(missing_ok=True)
+    os.replace(source, destination)
+
+
+def remove_database_files(path: Path) -> None:
+    for leftover in (path, path.with_name(path.name + '-wal'), path.with_name(path.name + '-shm')):
+        leftover.unlink(missing_ok=True)
+
+
+def resolve_compression(method: Optional[str]) -> str:
+    """Validate a configured compression name, falling back from zstd to gzip
+    when no zstd implementation is installed."""
+    method = str(method or 'none').lower()
+    if method not in COMPRESSION_SUFFIXES:
+        raise ValueError(
+            f"backup compression must be one of {', '.join(COMPRESSION_SUFFIXES)}, got {method!r}"
+        )
+    if method == 'zstd' and _load_zstd_module() is None:
+        logging.warning(
+            "zstd backup compression needs Python 3.14+ or the zstandard package; using gzip instead"
+        )
+        return 'gzip'
+    return method
+
+
+def compression_for_path(path: str | Path) -> str:
+    suffix = Path(path).suffix
+    for method, method_suffix in COMPRESSION_SUFFIXES.items():
+        if method_suffix and suffix == method_suffix:
+            return method
+    return 'none'
+
+
+def open_backup_stream(
+    path: str | Path,
+    mode: str,
+    compression: str,
+    *,
+    level: Optional[int] = None,
+) -> BinaryIO:
+    """Open a backup file for binary streaming through its compression."""
+    if compression == 'gzip':
+        return gzip.open(path, mode, compresslevel=6 if level is None else level)
+    if compression == 'zstd':
+        zstd = _load_zstd_module()
+        if zstd is None:
+            raise RuntimeError(
+                "Reading or writing zstd backups needs Python 3.14+ or the zstandard package: "
+                "pip install zstandard"
+            )
+        if zstd.__name__ == 'zstandard':
+            if 'w' in mode:
+                return zstd.open(path, mode, cctx=zstd.ZstdCompressor(level=3 if level is None else level))
+            return zstd.open(path, mode)
+        return zstd.open(path, mode, level=level) if 'w' in mode else zstd.open(path, mode)
+    return open(path, mode)
+
+
+def compress_file(
+    source: str | Path,
+    destination: str | Path,
+    compression: str,
+    *,
+    level: Optional[int] = None,
+) -> tuple[int, str]:
+    """Stream ``source`` into ``destination`` through ``compression``.
+
+    Returns the size of the written file and the SHA-256 of the uncompressed
+    bytes. The output is renamed into place only once it is complete.
+    """
+    destination = Path(destination)
+    partial = destination.with_name(destination.name + '.partial')
+    digest = hashlib.sha256()
+    try:
+        with open(source, 'rb') as reader, open_backup_stream(partial, 'wb', compression, level=level) as writer:
+            while chunk := reader.read(_STREAM_CHUNK_SIZE):
+                digest.update(chunk)
+                writer.write(chunk)
+        os.replace(partial, destination)
+    except BaseException:
+        partial.unlink(missing_ok=True)
+        raise
+    return destination.stat().st_size, digest.hexdigest()
+
+
+def _load_zstd_module() -> Optional[ModuleType]:
+    try:
+        from compression import zstd
+        return zstd
+    except ModuleNotFoundError:
+        pass
+    try:
+        import zstandard
+        return zstandard
+    except ModuleNotFoundError:
+        return None
+
+
+def hash_backup_file(path: str | Path) -> str:
+    """SHA-256 of a backup's uncompressed contents."""
+    digest = hashlib.sha256()
+    with open_backup_stream(path, 'rb', compression_for_path(path)) as reader:
+        while chunk := reader.read(_STREAM_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class DataVersionWatcher:
+    """Detect commits to a database through ``PRAGMA data_version``.
+
+    The value only changes when *another* connection commits, so the watcher
+    keeps one dedicated, read-only connection that never writes. Its methods
+    block; call them from a worker thread.
+    """
+
+    def __init__(self, db_path: str | Path):
+        self.db_path = db_path
+        self._connection = None
+
+    def current(self) -> int:
+        if self._connection is None:
+            self._connection = connect_database_sync(self.db_path, check_same_thread=False)
+        return self._connection.execute("PRAGMA data_version").fetchone()[0]
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+def backup_taken_at(path: Path) -> datetime:
+    """When a backup was taken, from its file name or else its mtime."""
+    match = _BACKUP_NAME_PATTERN.match(path.name)
+    if match:
+        try:
+            return datetime.strptime(match.group(1), '%Y%m%d_%H%M%S')
+        except ValueError:
+            pass
+    return datetime.fromtimestamp(path.stat().st_mtime)
+
+
+def list_backups(folder: str | Path) -> list[Path]:
+    """Completed backup files in ``folder``, oldest first."""
+    folder = Path(folder)
+    if not folder.exists():
+        return []
+    backups = [
+        path for path in folder.iterdir()
+        if path.is_file()
+        and not path.name.startswith('.')
+        and '.partial' not in path.name
+        and not path.name.endswith(FAILED_BACKUP_SUFFIX)
+    ]
+    return sorted(backups, key=backup_taken_at)
+
+
+def quarantine_backup(path: str | Path) -> Path:
+    """Rename a backup that failed verification so retention never counts it.
+
+    The file is kept for inspection as ``<name>.failed``; list_backups() and
+    prune_backups() skip it.
+    """
+    path = Path(path)
+    quarantined = path.with_name(path.name + FAILED_BACKUP_SUFFIX)
+    os.replace(path, quarantined)
+    return quarantined
+
+
+def backups_to_keep(backups: Iterable[Path], policy: RetentionPolicy) -> set[Path]:
+    newest_first = sorted(backups, key=backup_taken_at, reverse=True)
+    keep: set[Path] = set(newest_first[:1])
+    tiers = (
+        (policy.hourly, '%Y%m%d%H'),
+        (policy.daily, '%Y%m%d'),
+        (policy.weekly, '%G%V'),
+        (policy.monthly, '%Y%m'),
+    )
+    for limit, bucket_format in tiers:
+        buckets: set[str] = set()
+        for path in newest_first:
+            if len(buckets) >= limit:
+                break
+            bucket = backup_taken_at(path).strftime(bucket_format)
+            if bucket not in buckets:
+                buckets.add(bucket)
+                keep.add(path)
+    return keep
+
+
+def prune_backups(folder: str | Path, policy: RetentionPolicy) -> list[Path]:
+    """Delete backups in ``folder`` that no retention tier keeps."""
+    backups = list_backups(folder)
+    keep = backups_to_keep(backups, policy)
+    removed = []
+    for path in backups:
+        if path in keep:
+            continue
+        path.unlink()
+        removed.append(path)
+    return removed
+
+
+def format_size(size_bytes: int) -> str:
+    if size_bytes < 1024:
+        return f"{size_bytes} B"
+    size = size_bytes / 1024
+    for unit in ('KiB', 'MiB'):
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
@@ -5,18 +5,28 @@ deployments can enable at-rest encryption by setting ``DCGSH_DB_KEY`` or
 ``DCGSH_DB_KEY_FILE``. Set ``DCGSH_DB_CREATE_KEY_FILE=1`` to generate a missing
 key file on first use, and ``DCGSH_DB_REQUIRE_ENCRYPTION=1`` to fail fast when
 no key is configured.
+
+Every connection also gets the performance profile from ``main.database``
+(journal mode, synchronous level, page cache, mmap, temp store and busy
+timeout), and SQLCipher connections the ``main.database.sqlcipher`` settings
+(KDF iterations, page size, memory security, raw keys). ``main.py`` installs it with :func:`configure_connection_profile`
+before any manager opens a connection; the defaults below apply otherwise.
 """
 
 from __future__ import annotations
 
 import os
 import secrets
+import sqlite3
+import string
 from pathlib import Path
 from types import ModuleType
 from typing import Any
 
 import aiosqlite
 
+from .db_metrics import InstrumentedConnection
+
 
 DB_KEY_ENV = "DCGSH_DB_KEY"
 DB_KEY_FILE_ENV = "DCGSH_DB_KEY_FILE"
@@ -24,6 +34,35 @@ DB_CREATE_KEY_FILE_ENV = "DCGSH_DB_CREATE_KEY_FILE"
 DB_REQUIRE_ENCRYPTION_ENV = "DCGSH_DB_REQUIRE_ENCRYPTION"
 
 
+DEFAULT_CONNECTION_PROFILE: dict[str, Any] = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    # Negative values are KiB, matching SQLite's own cache_size convention.
+    "cache_size": -16000,
+    "mmap_size": 134217728,
+    "temp_store": "MEMORY",
+    "busy_timeout": 5000,
+    # Pages in the WAL before a commit checkpoints it; 0 leaves checkpoints
+    # to someone else (the continuous backup archiver).
+    "wal_autocheckpoint": 1000,
+}
+
+# ``None`` keeps SQLCipher's own default for that setting.
+DEFAULT_SQLCIPHER_PROFILE: dict[str, Any] = {
+    "kdf_iter": None,
+    "cipher_page_size": None,
+    "cipher_memory_security": None,
+    "raw_key": False,
+}
+
+_JOURNAL_MODES = {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"}
+_SYNCHRONOUS_LEVELS = {"OFF", "NORMAL", "FULL", "EXTRA"}
+_TEMP_STORES = {"DEFAULT", "FILE", "MEMORY"}
+
+_connection_profile: dict[str, Any] = dict(DEFAULT_CONNECTION_PROFILE)
+_sqlcipher_profile: dict[str, Any] = dict(DEFAULT_SQLCIPHER_PROFILE)
+
+
 def _truthy(value: str | None) -> bool:
     return bool(value and value.lower() in {"1", "true", "yes", "on"})
 
@@ -72,7 +111,7 @@ def _read_database_key_file(path: Path) -> str:
 
 
 def _create_database_key_file(path: Path) -> str:
-    key = secrets.token_urlsafe(64)
+    key = secrets.token_hex(32) if _sqlcipher_profile["raw_key"] else secrets.token_urlsafe(64)
     try:
         path.parent.mkdir(parents=True, exist_ok=True)
         flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL
@@ -102,6 +141,131 @@ def database_encryption_enabled() -> bool:
     return bool(get_database_key())
 
 
+def _profile_choice(settings: dict, name: str, choices: set[str]) -> str:
+    value = str(settings.get(name, DEFAULT_CONNECTION_PROFILE[name])).upper()
+    if value not in choices:
+        raise ValueError(f"main.database.{name} must be one of {', '.join(sorted(choices))}, got {value!r}")
+    return value
+
+
+def _profile_int(settings: dict, name: str) -> int:
+    value = settings.get(name, DEFAULT_CONNECTION_PROFILE[name])
+    try:
+        return int(value)
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"main.database.{name} must be an integer, got {value!r}") from exc
+
+
+def configure_connection_profile(settings: dict | None = None) -> dict[str, Any]:
+    """Validate ``main.database`` pragmas and use them for new connections.
+
+    Missing keys fall back to :data:`DEFAULT_CONNECTION_PROFILE`. Returns the
+    profile that will be applied.
+    """
+    settings = settings or {}
+    profile = {
+        "journal_mode": _profile_choice(settings, "journal_mode", _JOURNAL_MODES),
+        "synchronous": _profile_choice(settings, "synchronous", _SYNCHRONOUS_LEVELS),
+        "cache_size": _profile_int(settings, "cache_size"),
+        "mmap_size": max(0, _profile_int(settings, "mmap_size")),
+        "temp_store": _profile_choice(settings, "temp_store", _TEMP_STORES),
+        "busy_timeout": max(0, _profile_int(settings, "busy_timeout")),
+        "wal_autocheckpoint": max(0, _profile_int(settings, "wal_autocheckpoint")),
+    }
+    _connection_profile.clear()
+    _connection_profile.update(profile)
+    _configure_sqlcipher_profile(settings.get("sqlcipher") or {})
+    return dict(profile)
+
+
+def _configure_sqlcipher_profile(settings: dict) -> None:
+    kdf_iter = settings.get("kdf_iter")
+    if kdf_iter is not None:
+        kdf_iter = _positive_int(kdf_iter, "sqlcipher.kdf_iter")
+
+    page_size = settings.get("cipher_page_size")
+    if page_size is not None:
+        page_size = _positive_int(page_size, "sqlcipher.cipher_page_size")
+        if page_size < 512 or page_size > 65536 or page_size & (page_size - 1):
+            raise ValueError(
+                "main.database.sqlcipher.cipher_page_size must be a power of two between 512 and 65536"
+            )
+
+    memory_security = settings.get("cipher_memory_security")
+    if memory_security is not None and not isinstance(memory_security, bool):
+        raise ValueError("main.database.sqlcipher.cipher_memory_security must be true, false or null")
+
+    _sqlcipher_profile.clear()
+    _sqlcipher_profile.update({
+        "kdf_iter": kdf_iter,
+        "cipher_page_size": page_size,
+        "cipher_memory_security": memory_security,
+        "raw_key": bool(settings.get("raw_key", False)),
+    })
+
+
+def _positive_int(value: Any, name: str) -> int:
+    try:
+        number = int(value)
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"main.database.{name} must be an integer, got {value!r}") from exc
+    if number <= 0:
+        raise ValueError(f"main.database.{name} must be positive, got {value!r}")
+    return number
+
+
+def get_connection_profile() -> dict[str, Any]:
+    profile = dict(_connection_profile)
+    profile["sqlcipher"] = dict(_sqlcipher_profile)
+    return profile
+
+
+def _apply_connection_profile(connection: Any) -> None:
+    profile = _connection_profile
+    # busy_timeout goes first so switching journal_mode waits for other
+    # connections instead of failing with "database is locked".
+    connection.execute(f"PRAGMA busy_timeout = {profile['busy_timeout']}")
+    connection.execute(f"PRAGMA journal_mode = {profile['journal_mode']}").fetchone()
+    connection.execute(f"PRAGMA synchronous = {profile['synchronous']}")
+    connection.execute(f"PRAGMA cache_size = {profile['cache_size']}")
+    connection.execute(f"PRAGMA mmap_size = {profile['mmap_size']}").fetchone()
+    connection.execute(f"PRAGMA temp_store = {profile['temp_store']}")
+    connection.execute(f"PRAGMA wal_autocheckpoint = {profile['wal_autocheckpoint']}").fetchone()
+
+
+_SYNCHRONOUS_NAMES = {0: "OFF", 1: "NORMAL", 2: "FULL", 3: "EXTRA"}
+_TEMP_STORE_NAMES = {0: "DEFAULT", 1: "FILE", 2: "MEMORY"}
+
+
+async def read_connection_profile(database: str | bytes | Path) -> dict[str, Any]:
+    """Open one connection and report the pragmas SQLite actually applied.
+
+    SQLite silently ignores settings it cannot honour (for example WAL on an
+    in-memory database, or mmap in builds without it), so startup logs the
+    effective values rather than the configured ones.
+    """
+    pragmas = list(DEFAULT_CONNECTION_PROFILE)
+    if database_encryption_enabled():
+        pragmas += ["cipher_version", "cipher_page_size", "cipher_memory_security"]
+        if not _sqlcipher_profile["raw_key"]:
+            pragmas.append("kdf_iter")
+
+    async with connect_database(database) as db:
+        effective: dict[str, Any] = {}
+        for name in pragmas:
+            cursor = await db.execute(f"PRAGMA {name}")
+            row = await cursor.fetchone()
+            await cursor.close()
+            effective[name] = row[0] if row else None
+
+    effective["journal_mode"] = str(effective["journal_mode"]).upper()
+    effective["synchronous"] = _SYNCHRONOUS_NAMES.get(effective["synchronous"], effective["synchronous"])
+    effective["temp_store"] = _TEMP_STORE_NAMES.get(effective["temp_store"], effective["temp_store"])
+    if "cipher_version" in effective:
+        effective["sqlcipher_key"] = "raw" if _sqlcipher_profile["raw_key"] else "passphrase"
+    return effective
+
+
 def connect_database(
     database: str | bytes | Path,
     *,
@@ -109,21 +273,45 @@ def connect_database(
     **kwargs: Any,
 ) -> aiosqlite.Connection:
     """Return an aiosqlite connection, keyed with SQLCipher when configured."""
-    key = get_database_key()
-    if not key:
-        return aiosqlite.connect(
-            database,
-            iter_chunk_size=iter_chunk_size,
-            **kwargs,
-        )
+    # Resolve and validate the key here so a missing or malformed key fails
+    # in the caller instead of inside the connection's worker thread.
+    key_literal = _database_key_literal()
+    if isinstance(database, bytes):
+        database = database.decode("utf-8")
 
     def connector():
-        sqlcipher = _load_sqlcipher_module()
-        connection = sqlcipher.connect(str(database), **kwargs)
-        _configure_sqlcipher_connection(connection, key)
-        return connection
+        return _open_connection(str(database), key_literal, kwargs)
 
-    return aiosqlite.Connection(connector, iter_chunk_size)
+    return InstrumentedConnection(connector, iter_chunk_size)
+
+
+def connect_database_sync(database: str | Path, **kwargs: Any) -> Any:
+    """Blocking counterpart of :func:`connect_database` for worker threads.
+
+    Returns a ``sqlite3`` or ``sqlcipher3`` connection with the same key,
+    SQLCipher settings and connection profile as the bot's own connections.
+    """
+    return _open_connection(str(database), _database_key_literal(), kwargs)
+
+
+def _database_key_literal() -> str | None:
+    key = get_database_key()
+    return _sqlcipher_key_literal(key) if key else None
+
+
+def _open_connection(database: str, key_literal: str | None, kwargs: dict) -> Any:
+    if key_literal:
+        connection = _load_sqlcipher_module().connect(database, **kwargs)
+    else:
+        connection = sqlite3.connect(database, **kwargs)
+    try:
+        if key_literal:
+            _configure_sqlcipher_connection(connection, key_literal)
+        _apply_connection_profile(connection)
+    except Exception:
+        connection.close()
+        raise
+    return connection
 
 
 def _load_sqlcipher_module() -> ModuleType:
@@ -137,12 +325,38 @@ def _load_sqlcipher_module() -> ModuleType:
     return sqlcipher3
 
 
-def _configure_sqlcipher_connection(connection: Any, key: str) -> None:
-    connection.execute(f"PRAGMA key = {_sql_literal(key)}")
+def _configure_sqlcipher_connection(connection: Any, key_literal: str) -> None:
+    profile = _sqlcipher_profile
+    connection.execute(f"PRAGMA key = {key_literal}")
+    # Page size and KDF iterations are part of the file format: they must be
+    # set before the first read and match the values the file was written with.
+    if profile["cipher_page_size"] is not None:
+        connection.execute(f"PRAGMA cipher_page_size = {profile['cipher_page_size']}")
+    if profile["kdf_iter"] is not None and not profile["raw_key"]:
+        connection.execute(f"PRAGMA kdf_iter = {profile['kdf_iter']}")
+    if profile["cipher_memory_security"] is not None:
+        value = "ON" if profile["cipher_memory_security"] else "OFF"
+        connection.execute(f"PRAGMA cipher_memory_security = {value}")
     # Force a schema read so a wrong key or a non-SQLCipher backend fails
     # before the caller starts running feature-specific SQL.
     connection.execute("SELECT count(*) FROM sqlite_master").fetchone()
 
 
+def _sqlcipher_key_literal(key: str) -> str:
+    if not _sqlcipher_profile["raw_key"]:
+        return _sql_literal(key)
+    # A raw key skips PBKDF2 entirely: 64 hex digits are the 256-bit key,
+    # 96 hex digits are the key followed by the 128-bit database salt.
+    raw = key.strip()
+    if raw[:2].lower() == "x'" and raw.endswith("'"):
+        raw = raw[2:-1]
+    if len(raw) not in {64, 96} or any(char not in string.hexdigits for char in raw):
+        raise RuntimeError(
+            "main.database.sqlcipher.raw_key is enabled, so the database key must be "
+            "64 or 96 hexadecimal characters"
+        )
+    return f"\"x'{raw}'\""
+
+
 def _sql_literal(value: str) -> str:
     return "'" + value.replace("'", "''") + "'"
@@ -1,57 +1,232 @@
 import asyncio
 import logging
-from collections.abc import Iterable
-from typing import Any
+import os
+import weakref
+from collections.abc import AsyncIterator, Callable, Iterable
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, Optional
 
 import aiosqlite
 
 from .db_connect import connect_database
+from .db_metrics import TimedLock
+
+
+DEFAULT_READ_CONNECTIONS = 4
+
+_pool_settings: dict[str, Any] = {
+    'read_connections': DEFAULT_READ_CONNECTIONS,
+}
+
+# Pools are held strongly by the managers that use them. The registry only
+# needs to find a live pool for a path, so a manager that is dropped without
+# ``close()`` does not pin connection threads for the rest of the process.
+_pools: 'weakref.WeakValueDictionary[str, DatabaseConnectionPool]' = weakref.WeakValueDictionary()
+
+
+def configure_connection_pools(settings: Optional[dict] = None) -> None:
+    """Apply ``main.database`` pool settings to pools created afterwards."""
+    settings = settings or {}
+    read_connections = settings.get('read_connections', DEFAULT_READ_CONNECTIONS)
+    _pool_settings['read_connections'] = max(1, int(read_connections))
+
+
+def _pool_key(db_path: str | Path) -> str:
+    db_path = str(db_path)
+    if db_path == ':memory:':
+        return db_path
+    return os.path.abspath(db_path)
+
+
+class DatabaseConnectionPool:
+    """Shared connections for one database file.
+
+    One writer connection is serialized by ``write_lock``; every manager that
+    writes to the same file takes the same lock, so transactions never
+    interleave on the shared connection. Up to ``read_connections`` reader
+    connections serve read-only queries concurrently with the writer. All
+    connections are opened lazily through :func:`connect_database`, so the
+    SQLCipher key derivation runs once per pooled connection instead of once
+    per query.
+    """
+
+    def __init__(self, db_path: str | Path, *, read_connections: int = DEFAULT_READ_CONNECTIONS):
+        self.db_path = db_path
+        self.read_connections = max(1, read_connections)
+        # Timed so writer contention shows up in the query metrics.
+        self.write_lock = TimedLock(str(db_path))
+        self._writer: Optional[aiosqlite.Connection] = None
+        self._idle_readers: list[aiosqlite.Connection] = []
+        self._open_readers = 0
+        self._reader_slots = asyncio.Semaphore(self.read_connections)
+        self._references = 0
+        self._closed = False
+        self._user_change_listeners: list[Callable[[int], None]] = []
+
+    def add_user_change_listener(self, listener: Callable[[int], None]) -> None:
+        """Call ``listener(user_id)`` after any manager commits a change to a user."""
+        if listener not in self._user_change_listeners:
+            self._user_change_listeners.append(listener)
+
+    def remove_user_change_listener(self, listener: Callable[[int], None]) -> None:
+        if listener in self._user_change_listeners:
+            self._user_change_listeners.remove(listener)
+
+    def notify_user_changed(self, user_id: int) -> None:
+        for listener in list(self._user_change_listeners):
+            listener(user_id)
+
+    @property
+    def shares_memory_database(self) -> bool:
+        # Every ":memory:" connection is a separate database, so readers
+        # must go through the writer to see the same data.
+        return str(self.db_path) == ':memory:'
+
+    async def get_writer(self) -> aiosqlite.Connection:
+        """Return the writer connection; the caller must hold ``write_lock``."""
+        if self._closed:
+            raise RuntimeError(f"Connection pool for {self.db_path} is closed")
+        if self._writer is None:
+            self._writer = await connect_database(self.db_path)
+        return self._writer
+
+    @asynccontextmanager
+    async def writer(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Hold the writer for one unit of work.
+
+        Work that raises, or leaves a transaction open without committing, is
+        rolled back so the next holder starts from a clean connection — the
+        same outcome a short-lived connection used to get from closing.
+        """
+        async with self.write_lock:
+            db = await self.get_writer()
+            try:
+                yield db
+            except BaseException:
+                if db.in_transaction:
+                    await db.rollback()
+                raise
+            if db.in_transaction:
+                await db.rollback()
+
+    @asynccontextmanager
+    async def reader(self) -> AsyncIterator[aiosqlite.Connection]:
+        if self.shares_memory_database:
+            async with self.write_lock:
+                yield await self.get_writer()
+            return
+
+        async with self._reader_slots:
+            if self._closed:
+                raise RuntimeError(f"Connection pool for {self.db_path} is closed")
+            if self._idle_readers:
+                db = self._idle_readers.pop()
+            else:
+                db = await connect_database(self.db_path)
+                self._open_readers += 1
+            try:
+                yield db
+            except BaseException:
+                await self._discard_reader(db)
+                raise
+            if db.in_transaction:
+                await db.rollback()
+            if self._closed:
+                await self._discard_reader(db)
+            else:
+                self._idle_readers.append(db)
+
+    async def _discard_reader(self, db: aiosqlite.Connection) -> None:
+        self._open_readers -= 1
+        try:
+            await db.close()
+        except Exception:
+            logging.exception("Failed to close pooled reader for %s", self.db_path)
+
+    async def close(self) -> None:
+        self._closed = True
+        while self._idle_readers:
+            await self._discard_reader(self._idle_readers.pop())
+        async with self.write_lock:
+            if self._writer is not None:
+                await self._writer.close()
+                self._writer = None
+
+
+def acquire_connection_pool(db_path: str | Path) -> DatabaseConnectionPool:
+    """Return the shared pool for ``db_path`` and count one more user."""
+    key = _pool_key(db_path)
+    pool = _pools.get(key)
+    if pool is None or pool._closed:
+        pool = DatabaseConnectionPool(
+            db_path,
+            read_connections=_pool_settings['read_connections'],
+        )
+        _pools[key] = pool
+    pool._references += 1
+    return pool
+
+
+async def release_connection_pool(pool: DatabaseConnectionPool) -> None:
+    """Drop one user of ``pool``; the last one closes its connections."""
+    pool._references -= 1
+    if pool._references > 0:
+        return
+    key = _pool_key(pool.db_path)
+    if _pools.get(key) is pool:
+        del _pools[key]
+    await pool.close()
 
 
 class BaseDatabaseManager:
     """Lifecycle contract for database managers.
 
-    Most managers still open short-lived aiosqlite connections per method.
-    Managers migrated during P2-1 can opt into the persistent connection helper
-    below while the rest keep their existing behavior.
+    Managers share one :class:`DatabaseConnectionPool` per ``db_path``. Writes
+    run on the pool's single writer connection (``_write_connection`` or the
+    lower-level ``_get_persistent_connection_lock`` /
+    ``_get_persistent_connection`` pair), and read-only queries use
+    ``_read_connection`` so they do not queue behind writes.
     """
 
-    def _get_persistent_connection_lock(self) -> asyncio.Lock:
-        lock = getattr(self, "_persistent_connection_lock", None)
-        if lock is None:
-            lock = asyncio.Lock()
-            self._persistent_connection_lock = lock
-        return lock
-
-    async def _get_persistent_connection(self) -> aiosqlite.Connection:
-        connection = getattr(self, "_persistent_connection", None)
-        if connection is not None:
-            return connection
+    def _get_connection_pool(self) -> DatabaseConnectionPool:
+        pool = getattr(self, "_connection_pool", None)
+        if pool is not None:
+            return pool
 
         db_path = getattr(self, "db_path", None)
         if not db_path:
             raise RuntimeError(
-                f"{self.__class__.__name__} requires db_path for a persistent connection"
+                f"{self.__class__.__name__} requires db_path for a pooled connection"
             )
 
-        connection = await connect_database(db_path)
-        self._persistent_connection = connection
-        return connection
+        pool = acquire_connection_pool(db_path)
+        self._connection_pool = pool
+        return pool
+
+    def _get_persistent_connection_lock(self) -> asyncio.Lock:
+        return self._get_connection_pool().write_lock
+
+    async def _get_persistent_connection(self) -> aiosqlite.Connection:
+        return await self._get_connection_pool().get_writer()
+
+    def _write_connection(self):
+        return self._get_connection_pool().writer()
+
+    def _read_connection(self):
+        return self._get_connection_pool().reader()
+
+    def _notify_user_changed(self, user_id: int) -> None:
+        """Let managers caching per-user data from this file drop ``user_id``."""
+        self._get_connection_pool().notify_user_changed(user_id)
 
     async def close(self) -> None:
-        lock = getattr(self, "_persistent_connection_lock", None)
-        if lock is None:
-            connection = getattr(self, "_persistent_connection", None)
-            if connection is not None:
-                await connection.close()
-                self._persistent_connection = None
+        pool = getattr(self, "_connection_pool", None)
+        if pool is None:
             return
 
-        async with lock:
-            connection = getattr(self, "_persistent_connection", None)
-            if connection is not None:
-                await connection.close()
-                self._persistent_connection = None
+        self._connection_pool = None
+        await release_connection_pool(pool)
 
 
 def collect_database_managers_from_cogs(cogs: Iterable[Any]) -> list[BaseDatabaseManager]:
@@ -0,0 +1,492 @@
+"""Per-statement query metrics for every connection opened by the bot.
+
+:func:`bot.utils.db_connect.connect_database` returns an
+:class:`InstrumentedConnection`. aiosqlite funnels every statement and every
+fetch through ``Connection._execute``, so timing happens there, inside the
+connection's worker thread: a query's latency is the SQLite time spent
+executing it plus fetching its rows, without the time it queued behind other
+work on the same connection.
+
+Statements are grouped by template: literals are replaced by ``?`` and
+``IN (?, ?, ?)`` lists are collapsed, so the same query with different
+values or list lengths shares one entry. Each template keeps its call count,
+total and maximum time, rows returned (or changed, for writes), the most
+recent latencies for percentiles, and the time spent waiting for the pool's
+writer lock before it ran. Queries slower than ``slow_query_ms`` are logged.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Iterable, Optional
+
+import aiosqlite
+
+
+DEFAULT_SLOW_QUERY_MS = 200
+# Latencies kept per template for percentiles; older samples are dropped.
+SAMPLE_LIMIT = 2048
+
+_settings: dict[str, Any] = {
+    'enabled': True,
+    'slow_query_ms': DEFAULT_SLOW_QUERY_MS,
+}
+
+_STATEMENT_CALLS = {'execute', 'executemany', 'executescript', '_execute_insert', '_execute_fetchall'}
+_FETCH_CALLS = {'fetchone', 'fetchmany', 'fetchall'}
+
+# Called with (sql, parameters, origin) for every statement, before it runs;
+# origin is "path:line function" of the bot code that issued it.
+StatementListener = Callable[[str, Any, Optional[str]], None]
+_statement_listeners: list[StatementListener] = []
+
+_BOT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_PROJECT_ROOT = os.path.dirname(_BOT_ROOT)
+_INFRASTRUCTURE_FILES = {
+    os.path.join(_BOT_ROOT, 'utils', name)
+    for name in ('db_metrics.py', 'db_connect.py', 'db_lifecycle.py')
+}
+
+# Writer-lock wait of the current task, charged to the next statement it runs.
+_pending_lock_wait: ContextVar[float] = ContextVar('pending_lock_wait', default=0.0)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r'(?<![\w.])-?\d+(?:\.\d+)?\b')
+_PLACEHOLDER_LIST = re.compile(r'\?(?:\s*,\s*\?)+')
+_WHITESPACE = re.compile(r'\s+')
+
+
+def configure_query_metrics(settings: Optional[dict] = None) -> None:
+    """Apply ``main.database`` query metric settings."""
+    settings = settings or {}
+    _settings['enabled'] = bool(settings.get('query_metrics', True))
+    slow_query_ms = settings.get('slow_query_ms', DEFAULT_SLOW_QUERY_MS)
+    try:
+        _settings['slow_query_ms'] = max(0.0, float(slow_query_ms))
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"main.database.slow_query_ms must be a number, got {slow_query_ms!r}") from exc
+
+
+def add_statement_listener(listener: StatementListener) -> None:
+    """Observe every statement run through an instrumented connection."""
+    _statement_listeners.append(listener)
+
+
+def remove_statement_listener(listener: StatementListener) -> None:
+    if listener in _statement_listeners:
+        _statement_listeners.remove(listener)
+
+
+def _statement_origin() -> Optional[str]:
+    # The first public bot function on the stack, past private helpers such
+    # as _fetchall; falls back to the innermost bot frame.
+    origin = None
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = os.path.abspath(frame.f_code.co_filename)
+        if filename.startswith(_BOT_ROOT) and filename not in _INFRASTRUCTURE_FILES:
+            location = f"{os.path.relpath(filename, _PROJECT_ROOT)}:{frame.f_lineno} {frame.f_code.co_name}"
+            if not frame.f_code.co_name.startswith('_'):
+                return location
+            origin = origin or location
+        frame = frame.f_back
+    return origin
+
+
+@lru_cache(maxsize=4096)
+def normalize_sql(sql: str) -> str:
+    """Reduce a statement to its template."""
+    template = _STRING_LITERAL.sub('?', sql)
+    template = _NUMBER_LITERAL.sub('?', template)
+    template = _WHITESPACE.sub(' ', template).strip()
+    return _PLACEHOLDER_LIST.sub('?, ...', template)
+
+
+def _percentile(samples: Iterable[float], fraction: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+@dataclass(frozen=True)
+class QuerySummary:
+    template: str
+    count: int
+    errors: int
+    total_seconds: float
+    max_seconds: float
+    p50_seconds: float
+    p95_seconds: float
+    p99_seconds: float
+    rows: int
+    lock_wait_seconds: float
+    slow: int
+
+
+@dataclass(frozen=True)
+class LockWaitSummary:
+    database: str
+    acquisitions: int
+    contended: int
+    total_seconds: float
+    max_seconds: float
+    p95_seconds: float
+
+
+class _QueryStats:
+    __slots__ = ('count', 'errors', 'total_seconds', 'max_seconds', 'rows', 'lock_wait_seconds', 'slow', 'samples')
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.rows = 0
+        self.lock_wait_seconds = 0.0
+        self.slow = 0
+        self.samples: deque[float] = deque(maxlen=SAMPLE_LIMIT)
+
+
+class _LockStats:
+    __slots__ = ('acquisitions', 'contended', 'total_seconds', 'max_seconds', 'samples')
+
+    def __init__(self):
+        self.acquisitions = 0
+        self.contended = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.samples: deque[float] = deque(maxlen=SAMPLE_LIMIT)
+
+
+class QueryMetrics:
+    """Process-wide statement and writer-lock statistics.
+
+    Written from connection worker threads and read from the event loop, so
+    every access holds ``_lock``.
+    """
+
+    SORT_KEYS = {
+        'total': lambda summary: summary.total_seconds,
+        'p95': lambda summary: summary.p95_seconds,
+        'p99': lambda summary: summary.p99_seconds,
+        'count': lambda summary: summary.count,
+        'rows': lambda summary: summary.rows,
+        'lock_wait': lambda summary: summary.lock_wait_seconds,
+    }
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._queries: dict[str, _QueryStats] = {}
+        self._locks: dict[str, _LockStats] = {}
+        self.started_at = time.time()
+
+    def record_query(
+        self,
+        template: str,
+        seconds: float,
+        *,
+        rows: int = 0,
+        lock_wait: float = 0.0,
+        failed: bool = False,
+    ) -> None:
+        slow = seconds * 1000 >= _settings['slow_query_ms']
+        with self._lock:
+            stats = self._queries.get(template)
+            if stats is None:
+                stats = self._queries[template] = _QueryStats()
+            stats.count += 1
+            stats.errors += failed
+            stats.total_seconds += seconds
+            stats.max_seconds = max(stats.max_seconds, seconds)
+            stats.rows += rows
+            stats.lock_wait_seconds += lock_wait
+            stats.slow += slow
+            stats.samples.append(seconds)
+        if slow:
+            logging.warning(
+                f"Slow query ({seconds * 1000:.1f} ms, {rows} rows, "
+                f"writer lock wait {lock_wait * 1000:.1f} ms): {template}"
+            )
+
+    def record_lock_wait(self, database: str, seconds: float) -> None:
+        with self._lock:
+            stats = self._locks.get(database)
+            if stats is None:
+                stats = self._locks[database] = _LockStats()
+            stats.acquisitions += 1
+            stats.contended += seconds > 0
+            stats.total_seconds += seconds
+            stats.max_seconds = max(stats.max_seconds, seconds)
+            if seconds > 0:
+                stats.samples.append(seconds)
+
+    def top_queries(self, sort: str = 'total', limit: int = 10) -> list[QuerySummary]:
+        key = self.SORT_KEYS.get(sort)
+        if key is None:
+            raise ValueError(f"Unknown sort key {sort!r}; use one of {', '.join(self.SORT_KEYS)}")
+        with self._lock:
+            summaries = [
+                QuerySummary(
+                    template=template,
+                    count=stats.count,
+                    errors=stats.errors,
+                    total_seconds=stats.total_seconds,
+                    max_seconds=stats.max_seconds,
+                    p50_seconds=_percentile(stats.samples, 0.50),
+                    p95_seconds=_percentile(stats.samples, 0.95),
+                    p99_seconds=_percentile(stats.samples, 0.99),
+                    rows=stats.rows,
+                    lock_wait_seconds=stats.lock_wait_seconds,
+                    slow=stats.slow,
+                )
+                for template, stats in self._queries.items()
+            ]
+        summaries.sort(key=key, reverse=True)
+        return summaries[:max(0, limit)]
+
+    def lock_waits(self) -> list[LockWaitSummary]:
+        with self._lock:
+            return [
+                LockWaitSummary(
+                    database=database,
+                    acquisitions=stats.acquisitions,
+                    contended=stats.contended,
+                    total_seconds=stats.total_seconds,
+                    max_seconds=stats.max_seconds,
+                    p95_seconds=_percentile(stats.samples, 0.95),
+                )
+                for database, stats in sorted(self._locks.items())
+            ]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._queries.clear()
+            self._locks.clear()
+            self.started_at = time.time()
+
+
+query_metrics = QueryMetrics()
+
+
+class TimedLock(asyncio.Lock):
+    """``asyncio.Lock`` that records how long acquiring it had to wait."""
+
+    def __init__(self, name: str):
+        super().__init__()
+        self.name = name
+
+    async def acquire(self) -> bool:
+        if not self.locked():
+            await super().acquire()
+            waited = 0.0
+        else:
+            started = time.perf_counter()
+            await super().acquire()
+            waited = time.perf_counter() - started
+        if _settings['enabled']:
+            query_metrics.record_lock_wait(self.name, waited)
+            _pending_lock_wait.set(waited)
+        return True
+
+
+class _PendingQuery:
+    __slots__ = ('template', 'seconds', 'rows', 'lock_wait')
+
+    def __init__(self, template: str, seconds: float, lock_wait: float):
+        self.template = template
+        self.seconds = seconds
+        self.rows = 0
+        self.lock_wait = lock_wait
+
+
+class InstrumentedConnection(aiosqlite.Connection):
+    """aiosqlite connection that times statements in its worker thread.
+
+    A SELECT stays pending while its rows are fetched and is recorded once
+    the cursor is exhausted or closed, or when the connection runs its next
+    statement, so the latency covers the fetches too.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        # Only touched from this connection's worker thread.
+        self._pending_queries: dict[int, _PendingQuery] = {}
+
+    async def _execute(self, fn, *args, **kwargs):
+        name = getattr(fn, '__name__', '')
+        if _statement_listeners and name in _STATEMENT_CALLS and name != 'executescript' and args:
+            origin = _statement_origin()
+            parameters = args[1] if len(args) > 1 else ()
+            if name == 'executemany':
+                # Report one row of parameters; never consume a generator.
+                parameters = parameters[0] if isinstance(parameters, (list, tuple)) and parameters else None
+            for listener in list(_statement_listeners):
+                listener(args[0], parameters, origin)
+        if not _settings['enabled']:
+            return await super()._execute(fn, *args, **kwargs)
+        if name in _STATEMENT_CALLS:
+            lock_wait = _pending_lock_wait.get()
+            if lock_wait:
+                _pending_lock_wait.set(0.0)
+            return await super()._execute(self._run_statement, name, fn, lock_wait, args, kwargs)
+        if name in _FETCH_CALLS:
+            return await super()._execute(self._run_fetch, name, fn, args, kwargs)
+        if name == 'close':
+            return await super()._execute(self._run_close, fn)
+        return await super()._execute(fn, *args, **kwargs)
+
+    def _run_statement(self, name, fn, lock_wait, args, kwargs):
+        self._flush_pending()
+        sql = args[0] if args else kwargs.get('sql', kwargs.get('sql_script', ''))
+        template = normalize_sql(sql)
+        started = time.perf_counter()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception:
+            query_metrics.record_query(template, time.perf_counter() - started, lock_wait=lock_wait, failed=True)
+            raise
+        elapsed = time.perf_counter() - started
+
+        if name == '_execute_fetchall':
+            query_metrics.record_query(template, elapsed, rows=len(result), lock_wait=lock_wait)
+        elif name in ('execute', 'executemany') and result.description is not None:
+            self._pending_queries[id(result)] = _PendingQuery(template, elapsed, lock_wait)
+        else:
+            rowcount = getattr(result, 'rowcount', -1) if name != '_execute_insert' else 1
+            query_metrics.record_query(template, elapsed, rows=max(0, rowcount or 0), lock_wait=lock_wait)
+        return result
+
+    def _run_fetch(self, name, fn, args, kwargs):
+        cursor = getattr(fn, '__self__', None)
+        pending = self._pending_queries.get(id(cursor))
+        if pending is None:
+            return fn(*args, **kwargs)
+        started = time.perf_counter()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception:
+            self._flush_pending(id(cursor))
+            raise
+        pending.seconds += time.perf_counter() - started
+
+        if name == 'fetchone':
+            pending.rows += result is not None
+            exhausted = result is None
+        else:
+            pending.rows += len(result)
+            if name == 'fetchmany':
+                exhausted = len(result) < (args[0] if args else kwargs.get('size', cursor.arraysize))
+            else:
+                exhausted = True
+        if exhausted:
+            self._flush_pending(id(cursor))
+        return result
+
+    def _run_close(self, fn):
+        owner = getattr(fn, '__self__', None)
+        self._flush_pending(None if owner is self._connection else id(owner))
+        return fn()
+
+    def _flush_pending(self, cursor_id: Optional[int] = None) -> None:
+        if cursor_id is None:
+            pending = list(self._pending_queries.values())
+            self._pending_queries.clear()
+        else:
+            query = self._pending_queries.pop(cursor_id, None)
+            pending = [query] if query is not None else []
+        for query in pending:
+            query_metrics.record_query(query.template, query.seconds, rows=query.rows, lock_wait=query.lock_wait)
+
+
+class InstrumentationError(RuntimeError):
+    """aiosqlite no longer routes calls through the hooks InstrumentedConnection relies on."""
+
+
+class _InstrumentationProbe(InstrumentedConnection):
+    """Records the names aiosqlite passes to ``_execute``, without timing anything."""
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.seen: set[str] = set()
+
+    async def _execute(self, fn, *args, **kwargs):
+        self.seen.add(getattr(fn, '__name__', ''))
+        return await aiosqlite.Connection._execute(self, fn, *args, **kwargs)
+
+
+async def check_instrumentation() -> None:
+    """Raise InstrumentationError unless statements and fetches reach the hooks.
+
+    InstrumentedConnection overrides aiosqlite's private ``_execute`` and
+    recognizes calls by the names in ``_STATEMENT_CALLS`` and ``_FETCH_CALLS``.
+    An aiosqlite release that changes either would otherwise silently turn
+    off query metrics, the slow-query log and statement listeners.
+    """
+    probe = _InstrumentationProbe(lambda: sqlite3.connect(':memory:'), 64)
+    await probe
+    missing = []
+
+    def expect(step: str, names: set[str]) -> None:
+        if not probe.seen & names:
+            missing.append(f"{step} (saw {sorted(probe.seen) or 'no calls'})")
+        probe.seen.clear()
+
+    try:
+        cursor = await probe.execute('SELECT 1')
+        expect('execute', _STATEMENT_CALLS)
+        await cursor.fetchall()
+        expect('fetchall', _FETCH_CALLS)
+        await cursor.close()
+        probe.seen.clear()
+        await probe.execute_fetchall('SELECT 1')
+        expect('execute_fetchall', _STATEMENT_CALLS)
+    finally:
+        await probe.close()
+    if missing:
+        raise InstrumentationError(
+            f"aiosqlite {getattr(aiosqlite, '__version__', '?')} bypasses the query metric hooks for: "
+            f"{', '.join(missing)}. Install a supported aiosqlite version (see pyproject.toml) "
+            f"or update bot/utils/db_metrics.py."
+        )
+
+
+def format_query_report(sort: str = 'total', limit: int = 10, *, template_width: int = 160) -> str:
+    """Plain-text report of the top statements and writer-lock contention."""
+    summaries = query_metrics.top_queries(sort, limit)
+    started = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(query_metrics.started_at))
+    lines = [
+        f"Query metrics since {started} (slow threshold {_settings['slow_query_ms']:g} ms), "
+        f"top {len(summaries)} by {sort}:"
+    ]
+    for index, summary in enumerate(summaries, start=1):
+        template = summary.template
+        if len(template) > template_width:
+            template = template[:template_width - 3] + '...'
+        lines.append(
+            f"#{index} total {summary.total_seconds * 1000:.1f} ms | n={summary.count} | "
+            f"p50 {summary.p50_seconds * 1000:.2f} / p95 {summary.p95_seconds * 1000:.2f} / "
+            f"p99 {summary.p99_seconds * 1000:.2f} ms | rows {summary.rows} | "
+            f"lock wait {summary.lock_wait_seconds * 1000:.1f} ms | slow {summary.slow} | errors {summary.errors}"
+        )
+        lines.append(f"   {template}")
+    if not summaries:
+        lines.append("No statements recorded yet.")
+    for lock in query_metrics.lock_waits():
+        lines.append(
+            f"Writer lock {lock.database}: {lock.acquisitions} acquisitions, {lock.contended} contended, "
+            f"total wait {lock.total_seconds * 1000:.1f} ms, p95 {lock.p95_seconds * 1000:.2f} ms, "
+            f"max {lock.max_seconds * 1000:.1f} ms"
+        )
+    return '\n'.join(lines)
@@ -2,7 +2,6 @@ import aiosqlite
 import logging
 from typing import Any, Dict, List, Optional, Tuple
 
-from .db_connect import connect_database
 from .db_lifecycle import BaseDatabaseManager
 from .schema_migrations import (
     SchemaMigration,
@@ -49,7 +48,7 @@ class GiveawayDatabaseManager(BaseDatabaseManager):
         self.db_path = db_path
 
     async def initialize_database(self) -> None:
-        async with connect_database(self.db_path) as db:
+        async with self._write_connection() as db:
             await db.execute('''
                 CREATE TABLE IF NOT EXISTS giveaway (
                     giveaway_id INTEGER NOT NULL,
@@ -133,7 +132,7 @@ class GiveawayDatabaseManager(BaseDatabaseManager):
         image_filename=None,
         ui_version=1,
     ) -> None:
-        async with connect_database(self.db_path) as db:
+        async with self._write_connection() as db:
             await db.execute(
                 'INSERT INTO giveaway '
                 '(giveaway_id, message_id, starttime, duration, winner_number, '
@@ -149,7 +148,7 @@ class GiveawayDatabaseManager(BaseDatabaseManager):
             await db.commit()
 
     async def fetch_giveaway(self, giveaway_id) -> Optional[Dict[str, Any]]:
-        async with connect_database(self.db_path) as db:
+        async with self._read_connection() as db:
             cursor = await db.execute(
                 f"SELECT {', '.join(GIVEAWAY_COLUMNS)} FROM giveaway WHERE giveaway_id = ?",
                 (giveaway_id,),
@@ -182,7 +181,7 @@ class GiveawayDatabaseManager(BaseDatabaseManager):
         }
 
     async def fetch_all_giveaway_ids(self) -> List[str]:
-        async with connect_database(self.db_path) as db:
+        async with self._read_connection() as db:
             cursor = await db.execute('SELECT giveaway_id FROM giveaway')
             rows = await cursor.fetchall()
             await cursor.close()
@@ -196,7 +195,7 @@ class GiveawayDatabaseManager(BaseDatabaseManager):
             if include_ended
             else f'SELECT {column_sql} FROM giveaway WHERE is_end = 0'
         )
-        async with connect_database(self.db_path) as db:
+        async with self._read_connection() as db:
             cursor = await db.execute(query)
             records = await cursor.fetchall()
             await cursor.close()
@@ -204,7 +203,7 @@ class GiveawayDatabaseManager(BaseDatabaseManager):
 
     async def update_giveaway_winners(self, giveaway_id, winners: List) -> None:
         """Store winners (comma-joined) and mark ended."""
-        async with connect_database(self.db_path) as db:
+        async with self._write_connection() as db:
             await db.execute(
                 'UPDATE giveaway SET winner_ids = ?, is_end = 1 WHERE giveaway_id = ?',
                 (",".join(str(w) for w in winners), giveaway_id),
@@ -212,7 +211,7 @@ class GiveawayDatabaseManager(BaseDatabaseManager):
             await db.commit()
 
     async def mark_giveaway_as_ended(self, giveaway_id) -> None:
-        async with connect_database(self.db_path) as db:
+        async with self._write_connection() as db:
             await db.execute(
                 'UPDATE giveaway SET is_end = 1 WHERE giveaway_id = ?',
                 (giveaway_id,),
@@ -220,7 +219,7 @@ class GiveawayDatabaseManager(BaseDatabaseManager):
             await db.commit()
 
     async def update_giveaway_description(self, giveaway_id, new_description) -> None:
-        async with connect_database(self.db_path) as db:
+        async with self._write_connection() as db:
             await db.execute(
                 'UPDATE giveaway SET description = ? WHERE giveaway_id = ?',
                 (new_description, giveaway_id),
@@ -228,7 +227,7 @@ class GiveawayDatabaseManager(BaseDatabaseManager):
             await db.commit()
 
     async def update_giveaway_duration(self, giveaway_id, new_duration) -> None:
-        async with connect_database(self.db_path) as db:
+        async with self._write_connection() as db:
             await db.execute(
                 'UPDATE giveaway SET duration = ? WHERE giveaway_id = ?',
                 (new_duration, giveaway_id),
@@ -236,7 +235,7 @@ class GiveawayDatabaseManager(BaseDatabaseManager):
             await db.commit()
 
     async def update_giveaway_message_id(self, giveaway_id, message_id) -> None:
-        async with connect_database(self.db_path) as db:
+        async with self._write_connection() as db:
             await db.execute(
                 'UPDATE giveaway SET message_id = ? WHERE giveaway_id = ?',
                 (message_id, giveaway_id),
@@ -248,7 +247,7 @@ class GiveawayDatabaseManager(BaseDatabaseManager):
     # ------------------------------------------------------------------
 
     async def fetch_participant_ids(self, giveaway_id) -> List[str]:
-        async with connect_database(self.db_path) as db:
+        async with self._read_connection() as db:
             cursor = await db.execute(
                 'SELECT participant_ids FROM giveaway WHERE giveaway_id = ?',
                 (giveaway_id,),
@@ -265,7 +264,7 @@ class GiveawayDatabaseManager(BaseDatabaseManager):
         return str(participant_id) in participant_ids
 
     async def add_participant(self, giveaway_id, participant_id) -> None:
-        async with connect_database(self.db_path) as db:
+        async with self._write_connection() as db:
             cursor = await db.execute(
                 'SELECT participant_ids FROM giveaway WHERE giveaway_id = ?',
                 (giveaway_id,),
@@ -282,7 +281,7 @@ class GiveawayDatabaseManager(BaseDatabaseManager):
             await db.commit()
 
     async def remove_participant(self, giveaway_id, participant_id) -> None:
-        async with connect_database(self.db_path) as db:
+        async with self._write_connection() as db:
             cursor = await db.execute(
                 'SELECT participant_ids FROM giveaway WHERE giveaway_id = ?',
                 (giveaway_id,),
@@ -305,7 +304,7 @@ class GiveawayDatabaseManager(BaseDatabaseManager):
 
     async def fetch_winner_ids(self, giveaway_id) -> List[int]:
         """Winner rows may hold either raw ids or '<@id>' mentions; normalize to ints."""
-        async with connect_database(self.db_path) as db:
+        async with self._read_connection() as db:
             cursor = await db.execute(
                 'SELECT winner_ids FROM giveaway WHERE giveaway_id = ?',
                 (giveaway_id,),
@@ -325,7 +324,7 @@ class GiveawayDatabaseManager(BaseDatabaseManager):
         self, giveaway_id
     ) -> Optional[Tuple[int, int, int]]:
         """Return (reaction_req, message_req, timespent_req) or None if the giveaway is missing."""
-        async with connect_database(self.db_path) as db:
+        async with self._read_connection() as db:
             cursor = await db.execute(
                 'SELECT reaction_req, message_req, timespent_req '
                 'FROM giveaway WHERE giveaway_id = ?',
@@ -335,19 +334,6 @@ class GiveawayDatabaseManager(BaseDatabaseManager):
             await cursor.close()
         return record  # type: ignore[return-value]
 
-    async def fetch_user_achievements(
-        self, user_id
-    ) -> Optional[Tuple]:
-        """Return legacy achievement counters used for giveaway entry requirements."""
-        async with connect_database(self.db_path) as db:
-            cursor = await db.execute(
-                'SELECT * FROM achievements WHERE user_id = ?',
-                (user_id,),
-            )
-            record = await cursor.fetchone()
-            await cursor.close()
-        return record
-
     # ------------------------------------------------------------------
     # giveaway_views table
     # ------------------------------------------------------------------
@@ -355,7 +341,7 @@ class GiveawayDatabaseManager(BaseDatabaseManager):
     async def save_giveaway_view(
         self, giveaway_id, giveaway_channel_id, message_id
     ) -> None:
-        async with connect_database(self.db_path) as db:
+        async with self._write_connection() as db:
             await db.execute(
                 'REPLACE INTO giveaway_views (giveaway_id, giveaway_channel_id, message_id) '
                 'VALUES (?, ?, ?)',
@@ -364,7 +350,7 @@ class GiveawayDatabaseManager(BaseDatabaseManager):
             await db.commit()
 
     async def load_giveaway_views(self) -> List[Tuple[str, str, str]]:
-        async with connect_database(self.db_path) as db:
+        async with self._read_connection() as db:
             cursor = await db.execute(
                 'SELECT giveaway_id, giveaway_channel_id, message_id FROM giveaway_views'
             )
@@ -373,7 +359,7 @@ class GiveawayDatabaseManager(BaseDatabaseManager):
         return records
 
     async def cleanup_ended_giveaway_views(self) -> None:
-        async with connect_database(self.db_path) as db:
+        async with self._write_connection() as db:
             await db.execute('''
                 DELETE FROM giveaway_views
                 WHERE giveaway_id IN (
@@ -5,7 +5,6 @@ from typing import Any
 
 import aiosqlite
 
-from .db_connect import connect_database
 from .db_lifecycle import BaseDatabaseManager
 from .schema_migrations import SchemaMigration, add_column_if_missing, apply_schema_migrations
 
@@ -37,7 +36,7 @@ class InviteGuardDatabaseManager(BaseDatabaseManager):
         self.db_path = db_path
 
     async def initialize_database(self) -> None:
-        async with connect_database(self.db_path) as db:
+        async with self._write_connection() as db:
             await db.execute('''
                 CREATE TABLE IF NOT EXISTS invite_users (
                     guild_id INTEGER NOT NULL,
@@ -116,7 +115,7 @@ class InviteGuardDatabaseManager(BaseDatabaseManager):
         summary = InviteLinkSyncSummary(scanned=len(records))
         active_codes = {record.code for record in records}
 
-        async with connect_database(self.db_path) as db:
+        async with self._write_connection() as db:
             for record in records:
                 existing = await self._fetch_link_row(db, guild_id, record.code)
                 if existing is None:
@@ -216,7 +215,7 @@ class InviteGuardDatabaseManager(BaseDatabaseManager):
         record: InviteLinkRecord,
         now: str,
     ) -> None:
-        async with connect_database(self.db_path) as db:
+        async with self._write_connection() as db:
             existing = await self._fetch_link_row(db, guild_id, record.code)
             if existing is None:
                 await db.execute(
@@ -280,7 +279,7 @@ class InviteGuardDatabaseManager(BaseDatabaseManager):
             await db.commit()
 
     async def mark_invite_inactive(self, guild_id: int, code: str, now: str) -> None:
-        async with connect_database(self.db_path) as db:
+        async with self._write_connection() as db:
             await db.execute(
                 '''
                 UPDATE invite_links
@@ -292,7 +291,7 @@ class InviteGuardDatabaseManager(BaseDatabaseManager):
             await db.commit()
 
     async def record_member_join(self, guild_id: int, user_id: int, now: str) -> dict[str, Any]:
-        async with connect_database(self.db_path) as db:
+        async with self._write_connection() as db:
             await self._ensure_user_row(db, guild_id, user_id, now)
             await db.execute(
                 '''
@@ -309,7 +308,7 @@ class InviteGuardDatabaseManager(BaseDatabaseManager):
             return await self._get_user_record(db, guild_id, user_id)
 
     async def record_member_leave(self, guild_id: int, user_id: int, now: str) -> None:
-        async with connect_database(self.db_path) as db:
+        async with self._write_connection() as db:
             await self._ensure_user_row(db, guild_id, user_id, now)
             await db.execute(
                 '''
@@ -331,7 +330,7 @@ class InviteGuardDatabaseManager(BaseDatabaseManager):
         code: str,
         now: str,
     ) -> bool:
-        async with connect_database(self.db_path) as db:
+        async with self._write_connection() as db:
             await db.execute('BEGIN IMMEDIATE')
             await self._ensure_user_row(db, guild_id, user_id, now)
             await self._ensure_user_row(db, guild_id, inviter_id, now)
@@ -389,7 +388,7 @@ class InviteGuardDatabaseManager(BaseDatabaseManager):
         Returns False (and rolls back) if any member in the batch is already
         attribution_locked or has allow_reattribution disabled at read-back time.
         """
-        async with connect_database(self.db_path) as db:
+        async with self._write_connection() as db:
             await db.execute('BEGIN IMMEDIATE')
 
             for member_id in member_ids:
@@ -444,7 +443,7 @@ class InviteGuardDatabaseManager(BaseDatabaseManager):
         allow_reattribution: bool,
         now: str,
     ) -> bool:
-        async with connect_database(self.db_path) as db:
+        async with self._write_connection() as db:
             await self._ensure_user_row(db, guild_id, user_id, now)
             user_record = await self._get_user_record(db, guild_id, user_id)
             if int(user_record['attribution_locked'] or 0):
@@ -475,15 +474,15 @@ class InviteGuardDatabaseManager(BaseDatabaseManager):
             return True
 
     async def get_user(self, guild_id: int, user_id: int) -> dict[str, Any] | None:
-        async with connect_database(self.db_path) as db:
+        async with self._read_connection() as db:
             return await self._get_user_record(db, guild_id, user_id)
 
     async def get_invite_link(self, guild_id: int, code: str) -> dict[str, Any] | None:
-        async with connect_database(self.db_path) as db:
+        async with self._read_connection() as db:
             return await self._fetch_link_row(db, guild_id, code)
 
     async def get_leaderboard(self, guild_id: int, limit: int) -> list[dict[str, Any]]:
-        async with connect_database(self.db_path) as db:
+        async with self._read_connection() as db:
             cursor = await db.execute(
                 '''
                 SELECT
@@ -525,7 +524,7 @@ class InviteGuardDatabaseManager(BaseDatabaseManager):
         # Only reconciles invited_count (single-inviter attributed members). Pooled
         # attribution (pooled_count) has no per-member invited_by_user_id row to
         # recompute from by design, so it is intentionally excluded here.
-        async with connect_database(self.db_path) as db:
+        async with self._read_connection() as db:
             cursor = await db.execute(
                 '''
                 WITH actual_counts AS (
@@ -578,7 +577,7 @@ class InviteGuardDatabaseManager(BaseDatabaseManager):
         ]
 
     async def set_invite_ignored(self, guild_id: int, code: str, ignored: bool) -> bool:
-        async with connect_database(self.db_path) as db:
+        async with self._write_connection() as db:
             cursor = await db.execute(
                 '''
                 UPDATE invite_links
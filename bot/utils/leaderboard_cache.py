@@ -0,0 +1,135 @@
+"""In-memory leaderboards and rank indexes maintained from counter updates, and a TTL cache for rendered leaderboard pages and user profiles."""
+
+import time
+from bisect import bisect_left, bisect_right, insort
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+
+class TopNLeaderboard:
+    """The ``size`` highest positive values of one counter in one period.
+
+    Loaded from an ``ORDER BY ... DESC LIMIT size`` query and then kept
+    exact from the new totals of updated users: a user enters once they beat
+    the lowest entry, which is evicted. Counters normally only grow; when an
+    entry of a full board drops, someone outside the board could now be
+    ahead of it, so the board is marked stale and must be reloaded.
+    Ties are ordered by user ID.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self.stale = True
+        self._values: Dict[int, int] = {}
+
+    def load(self, rows: Iterable[Tuple[int, int]]) -> None:
+        self._values = {}
+        for user_id, value in rows:
+            if value and value > 0 and len(self._values) < self.size:
+                self._values[user_id] = value
+        self.stale = False
+
+    def invalidate(self) -> None:
+        self.stale = True
+        self._values = {}
+
+    @property
+    def full(self) -> bool:
+        return len(self._values) >= self.size
+
+    def update(self, user_id: int, value: int) -> None:
+        """Apply the new total of ``user_id``."""
+        if self.stale:
+            return
+        value = value or 0
+        current = self._values.get(user_id)
+        if current is not None:
+            if value >= current:
+                self._values[user_id] = value
+            elif self.full:
+                self.invalidate()
+            elif value > 0:
+                self._values[user_id] = value
+            else:
+                del self._values[user_id]
+            return
+
+        if value <= 0:
+            return
+        if not self.full:
+            self._values[user_id] = value
+            return
+        lowest = min(self._values, key=lambda entry: (self._values[entry], -entry))
+        if (value, -user_id) > (self._values[lowest], -lowest):
+            del self._values[lowest]
+            self._values[user_id] = value
+
+    def top(self, limit: int) -> List[Tuple[int, int]]:
+        ranked = sorted(self._values.items(), key=lambda entry: (-entry[1], entry[0]))
+        return ranked[:limit]
+
+
+class RankIndex:
+    """Every positive value of one counter in one period, kept sorted.
+
+    Answers "how many users are ahead of this value" with a binary search;
+    updates move one value within the sorted list.
+    """
+
+    def __init__(self):
+        self._values: Dict[int, int] = {}
+        self._sorted: List[int] = []
+
+    def load(self, rows: Iterable[Tuple[int, int]]) -> None:
+        self._values = {user_id: value for user_id, value in rows if value and value > 0}
+        self._sorted = sorted(self._values.values())
+
+    @property
+    def total(self) -> int:
+        return len(self._sorted)
+
+    def value(self, user_id: int) -> int:
+        return self._values.get(user_id, 0)
+
+    def update(self, user_id: int, value: int) -> None:
+        """Apply the new total of ``user_id``."""
+        current = self._values.pop(user_id, None)
+        if current is not None:
+            del self._sorted[bisect_left(self._sorted, current)]
+        if value and value > 0:
+            self._values[user_id] = value
+            insort(self._sorted, value)
+
+    def count_above(self, value: int) -> int:
+        return len(self._sorted) - bisect_right(self._sorted, value)
+
+
+class TTLCache:
+    """At most ``max_entries`` values, each kept for ``ttl`` seconds.
+
+    Every entry lives equally long, so when the cache is full the oldest one
+    is dropped first.
+    """
+
+    def __init__(self, ttl: float, max_entries: int = 256):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._entries[key]
+            return None
+        return entry[1]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        self._entries.pop(key, None)
+        while len(self._entries) >= self.max_entries:
+            self._entries.popitem(last=False)
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+
+    def pop(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
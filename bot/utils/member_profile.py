@@ -0,0 +1,86 @@
+"""Member stats shared by the role, giveaway and private room features.
+
+Every read goes through :meth:`AchievementDatabaseManager.get_user_profile`.
+When AchievementCog is loaded its manager is used, so the counts include
+buffered deltas and live voice time and share its profile cache. Without
+the cog, a short-lived manager on the configured database reads the stored
+stats.
+"""
+
+import logging
+from typing import Any, Dict, Optional
+
+from .achievement_db import ACHIEVEMENT_TYPE_COLUMNS, COUNTER_COLUMNS, AchievementDatabaseManager
+from .config import config
+from .log_helpers import fmt_user
+
+_EMPTY_COUNTS = {
+    'message_count': 0,
+    'reaction_count': 0,
+    'time_spent': 0,
+    'giveaway_count': 0,
+    'checkin_sum': 0,
+    'checkin_combo': 0,
+}
+
+
+async def _read_member_profile(
+    bot: Any,
+    user_id: int,
+    year: Optional[int],
+    month: Optional[int],
+) -> Dict[str, Dict[str, int]]:
+    achievement_cog = bot.get_cog('AchievementCog')
+    if achievement_cog is not None:
+        return await achievement_cog.db.get_user_profile(user_id, year, month)
+    manager = AchievementDatabaseManager(config.get_config('main')['db_path'])
+    try:
+        return await manager.get_user_profile(user_id, year, month)
+    finally:
+        await manager.close()
+
+
+async def get_member_profile(
+    bot: Any,
+    user_id: int,
+    year: Optional[int] = None,
+    month: Optional[int] = None,
+) -> Dict[str, Dict[str, int]]:
+    """Lifetime (``'total'``) and, for a month, ``'monthly'`` stats of a member.
+
+    Errors are logged and read as zero counts.
+    """
+    try:
+        return await _read_member_profile(bot, user_id, year, month)
+    except Exception as e:
+        logging.error("Error reading the profile of %s: %s", fmt_user(user_id), e)
+        profile = {'total': dict(_EMPTY_COUNTS)}
+        if year is not None:
+            profile['monthly'] = dict(_EMPTY_COUNTS)
+        return profile
+
+
+async def get_member_progress(bot: Any, user_id: int, achievement_type: str) -> Optional[int]:
+    """A member's lifetime count for an achievement type, voice time in minutes.
+
+    None if the stats could not be read, for a counter when the member has
+    not been counted for anything yet, and for types not counted per member.
+    """
+    column_name = ACHIEVEMENT_TYPE_COLUMNS.get(achievement_type, achievement_type)
+    try:
+        counts = (await _read_member_profile(bot, user_id, None, None))['total']
+    except Exception as e:
+        logging.error(
+            "Error getting achievement progress for %s, type %s: %s",
+            fmt_user(user_id),
+            achievement_type,
+            e,
+        )
+        return None
+    if column_name not in counts:
+        return None
+    if column_name in COUNTER_COLUMNS and not any(counts[column] for column in COUNTER_COLUMNS):
+        return None
+    if column_name == 'time_spent':
+        return counts['time_spent'] // 60
+    return counts[column_name]
@@ -3,7 +3,6 @@ import logging
 from datetime import datetime, timedelta, timezone
 from typing import Optional, Dict, List, Tuple, Any
 
-from .db_connect import connect_database
 from .db_lifecycle import BaseDatabaseManager
 from .log_helpers import fmt_user
 from .signature_cooldown import (
@@ -19,7 +18,7 @@ class RoleDatabaseManager(BaseDatabaseManager):
 
     async def initialize_database(self) -> None:
         """Create necessary role-related database tables if they don't exist."""
-        async with connect_database(self.db_path) as db:
+        async with self._write_connection() as db:
             # Role views tables for different role types
             await db.execute('''
                 CREATE TABLE IF NOT EXISTS role_views (
@@ -68,7 +67,7 @@ class RoleDatabaseManager(BaseDatabaseManager):
 
     async def save_role_view(self, message_id: int, channel_id: int, table: str = 'role_views') -> bool:
         """Save a role view message to the database."""
-        async with connect_database(self.db_path) as db:
+        async with self._write_connection() as db:
             try:
                 await db.execute(f'INSERT INTO {table} (message_id, channel_id) VALUES (?, ?)',
                                  (message_id, channel_id))
@@ -80,7 +79,7 @@ class RoleDatabaseManager(BaseDatabaseManager):
 
     async def remove_role_view(self, message_id: int, channel_id: int, table: str = 'role_views') -> bool:
         """Remove a role view message from the database."""
-        async with connect_database(self.db_path) as db:
+        async with self._write_connection() as db:
             try:
                 await db.execute(f'DELETE FROM {table} WHERE message_id = ? AND channel_id = ?',
                                  (message_id, channel_id))
@@ -92,7 +91,7 @@ class RoleDatabaseManager(BaseDatabaseManager):
 
     async def get_all_role_views(self, table: str = 'role_views') -> List[Tuple[int, int]]:
         """Get all role view messages from the database."""
-        async with connect_database(self.db_path) as db:
+        async with self._read_connection() as db:
             try:
                 cursor = await db.execute(f'SELECT message_id, channel_id FROM {table}')
                 return await cursor.fetchall()
@@ -100,85 +99,10 @@ class RoleDatabaseManager(BaseDatabaseManager):
                 logging.error(f"Error getting role views from {table}: {e}")
                 return []
 
-    async def get_user_achievement_progress(self, user_id: int, achievement_type: str) -> Optional[int]:
-        """Get user's progress for a specific achievement type."""
-        async with connect_database(self.db_path) as db:
-            try:
-                if achievement_type in ['checkin_sum', 'checkin_combo']:
-                    return await self._get_checkin_progress(user_id, achievement_type)
-                else:
-                    # Map achievement type to database column
-                    column_mapping = {
-                        'reaction': 'reaction_count',
-                        'message': 'message_count',
-                        'time_spent': 'time_spent',
-                    }
-                    column_name = column_mapping.get(achievement_type, achievement_type)
-                    
-                    cursor = await db.execute(f"SELECT {column_name} FROM achievements WHERE user_id = ?", (user_id,))
-                    result = await cursor.fetchone()
-                    
-                    if result and result[0] is not None:
-                        # Convert time_spent from seconds to minutes if needed
-                        if achievement_type == 'time_spent':
-                            return result[0] // 60
-                        return result[0]
-                    return None
-            except Exception as e:
-                logging.error(
-                    "Error getting achievement progress for %s, type %s: %s",
-                    fmt_user(user_id),
-                    achievement_type,
-                    e,
-                )
-                return None
-
-    async def _get_checkin_progress(self, user_id: int, checkin_type: str) -> Optional[int]:
-        """Get user's checkin progress from shop tables."""
-        async with connect_database(self.db_path) as db:
-            try:
-                if checkin_type == 'checkin_sum':
-                    cursor = await db.execute("SELECT COUNT(*) FROM shop_checkin_records WHERE user_id = ?", (user_id,))
-                    result = await cursor.fetchone()
-                    return result[0] if result else 0
-                elif checkin_type == 'checkin_combo':
-                    cursor = await db.execute("SELECT max_streak FROM shop_user_checkin WHERE user_id = ?", (user_id,))
-                    result = await cursor.fetchone()
-                    return result[0] if result else 0
-                return None
-            except Exception as e:
-                logging.error(
-                    "Error getting checkin progress for %s, type %s: %s",
-                    fmt_user(user_id),
-                    checkin_type,
-                    e,
-                )
-                return None
-
-    async def check_voice_time_requirement(self, user_id: int, required_time: int) -> Tuple[bool, int]:
-        """Check if user meets voice time requirement for signature feature."""
-        async with connect_database(self.db_path) as db:
-            try:
-                cursor = await db.execute(
-                    "SELECT time_spent FROM achievements WHERE user_id = ?",
-                    (user_id,)
-                )
-                result = await cursor.fetchone()
-
-                if not result or not result[0]:
-                    return False, 0
-
-                # Convert seconds to minutes
-                current_time = result[0] // 60
-                return current_time >= required_time, current_time
-            except Exception as e:
-                logging.error("Error checking voice time requirement for %s: %s", fmt_user(user_id), e)
-                return False, 0
-
     # Signature-related methods
     async def get_user_signature(self, user_id: int) -> Optional[Dict[str, Any]]:
         """Get user's signature information."""
-        async with connect_database(self.db_path) as db:
+        async with self._read_connection() as db:
             try:
                 cursor = await db.execute('''
                     SELECT signature, change_time1, change_time2, change_time3, is_disabled
@@ -202,7 +126,7 @@ class RoleDatabaseManager(BaseDatabaseManager):
 
     async def update_user_signature(self, user_id: int, signature: str, time_slot: int) -> bool:
         """Update user's signature and record the change time."""
-        async with connect_database(self.db_path) as db:
+        async with self._write_connection() as db:
             try:
                 current_time = datetime.now(timezone.utc).isoformat()
                 
@@ -307,7 +231,7 @@ class RoleDatabaseManager(BaseDatabaseManager):
 
     async def toggle_signature_permission(self, user_id: int, disable: bool) -> bool:
         """Toggle a user's signature permission."""
-        async with connect_database(self.db_path) as db:
+        async with self._write_connection() as db:
             try:
                 await db.execute('''
                     INSERT INTO user_signatures (user_id, is_disabled)
@@ -322,7 +246,7 @@ class RoleDatabaseManager(BaseDatabaseManager):
 
     async def clear_user_signature(self, user_id: int) -> bool:
         """Clear user's signature and change history."""
-        async with connect_database(self.db_path) as db:
+        async with self._write_connection() as db:
             try:
                 await db.execute('''
                     UPDATE user_signatures
@@ -1,4 +1,3 @@
-import asyncio
 import logging
 from collections import defaultdict
 from datetime import datetime, timedelta
@@ -6,8 +5,8 @@ from typing import Any, Dict, List, Optional, Tuple
 
 import aiosqlite
 
-from .db_connect import connect_database
 from .db_lifecycle import BaseDatabaseManager
+from .schema_migrations import SchemaMigration, apply_schema_migrations
 
 
 class ShopDatabaseManager(BaseDatabaseManager):
@@ -15,8 +14,6 @@ class ShopDatabaseManager(BaseDatabaseManager):
         self.db_path = db_path
         self.config = config or {}
         self.makeup_limit = self.config.get('makeup_checkin_limit_per_month', 3)
-        self._persistent_connection: Optional[aiosqlite.Connection] = None
-        self._persistent_connection_lock = asyncio.Lock()
 
     async def _execute_on_connection(
         self,
@@ -66,13 +63,11 @@ class ShopDatabaseManager(BaseDatabaseManager):
         sql: str,
         parameters: Tuple[Any, ...] = (),
     ) -> Optional[Tuple]:
-        async with self._get_persistent_connection_lock():
-            db = await self._get_persistent_connection()
+        async with self._read_connection() as db:
             return await self._fetchone_on_connection(db, sql, parameters)
 
     async def _fetchall(self, sql: str, parameters: Tuple[Any, ...] = ()) -> List[Tuple]:
-        async with self._get_persistent_connection_lock():
-            db = await self._get_persistent_connection()
+        async with self._read_connection() as db:
             return await self._fetchall_on_connection(db, sql, parameters)
 
     async def initialize_database(self) -> None:
@@ -149,11 +144,31 @@ class ShopDatabaseManager(BaseDatabaseManager):
                     )
                 ''')
 
+                await apply_schema_migrations(
+                    db,
+                    namespace='shop',
+                    migrations=[
+                        SchemaMigration(
+                            version=1,
+                            description='index check-in records by date',
+                            migrate=self._migrate_checkin_date_index,
+                        ),
+                    ],
+                )
                 await db.commit()
             except Exception:
                 await db.rollback()
                 raise
 
+    async def _migrate_checkin_date_index(self, db: aiosqlite.Connection) -> None:
+        # The primary key leads with user_id; monthly and daily check-in
+        # queries over all users filter on the date alone.
+        await self._execute_on_connection(
+            db,
+            'CREATE INDEX IF NOT EXISTS idx_shop_checkin_records_date '
+            'ON shop_checkin_records(checkin_date, user_id)',
+        )
+
     async def get_user_balance(self, user_id: int) -> int:
         """Get a user's current balance."""
         async with self._get_persistent_connection_lock():
@@ -290,6 +305,7 @@ class ShopDatabaseManager(BaseDatabaseManager):
                 ''', (user_id, today, now_timestamp, 0))
 
                 await db.commit()
+                self._notify_user_changed(user_id)
                 return {
                     "already_checked_in": False,
                     "last_checkin": today,
@@ -572,6 +588,7 @@ class ShopDatabaseManager(BaseDatabaseManager):
 
                 await self._recalculate_checkin_streak_on_connection(db, user_id)
                 await db.commit()
+                self._notify_user_changed(user_id)
                 return True
             except Exception:
                 await db.rollback()
@@ -623,6 +640,7 @@ class ShopDatabaseManager(BaseDatabaseManager):
             try:
                 await self._recalculate_checkin_streak_on_connection(db, user_id)
                 await db.commit()
+                self._notify_user_changed(user_id)
             except Exception:
                 await db.rollback()
                 raise
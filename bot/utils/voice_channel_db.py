@@ -1,10 +1,8 @@
 # bot/utils/voice_channel_db.py
-import asyncio
 from typing import Any, Dict, List, Optional, Tuple
 
 import aiosqlite
 
-from .db_connect import connect_database
 from .db_lifecycle import BaseDatabaseManager
 from .schema_migrations import (
     SchemaMigration,
@@ -34,8 +32,6 @@ class VoiceChannelDatabaseManager(BaseDatabaseManager):
 
     def __init__(self, db_path: str):
         self.db_path = db_path
-        self._persistent_connection: Optional[aiosqlite.Connection] = None
-        self._persistent_connection_lock = asyncio.Lock()
 
     async def _execute_write(self, sql: str, parameters: Tuple[Any, ...] = ()) -> None:
         async with self._get_persistent_connection_lock():
@@ -54,8 +50,7 @@ class VoiceChannelDatabaseManager(BaseDatabaseManager):
     async def _fetchone(
         self, sql: str, parameters: Tuple[Any, ...] = ()
     ) -> Optional[Tuple]:
-        async with self._get_persistent_connection_lock():
-            db = await self._get_persistent_connection()
+        async with self._read_connection() as db:
             cursor = await db.execute(sql, parameters)
             try:
                 return await cursor.fetchone()
@@ -63,8 +58,7 @@ class VoiceChannelDatabaseManager(BaseDatabaseManager):
                 await cursor.close()
 
     async def _fetchall(self, sql: str, parameters: Tuple[Any, ...] = ()) -> List[Tuple]:
-        async with self._get_persistent_connection_lock():
-            db = await self._get_persistent_connection()
+        async with self._read_connection() as db:
             cursor = await db.execute(sql, parameters)
             try:
                 return await cursor.fetchall()
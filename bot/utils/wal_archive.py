@@ -0,0 +1,450 @@
+"""Continuous backup by archiving WAL frames, and point-in-time restore.
+
+The archive lives in one directory per *generation*::
+
+    <archive>/<YYYYmmdd_HHMMSS>/base.db[.gz|.zst]
+    <archive>/<YYYYmmdd_HHMMSS>/segments/<seq>_<YYYYmmdd_HHMMSS_ffffff>.wal[.gz|.zst]
+
+A generation starts with a byte-for-byte copy of the main database file
+taken right after a complete checkpoint, so it keeps SQLCipher's per-file
+salt and WAL frames can be replayed onto it unchanged. Each archive pass then
+ships the frames committed since the previous pass as one segment and
+checkpoints them into the database.
+
+Both steps run while the archiver holds the database write lock (``BEGIN
+IMMEDIATE`` on its own connection), so no frame can be committed between
+being copied and being checkpointed. Bot connections must run with
+``wal_autocheckpoint = 0`` while archiving is enabled: SQLite may only reuse
+the WAL after a complete checkpoint, and only the archiver checkpoints, so
+no frame is overwritten before it has been shipped.
+
+Segment files hold ``SEGMENT_MAGIC``, the page size as a 4-byte big-endian
+integer, then one record per frame: page number, database size in pages for
+commit frames (else 0), both 4-byte big-endian, followed by the page image.
+Restoring replays whole transactions, so the restore point is the last
+archive pass at or before the requested time.
+
+Everything here blocks; call it from a worker thread.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import shutil
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, Optional
+
+from .db_backup import (
+    COMPRESSION_SUFFIXES,
+    DEFAULT_COMPRESSION,
+    BackupVerificationError,
+    compress_file,
+    compression_for_path,
+    open_backup_stream,
+    quick_check_database,
+    remove_database_files,
+    replace_database_file,
+    resolve_compression,
+    restore_backup,
+)
+from .db_connect import connect_database_sync
+
+
+DEFAULT_ARCHIVE_INTERVAL_SECONDS = 60
+DEFAULT_BASE_INTERVAL_HOURS = 24
+DEFAULT_KEEP_GENERATIONS = 7
+
+SEGMENT_MAGIC = b'BIRDWAL1'
+
+_WAL_HEADER_SIZE = 32
+_WAL_FRAME_HEADER_SIZE = 24
+_WAL_MAGIC_LITTLE_ENDIAN = 0x377F0682
+_WAL_MAGIC_BIG_ENDIAN = 0x377F0683
+_TIMESTAMP_FORMAT = '%Y%m%d_%H%M%S'
+_SEGMENT_TIMESTAMP_FORMAT = '%Y%m%d_%H%M%S_%f'
+
+
+def continuous_backup_enabled(backup_settings: Optional[dict]) -> bool:
+    continuous = (backup_settings or {}).get('continuous') or {}
+    return bool(continuous.get('enabled', False))
+
+
+@dataclass(frozen=True)
+class WalFrame:
+    page_number: int
+    # Database size in pages after this frame's transaction; 0 for frames
+    # that are not the last frame of a transaction.
+    commit_size: int
+    data: bytes
+
+
+@dataclass(frozen=True)
+class _WalPosition:
+    salts: tuple[int, int]
+    checkpoint_sequence: int
+    frames: int
+    checksum: tuple[int, int]
+
+
+@dataclass(frozen=True)
+class PointInTimeRestore:
+    path: Path
+    generation: Path
+    restored_to: datetime
+    segments: int
+    transactions: int
+    duration_seconds: float
+
+
+class WalArchiveGapError(RuntimeError):
+    """The WAL was reset without the archiver seeing all of its frames."""
+
+
+class WalArchiver:
+    """Ship committed WAL frames of one database into an archive directory."""
+
+    def __init__(
+        self,
+        db_path: str | Path,
+        archive_dir: str | Path,
+        *,
+        compression: str = DEFAULT_COMPRESSION,
+        keep_generations: int = DEFAULT_KEEP_GENERATIONS,
+    ):
+        self.db_path = Path(db_path)
+        self.wal_path = self.db_path.with_name(self.db_path.name + '-wal')
+        self.archive_dir = Path(archive_dir)
+        self.compression = resolve_compression(compression)
+        self.keep_generations = max(1, keep_generations)
+        self.generation: Optional[Path] = None
+        self.generation_started_at: Optional[datetime] = None
+        self._position: Optional[_WalPosition] = None
+        self._fully_checkpointed = False
+        self._next_segment = 0
+        self._lock_db = None
+        self._checkpoint_db = None
+        # Shutdown runs a final pass from the event loop thread while a
+        # scheduled pass may still be running in a worker thread.
+        self._lock = threading.Lock()
+
+    def start_generation(self, now: Optional[datetime] = None) -> Path:
+        """Write a new base snapshot and archive later frames against it."""
+        now = now or datetime.now()
+        generation = self.archive_dir / now.strftime(_TIMESTAMP_FORMAT)
+        (generation / 'segments').mkdir(parents=True, exist_ok=True)
+
+        with self._lock, self._write_locked():
+            self._checkpoint(require_complete=True)
+            # Nothing is left to backfill and nobody can commit, so the main
+            # file is exactly the committed state; frames still in the WAL
+            # are already part of it.
+            compress_file(
+                self.db_path,
+                generation / ('base.db' + COMPRESSION_SUFFIXES[self.compression]),
+                self.compression,
+            )
+            _, self._position = _read_committed_frames(self.wal_path, None)
+
+        self.generation = generation
+        self.generation_started_at = now
+        self._next_segment = 0
+        self._prune_generations()
+        logging.info(f"Started WAL archive generation {generation}")
+        return generation
+
+    def archive(self, now: Optional[datetime] = None) -> Optional[Path]:
+        """Ship frames committed since the last pass; returns the new segment."""
+        if self.generation is None:
+            raise RuntimeError("start_generation() must run before archive()")
+        now = now or datetime.now()
+
+        with self._lock, self._write_locked():
+            header = _read_wal_header(self.wal_path)
+            if header is not None and self._position is not None and header[1] != self._position.salts:
+                # The WAL was restarted. That is expected after a complete
+                # checkpoint by this archiver (the checkpoint sequence moves
+                # on by one); anything else means frames were lost.
+                expected = self._fully_checkpointed and header[2] == self._position.checkpoint_sequence + 1
+                if not expected:
+                    raise WalArchiveGapError(
+                        f"{self.wal_path} was reset outside the archiver; start a new generation"
+                    )
+                self._position = None
+
+            frames, position = _read_committed_frames(self.wal_path, self._position)
+            segment = None
+            if frames:
+                segment = self._write_segment(frames, now)
+            if position is not None:
+                self._position = position
+            self._checkpoint(require_complete=False)
+        return segment
+
+    def close(self) -> None:
+        with self._lock:
+            for connection in (self._lock_db, self._checkpoint_db):
+                if connection is not None:
+                    connection.close()
+            self._lock_db = None
+            self._checkpoint_db = None
+
+    @contextmanager
+    def _write_locked(self) -> Iterator[None]:
+        if self._lock_db is None:
+            self._lock_db = connect_database_sync(self.db_path, isolation_level=None, check_same_thread=False)
+        self._lock_db.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        finally:
+            self._lock_db.execute("ROLLBACK")
+
+    def _checkpoint(self, *, require_complete: bool) -> None:
+        if self._checkpoint_db is None:
+            self._checkpoint_db = connect_database_sync(
+                self.db_path, isolation_level=None, check_same_thread=False,
+            )
+        busy, log_frames, checkpointed = self._checkpoint_db.execute(
+            "PRAGMA wal_checkpoint(PASSIVE)"
+        ).fetchone()
+        if log_frames == -1:
+            raise RuntimeError(f"{self.db_path} is not in WAL mode; continuous backup needs journal_mode=WAL")
+        self._fully_checkpointed = log_frames == checkpointed
+        if require_complete and not self._fully_checkpointed:
+            raise RuntimeError(
+                f"Could not checkpoint all of {self.wal_path} ({checkpointed}/{log_frames} frames); "
+                "a long-running reader is holding an old snapshot"
+            )
+
+    def _write_segment(self, frames: list[WalFrame], now: datetime) -> Path:
+        name = f"{self._next_segment:08d}_{now.strftime(_SEGMENT_TIMESTAMP_FORMAT)}.wal"
+        segment = self.generation / 'segments' / (name + COMPRESSION_SUFFIXES[self.compression])
+        partial = segment.with_name(segment.name + '.partial')
+        page_size = len(frames[0].data)
+        try:
+            with open_backup_stream(partial, 'wb', self.compression) as writer:
+                writer.write(SEGMENT_MAGIC + struct.pack('>I', page_size))
+                for frame in frames:
+                    writer.write(struct.pack('>II', frame.page_number, frame.commit_size))
+                    writer.write(frame.data)
+            os.replace(partial, segment)
+        except BaseException:
+            partial.unlink(missing_ok=True)
+            raise
+        self._next_segment += 1
+        return segment
+
+    def _prune_generations(self) -> None:
+        generations = list_generations(self.archive_dir)
+        for generation in generations[:-self.keep_generations]:
+            shutil.rmtree(generation, ignore_errors=True)
+            logging.info(f"Deleted WAL archive generation outside retention: {generation}")
+
+
+def _wal_checksum(data: bytes, checksum: tuple[int, int], big_endian: bool) -> tuple[int, int]:
+    s0, s1 = checksum
+    word_format = '>II' if big_endian else '<II'
+    for first, second in struct.iter_unpack(word_format, data):
+        s0 = (s0 + first + s1) & 0xFFFFFFFF
+        s1 = (s1 + second + s0) & 0xFFFFFFFF
+    return s0, s1
+
+
+def _read_wal_header(wal_path: Path) -> Optional[tuple[int, tuple[int, int], int, tuple[int, int], bool]]:
+    """Return page size, salts, checkpoint sequence, checksum and byte order."""
+    try:
+        with open(wal_path, 'rb') as wal:
+            header = wal.read(_WAL_HEADER_SIZE)
+    except FileNotFoundError:
+        return None
+    if len(header) < _WAL_HEADER_SIZE:
+        return None
+    magic, _version, page_size, sequence, salt1, salt2, check1, check2 = struct.unpack('>8I', header)
+    if magic not in (_WAL_MAGIC_LITTLE_ENDIAN, _WAL_MAGIC_BIG_ENDIAN):
+        return None
+    big_endian = magic == _WAL_MAGIC_BIG_ENDIAN
+    if _wal_checksum(header[:24], (0, 0), big_endian) != (check1, check2):
+        return None
+    return page_size, (salt1, salt2), sequence, (check1, check2), big_endian
+
+
+def _read_committed_frames(
+    wal_path: Path,
+    position: Optional[_WalPosition],
+) -> tuple[list[WalFrame], Optional[_WalPosition]]:
+    """Read valid, committed frames after ``position`` (or from the start)."""
+    header = _read_wal_header(wal_path)
+    if header is None:
+        return [], position
+    page_size, salts, sequence, checksum, big_endian = header
+    frame_size = _WAL_FRAME_HEADER_SIZE + page_size
+
+    frame_index = 0
+    if position is not None and position.salts == salts:
+        frame_index = position.frames
+        checksum = position.checksum
+
+    frames: list[WalFrame] = []
+    committed: list[WalFrame] = []
+    committed_position = _WalPosition(salts, sequence, frame_index, checksum)
+    with open(wal_path, 'rb') as wal:
+        wal.seek(_WAL_HEADER_SIZE + frame_index * frame_size)
+        while True:
+            raw = wal.read(frame_size)
+            if len(raw) < frame_size:
+                break
+            page_number, commit_size, salt1, salt2, check1, check2 = struct.unpack('>6I', raw[:24])
+            if (salt1, salt2) != salts:
+                break
+            checksum = _wal_checksum(raw[:8], checksum, big_endian)
+            checksum = _wal_checksum(raw[24:], checksum, big_endian)
+            if checksum != (check1, check2):
+                break
+            frame_index += 1
+            frames.append(WalFrame(page_number, commit_size, raw[24:]))
+            if commit_size:
+                committed.extend(frames)
+                frames = []
+                committed_position = _WalPosition(salts, sequence, frame_index, checksum)
+    return committed, committed_position
+
+
+def list_generations(archive_dir: str | Path) -> list[Path]:
+    archive_dir = Path(archive_dir)
+    if not archive_dir.exists():
+        return []
+    generations = []
+    for path in archive_dir.iterdir():
+        if not path.is_dir():
+            continue
+        try:
+            datetime.strptime(path.name, _TIMESTAMP_FORMAT)
+        except ValueError:
+            continue
+        if _find_base(path) is not None:
+            generations.append(path)
+    return sorted(generations, key=lambda path: path.name)
+
+
+def _find_base(generation: Path) -> Optional[Path]:
+    for suffix in COMPRESSION_SUFFIXES.values():
+        candidate = generation / f'base.db{suffix}'
+        if candidate.exists():
+            return candidate
+    return None
+
+
+def _segment_time(segment: Path) -> datetime:
+    stamp = segment.name.split('.', 1)[0].split('_', 1)[1]
+    return datetime.strptime(stamp, _SEGMENT_TIMESTAMP_FORMAT)
+
+
+def _list_segments(generation: Path) -> list[Path]:
+    folder = generation / 'segments'
+    if not folder.exists():
+        return []
+    return sorted(
+        path for path in folder.iterdir()
+        if path.is_file() and '.partial' not in path.name
+    )
+
+
+def _iter_segment_frames(segment: Path) -> Iterator[WalFrame]:
+    with open_backup_stream(segment, 'rb', compression_for_path(segment)) as reader:
+        header = reader.read(len(SEGMENT_MAGIC) + 4)
+        if header[:len(SEGMENT_MAGIC)] != SEGMENT_MAGIC:
+            raise ValueError(f"{segment} is not a WAL archive segment")
+        page_size = struct.unpack('>I', header[len(SEGMENT_MAGIC):])[0]
+        while True:
+            record = reader.read(8)
+            if not record:
+                return
+            data = reader.read(page_size)
+            if len(record) < 8 or len(data) < page_size:
+                raise ValueError(f"{segment} is truncated")
+            page_number, commit_size = struct.unpack('>II', record)
+            yield WalFrame(page_number, commit_size, data)
+
+
+def restore_point_in_time(
+    archive_dir: str | Path,
+    destination: str | Path,
+    *,
+    until: Optional[datetime] = None,
+    overwrite: bool = False,
+) -> PointInTimeRestore:
+    """Rebuild the database as of ``until`` (default: the latest archive pass).
+
+    Picks the newest generation whose base snapshot is not after ``until``,
+    decompresses the base and replays every segment archived at or before
+    ``until``, one transaction at a time. The result is written next to
+    ``destination``, checked with ``PRAGMA quick_check`` and renamed into
+    place when complete.
+    """
+    started = time.perf_counter()
+    destination = Path(destination)
+    if destination.exists() and not overwrite:
+        raise FileExistsError(f"{destination} already exists; pass overwrite=True to replace it")
+
+    generations = list_generations(archive_dir)
+    if until is not None:
+        generations = [
+            generation for generation in generations
+            if datetime.strptime(generation.name, _TIMESTAMP_FORMAT) <= until
+        ]
+    if not generations:
+        raise FileNotFoundError(f"No WAL archive generation in {archive_dir} covers the requested time")
+    generation = generations[-1]
+    restored_to = datetime.strptime(generation.name, _TIMESTAMP_FORMAT)
+
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    partial = destination.with_name(destination.name + '.partial')
+    segments_applied = 0
+    transactions = 0
+    try:
+        restore_backup(_find_base(generation), partial, overwrite=True, verify=False)
+
+        with open(partial, 'r+b') as database:
+            pending: list[WalFrame] = []
+            for segment in _list_segments(generation):
+                segment_time = _segment_time(segment)
+                if until is not None and segment_time > until:
+                    break
+                for frame in _iter_segment_frames(segment):
+                    pending.append(frame)
+                    if not frame.commit_size:
+                        continue
+                    page_size = len(frame.data)
+                    for page in pending:
+                        database.seek((page.page_number - 1) * page_size)
+                        database.write(page.data)
+                    database.truncate(frame.commit_size * page_size)
+                    pending = []
+                    transactions += 1
+                segments_applied += 1
+                restored_to = segment_time
+            database.flush()
+            os.fsync(database.fileno())
+
+        verification = quick_check_database(partial)
+        if not verification.ok:
+            raise BackupVerificationError(f"Restored database failed quick_check: {verification.detail}")
+        replace_database_file(partial, destination)
+    except BaseException:
+        remove_database_files(partial)
+        raise
+
+    return PointInTimeRestore(
+        path=destination,
+        generation=generation,
+        restored_to=restored_to,
+        segments=segments_applied,
+        transactions=transactions,
+        duration_seconds=time.perf_counter() - started,
+    )
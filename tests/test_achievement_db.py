@@ -1,6 +1,10 @@
 import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
 
+from bot.utils import member_profile
 from bot.utils.achievement_db import AchievementDatabaseManager
+from bot.utils.db_metrics import add_statement_listener, remove_statement_listener
 from bot.utils.shop_db import ShopDatabaseManager
 
 
@@ -71,3 +75,609 @@ def test_achievement_counts_leaderboards_voice_and_shop_interop(tmp_path):
             await shop.close()
 
     asyncio.run(scenario())
+
+
+def test_counter_updates_are_buffered_merged_on_read_and_flushed_on_close(tmp_path):
+    async def scenario():
+        db_path = str(tmp_path / "achievement.db")
+        config = {"counter_flush": {"interval_seconds": 3600, "max_pending": 3}}
+        achievements = AchievementDatabaseManager(db_path, config)
+        await achievements.initialize_database()
+
+        assert await achievements.update_achievement_count(10, "message", 2) is True
+        assert await achievements.update_achievement_count(10, "message", 1) is True
+        assert await achievements.update_monthly_achievement_count(10, "message", 3, 2026, 4) is True
+        assert await achievements.update_achievement_count(10, "unknown", 1) is False
+        assert achievements.pending_counter_keys() == 2
+
+        row = await achievements._fetchone(
+            "SELECT message_count FROM achievements WHERE user_id = ?", (10,)
+        )
+        assert row is None
+        assert (await achievements.get_user_achievements(10))["message_count"] == 3
+        assert (await achievements.get_monthly_achievements(10, 2026, 4))["message_count"] == 3
+
+        # Reaching max_pending flushes everything in one transaction.
+        assert await achievements.update_achievement_count(20, "reaction", 4) is True
+        assert achievements.pending_counter_keys() == 0
+        assert await achievements._fetchone(
+            "SELECT message_count FROM achievements WHERE user_id = ?", (10,)
+        ) == (3,)
+
+        assert await achievements.update_achievement_count(20, "reaction", 1) is True
+        assert await achievements.get_leaderboard("reaction") == [(20, 5)]
+        assert await achievements.update_monthly_achievement_count(20, "time_spent", 60, 2026, 4) is True
+        await achievements.close()
+
+        reopened = AchievementDatabaseManager(db_path)
+        try:
+            monthly = await reopened.get_monthly_achievements(20, 2026, 4)
+            assert monthly["time_spent"] == 60
+        finally:
+            await reopened.close()
+
+    asyncio.run(scenario())
+
+
+def test_voice_sessions_are_in_memory_and_checkpointed_with_their_time(tmp_path):
+    async def scenario():
+        db_path = str(tmp_path / "achievement.db")
+        config = {"counter_flush": {"interval_seconds": 3600, "max_pending": 500}}
+        achievements = AchievementDatabaseManager(db_path, config)
+        await achievements.initialize_database()
+        start = datetime(2026, 4, 30, 23, 0, tzinfo=timezone.utc)
+
+        assert await achievements.start_voice_session(10, 100, now=start) is True
+        assert await achievements.start_voice_session(20, 100, now=start) is True
+        # A repeated start (e.g. a reconnect) keeps the original start time.
+        assert await achievements.start_voice_session(10, 100, now=start + timedelta(minutes=5)) is True
+        assert await achievements.get_active_voice_sessions(10) == [(100, start.isoformat())]
+        assert await achievements._fetchall("SELECT user_id FROM voice_channel_entries") == []
+
+        assert await achievements.flush_pending_counts() is True
+        assert sorted(await achievements._fetchall("SELECT user_id FROM voice_channel_entries")) == [(10,), (20,)]
+
+        assert await achievements.end_voice_session(10, 100, now=start + timedelta(minutes=30)) == 1800
+        assert await achievements.end_voice_session(10, 100) == 0
+        assert (await achievements.get_user_achievements(10))["time_spent"] == 1800
+        assert (await achievements.get_monthly_achievements(10, 2026, 4))["time_spent"] == 1800
+        assert await achievements.flush_pending_counts() is True
+        assert await achievements._fetchall("SELECT user_id FROM voice_channel_entries") == [(20,)]
+
+        # Simulate a crash: a new manager resumes the checkpointed session.
+        resumed = AchievementDatabaseManager(db_path, config)
+        await resumed.initialize_database()
+        try:
+            assert await resumed.get_active_voice_sessions(20) == [(100, start.isoformat())]
+            assert await resumed.cleanup_invalid_voice_sessions([]) is True
+            assert await resumed.get_active_voice_sessions(20) == []
+            assert await resumed._fetchall("SELECT user_id FROM voice_channel_entries") == []
+            assert (await resumed.get_user_achievements(20))["time_spent"] == 0
+        finally:
+            await resumed.close()
+            await achievements.close()
+
+    asyncio.run(scenario())
+
+
+
+def test_open_voice_sessions_count_in_reads_and_split_at_month_end(tmp_path):
+    async def scenario():
+        db_path = str(tmp_path / "achievement.db")
+        achievements = AchievementDatabaseManager(db_path)
+        await achievements.initialize_database()
+        try:
+            now = datetime.now(timezone.utc)
+            assert await achievements.update_achievement_count(10, "time_spent", 3000) is True
+            assert await achievements.update_achievement_count(20, "time_spent", 600) is True
+            # User 30 has no stored time at all; user 20 is in two channels.
+            assert await achievements.start_voice_session(20, 100, now=now - timedelta(hours=1)) is True
+            assert await achievements.start_voice_session(20, 200, now=now - timedelta(minutes=10)) is True
+            assert await achievements.start_voice_session(30, 100, now=now - timedelta(minutes=20)) is True
+
+            live_20 = (await achievements.get_user_achievements(20))["time_spent"]
+            assert 600 + 3600 + 600 <= live_20 <= 600 + 3600 + 600 + 5
+
+            leaderboard = await achievements.get_leaderboard("time_spent", limit=2)
+            assert [user_id for user_id, _ in leaderboard] == [20, 10]
+            assert (await achievements.get_leaderboard("time_spent"))[-1][0] == 30
+            assert await achievements.get_user_rank(10, "time_spent") == (2, 3)
+            assert await achievements.get_user_rank(30, "time_spent") == (3, 3)
+            assert await achievements._fetchall("SELECT time_spent FROM achievements WHERE user_id = 20") == [(600,)]
+
+            monthly = await achievements.get_monthly_leaderboard(now.year, now.month, "time_spent")
+            assert [user_id for user_id, _ in monthly][:1] == [20]
+            assert await achievements.get_monthly_voice_seconds(30, now.year, now.month) >= 1200
+
+            # A session across the end of April is credited to both months.
+            start = datetime(2026, 4, 30, 23, 0, tzinfo=timezone.utc)
+            end = datetime(2026, 5, 1, 0, 30, tzinfo=timezone.utc)
+            assert await achievements.start_voice_session(40, 100, now=start) is True
+            assert achievements.live_voice_seconds(40, 2026, 4, now=end) == 3600
+            assert achievements.live_voice_seconds(40, 2026, 5, now=end) == 1800
+            assert await achievements.end_voice_session(40, 100, now=end) == 5400
+            assert (await achievements.get_monthly_achievements(40, 2026, 4))["time_spent"] == 3600
+            assert (await achievements.get_monthly_achievements(40, 2026, 5))["time_spent"] == 1800
+            assert (await achievements.get_user_achievements(40))["time_spent"] == 5400
+        finally:
+            await achievements.close()
+
+    asyncio.run(scenario())
+
+
+def test_leaderboards_are_served_from_memory_and_follow_manual_changes(tmp_path):
+    seen = []
+
+    def listener(sql, parameters, origin):
+        seen.append(sql)
+
+    async def scenario():
+        db_path = str(tmp_path / "achievement.db")
+        config = {"counter_flush": {"interval_seconds": 3600}, "leaderboard_cache": {"size": 3}}
+        achievements = AchievementDatabaseManager(db_path, config)
+        await achievements.initialize_database()
+        try:
+            for user_id, count in ((1, 50), (2, 40), (3, 30), (4, 20)):
+                await achievements.update_achievement_count(user_id, "message", count)
+                await achievements.update_monthly_achievement_count(user_id, "message", count, 2026, 4)
+            assert await achievements.flush_pending_counts() is True
+
+            add_statement_listener(listener)
+            try:
+                assert await achievements.get_leaderboard("message", 3) == [(1, 50), (2, 40), (3, 30)]
+                assert not seen
+            finally:
+                remove_statement_listener(listener)
+
+            # A month outside the startup window is loaded on first use.
+            assert await achievements.get_monthly_leaderboard("2026", "04", "message", 2) == [(1, 50), (2, 40)]
+
+            await achievements.update_achievement_count(4, "message", 25)
+            assert await achievements.get_leaderboard("message", 3) == [(1, 50), (4, 45), (2, 40)]
+            await achievements.update_monthly_achievement_count(3, "message", 30, 2026, 4)
+            assert await achievements.get_monthly_leaderboard(2026, 4, "message", 2) == [(3, 60), (1, 50)]
+
+            assert await achievements.apply_manual_changes(5, {"message_count": 100}, "increase") is True
+            assert (await achievements.get_leaderboard("message", 2)) == [(5, 100), (1, 50)]
+            assert await achievements.apply_manual_changes(5, {"message_count": 95}, "decrease") is True
+            assert await achievements.get_leaderboard("message", 3) == [(1, 50), (4, 45), (2, 40)]
+            # Larger requests than the board size still come from SQLite.
+            assert [user_id for user_id, _ in await achievements.get_leaderboard("message", 10)] == [1, 4, 2, 3, 5]
+        finally:
+            await achievements.close()
+
+    asyncio.run(scenario())
+
+
+def test_leaderboard_boards_break_ties_by_user_id_like_keyset_pages(tmp_path):
+    async def scenario():
+        db_path = str(tmp_path / "achievement.db")
+        achievements = AchievementDatabaseManager(db_path, {"leaderboard_cache": {"size": 3}})
+        await achievements.initialize_database()
+        try:
+            for user_id in (5, 4, 3, 2, 1, 6):
+                score = 20 if user_id == 6 else 10
+                await achievements.update_achievement_count(user_id, "message", score)
+                await achievements.update_monthly_achievement_count(user_id, "message", score, 2026, 4)
+            await achievements.flush_pending_counts()
+            achievements._leaderboards.clear()
+
+            for period in ({}, {"year": 2026, "month": 4}):
+                if period:
+                    first = await achievements.get_monthly_leaderboard(2026, 4, "message", 3)
+                else:
+                    first = await achievements.get_leaderboard("message", 3)
+                assert first == [(6, 20), (1, 10), (2, 10)]
+                rest = await achievements.get_leaderboard_page("message", 5, (10, 2), **period)
+                assert rest == [(3, 10), (4, 10), (5, 10)]
+
+            async with achievements._read_connection() as db:
+                cursor = await db.execute(
+                    "EXPLAIN QUERY PLAN SELECT user_id, message_count FROM achievements "
+                    "WHERE message_count > 0 ORDER BY message_count DESC, user_id LIMIT ?",
+                    (3,),
+                )
+                plan = " ".join(row[-1] for row in await cursor.fetchall())
+                await cursor.close()
+            assert "TEMP B-TREE" not in plan
+        finally:
+            await achievements.close()
+
+    asyncio.run(scenario())
+
+
+def test_user_rank_falls_back_to_sql_until_the_rank_index_is_loaded(tmp_path):
+    seen = []
+
+    def listener(sql, parameters, origin):
+        seen.append(sql)
+
+    async def scenario():
+        db_path = str(tmp_path / "achievement.db")
+        achievements = AchievementDatabaseManager(db_path, {"counter_flush": {"interval_seconds": 3600}})
+        await achievements.initialize_database()
+        try:
+            for user_id, count in ((1, 50), (2, 40), (3, 40), (4, 10)):
+                await achievements.update_achievement_count(user_id, "reaction", count)
+                await achievements.update_monthly_achievement_count(user_id, "reaction", count, 2026, 4)
+
+            assert await achievements.get_user_rank(3, "reaction") == (2, 4)
+            assert await achievements.get_user_rank(4, "reaction", 2026, 4) == (4, 4)
+            await asyncio.gather(*achievements._rank_index_loads.values())
+
+            add_statement_listener(listener)
+            try:
+                assert await achievements.get_user_rank(3, "reaction") == (2, 4)
+                assert await achievements.get_user_rank(99, "reaction") == (5, 4)
+                assert await achievements.get_user_rank(4, "reaction", "2026", "04") == (4, 4)
+                assert not seen
+            finally:
+                remove_statement_listener(listener)
+
+            await achievements.update_achievement_count(4, "reaction", 45)
+            await achievements.update_monthly_achievement_count(4, "reaction", 35, 2026, 4)
+            assert await achievements.get_user_rank(4, "reaction") == (1, 4)
+            assert await achievements.get_user_rank(4, "reaction", 2026, 4) == (2, 4)
+            assert await achievements.apply_manual_changes(4, {"reaction_count": 55}, "decrease") is True
+            assert await achievements.get_user_rank(4, "reaction") == (4, 3)
+            assert await achievements.get_user_rank(1, "reaction") == (1, 3)
+        finally:
+            await achievements.close()
+
+    asyncio.run(scenario())
+
+
+def test_only_the_most_recently_read_months_stay_cached(tmp_path):
+    async def scenario():
+        db_path = str(tmp_path / "achievement.db")
+        achievements = AchievementDatabaseManager(db_path, {"leaderboard_cache": {"months": 2}})
+        await achievements.initialize_database()
+        try:
+            for month in (1, 2, 3):
+                await achievements.update_monthly_achievement_count(1, "message", month, 2026, month)
+
+            def cached_months():
+                return {
+                    (year, month)
+                    for _, year, month in [*achievements._leaderboards, *achievements._rank_indexes]
+                }
+
+            assert await achievements.get_monthly_leaderboard(2026, 1, "message") == [(1, 1)]
+            await achievements.get_user_rank(1, "message", 2026, 2)
+            await asyncio.gather(*achievements._rank_index_loads.values())
+            assert cached_months() == {(None, None), (2026, 1), (2026, 2)}
+
+            assert await achievements.get_monthly_leaderboard(2026, 3, "message") == [(1, 3)]
+            assert cached_months() == {(None, None), (2026, 2), (2026, 3)}
+            assert ("message_count", 2026, 2) in achievements._rank_indexes
+
+            # An evicted month is loaded again on the next read.
+            assert await achievements.get_monthly_leaderboard(2026, 1, "message") == [(1, 1)]
+            assert await achievements.get_user_rank(1, "message", 2026, 1) == (1, 1)
+            assert cached_months() == {(None, None), (2026, 3), (2026, 1)}
+        finally:
+            await achievements.close()
+
+    asyncio.run(scenario())
+
+
+def test_monthly_checkin_combo_leaderboard_is_set_based_and_cached_per_month(tmp_path):
+    seen = []
+
+    def listener(sql, parameters, origin):
+        seen.append(" ".join(sql.split()))
+
+    async def scenario():
+        db_path = str(tmp_path / "achievement.db")
+        achievements = AchievementDatabaseManager(db_path)
+        shop = ShopDatabaseManager(db_path)
+        await achievements.initialize_database()
+        await shop.initialize_database()
+        try:
+            days = {
+                1: [1, 2, 3, 7, 8],
+                2: [4, 5, 6, 7, 10, 11, 12, 13, 14],
+                3: [30],
+                4: [20, 22, 24],
+            }
+            async with shop._write_connection() as db:
+                await db.executemany(
+                    "INSERT INTO shop_checkin_records (user_id, checkin_date, checkin_timestamp) VALUES (?, ?, ?)",
+                    [
+                        (user_id, f"2026-04-{day:02d}", "2026-04-01T00:00:00")
+                        for user_id, user_days in days.items()
+                        for day in user_days
+                    ] + [(1, "2026-05-01", "2026-05-01T00:00:00"), (3, "2026-03-31", "2026-03-31T00:00:00")],
+                )
+                await db.commit()
+
+            expected = [(2, 5), (1, 3), (3, 1), (4, 1)]
+            assert await achievements.get_monthly_checkin_leaderboard(2026, 4, "checkin_combo", 10) == expected
+            for user_id, combo in expected:
+                assert (await achievements.get_monthly_checkin_data(user_id, 2026, 4))["checkin_combo"] == combo
+
+            add_statement_listener(listener)
+            try:
+                assert await achievements.get_monthly_checkin_leaderboard("2026", "04", "checkin_combo", 2) == expected[:2]
+                assert not any("ROW_NUMBER" in sql for sql in seen)
+
+                # A makeup check-in into the month invalidates its ranking.
+                async with shop._write_connection() as db:
+                    await db.execute(
+                        "INSERT INTO shop_checkin_records (user_id, checkin_date, checkin_timestamp, is_makeup) "
+                        "VALUES (4, '2026-04-21', '2026-05-02T00:00:00', 1)"
+                    )
+                    await db.commit()
+                assert await achievements.get_monthly_checkin_leaderboard(2026, 4, "checkin_combo", 3) == [(2, 5), (1, 3), (4, 3)]
+                assert any("ROW_NUMBER" in sql for sql in seen)
+            finally:
+                remove_statement_listener(listener)
+        finally:
+            await achievements.close()
+            await shop.close()
+
+    asyncio.run(scenario())
+
+
+def test_daily_rollups_answer_date_ranges_and_compact_into_months(tmp_path):
+    async def scenario():
+        achievements = AchievementDatabaseManager(
+            str(tmp_path / "achievement.db"),
+            {"daily_rollup": {"retention_days": 30}},
+        )
+        await achievements.initialize_database()
+        try:
+            def at(day, hour=12):
+                return datetime(2026, 1, day, hour, tzinfo=timezone.utc)
+
+            await achievements.update_achievement_count(1, "message", 2, now=at(10))
+            await achievements.update_achievement_count(1, "message", 1, now=at(20))
+            await achievements.update_achievement_count(2, "message", 4, now=at(20))
+            # 23:00 -> 01:00 is split across two days.
+            await achievements.start_voice_session(3, 100, now=at(14, 23))
+            await achievements.end_voice_session(3, 100, now=at(15, 1))
+
+            def days(first, last):
+                return datetime(2026, 1, first).date(), datetime(2026, 1, last).date()
+
+            assert await achievements.get_range_leaderboard("message", *days(10, 11)) == [(1, 2)]
+            assert await achievements.get_range_leaderboard("message", *days(10, 21)) == [(2, 4), (1, 3)]
+            assert await achievements.get_range_leaderboard("time_spent", *days(15, 16)) == [(3, 3600)]
+            assert await achievements.get_range_leaderboard("time_spent", *days(14, 16)) == [(3, 7200)]
+            assert await achievements.get_range_leaderboard("giveaway_count", *days(1, 31)) == []
+
+            # Open sessions count for the part inside the range.
+            await achievements.start_voice_session(4, 100, now=at(16, 0))
+            live = achievements._live_voice_in_range(*days(16, 17), now=at(16, 6))
+            assert live == {4: 6 * 3600}
+            await achievements.end_voice_session(4, 100, now=at(16, 6))
+
+            assert await achievements.compact_daily_achievements(today=datetime(2026, 2, 15).date()) == 0
+            assert await achievements.compact_daily_achievements(today=datetime(2026, 3, 15).date()) == 1
+            rows = await achievements._fetchall(
+                "SELECT day, user_id, message_count, time_spent FROM daily_achievements ORDER BY user_id"
+            )
+            assert rows == [
+                ("2026-01-01", 1, 3, 0),
+                ("2026-01-01", 2, 4, 0),
+                ("2026-01-01", 3, 0, 7200),
+                ("2026-01-01", 4, 0, 6 * 3600),
+            ]
+            # A compacted month counts when the range includes its first day.
+            assert await achievements.get_range_leaderboard("message", *days(1, 2)) == [(2, 4), (1, 3)]
+            assert await achievements.get_range_leaderboard("message", *days(10, 21)) == []
+            assert await achievements.compact_daily_achievements(today=datetime(2026, 3, 15).date()) == 0
+        finally:
+            await achievements.close()
+
+    asyncio.run(scenario())
+
+
+def test_leaderboard_pages_walk_every_period_by_keyset(tmp_path):
+    async def scenario():
+        db_path = str(tmp_path / "achievement.db")
+        achievements = AchievementDatabaseManager(db_path, {"leaderboard_cache": {"size": 5}})
+        shop = ShopDatabaseManager(db_path)
+        await achievements.initialize_database()
+        await shop.initialize_database()
+        try:
+            day = datetime(2026, 4, 10, 12, tzinfo=timezone.utc)
+            # Scores 60, 59, ... with pairs of ties to cross page boundaries.
+            for user_id in range(1, 121):
+                score = 61 - (user_id + 1) // 2
+                await achievements.update_achievement_count(user_id, "message", score, now=day)
+                await achievements.update_monthly_achievement_count(user_id, "message", score, 2026, 4)
+            expected = sorted(
+                ((user_id, 61 - (user_id + 1) // 2) for user_id in range(1, 121)),
+                key=lambda row: (-row[1], row[0]),
+            )
+
+            async def walk(**period):
+                rows, after = [], None
+                while True:
+                    page = await achievements.get_leaderboard_page("message", 7, after, **period)
+                    rows += page
+                    if len(page) < 7:
+                        return rows
+                    after = (page[-1][1], page[-1][0])
+
+            assert await walk() == expected
+            assert await walk(year=2026, month="04") == expected
+            assert await walk(start=day.date(), end=day.date() + timedelta(days=1)) == expected
+            assert await achievements.get_leaderboard_page("message", 3, (59, 3)) == [(4, 59), (5, 58), (6, 58)]
+
+            async with shop._write_connection() as db:
+                await db.executemany(
+                    "INSERT INTO shop_checkin_records (user_id, checkin_date, checkin_timestamp) VALUES (?, ?, ?)",
+                    [(7, "2026-04-01", "t"), (7, "2026-04-02", "t"), (8, "2026-04-01", "t"), (9, "2026-03-31", "t")],
+                )
+                await db.commit()
+            assert await achievements.get_leaderboard_page("checkin_sum", 2) == [(7, 2), (8, 1)]
+            assert await achievements.get_leaderboard_page("checkin_sum", 2, (1, 8)) == [(9, 1)]
+            assert await achievements.get_leaderboard_page("checkin_sum", 5, year=2026, month=4) == [(7, 2), (8, 1)]
+            assert await achievements.get_leaderboard_page("checkin_combo", 5, (2, 7), year=2026, month=4) == [(8, 1)]
+
+            # Users in voice are ranked by stored plus live time.
+            await achievements.update_achievement_count(1, "time_spent", 100)
+            await achievements.update_achievement_count(2, "time_spent", 90)
+            await achievements.update_achievement_count(3, "time_spent", 80)
+            await achievements.start_voice_session(3, 100, now=datetime.now(timezone.utc) - timedelta(seconds=15))
+            await achievements.start_voice_session(4, 100, now=datetime.now(timezone.utc) - timedelta(seconds=50))
+            first = await achievements.get_leaderboard_page("time_spent", 2, (100, 1))
+            assert [user_id for user_id, _ in first] == [3, 2]
+            rest = await achievements.get_leaderboard_page("time_spent", 5, (first[-1][1], first[-1][0]))
+            assert [user_id for user_id, _ in rest] == [4]
+
+            async with achievements._read_connection() as db:
+                cursor = await db.execute(
+                    "EXPLAIN QUERY PLAN SELECT user_id, message_count AS score FROM monthly_achievements "
+                    "WHERE year = ? AND month = ? AND message_count > 0 "
+                    "AND message_count <= ? AND (message_count < ? OR user_id > ?) "
+                    "ORDER BY score DESC, user_id LIMIT ?",
+                    (2026, 4, 30, 30, 5, 10),
+                )
+                plan = " ".join(row[-1] for row in await cursor.fetchall())
+                await cursor.close()
+            assert "idx_monthly_achievements_message_count" in plan
+            assert "TEMP B-TREE" not in plan
+        finally:
+            await achievements.close()
+            await shop.close()
+
+    asyncio.run(scenario())
+
+
+def test_user_profile_is_one_cached_query_invalidated_by_writes(tmp_path):
+    seen = []
+
+    def listener(sql, parameters, origin):
+        seen.append(sql)
+
+    async def scenario():
+        db_path = str(tmp_path / "achievement.db")
+        config = {"counter_flush": {"interval_seconds": 3600}}
+        achievements = AchievementDatabaseManager(db_path, config)
+        shop = ShopDatabaseManager(db_path)
+        await achievements.initialize_database()
+        try:
+            # Without the shop tables nobody has checked in.
+            assert (await achievements.get_user_achievements(10))["checkin_sum"] == 0
+            await shop.initialize_database()
+            achievements.invalidate_user_profile(10)
+
+            await achievements.update_achievement_count(10, "message", 4)
+            await achievements.update_monthly_achievement_count(10, "message", 4, 2026, 4)
+            await achievements.flush_pending_counts()
+            async with shop._write_connection() as db:
+                await db.executemany(
+                    "INSERT INTO shop_checkin_records (user_id, checkin_date, checkin_timestamp) VALUES (?, ?, ?)",
+                    [(10, "2026-04-01", "t"), (10, "2026-04-02", "t"), (10, "2026-04-04", "t"), (10, "2026-05-01", "t")],
+                )
+                await db.execute("INSERT INTO shop_user_checkin (user_id, max_streak) VALUES (10, 3)")
+                await db.commit()
+
+            add_statement_listener(listener)
+            try:
+                profile = await achievements.get_user_profile(10, 2026, 4)
+                assert len(seen) == 1
+                assert profile["total"]["message_count"] == 4
+                assert (profile["total"]["checkin_sum"], profile["total"]["checkin_combo"]) == (4, 3)
+                assert profile["monthly"]["message_count"] == 4
+                assert (profile["monthly"]["checkin_sum"], profile["monthly"]["checkin_combo"]) == (3, 2)
+
+                # Cached: buffered deltas are merged without a query.
+                await achievements.update_achievement_count(10, "message", 2)
+                assert (await achievements.get_user_achievements(10))["message_count"] == 6
+                assert (await achievements.get_monthly_achievements(10, 2026, 4))["message_count"] == 4
+                assert len(seen) == 2
+
+                # A flush drops the entry, so the next read queries again.
+                await achievements.flush_pending_counts()
+                seen.clear()
+                assert (await achievements.get_user_achievements(10))["message_count"] == 6
+                assert len(seen) == 1
+            finally:
+                remove_statement_listener(listener)
+
+            assert await achievements.apply_manual_changes(10, {"message_count": 1}, "decrease") is True
+            assert (await achievements.get_user_achievements(10))["message_count"] == 5
+        finally:
+            await achievements.close()
+            await shop.close()
+
+    asyncio.run(scenario())
+
+
+def test_member_profile_reads_through_the_achievement_cog_or_the_stored_stats(tmp_path, monkeypatch):
+    async def scenario():
+        db_path = str(tmp_path / "achievement.db")
+        monkeypatch.setattr(member_profile.config, "get_config", lambda name=None: {"db_path": db_path})
+        achievements = AchievementDatabaseManager(db_path, {"counter_flush": {"interval_seconds": 3600}})
+        await achievements.initialize_database()
+        try:
+            await achievements.update_achievement_count(10, "message", 4)
+            await achievements.flush_pending_counts()
+            await achievements.update_achievement_count(10, "message", 2)
+
+            cogs = {"AchievementCog": SimpleNamespace(db=achievements)}
+            bot = SimpleNamespace(get_cog=cogs.get)
+            assert await member_profile.get_member_progress(bot, 10, "message") == 6
+            assert await member_profile.get_member_progress(bot, 10, "checkin_sum") == 0
+            # Nobody counted yet, and unreadable stats, give no progress at all.
+            assert await member_profile.get_member_progress(bot, 11, "message") is None
+
+            async def broken_profile(user_id, year=None, month=None):
+                raise RuntimeError("database is locked")
+
+            cogs["AchievementCog"] = SimpleNamespace(db=SimpleNamespace(get_user_profile=broken_profile))
+            assert await member_profile.get_member_progress(bot, 10, "message") is None
+            assert (await member_profile.get_member_profile(bot, 10))["total"]["message_count"] == 0
+
+            # Without the cog a standalone manager reads the stored counts.
+            cogs.clear()
+            assert await member_profile.get_member_progress(bot, 10, "message") == 4
+            profile = await member_profile.get_member_profile(bot, 10, 2026, 4)
+            assert profile["monthly"]["message_count"] == 0
+
+            # The profile cache listens for check-ins once, from initialize_database.
+            pool = achievements._get_connection_pool()
+            assert pool._user_change_listeners == [achievements.invalidate_user_profile]
+        finally:
+            await achievements.close()
+
+    asyncio.run(scenario())
+
+
+def test_bulk_changes_apply_in_one_transaction_with_one_log_entry(tmp_path):
+    async def scenario():
+        achievements = AchievementDatabaseManager(str(tmp_path / "achievement.db"))
+        await achievements.initialize_database()
+        try:
+            await achievements.update_achievement_count(1, "message", 5)
+            await achievements.flush_pending_counts()
+            assert await achievements.get_leaderboard("message", 2) == [(1, 5)]
+
+            adjustments = [
+                (user_id, {"message_count": 3, "reaction_count": 0, "time_spent": 60})
+                for user_id in range(1, 10_001)
+            ]
+            batch_id = await achievements.apply_bulk_changes(99, adjustments, "increase")
+            assert batch_id
+
+            assert (await achievements.get_user_achievements(1))["message_count"] == 8
+            assert (await achievements.get_user_achievements(10_000))["time_spent"] == 60
+            assert await achievements.get_leaderboard("message", 2) == [(1, 8), (2, 3)]
+
+            operations = await achievements.get_all_operations()
+            assert len(operations) == 1
+            operator, target, operation, messages, reactions, time_spent, _, _, users = operations[0]
+            assert (operator, target, operation) == (99, 0, "bulk_increase")
+            assert (messages, reactions, time_spent, users) == (30_000, 0, 600_000, 10_000)
+
+            await achievements.apply_bulk_changes(99, adjustments[:1], "decrease")
+            assert (await achievements.get_user_achievements(1))["message_count"] == 5
+            assert sorted(row[8] for row in await achievements.get_all_operations()) == [1, 10_000]
+        finally:
+            await achievements.close()
+
+    asyncio.run(scenario())
@@ -0,0 +1,39 @@
+import pytest
+
+from bot.utils.achievement_import import AdjustmentImportError, parse_adjustments
+
+
+def test_parse_adjustments_merges_users_and_defaults_missing_columns():
+    text = "\ufeffuser_id,messages,time_spent\n10,5,60\n\n20,,30\n10,1,0\n"
+
+    assert parse_adjustments(text) == [
+        (10, {"message_count": 6, "reaction_count": 0, "time_spent": 60}),
+        (20, {"message_count": 0, "reaction_count": 0, "time_spent": 30}),
+    ]
+
+
+def test_parse_adjustments_reports_every_bad_row():
+    text = "user_id,reactions\nabc,1\n10,-2\n11\n12,3\n"
+
+    with pytest.raises(AdjustmentImportError) as excinfo:
+        parse_adjustments(text)
+
+    assert excinfo.value.errors == [
+        "Line 2: invalid user_id",
+        "Line 3: reactions must be a non-negative integer",
+        "Line 4: expected 2 values, got 1",
+    ]
+
+
+@pytest.mark.parametrize(
+    "text, error",
+    [
+        ("messages\n5\n", "Header row must contain user_id"),
+        ("user_id,points\n1,2\n", "Unknown columns: points"),
+        ("user_id\n1\n", "Header row needs one of: messages, reactions, time_spent"),
+        ("user_id,messages\n", "No rows to import"),
+    ],
+)
+def test_parse_adjustments_rejects_unusable_files(text, error):
+    with pytest.raises(AdjustmentImportError, match=error):
+        parse_adjustments(text)
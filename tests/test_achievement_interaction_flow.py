@@ -1,15 +1,18 @@
 import asyncio
+from datetime import datetime
 from types import SimpleNamespace
 
 import discord
 
 from bot.cogs.achievement import views as achievement_views
+from bot.cogs.achievement.cog import AchievementCog
 from bot.cogs.achievement.views import (
     AchievementRefreshView,
     ConfirmationView,
     RankView,
     resolve_achievement_avatar_url,
 )
+from bot.utils.leaderboard_cache import TTLCache
 
 
 ACHIEVEMENT_TEXT = {
@@ -18,13 +21,19 @@ ACHIEVEMENT_TEXT = {
         "{user_mention} completed {completed_achievements}/{total_achievements}"
     ),
     "achievements.achievements_finish_emoji": "✅",
+    "achievements.achievements_progress_title": "Progress {date}",
+    "achievements.achievements_rank_line": "Ranks: {ranks}",
+    "achievements.achievements_rank_entry": "{type_name} #{rank}/{total}",
     "achievements.rank.all_button_label": "All",
     "achievements.achievements_ranking_title": "Rankings",
     "achievements.rank.embed_title_single": "Rank: {type_name}",
     "achievements.rank.embed_title_date_format": "{title} ({year}-{month})",
+    "achievements.rank.embed_title_range_format": "{title} ({start} ~ {end})",
     "achievements.rank.no_data_message": "No data",
     "achievements.rank.rank_prefix": "#{rank}",
     "achievements.rank.pagination_field_name": "{start}-{end}",
+    "achievements.rank.previous_page_label": "Previous",
+    "achievements.rank.next_page_label": "Next",
 }
 
 
@@ -76,8 +85,10 @@ class FakeMessage:
 
 
 class FakeAchievementCog:
-    def __init__(self, *, hidden_types=None):
+    def __init__(self, *, hidden_types=None, db=None):
         self.hidden_types = hidden_types or set()
+        self.db = db
+        self.rank_pages = TTLCache(60)
 
     def is_achievement_type_visible(self, achievement_type):
         return achievement_type not in self.hidden_types
@@ -107,6 +118,21 @@ class FakeAchievementCog:
         }
 
 
+class FakeRankDB:
+    def __init__(self, rankings):
+        self.rankings = rankings
+        self.calls = []
+        self.periods = []
+
+    async def get_leaderboard_page(self, achievement_type, limit, after=None, **period):
+        self.calls.append((achievement_type, limit, after))
+        self.periods.append(period)
+        rows = self.rankings.get(achievement_type, [])
+        if after is not None:
+            rows = [row for row in rows if (-row[1], row[0]) > (-after[0], after[1])]
+        return rows[:limit]
+
+
 class FakeBot:
     def __init__(self, achievement_cog):
         self.achievement_cog = achievement_cog
@@ -232,6 +258,9 @@ def test_achievement_page_uses_components_v2_native_separators(monkeypatch):
             def get_achievement_count_value(self, user_achievements, achievement_type):
                 return user_achievements[achievement_type]
 
+            def get_visible_achievement_type_names(self):
+                return {"reaction": "Reactions", "message": "Messages"}
+
         class PageBot:
             user = SimpleNamespace(
                 avatar=SimpleNamespace(url="https://example.com/bot-avatar.png"),
@@ -256,6 +285,10 @@ def test_achievement_page_uses_components_v2_native_separators(monkeypatch):
             async def get_user_achievements(self, user_id):
                 return {"reaction": 10, "message": 5}
 
+            async def get_user_rank(self, user_id, achievement_type, year=None, month=None):
+                # Unranked members come back one past the last place.
+                return {"reaction": (3, 40), "message": (41, 40)}[achievement_type]
+
         view = AchievementRefreshView(PageBot(), 123, PageDB())
         await view.format_page()
 
@@ -273,6 +306,7 @@ def test_achievement_page_uses_components_v2_native_separators(monkeypatch):
             if component["type"] == 14
         )
         assert "Achievements: Tester" in components[0]["components"][0]["content"]
+        assert components[0]["components"][0]["content"].endswith("Ranks: Reactions #3/40")
         assert components[0]["accessory"]["media"]["url"] == (
             "https://example.com/user-avatar.png"
         )
@@ -282,6 +316,48 @@ def test_achievement_page_uses_components_v2_native_separators(monkeypatch):
     asyncio.run(scenario())
 
 
+def test_monthly_achievement_page_shows_monthly_ranks(monkeypatch):
+    async def scenario():
+        _install_achievement_config(monkeypatch)
+
+        class MonthlyAchievementCog:
+            def get_visible_achievement_type_names(self):
+                return {"reaction": "Reactions", "time_spent": "Voice"}
+
+            def get_monthly_progress_items(self, user_achievements):
+                return [("reaction", 4), ("time_spent", 2)]
+
+        class MonthlyDB:
+            def __init__(self):
+                self.ranks = []
+
+            async def get_monthly_achievements(self, user_id, year, month):
+                return {"reaction_count": 4, "message_count": 0, "time_spent": 120}
+
+            async def get_user_rank(self, user_id, achievement_type, year=None, month=None):
+                self.ranks.append((achievement_type, year, month))
+                return 2, 9
+
+        class MonthlyBot(FakeBot):
+            async def fetch_user(self, user_id):
+                return SimpleNamespace(
+                    id=user_id,
+                    name="Tester",
+                    mention=f"<@{user_id}>",
+                    display_avatar=SimpleNamespace(url="https://example.com/avatar.png"),
+                )
+
+        db = MonthlyDB()
+        view = AchievementRefreshView(MonthlyBot(MonthlyAchievementCog()), 123, db)
+        embed = await view.format_page_monthly("2026-03")
+
+        assert db.ranks == [("reaction", 2026, 3), ("time_spent", 2026, 3)]
+        assert embed.description == "Ranks: Reactions #2/9 · Voice #2/9"
+        assert [field.value for field in embed.fields] == ["4", "2"]
+
+    asyncio.run(scenario())
+
+
 def test_achievement_avatar_fallback_order():
     user = SimpleNamespace(
         avatar=SimpleNamespace(url="user-avatar"),
@@ -329,14 +405,12 @@ def test_rank_type_button_keeps_underscored_time_spent_type(monkeypatch):
     async def scenario():
         _install_achievement_config(monkeypatch)
         events = []
-        bot = FakeBot(FakeAchievementCog())
-        view = RankView(
-            bot,
-            all_rankings={
-                "message": [(101, 12)],
-                "time_spent": [(101, 900), (102, 120)],
-            },
-        )
+        db = FakeRankDB({
+            "message": [(101, 12)],
+            "time_spent": [(101, 900), (102, 120)],
+        })
+        bot = FakeBot(FakeAchievementCog(db=db))
+        view = RankView(bot)
         interaction = FakeInteraction(
             data={"custom_id": "type_time_spent"},
             events=events,
@@ -353,20 +427,130 @@ def test_rank_type_button_keeps_underscored_time_spent_type(monkeypatch):
         assert embed.fields[0].name == "1-2"
         assert "<@101> - 15" in embed.fields[0].value
         assert "<@102> - 2" in embed.fields[0].value
+        assert db.calls == [("time_spent", RankView.PAGE_SIZE + 1, None)]
+        assert view.next_button.disabled and view.previous_button.disabled
 
     asyncio.run(scenario())
 
 
+def test_rank_pages_are_fetched_lazily_by_keyset_and_cached(monkeypatch):
+    async def scenario():
+        _install_achievement_config(monkeypatch)
+        monkeypatch.setattr(RankView, "PAGE_SIZE", 2)
+        db = FakeRankDB({"message": [(101, 9), (102, 7), (103, 7), (104, 1)]})
+        cog = FakeAchievementCog(db=db)
+        view = RankView(FakeBot(cog))
+
+        await view.type_button_callback(FakeInteraction(data={"custom_id": "type_message"}, events=[]))
+        assert not view.next_button.disabled
+        await view.next_page(FakeInteraction(events=[]))
+
+        assert db.calls == [("message", 3, None), ("message", 3, (7, 102))]
+        assert view.next_button.disabled and not view.previous_button.disabled
+
+        # Another panel on the same period reuses the rendered pages.
+        other = RankView(FakeBot(cog))
+        await other.type_button_callback(FakeInteraction(data={"custom_id": "type_message"}, events=[]))
+        second = FakeInteraction(events=[])
+        await other.next_page(second)
+        assert len(db.calls) == 2
+        assert second.original_edits[0]["embed"].fields[0].name == "3-4"
+        assert other.next_button.disabled
+
+        # The all-rankings page asks for the top rows of each category.
+        await other.all_button_callback(FakeInteraction(events=[]))
+        assert db.calls[2:] == [
+            ("message", 3, None),
+            ("time_spent", 3, None),
+            ("checkin_sum", 3, None),
+            ("checkin_combo", 3, None),
+        ]
+
+    asyncio.run(scenario())
+
+
+def test_rank_date_range_is_parsed_inclusive_and_shown_in_titles(monkeypatch):
+    _install_achievement_config(monkeypatch)
+    start, end = AchievementCog.parse_rank_range("2026-04-01", "2026-04-07")
+    assert (start.isoformat(), end.isoformat()) == ("2026-04-01", "2026-04-07")
+    assert AchievementCog.parse_rank_range("2026-04-07", "2026-04-01") == (None, None)
+    assert AchievementCog.parse_rank_range("2026-04-31", None) == (None, None)
+    assert AchievementCog.parse_rank_range(None, "2026-04-01") == (None, None)
+    assert AchievementCog.parse_rank_range("2026-04-01", None)[1] is not None
+
+    db = FakeRankDB({})
+    view = RankView(FakeBot(FakeAchievementCog(db=db)), start=start, end=end)
+
+    assert asyncio.run(view.format_all_rankings_embed()).title == "Rankings (2026-04-01 ~ 2026-04-07)"
+    assert asyncio.run(view.format_single_type_embed("message")).title == "Rank: Messages (2026-04-01 ~ 2026-04-07)"
+    # The inclusive end is passed on as an exclusive bound.
+    assert db.periods[-1]["end"].isoformat() == "2026-04-08"
+
+
+def test_rank_refuses_ranges_starting_in_compacted_months():
+    sent = []
+
+    class Followup:
+        async def send(self, content, *, ephemeral=False):
+            sent.append((content, ephemeral))
+
+    cog = object.__new__(AchievementCog)
+    cog.db = SimpleNamespace(daily_compaction_cutoff=lambda: datetime(2026, 6, 1).date())
+    interaction = FakeInteraction(events=[])
+    interaction.followup = Followup()
+
+    asyncio.run(AchievementCog.rank.callback(cog, interaction, start="2026-05-20", end="2026-06-10"))
+
+    assert interaction.response.deferred
+    assert sent == [(
+        "Daily counts are only kept from 2026-06-01. "
+        "Please start the range on or after that day, or use date for older months.",
+        True,
+    )]
+
+
 def test_rank_view_hides_shop_types_when_shop_feature_is_disabled(monkeypatch):
     _install_achievement_config(monkeypatch)
     bot = FakeBot(FakeAchievementCog(
         hidden_types={"checkin_sum", "checkin_combo"},
     ))
 
-    view = RankView(bot, all_rankings={})
+    view = RankView(bot)
 
     assert [button.custom_id for button in view.type_buttons] == [
         "type_message",
         "type_time_spent",
     ]
     assert [str(button.emoji) for button in view.type_buttons] == ["🟡", "🔵"]
+
+
+def test_mute_and_deafen_updates_do_not_touch_voice_sessions():
+    calls = []
+
+    class FakeDb:
+        async def end_voice_session(self, user_id, channel_id):
+            calls.append(("end", user_id, channel_id))
+
+        async def start_voice_session(self, user_id, channel_id):
+            calls.append(("start", user_id, channel_id))
+
+    cog = object.__new__(AchievementCog)
+    cog.db = FakeDb()
+    member = SimpleNamespace(id=10, bot=False)
+    lobby = SimpleNamespace(id=100)
+    room = SimpleNamespace(id=200)
+
+    async def scenario():
+        await cog.on_voice_state_update(member, SimpleNamespace(channel=None), SimpleNamespace(channel=lobby))
+        await cog.on_voice_state_update(member, SimpleNamespace(channel=lobby), SimpleNamespace(channel=lobby))
+        await cog.on_voice_state_update(member, SimpleNamespace(channel=lobby), SimpleNamespace(channel=room))
+        await cog.on_voice_state_update(member, SimpleNamespace(channel=room), SimpleNamespace(channel=None))
+
+    asyncio.run(scenario())
+
+    assert calls == [
+        ("start", 10, 100),
+        ("end", 10, 100),
+        ("start", 10, 200),
+        ("end", 10, 200),
+    ]
@@ -0,0 +1,66 @@
+import asyncio
+import sqlite3
+
+from bot.utils.db_metrics import add_statement_listener, remove_statement_listener
+from bot.utils.shop_db import ShopDatabaseManager
+from tools.audit_query_plans import CapturedStatement, audit_statements, format_report, seed_database
+
+
+def test_listener_sees_manager_statements_with_parameters_and_call_site(tmp_path):
+    seen = []
+
+    def listener(sql, parameters, origin):
+        seen.append((" ".join(sql.split()), parameters, origin))
+
+    async def scenario():
+        db = ShopDatabaseManager(str(tmp_path / "shop.db"))
+        try:
+            await db.initialize_database()
+            add_statement_listener(listener)
+            try:
+                await db.get_user_balance(42)
+            finally:
+                remove_statement_listener(listener)
+        finally:
+            await db.close()
+
+    asyncio.run(scenario())
+
+    selects = [entry for entry in seen if entry[0].startswith("SELECT") and "user_balance" in entry[0]]
+    assert selects
+    sql, parameters, origin = selects[0]
+    assert tuple(parameters) == (42,)
+    assert origin.startswith("bot/utils/shop_db.py:") and origin.endswith(" get_user_balance")
+
+
+def test_seeded_database_flags_scans_and_temp_btrees(tmp_path):
+    db_path = str(tmp_path / "audit.db")
+    counts = seed_database(db_path, 200)
+
+    assert counts["shop_transactions"] == 200
+    connection = sqlite3.connect(db_path)
+    assert connection.execute("SELECT count(*) FROM sqlite_stat1").fetchone()[0] > 0
+    connection.close()
+
+    statements = {
+        "unindexed": CapturedStatement(
+            "SELECT id FROM shop_transactions WHERE user_id = ? ORDER BY timestamp DESC", (7,), "bot/x.py:1 f", 3
+        ),
+        "by_key": CapturedStatement("SELECT * FROM ticket_types WHERE type_name = ?", ("a",), "bot/x.py:2 g", 1),
+        "missing_table": CapturedStatement("SELECT * FROM sample", (), "tests/x.py:1 h", 1),
+        "ddl": CapturedStatement("CREATE TABLE t (x)", (), None, 1),
+    }
+    audits = {audit.template: audit for audit in audit_statements(db_path, statements)}
+
+    unindexed = audits["SELECT id FROM shop_transactions WHERE user_id = ? ORDER BY timestamp DESC"]
+    assert unindexed.scans == ["SCAN shop_transactions"]
+    assert unindexed.temp_btrees == ["USE TEMP B-TREE FOR ORDER BY"]
+    keyed = audits["SELECT * FROM ticket_types WHERE type_name = ?"]
+    assert keyed.skipped is None and not keyed.scans and not keyed.temp_btrees
+    assert "no such table" in audits["SELECT * FROM sample"].skipped
+    assert audits["CREATE TABLE t (x)"].skipped == "CREATE statement"
+
+    report = format_report(list(audits.values()), rows=200)
+    assert "[SCAN + TEMP B-TREE] bot/x.py:1 f (3 calls in tests)" in report
+    assert "ticket_types" not in report
+    assert report.endswith("1 statements with full scans, 1 with temp B-trees, 2 skipped.")
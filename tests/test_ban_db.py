@@ -63,5 +63,6 @@ def test_tempban_lifecycle_and_cleanup(tmp_path):
         )
         assert await db.deactivate_tempban(old_id) is True
         assert await db.cleanup_old_records(days_old=30) == 1
+        await db.close()
 
     asyncio.run(scenario())
@@ -0,0 +1,127 @@
+import asyncio
+from datetime import datetime, timezone
+
+from bot.cogs.check_status.chart_cache import ChartCache, is_period_complete
+from bot.cogs.check_status.charts import ChartRenderer, render_voice_status_charts, summarize_samples
+
+
+ROWS = [
+    ("2026-04-27 10:00:00", 5, 2),
+    ("2026-04-27 10:10:00", 7, 1),
+    ("2026-04-28 10:00:00", 1, 3),
+    ("2026-05-02 22:00:00", 4, 2),
+]
+
+
+def test_summarize_samples_keeps_day_samples_and_period_peaks():
+    assert summarize_samples("day", ROWS[:2]) == {
+        "labels": ["2026-04-27 10:00:00", "2026-04-27 10:10:00"],
+        "people": [5, 7],
+        "channels": [2, 1],
+    }
+    assert summarize_samples("month", ROWS) == {
+        "labels": ["2026-04-27", "2026-04-28", "2026-05-02"],
+        "people": [7, 1, 4],
+        "channels": [2, 3, 2],
+    }
+    assert summarize_samples("year", ROWS) == {
+        "labels": ["2026-04", "2026-05"],
+        "people": [7, 4],
+        "channels": [3, 2],
+    }
+
+
+def test_render_voice_status_charts_returns_png_pairs():
+    for mode, period, rows in (
+        ("day", "2026-04-27", ROWS[:2]),
+        ("month", "2026-04", ROWS[:3]),
+        ("year", "2026", ROWS),
+    ):
+        people_png, channels_png = render_voice_status_charts(mode, period, summarize_samples(mode, rows))
+        assert people_png.startswith(b"\x89PNG")
+        assert channels_png.startswith(b"\x89PNG")
+        assert people_png != channels_png
+
+
+def test_chart_renderer_renders_in_a_worker_process():
+    renderer = ChartRenderer(max_workers=1)
+    try:
+        people_png, channels_png = asyncio.run(
+            renderer.render("year", "2026", summarize_samples("year", ROWS), scope="Games")
+        )
+    finally:
+        renderer.shutdown()
+
+    assert people_png.startswith(b"\x89PNG")
+    assert channels_png.startswith(b"\x89PNG")
+    assert renderer._pool is None
+
+
+def test_period_completion_follows_the_end_of_the_period():
+    now = datetime(2026, 5, 1, 0, 30, tzinfo=timezone.utc)
+
+    assert is_period_complete("2026-04-30", now)
+    assert is_period_complete("2026-04", now)
+    assert not is_period_complete("2026-05-01", now)
+    assert not is_period_complete("2026", now)
+    assert not is_period_complete("2026-04", datetime(2026, 5, 1, 0, 5, tzinfo=timezone.utc))
+    assert not is_period_complete("2025-02-30", now)
+
+
+def test_chart_cache_keeps_completed_periods_on_disk_with_lru_eviction(tmp_path):
+    renders = []
+
+    def renderer(charts):
+        async def render():
+            renders.append(charts)
+            return charts
+        return render
+
+    first = (b"a" * 40, b"b" * 40)
+    second = (b"c" * 40, b"d" * 40)
+    third = (b"e" * 40, b"f" * 40)
+
+    async def scenario():
+        cache = ChartCache(str(tmp_path / "charts"), max_bytes=200)
+        assert await cache.get_or_render("year", "2024", "zh_CN", 1, renderer(first)) == first
+        assert await cache.get_or_render("year", "2024", "zh_CN", 1, renderer(second)) == first
+        assert await cache.get_or_render("year", "2024", "en", 1, renderer(second)) == second
+        assert await cache.get_or_render("year", "2024", "zh_CN", 1, renderer(second)) == first
+        # Over budget: the least recently used pair (the "en" one) is evicted.
+        assert await cache.get_or_render("year", "2023", "zh_CN", 1, renderer(third)) == third
+
+        reopened = ChartCache(str(tmp_path / "charts"), max_bytes=200)
+        assert await reopened.get_or_render("year", "2024", "zh_CN", 1, renderer(second)) == first
+        assert await reopened.get_or_render("year", "2023", "zh_CN", 1, renderer(first)) == third
+        assert await reopened.get_or_render("year", "2024", "en", 1, renderer(third)) == third
+
+    asyncio.run(scenario())
+
+    assert renders == [first, second, third, third]
+    assert len(list((tmp_path / "charts").glob("*.png"))) == 4
+
+
+def test_chart_cache_shares_renders_and_keeps_the_current_period_in_memory(tmp_path):
+    calls = []
+
+    async def render():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return b"people", b"channels"
+
+    async def empty():
+        return None
+
+    async def scenario():
+        cache = ChartCache(str(tmp_path / "charts"), current_ttl=60)
+        results = await asyncio.gather(*(
+            cache.get_or_render("day", "2999-01-01", "zh_CN", 1, render) for _ in range(5)
+        ))
+        assert results == [(b"people", b"channels")] * 5
+        assert await cache.get_or_render("day", "2999-01-01", "zh_CN", 1, render) == (b"people", b"channels")
+        assert await cache.get_or_render("day", "2020-01-01", "zh_CN", 1, empty) is None
+
+    asyncio.run(scenario())
+
+    assert calls == [1]
+    assert not list((tmp_path / "charts").glob("*.png"))
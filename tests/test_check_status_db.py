@@ -1,5 +1,7 @@
 import asyncio
 
+import aiosqlite
+
 from bot.utils.check_status_db import CheckStatusDatabaseManager
 
 
@@ -22,3 +24,145 @@ def test_record_status_and_fetch_by_date_prefix(tmp_path):
         ("2026-04-27 10:10:00", 7, 3),
     ]
     assert run(db.fetch_status_by_date_prefix("2026-04-29")) == []
+    run(db.close())
+
+
+def test_fetch_status_ranges_use_the_timestamp_index(tmp_path):
+    db = CheckStatusDatabaseManager(str(tmp_path / "status.db"))
+
+    run(db.initialize_database())
+    run(db.record_status("2025-11-30 23:50:00", people=1, channels=1))
+    run(db.record_status("2025-12-01 00:00:00", people=2, channels=1))
+    run(db.record_status("2025-12-31 23:50:00", people=3, channels=1))
+    run(db.record_status("2026-01-01 00:00:00", people=4, channels=1))
+
+    assert [row[1] for row in run(db.fetch_status_by_date_prefix("2025"))] == [1, 2, 3]
+    assert [row[1] for row in run(db.fetch_status_by_date_prefix("2025-12"))] == [2, 3]
+    assert [row[1] for row in run(db.fetch_status_by_date_prefix("2025-12-31"))] == [3]
+    assert run(db.fetch_status_by_date_prefix("2025-02-30")) == []
+
+    async def plan():
+        async with db._read_connection() as conn:
+            cursor = await conn.execute(
+                "EXPLAIN QUERY PLAN SELECT timestamp, people, channels FROM status "
+                "WHERE timestamp >= ? AND timestamp < ? ORDER BY timestamp",
+                ("2025", "2026"),
+            )
+            rows = await cursor.fetchall()
+            await cursor.close()
+        return " ".join(row[-1] for row in rows)
+
+    assert "USING INDEX idx_status_timestamp" in run(plan())
+    run(db.close())
+
+
+def test_status_rollups_track_daily_and_monthly_peaks_and_averages(tmp_path):
+    db = CheckStatusDatabaseManager(str(tmp_path / "status.db"))
+
+    run(db.initialize_database())
+    run(db.record_status("2026-04-30 23:50:00", people=4, channels=2))
+    run(db.record_status("2026-05-01 00:00:00", people=6, channels=1))
+    run(db.record_status("2026-05-01 00:10:00", people=2, channels=3))
+    run(db.record_status("2026-05-02 12:00:00", people=1, channels=1))
+
+    assert run(db.fetch_status_rollups("2026-05")) == [
+        ("2026-05-01", 6, 3, 4.0, 2.0),
+        ("2026-05-02", 1, 1, 1.0, 1.0),
+    ]
+    assert run(db.fetch_status_rollups("2026-04-30")) == [("2026-04-30", 4, 2, 4.0, 2.0)]
+    assert run(db.fetch_status_rollups("2026")) == [
+        ("2026-04", 4, 2, 4.0, 2.0),
+        ("2026-05", 6, 3, 3.0, 5 / 3),
+    ]
+    assert run(db.fetch_status_rollups("2025")) == []
+    assert run(db.fetch_status_rollups("2025-02-30")) == []
+    run(db.close())
+
+
+def test_status_rollup_migration_backfills_existing_samples(tmp_path):
+    path = str(tmp_path / "status.db")
+
+    async def seed_version_one():
+        async with aiosqlite.connect(path) as conn:
+            await conn.execute(
+                "CREATE TABLE status (timestamp TEXT NOT NULL, people INTEGER DEFAULT 0, channels INTEGER DEFAULT 0)"
+            )
+            await conn.executemany(
+                "INSERT INTO status VALUES (?, ?, ?)",
+                [("2025-12-31 10:00:00", 3, 1), ("2025-12-31 11:00:00", 5, 2), ("2026-01-01 09:00:00", 2, 2)],
+            )
+            await conn.commit()
+
+    run(seed_version_one())
+    db = CheckStatusDatabaseManager(path)
+    run(db.initialize_database())
+    run(db.record_status("2026-01-01 10:00:00", people=4, channels=1))
+
+    assert run(db.fetch_status_rollups("2025-12")) == [("2025-12-31", 5, 2, 4.0, 1.5)]
+    assert run(db.fetch_status_rollups("2026")) == [("2026-01", 4, 2, 3.0, 1.5)]
+    run(db.close())
+
+
+def test_category_samples_are_compact_rolled_up_and_pruned(tmp_path):
+    db = CheckStatusDatabaseManager(str(tmp_path / "status.db"))
+
+    run(db.initialize_database())
+    run(db.record_status("2026-04-30 23:50:00", 5, 2, categories=[(10, "Games", 4, 1), (20, "Chat", 1, 1)]))
+    run(db.record_status("2026-05-01 00:00:00", 6, 2, categories=[(10, "Gaming", 6, 2), (20, "Chat", 0, 0)]))
+    run(db.record_status("2026-05-01 00:10:00", 2, 1, categories=[(10, "Gaming", 2, 1)]))
+
+    assert run(db.fetch_category_status_by_date_prefix(10, "2026-05-01")) == [
+        ("2026-05-01 00:00:00", 6, 2),
+        ("2026-05-01 00:10:00", 2, 1),
+    ]
+    assert run(db.fetch_category_status_by_date_prefix(10, "2026-05")) == []
+    assert run(db.fetch_category_status_rollups(10, "2026-05")) == [("2026-05-01", 6, 2, 4.0, 1.5)]
+    assert run(db.fetch_category_status_rollups(20, "2026")) == [
+        ("2026-04", 1, 1, 1.0, 1.0),
+        ("2026-05", 0, 0, 0.0, 0.0),
+    ]
+    assert run(db.fetch_status_rollups("2026-05")) == [("2026-05-01", 6, 2, 4.0, 1.5)]
+
+    assert run(db.prune_category_samples("2026-05-01 00:00:00")) == 2
+    assert run(db.fetch_category_status_by_date_prefix(10, "2026-04-30")) == []
+    assert len(run(db.fetch_category_status_by_date_prefix(10, "2026-05-01"))) == 2
+    assert run(db.fetch_category_status_rollups(10, "2026-04")) == [("2026-04-30", 4, 1, 4.0, 1.0)]
+
+    async def stored():
+        async with db._read_connection() as conn:
+            cursor = await conn.execute("SELECT category_id, name FROM status_categories ORDER BY category_id")
+            names = await cursor.fetchall()
+            cursor = await conn.execute("SELECT typeof(ts) FROM category_status LIMIT 1")
+            ts_type = (await cursor.fetchone())[0]
+            await cursor.close()
+        return names, ts_type
+
+    assert run(stored()) == ([(10, "Gaming"), (20, "Chat")], "integer")
+    run(db.close())
+
+
+def test_queued_status_samples_are_written_in_one_batch_and_on_close(tmp_path):
+    path = str(tmp_path / "status.db")
+    db = CheckStatusDatabaseManager(path)
+
+    run(db.initialize_database())
+    db.queue_status("2026-05-01 00:00:00", 3, 1, [(10, "Games", 3, 1)])
+    db.queue_status("2026-05-01 00:01:00", 5, 2, [(10, "Games", 5, 2)])
+    assert db.pending_status_count == 2
+    assert run(db.fetch_status_by_date_prefix("2026-05-01")) == []
+
+    run(db.flush_pending_status())
+    assert db.pending_status_count == 0
+    assert run(db.fetch_status_by_date_prefix("2026-05-01")) == [
+        ("2026-05-01 00:00:00", 3, 1),
+        ("2026-05-01 00:01:00", 5, 2),
+    ]
+    assert run(db.fetch_status_rollups("2026-05")) == [("2026-05-01", 5, 2, 4.0, 1.5)]
+    assert run(db.fetch_category_status_rollups(10, "2026-05")) == [("2026-05-01", 5, 2, 4.0, 1.5)]
+
+    db.queue_status("2026-05-01 00:02:00", 1, 1)
+    run(db.close())
+
+    reopened = CheckStatusDatabaseManager(path)
+    assert [row[1] for row in run(reopened.fetch_status_by_date_prefix("2026-05-01"))] == [3, 5, 1]
+    run(reopened.close())
@@ -0,0 +1,110 @@
+import asyncio
+from types import SimpleNamespace
+
+import discord
+
+from bot.cogs.check_status import occupancy
+from bot.cogs.check_status.cog import CheckStatusCog
+from bot.cogs.check_status.occupancy import VoiceOccupancyIndex
+
+
+def category(category_id, name):
+    return SimpleNamespace(id=category_id, name=name, type=discord.ChannelType.category)
+
+
+def voice(channel_id, parent, members=0):
+    return SimpleNamespace(
+        id=channel_id, category=parent, members=[object()] * members, type=discord.ChannelType.voice,
+    )
+
+
+def test_occupancy_index_follows_voice_and_channel_events():
+    games = category(10, "Games")
+    chat = category(20, "Chat")
+    lobby = voice(1, games, members=2)
+    duo = voice(2, games)
+    lounge = voice(3, chat, members=1)
+    loose = voice(4, None, members=3)
+    stage = SimpleNamespace(id=5, type=discord.ChannelType.stage_voice)
+
+    index = VoiceOccupancyIndex()
+    index.rebuild([SimpleNamespace(voice_channels=[lobby, duo, lounge, loose])])
+    assert index.ready
+    assert index.snapshot() == (3, 2, [(10, "Games", 2, 1), (20, "Chat", 1, 1)])
+
+    index.member_moved(None, duo)
+    index.member_moved(lobby, lounge)
+    index.member_moved(lounge, lounge)
+    index.member_moved(loose, stage)
+    assert index.snapshot() == (4, 3, [(10, "Games", 2, 2), (20, "Chat", 2, 1)])
+
+    index.member_moved(lobby, None)
+    assert index.snapshot() == (3, 2, [(10, "Games", 1, 1), (20, "Chat", 2, 1)])
+
+    # Moved into another category with the members it had at the time.
+    duo.category = chat
+    duo.members = [object()]
+    index.channel_updated(duo)
+    index.channel_updated(category(20, "Hangout"))
+    assert index.snapshot() == (3, 2, [(10, "Games", 0, 0), (20, "Hangout", 3, 2)])
+
+    index.channel_created(voice(6, games, members=1))
+    index.channel_deleted(lobby)
+    assert index.snapshot() == (4, 3, [(10, "Games", 1, 1), (20, "Hangout", 3, 2)])
+
+    index.channel_deleted(chat)
+    assert index.snapshot() == (1, 1, [(10, "Games", 1, 1)])
+
+
+def test_occupancy_follows_guild_membership_and_is_rebuilt_hourly(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(occupancy.time, "monotonic", lambda: clock[0])
+    games = category(10, "Games")
+    lobby = voice(1, games, members=2)
+    home = SimpleNamespace(id=100, voice_channels=[lobby])
+    other = SimpleNamespace(id=200, voice_channels=[voice(2, category(20, "Other"), members=4)])
+
+    cog = object.__new__(CheckStatusCog)
+    cog.bot = SimpleNamespace(guilds=[home, other])
+    cog.occupancy = VoiceOccupancyIndex()
+    assert cog._voice_occupancy()[:2] == (6, 2)
+
+    # discord.py may still list the guild while on_guild_remove runs.
+    asyncio.run(cog.on_guild_remove(other))
+    assert cog._voice_occupancy() == (2, 1, [(10, "Games", 2, 1)])
+    asyncio.run(cog.on_guild_join(other))
+    assert cog._voice_occupancy()[:2] == (6, 2)
+
+    # A missed voice event is corrected by the next hourly rebuild.
+    lobby.members = []
+    assert cog._voice_occupancy()[:2] == (6, 2)
+    clock[0] += occupancy.REBUILD_INTERVAL_SECONDS
+    assert cog._voice_occupancy()[:2] == (4, 1)
+
+
+def test_hourly_rebuild_does_not_report_drift_after_renames_and_moves(monkeypatch, caplog):
+    clock = [1000.0]
+    monkeypatch.setattr(occupancy.time, "monotonic", lambda: clock[0])
+    games = category(10, "Games")
+    chat = category(20, "Chat")
+    lobby = voice(1, games, members=1)
+    lounge = voice(2, chat, members=2)
+    guild = SimpleNamespace(id=100, voice_channels=[lobby, lounge])
+
+    cog = object.__new__(CheckStatusCog)
+    cog.bot = SimpleNamespace(guilds=[guild])
+    cog.occupancy = VoiceOccupancyIndex()
+    cog._voice_occupancy()
+
+    # Re-indexing the only channel of Games moves it behind Chat in the index.
+    index_order = [category_id for category_id, *_ in cog.occupancy.snapshot()[2]]
+    cog.occupancy.channel_updated(lobby)
+    assert [category_id for category_id, *_ in cog.occupancy.snapshot()[2]] == index_order[::-1]
+    cog.occupancy.member_moved(lounge, lobby)
+    lounge.members.pop()
+    lobby.members.append(object())
+
+    clock[0] += occupancy.REBUILD_INTERVAL_SECONDS
+    with caplog.at_level("WARNING"):
+        assert cog._voice_occupancy()[:2] == (3, 2)
+    assert "drifted" not in caplog.text
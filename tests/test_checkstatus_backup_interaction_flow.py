@@ -1,4 +1,5 @@
 import asyncio
+import sqlite3
 from pathlib import Path
 from types import SimpleNamespace
 
@@ -7,6 +8,10 @@ from bot.cogs.backup.cog import BackupCog
 from bot.cogs.check_status import cog as checkstatus_cog
 from bot.cogs.check_status import views as checkstatus_views
 from bot.cogs.check_status.cog import CheckStatusCog
+from bot.cogs.check_status.occupancy import VoiceOccupancyIndex
+from bot.utils.db_backup import BackupResult, BackupVerification
+from bot.utils.db_metrics import query_metrics
+from bot.utils.wal_archive import restore_point_in_time
 
 
 CHECKSTATUS_TEXT = {
@@ -125,17 +130,21 @@ def test_check_voice_status_counts_active_categories(monkeypatch):
     async def scenario():
         _install_checkstatus_translations(monkeypatch)
         events = []
-        gaming = SimpleNamespace(name="Gaming")
-        quiet = SimpleNamespace(name="Quiet")
+        gaming = SimpleNamespace(id=10, name="Gaming")
+        quiet = SimpleNamespace(id=20, name="Quiet")
+        idle = SimpleNamespace(id=30, name="Idle")
         guild = SimpleNamespace(
             voice_channels=[
-                SimpleNamespace(category=gaming, members=[object(), object()]),
-                SimpleNamespace(category=gaming, members=[]),
-                SimpleNamespace(category=quiet, members=[object()]),
+                SimpleNamespace(id=1, category=gaming, members=[object(), object()]),
+                SimpleNamespace(id=2, category=gaming, members=[]),
+                SimpleNamespace(id=3, category=quiet, members=[object()]),
+                SimpleNamespace(id=4, category=idle, members=[]),
+                SimpleNamespace(id=5, category=None, members=[object()]),
             ],
         )
         cog = object.__new__(CheckStatusCog)
         cog.bot = SimpleNamespace(guilds=[guild])
+        cog.occupancy = VoiceOccupancyIndex()
         interaction = FakeInteraction(events=events)
 
         await CheckStatusCog.check_voice_status.callback(cog, interaction)
@@ -182,7 +191,7 @@ def test_check_log_reads_requested_log_type_tail(monkeypatch, tmp_path):
     asyncio.run(scenario())
 
 
-def test_backup_now_invokes_manual_backup_before_response(monkeypatch):
+def test_backup_now_defers_then_reports_backup_duration_and_size(monkeypatch):
     async def scenario():
         async def check_channel_validity(interaction):
             return True
@@ -192,6 +201,13 @@ def test_backup_now_invokes_manual_backup_before_response(monkeypatch):
 
         async def backup_database(*, manual=False):
             events.append(("backup", manual))
+            return BackupResult(
+                path=Path("database_20240626_120000.db"),
+                size_bytes=3 * 1024 * 1024,
+                duration_seconds=1.234,
+                pages=768,
+                verification=BackupVerification(ok=True, detail="ok", duration_seconds=0.456),
+            )
 
         cog = SimpleNamespace(backup_database=backup_database)
         interaction = FakeInteraction(events=events)
@@ -199,8 +215,184 @@ def test_backup_now_invokes_manual_backup_before_response(monkeypatch):
         await BackupCog.backup_now.callback(cog, interaction)
 
         assert events == [
+            ("defer", False),
             ("backup", True),
-            ("response", "Database backup created"),
+            ("followup", "Database backup created: database_20240626_120000.db (3.0 MiB, 1.23s)\nquick_check: ok (0.46s)"),
         ]
 
     asyncio.run(scenario())
+
+
+def test_backup_now_reports_a_failed_backup(monkeypatch):
+    async def scenario():
+        async def check_channel_validity(interaction):
+            return True
+
+        monkeypatch.setattr(backup_cog, "check_channel_validity", check_channel_validity)
+        events = []
+
+        async def backup_database(*, manual=False):
+            raise OSError("No space left on device")
+
+        cog = SimpleNamespace(backup_database=backup_database)
+        interaction = FakeInteraction(events=events)
+
+        await BackupCog.backup_now.callback(cog, interaction)
+
+        assert events == [
+            ("defer", False),
+            ("followup", "Database backup failed: No space left on device"),
+        ]
+
+    asyncio.run(scenario())
+
+
+def test_scheduled_backup_skips_unchanged_database(tmp_path, monkeypatch):
+    source = tmp_path / "bot.db"
+    connection = sqlite3.connect(source)
+    connection.execute("CREATE TABLE sample (value TEXT)")
+    connection.commit()
+    monkeypatch.setattr(
+        backup_cog.config,
+        "get_config",
+        lambda *args, **kwargs: {"db_path": str(source), "backup": {"compression": "gzip"}},
+    )
+
+    async def scenario():
+        cog = BackupCog(bot=None)
+        cog.backup_folder = tmp_path / "db_backup"
+        cog.verification_log = tmp_path / "verification.jsonl"
+        try:
+            first = await cog.backup_database()
+            assert first.path.suffix == ".gz"
+            assert first.verification.ok is True
+            assert '"ok": true' in cog.verification_log.read_text(encoding="utf-8")
+
+            assert await cog.backup_database() is None
+
+            connection.execute("INSERT INTO sample(value) VALUES ('changed')")
+            connection.commit()
+            second = await cog.backup_database()
+            assert second is not None and second.skipped is False
+            assert second.sha256 != first.sha256
+        finally:
+            cog.cog_unload()
+
+    asyncio.run(scenario())
+    connection.close()
+
+
+def test_backup_failing_verification_is_quarantined_outside_retention(tmp_path, monkeypatch):
+    source = tmp_path / "bot.db"
+    connection = sqlite3.connect(source)
+    connection.execute("CREATE TABLE sample (value TEXT)")
+    connection.commit()
+    monkeypatch.setattr(
+        backup_cog.config,
+        "get_config",
+        lambda *args, **kwargs: {"db_path": str(source), "backup": {"compression": "gzip"}},
+    )
+
+    async def scenario():
+        cog = BackupCog(bot=None)
+        cog.backup_folder = tmp_path / "db_backup"
+        cog.verification_log = tmp_path / "verification.jsonl"
+        cog.retention = backup_cog.RetentionPolicy(hourly=1, daily=1, weekly=1, monthly=1)
+        try:
+            good = await cog.backup_database()
+            assert good.verification.ok is True
+            # Backups are named by the second; keep the next one from reusing the name.
+            earlier = good.path.with_name("database_20000101_000000.db.gz")
+            good.path.rename(earlier)
+            good = backup_cog.replace(good, path=earlier)
+
+            monkeypatch.setattr(
+                backup_cog, "verify_backup", lambda path: BackupVerification(False, "broken", 0.0),
+            )
+            connection.execute("INSERT INTO sample(value) VALUES ('changed')")
+            connection.commit()
+            failed = await cog.backup_database()
+
+            assert failed.verification.ok is False
+            assert failed.path.name.endswith(".failed")
+            assert failed.path.exists()
+            assert good.path.exists()
+            assert backup_cog.list_backups(cog.backup_folder) == [good.path]
+            assert cog._last_backup_sha256 == good.sha256
+        finally:
+            cog.cog_unload()
+
+    asyncio.run(scenario())
+    connection.close()
+
+
+def test_continuous_backup_archives_wal_and_ships_last_frames_on_unload(tmp_path, monkeypatch):
+    source = tmp_path / "bot.db"
+    connection = sqlite3.connect(source)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA wal_autocheckpoint=0")
+    connection.execute("CREATE TABLE sample (value TEXT)")
+    connection.commit()
+    monkeypatch.setattr(backup_cog, "project_path", lambda *parts: tmp_path.joinpath(*parts))
+    monkeypatch.setattr(
+        backup_cog.config,
+        "get_config",
+        lambda *args, **kwargs: {
+            "db_path": str(source),
+            "backup": {"continuous": {"enabled": True, "interval_seconds": 5}},
+        },
+    )
+
+    async def scenario():
+        cog = BackupCog(bot=None)
+        # Drive the passes by hand instead of waiting for the loop.
+        cog.archive_wal.cancel()
+        assert cog.archive_wal.seconds == 5
+        try:
+            assert await asyncio.to_thread(cog._archive_wal_once) is None
+            connection.execute("INSERT INTO sample(value) VALUES ('first')")
+            connection.commit()
+            assert await asyncio.to_thread(cog._archive_wal_once) is not None
+            connection.execute("INSERT INTO sample(value) VALUES ('second')")
+            connection.commit()
+        finally:
+            cog.cog_unload()
+
+    asyncio.run(scenario())
+    connection.close()
+
+    restored = restore_point_in_time(tmp_path / "backup" / "wal_archive", tmp_path / "restored.db")
+    assert restored.segments == 2
+    rows = sqlite3.connect(restored.path).execute("SELECT value FROM sample ORDER BY rowid").fetchall()
+    assert rows == [("first",), ("second",)]
+
+
+def test_db_stats_lists_statements_by_requested_metric(monkeypatch):
+    async def check_channel_validity(interaction):
+        return True
+
+    monkeypatch.setattr(backup_cog, "check_channel_validity", check_channel_validity)
+    query_metrics.reset()
+    for _ in range(20):
+        query_metrics.record_query("SELECT * FROM fast WHERE id = ?", 0.001, rows=1)
+    query_metrics.record_query("SELECT * FROM slow", 0.5, rows=900)
+
+    async def scenario():
+        interaction = FakeInteraction(events=[])
+        await BackupCog.db_stats.callback(SimpleNamespace(), interaction, "P95", 5)
+        rejected = FakeInteraction(events=[])
+        await BackupCog.db_stats.callback(SimpleNamespace(), rejected, "median", 5)
+        return interaction.response.messages, rejected.response.messages
+
+    try:
+        messages, rejected = asyncio.run(scenario())
+    finally:
+        query_metrics.reset()
+
+    report = messages[0]["content"]
+    assert report.startswith("```\nQuery metrics since")
+    assert "top 2 by p95" in report
+    assert report.index("SELECT * FROM slow") < report.index("SELECT * FROM fast WHERE id = ?")
+    assert "n=20" in report and "rows 900" in report
+    assert rejected[0]["ephemeral"] is True
+    assert "lock_wait" in rejected[0]["content"]
@@ -0,0 +1,242 @@
+import asyncio
+import json
+import sqlite3
+import threading
+from datetime import datetime
+
+import pytest
+
+from bot.utils.db_backup import (
+    COMPRESSION_SUFFIXES,
+    BackupVerificationError,
+    RetentionPolicy,
+    _load_zstd_module,
+    backup_database_file,
+    create_backup,
+    hash_backup_file,
+    list_backups,
+    open_backup_stream,
+    prune_backups,
+    record_verification,
+    restore_backup,
+    verify_backup,
+)
+from bot.utils.db_connect import DB_KEY_ENV, DB_KEY_FILE_ENV, DB_REQUIRE_ENCRYPTION_ENV, connect_database
+
+
+def _clear_database_key_env(monkeypatch):
+    monkeypatch.delenv(DB_KEY_ENV, raising=False)
+    monkeypatch.delenv(DB_KEY_FILE_ENV, raising=False)
+    monkeypatch.delenv(DB_REQUIRE_ENCRYPTION_ENV, raising=False)
+
+
+def _create_source(db_path, rows):
+    async def scenario():
+        async with connect_database(db_path) as db:
+            await db.execute("CREATE TABLE sample (id INTEGER PRIMARY KEY, payload BLOB)")
+            await db.executemany(
+                "INSERT INTO sample(payload) VALUES (randomblob(2000))",
+                [()] * rows,
+            )
+            await db.commit()
+
+    asyncio.run(scenario())
+
+
+def test_backup_copies_a_consistent_snapshot_while_writes_continue(tmp_path, monkeypatch):
+    _clear_database_key_env(monkeypatch)
+    source = tmp_path / "bot.db"
+    destination = tmp_path / "backup" / "database.db"
+    _create_source(source, rows=500)
+
+    writes = []
+    stop = threading.Event()
+
+    def writer():
+        connection = sqlite3.connect(source, timeout=5)
+        while not stop.is_set():
+            connection.execute("INSERT INTO sample(payload) VALUES (randomblob(10))")
+            connection.commit()
+            writes.append(1)
+        connection.close()
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    try:
+        result = backup_database_file(source, destination, pages_per_step=16, step_pause=0.001)
+    finally:
+        stop.set()
+        thread.join()
+
+    assert result.path == destination
+    assert result.size_bytes == destination.stat().st_size
+    assert result.pages > 16
+    assert writes, "writes should keep committing while the backup runs"
+    assert not list(destination.parent.glob("*.partial*"))
+
+    copy = sqlite3.connect(destination)
+    try:
+        assert copy.execute("PRAGMA integrity_check").fetchone() == ("ok",)
+        assert copy.execute("PRAGMA journal_mode").fetchone() == ("delete",)
+        assert copy.execute("SELECT count(*) FROM sample").fetchone()[0] >= 500
+    finally:
+        copy.close()
+
+
+def test_backup_of_sqlcipher_database_stays_encrypted(tmp_path, monkeypatch):
+    pytest.importorskip("sqlcipher3")
+    _clear_database_key_env(monkeypatch)
+    monkeypatch.setenv(DB_KEY_ENV, "unit-test-key")
+    source = tmp_path / "bot.db"
+    destination = tmp_path / "database.db"
+    _create_source(source, rows=20)
+
+    backup_database_file(source, destination)
+
+    with pytest.raises(sqlite3.DatabaseError):
+        sqlite3.connect(destination).execute("SELECT count(*) FROM sample").fetchone()
+
+    async def count_rows():
+        async with connect_database(destination) as db:
+            cursor = await db.execute("SELECT count(*) FROM sample")
+            return (await cursor.fetchone())[0]
+
+    assert asyncio.run(count_rows()) == 20
+
+
+def test_failed_backup_leaves_no_partial_file(tmp_path, monkeypatch):
+    _clear_database_key_env(monkeypatch)
+    source = tmp_path / "missing" / "bot.db"
+    destination = tmp_path / "backup" / "database.db"
+
+    with pytest.raises(sqlite3.Error):
+        backup_database_file(source, destination)
+
+    assert not destination.exists()
+    assert list(destination.parent.iterdir()) == []
+
+
+@pytest.mark.parametrize("compression", ["gzip", "zstd", "none"])
+def test_create_backup_compresses_and_skips_unchanged_snapshots(tmp_path, monkeypatch, compression):
+    if compression == "zstd" and _load_zstd_module() is None:
+        pytest.skip("no zstd implementation installed")
+    _clear_database_key_env(monkeypatch)
+    source = tmp_path / "bot.db"
+    folder = tmp_path / "backup"
+    _create_source(source, rows=50)
+
+    first = create_backup(source, folder, taken_at=datetime(2024, 6, 26, 12), compression=compression)
+
+    assert first.path.name == "database_20240626_120000.db" + COMPRESSION_SUFFIXES[compression]
+    assert first.size_bytes == first.path.stat().st_size
+    assert hash_backup_file(first.path) == first.sha256
+    with open_backup_stream(first.path, "rb", compression) as reader:
+        assert reader.read(16) == b"SQLite format 3\x00"
+
+    second = create_backup(
+        source,
+        folder,
+        taken_at=datetime(2024, 6, 26, 18),
+        compression=compression,
+        previous_sha256=first.sha256,
+    )
+
+    assert second.skipped is True
+    assert list_backups(folder) == [first.path]
+
+
+@pytest.mark.parametrize("encrypted", [False, True])
+def test_backup_is_verified_and_restored_over_the_live_database(tmp_path, monkeypatch, encrypted):
+    _clear_database_key_env(monkeypatch)
+    if encrypted:
+        pytest.importorskip("sqlcipher3")
+        monkeypatch.setenv(DB_KEY_ENV, "verify-test-key")
+    source = tmp_path / "bot.db"
+    folder = tmp_path / "backup" / "db_backup"
+    _create_source(source, rows=50)
+    backup = create_backup(source, folder, taken_at=datetime(2024, 6, 26, 12), compression="gzip")
+
+    verification = verify_backup(backup.path)
+    assert verification.ok is True
+    assert verification.detail == "ok"
+    assert list(folder.iterdir()) == [backup.path]
+
+    log = tmp_path / "backup" / "verification.jsonl"
+    record_verification(log, backup.path, verification, checked_at=datetime(2024, 6, 26, 12, 0, 5))
+    entry = json.loads(log.read_text(encoding="utf-8"))
+    assert entry["ok"] is True and entry["checked_at"] == "2024-06-26T12:00:05"
+
+    # A stale WAL next to the target must not be replayed onto the restored file.
+    destination = tmp_path / "data" / "bot.db"
+    destination.parent.mkdir()
+    destination.write_bytes(b"old database")
+    destination.with_name("bot.db-wal").write_bytes(b"stale wal")
+    with pytest.raises(FileExistsError):
+        restore_backup(backup.path, destination)
+
+    restored = restore_backup(backup.path, destination, overwrite=True)
+
+    assert restored.verification.ok is True
+    assert not destination.with_name("bot.db-wal").exists()
+    assert not destination.with_name("bot.db.partial").exists()
+
+    async def count_rows():
+        async with connect_database(destination) as db:
+            cursor = await db.execute("SELECT count(*) FROM sample")
+            return (await cursor.fetchone())[0]
+
+    assert asyncio.run(count_rows()) == 50
+
+
+def test_corrupt_backup_fails_verification_and_restore(tmp_path, monkeypatch):
+    _clear_database_key_env(monkeypatch)
+    source = tmp_path / "bot.db"
+    _create_source(source, rows=50)
+    backup = create_backup(source, tmp_path / "backup", compression="none")
+    # Overwrite the b-tree page header of the table's root page.
+    with open(backup.path, "r+b") as damaged:
+        damaged.seek(4096)
+        damaged.write(b"\xff" * 16)
+
+    verification = verify_backup(backup.path)
+    assert verification.ok is False
+    assert verification.detail != "ok"
+
+    destination = tmp_path / "data" / "bot.db"
+    destination.parent.mkdir()
+    destination.write_bytes(b"current database")
+    with pytest.raises(BackupVerificationError):
+        restore_backup(backup.path, destination, overwrite=True)
+    assert destination.read_bytes() == b"current database"
+    assert list(destination.parent.iterdir()) == [destination]
+
+
+def test_tiered_retention_keeps_newest_backup_per_period(tmp_path):
+    taken = [
+        datetime(2024, 1, 31, 18),
+        datetime(2024, 2, 28, 18),
+        datetime(2024, 3, 1, 0),
+        datetime(2024, 3, 1, 6),
+        datetime(2024, 3, 2, 0),
+        datetime(2024, 3, 2, 6),
+        datetime(2024, 3, 2, 12),
+        datetime(2024, 3, 2, 12, 30),
+    ]
+    for moment in taken:
+        (tmp_path / f"database_{moment.strftime('%Y%m%d_%H%M%S')}.db.gz").write_bytes(b"")
+    (tmp_path / "database_20240302_180000.db.gz.partial").write_bytes(b"")
+
+    removed = prune_backups(tmp_path, RetentionPolicy(hourly=2, daily=2, weekly=0, monthly=3))
+
+    assert sorted(path.name for path in removed) == [
+        "database_20240301_000000.db.gz",
+        "database_20240302_000000.db.gz",
+        "database_20240302_120000.db.gz",
+    ]
+    assert [path.name for path in list_backups(tmp_path)] == [
+        "database_20240131_180000.db.gz",
+        "database_20240228_180000.db.gz",
+        "database_20240301_060000.db.gz",
+        "database_20240302_060000.db.gz",
+        "database_20240302_123000.db.gz",
+    ]
@@ -9,9 +9,12 @@ from bot.utils.db_connect import (
     DB_KEY_ENV,
     DB_KEY_FILE_ENV,
     DB_REQUIRE_ENCRYPTION_ENV,
+    DEFAULT_CONNECTION_PROFILE,
+    configure_connection_profile,
     connect_database,
     database_encryption_enabled,
     get_database_key,
+    read_connection_profile,
 )
 from runtime_env import load_env_file
 from tools.encrypt_database import encrypt_database
@@ -43,6 +46,90 @@ def test_connect_database_uses_plain_sqlite_without_key(tmp_path, monkeypatch):
     assert sqlite3.connect(db_path).execute("SELECT value FROM sample").fetchone() == ("ok",)
 
 
+@pytest.fixture
+def connection_profile():
+    yield configure_connection_profile
+    configure_connection_profile(DEFAULT_CONNECTION_PROFILE)
+
+
+def test_connect_database_applies_connection_profile(tmp_path, monkeypatch, connection_profile):
+    _clear_database_key_env(monkeypatch)
+    connection_profile({"cache_size": -4000, "busy_timeout": 1234, "synchronous": "normal"})
+
+    import asyncio
+
+    effective = asyncio.run(read_connection_profile(tmp_path / "profile.db"))
+
+    assert effective["journal_mode"] == "WAL"
+    assert effective["synchronous"] == "NORMAL"
+    assert effective["cache_size"] == -4000
+    assert effective["temp_store"] == "MEMORY"
+    assert effective["busy_timeout"] == 1234
+
+
+def test_connection_profile_rejects_unknown_pragma_values(connection_profile):
+    with pytest.raises(ValueError, match="main.database.journal_mode"):
+        connection_profile({"journal_mode": "WAL; DROP TABLE users"})
+    with pytest.raises(ValueError, match="main.database.cache_size"):
+        connection_profile({"cache_size": "large"})
+
+
+def test_sqlcipher_profile_sets_cipher_settings(tmp_path, monkeypatch, connection_profile):
+    sqlcipher3 = pytest.importorskip("sqlcipher3")
+    _clear_database_key_env(monkeypatch)
+    monkeypatch.setenv(DB_KEY_ENV, "unit-test-key")
+    connection_profile({
+        "sqlcipher": {"kdf_iter": 4000, "cipher_page_size": 8192, "cipher_memory_security": False},
+    })
+    db_path = tmp_path / "tuned.db"
+
+    async def scenario():
+        async with connect_database(db_path) as db:
+            await db.execute("CREATE TABLE sample (value TEXT)")
+            await db.commit()
+        return await read_connection_profile(db_path)
+
+    import asyncio
+
+    effective = asyncio.run(scenario())
+
+    assert int(effective["kdf_iter"]) == 4000
+    assert int(effective["cipher_page_size"]) == 8192
+    assert effective["sqlcipher_key"] == "passphrase"
+    # The file was written with non-default cipher settings, so a plain keyed
+    # connection cannot read it.
+    stock = sqlcipher3.connect(str(db_path))
+    stock.execute("PRAGMA key = 'unit-test-key'")
+    with pytest.raises(sqlcipher3.DatabaseError):
+        stock.execute("SELECT count(*) FROM sqlite_master").fetchone()
+    stock.close()
+
+
+def test_sqlcipher_raw_key_requires_hex_key(tmp_path, monkeypatch, connection_profile):
+    pytest.importorskip("sqlcipher3")
+    _clear_database_key_env(monkeypatch)
+    connection_profile({"sqlcipher": {"raw_key": True}})
+    db_path = tmp_path / "raw.db"
+
+    async def write_and_read():
+        async with connect_database(db_path) as db:
+            await db.execute("CREATE TABLE IF NOT EXISTS sample (value TEXT)")
+            await db.execute("INSERT INTO sample(value) VALUES ('raw')")
+            await db.commit()
+            cursor = await db.execute("SELECT value FROM sample")
+            return await cursor.fetchall()
+
+    import asyncio
+
+    monkeypatch.setenv(DB_KEY_ENV, "ab" * 32)
+    assert asyncio.run(write_and_read()) == [("raw",)]
+    assert asyncio.run(read_connection_profile(db_path))["sqlcipher_key"] == "raw"
+
+    monkeypatch.setenv(DB_KEY_ENV, "not-a-hex-key")
+    with pytest.raises(RuntimeError, match="64 or 96 hexadecimal"):
+        asyncio.run(write_and_read())
+
+
 def test_connect_database_requires_key_when_enforced(monkeypatch):
     _clear_database_key_env(monkeypatch)
     monkeypatch.setenv(DB_REQUIRE_ENCRYPTION_ENV, "1")
@@ -111,10 +198,11 @@ def test_load_env_file_keeps_existing_environment_by_default(tmp_path, monkeypat
     assert environ[DB_KEY_FILE_ENV] == "configured-by-launcher"
 
 
-def test_encrypt_database_outputs_sqlcipher_database(tmp_path, monkeypatch):
+def test_encrypt_database_outputs_sqlcipher_database(tmp_path, monkeypatch, connection_profile):
     pytest.importorskip("sqlcipher3")
     _clear_database_key_env(monkeypatch)
     monkeypatch.setenv(DB_KEY_ENV, "unit-test-key")
+    connection_profile({"sqlcipher": {"kdf_iter": 4000}})
 
     source = tmp_path / "plain.db"
     destination = tmp_path / "encrypted.db"
@@ -139,3 +227,6 @@ def test_encrypt_database_outputs_sqlcipher_database(tmp_path, monkeypatch):
     import asyncio
 
     assert asyncio.run(scenario()) == ("secret",)
+    effective = asyncio.run(read_connection_profile(destination))
+    assert effective["journal_mode"] == "WAL"
+    assert int(effective["kdf_iter"]) == 4000
@@ -0,0 +1,65 @@
+import asyncio
+
+from bot.utils.achievement_db import AchievementDatabaseManager
+from bot.utils.db_lifecycle import close_database_managers
+from bot.utils.shop_db import ShopDatabaseManager
+from bot.utils.tickets_db import TicketsDatabaseManager
+
+
+def test_managers_on_same_file_share_one_pool_until_last_close(tmp_path):
+    async def scenario():
+        db_path = str(tmp_path / "shared.db")
+        achievements = AchievementDatabaseManager(db_path)
+        shop = ShopDatabaseManager(db_path)
+        tickets = TicketsDatabaseManager(db_path)
+        other = TicketsDatabaseManager(str(tmp_path / "other.db"))
+
+        pool = achievements._get_connection_pool()
+        assert shop._get_connection_pool() is pool
+        assert tickets._get_connection_pool() is pool
+        assert other._get_connection_pool() is not pool
+        assert shop._get_persistent_connection_lock() is achievements._get_persistent_connection_lock()
+
+        await achievements.initialize_database()
+        await shop.initialize_database()
+        await tickets.initialize_database()
+
+        await close_database_managers([achievements, shop])
+        assert pool._closed is False
+        assert await tickets.get_ticket_number() == 1
+
+        await close_database_managers([tickets, other])
+        assert pool._closed is True
+
+    asyncio.run(scenario())
+
+
+def test_readers_do_not_wait_for_the_writer(tmp_path):
+    async def scenario():
+        tickets = TicketsDatabaseManager(str(tmp_path / "tickets.db"))
+        await tickets.initialize_database()
+        try:
+            async with tickets._write_connection():
+                # The writer is held; a read must still complete.
+                assert await asyncio.wait_for(tickets.get_ticket_number(), timeout=2) == 1
+        finally:
+            await tickets.close()
+
+    asyncio.run(scenario())
+
+
+def test_writer_rolls_back_uncommitted_work_on_release(tmp_path):
+    async def scenario():
+        tickets = TicketsDatabaseManager(str(tmp_path / "tickets.db"))
+        await tickets.initialize_database()
+        try:
+            async with tickets._write_connection() as db:
+                await db.execute(
+                    "INSERT INTO ticket_types (type_name, type_data) VALUES (?, ?)",
+                    ("leaked", "{}"),
+                )
+            assert await tickets.list_ticket_types() == {}
+        finally:
+            await tickets.close()
+
+    asyncio.run(scenario())
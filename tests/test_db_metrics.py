@@ -0,0 +1,120 @@
+import asyncio
+import logging
+
+import pytest
+
+from bot.utils.db_connect import DB_KEY_ENV, DB_KEY_FILE_ENV, DB_REQUIRE_ENCRYPTION_ENV, connect_database
+from bot.utils.db_lifecycle import acquire_connection_pool, release_connection_pool
+from bot.utils import db_metrics
+from bot.utils.db_metrics import configure_query_metrics, normalize_sql, query_metrics
+
+
+@pytest.fixture
+def metrics(monkeypatch):
+    monkeypatch.delenv(DB_KEY_ENV, raising=False)
+    monkeypatch.delenv(DB_KEY_FILE_ENV, raising=False)
+    monkeypatch.delenv(DB_REQUIRE_ENCRYPTION_ENV, raising=False)
+    configure_query_metrics({"slow_query_ms": 10_000})
+    query_metrics.reset()
+    yield query_metrics
+    configure_query_metrics()
+    query_metrics.reset()
+
+
+def _by_template(sort="total"):
+    return {summary.template: summary for summary in query_metrics.top_queries(sort, limit=100)}
+
+
+def test_normalize_sql_groups_statements_by_template():
+    assert normalize_sql("SELECT *\n  FROM t WHERE id = 42 AND name = 'o''k'") == "SELECT * FROM t WHERE id = ? AND name = ?"
+    assert normalize_sql("SELECT * FROM t WHERE id IN (?, ?,?)") == normalize_sql("SELECT * FROM t WHERE id IN (?,?)")
+    assert normalize_sql("SELECT * FROM table2 WHERE x = -1.5") == "SELECT * FROM table2 WHERE x = ?"
+
+
+def test_statements_record_counts_latency_and_rows(tmp_path, metrics):
+    async def scenario():
+        async with connect_database(tmp_path / "metrics.db") as db:
+            await db.execute("CREATE TABLE sample (id INTEGER PRIMARY KEY, value TEXT)")
+            await db.executemany("INSERT INTO sample(value) VALUES (?)", [(str(i),) for i in range(50)])
+            await db.commit()
+
+            cursor = await db.execute("SELECT id FROM sample WHERE id > ?", (10,))
+            assert len(await cursor.fetchall()) == 40
+
+            # fetchone leaves the cursor open; the next statement closes the sample.
+            cursor = await db.execute("SELECT count(*) FROM sample WHERE id > 5")
+            await cursor.fetchone()
+
+            async with db.execute("SELECT id FROM sample WHERE id <= 20") as cursor:
+                assert len([row async for row in cursor]) == 20
+
+            await db.execute("UPDATE sample SET value = 'x' WHERE id <= 3")
+            with pytest.raises(Exception):
+                await db.execute("SELECT missing FROM sample")
+
+    asyncio.run(scenario())
+
+    stats = _by_template()
+    assert stats["INSERT INTO sample(value) VALUES (?)"].rows == 50
+    assert stats["SELECT id FROM sample WHERE id > ?"].rows == 40
+    assert stats["SELECT count(*) FROM sample WHERE id > ?"].rows == 1
+    assert stats["SELECT id FROM sample WHERE id <= ?"].rows == 20
+    assert stats["UPDATE sample SET value = ? WHERE id <= ?"].rows == 3
+    assert stats["SELECT missing FROM sample"].errors == 1
+    select = stats["SELECT id FROM sample WHERE id > ?"]
+    assert select.count == 1
+    assert 0 < select.p50_seconds <= select.p95_seconds <= select.p99_seconds <= select.max_seconds
+
+
+def test_writer_lock_wait_is_charged_to_the_next_statement(tmp_path, metrics):
+    db_path = tmp_path / "contended.db"
+
+    async def scenario():
+        pool = acquire_connection_pool(db_path)
+        try:
+            async with pool.writer() as db:
+                await db.execute("CREATE TABLE sample (value INTEGER)")
+                await db.commit()
+
+            async def hold_writer():
+                async with pool.writer():
+                    await asyncio.sleep(0.05)
+
+            async def write_after_waiting():
+                await asyncio.sleep(0)
+                async with pool.writer() as db:
+                    await db.execute("INSERT INTO sample(value) VALUES (1)")
+                    await db.commit()
+
+            await asyncio.gather(hold_writer(), write_after_waiting())
+        finally:
+            await release_connection_pool(pool)
+
+    asyncio.run(scenario())
+
+    assert _by_template("lock_wait")["INSERT INTO sample(value) VALUES (?)"].lock_wait_seconds >= 0.04
+    [lock] = query_metrics.lock_waits()
+    assert lock.database == str(db_path)
+    assert lock.contended == 1
+    assert lock.max_seconds >= 0.04
+
+
+def test_slow_queries_are_logged(tmp_path, metrics, caplog):
+    configure_query_metrics({"slow_query_ms": 0})
+
+    async def scenario():
+        async with connect_database(tmp_path / "slow.db") as db:
+            await db.execute_fetchall("SELECT 1")
+
+    with caplog.at_level(logging.WARNING):
+        asyncio.run(scenario())
+
+    assert any("Slow query" in record.getMessage() and "SELECT ?" in record.getMessage() for record in caplog.records)
+
+
+def test_instrumentation_check_passes_and_fails_loudly_when_hooks_are_bypassed(monkeypatch):
+    asyncio.run(db_metrics.check_instrumentation())
+
+    monkeypatch.setattr(db_metrics, "_FETCH_CALLS", {"fetch_all_rows"})
+    with pytest.raises(db_metrics.InstrumentationError, match="fetchall"):
+        asyncio.run(db_metrics.check_instrumentation())
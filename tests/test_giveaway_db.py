@@ -65,5 +65,6 @@ def test_giveaway_record_participants_winners_and_views(tmp_path):
 
         await db.cleanup_ended_giveaway_views()
         assert await db.load_giveaway_views() == []
+        await db.close()
 
     asyncio.run(scenario())
@@ -615,3 +615,25 @@ def test_end_giveaway_draws_notifies_updates_db_then_disables_message(monkeypatc
         assert interaction.response.messages[0]["content"] == "Giveaway ga-1 has been ended early."
 
     asyncio.run(scenario())
+
+
+def test_eligibility_reads_the_member_profile():
+    class FakeAchievementDB:
+        async def get_user_profile(self, user_id, year=None, month=None):
+            return {"total": {"message_count": 12, "reaction_count": 3, "time_spent": 600}}
+
+    class FakeGiveawayDB:
+        def __init__(self, requirements):
+            self.requirements = requirements
+
+        async def fetch_giveaway_requirements(self, giveaway_id):
+            return self.requirements
+
+    cog = object.__new__(GiveawayCog)
+    cog.bot = SimpleNamespace(get_cog={"AchievementCog": SimpleNamespace(db=FakeAchievementDB())}.get)
+    interaction = SimpleNamespace(response=FakeResponse([]))
+
+    cog.db = FakeGiveawayDB((2, 10, 600))
+    assert asyncio.run(cog.check_participant_eligibility(1, 123, interaction)) is True
+    cog.db = FakeGiveawayDB((2, 10, 601))
+    assert asyncio.run(cog.check_participant_eligibility(1, 123, interaction)) is False
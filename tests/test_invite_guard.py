@@ -470,6 +470,7 @@ def test_member_join_attributes_single_invite_delta_and_locks_rejoins(tmp_path):
         assert joined_again["join_count"] == 2
         assert inviter_again["invited_count"] == 1
         assert len(cog.shop_db.transactions) == 1
+        await cog.db.close()
 
     asyncio.run(scenario())
 
@@ -501,6 +502,7 @@ def test_invite_reward_updates_shop_balance_and_transaction_history(tmp_path):
             assert history[0][6] == "Invite reward: 200 via abc"
         finally:
             await cog.shop_db.close()
+        await cog.db.close()
 
     asyncio.run(scenario())
 
@@ -543,6 +545,7 @@ def test_ignored_join_can_be_reattributed_by_later_regular_invite(tmp_path):
         assert attributed["attribution_locked"] == 1
         assert inviter_record["invited_count"] == 1
         assert len(cog.shop_db.transactions) == 1
+        await cog.db.close()
 
     asyncio.run(scenario())
 
@@ -572,6 +575,7 @@ def test_ambiguous_join_does_not_increment_inviter_counts(tmp_path):
         assert await cog.db.get_user(123, 100) is None
         assert await cog.db.get_user(123, 101) is None
         assert cog.shop_db.transactions == []
+        await cog.db.close()
 
     asyncio.run(scenario())
 
@@ -629,6 +633,7 @@ def test_pooled_join_two_members_two_invites_credits_each_inviter(tmp_path):
         assert amounts_by_user[100]["amount"] == 60
         assert amounts_by_user[101]["amount"] == 60
         assert amounts_by_user[100]["operation_type"] == "invite_reward"
+        await cog.db.close()
 
     asyncio.run(scenario())
 
@@ -664,6 +669,7 @@ def test_pooled_join_two_members_single_invite_full_attribution(tmp_path):
         assert inviter_record["pooled_count"] == 0
         assert len(cog.shop_db.transactions) == 2
         assert all(t["amount"] == 60 for t in cog.shop_db.transactions)
+        await cog.db.close()
 
     asyncio.run(scenario())
 
@@ -695,6 +701,7 @@ def test_pooled_join_total_delta_mismatch_falls_back_to_ambiguous(tmp_path):
             assert record["attribution_locked"] == 0
         assert await cog.db.get_user(123, 100) is None
         assert cog.shop_db.transactions == []
+        await cog.db.close()
 
     asyncio.run(scenario())
 
@@ -730,6 +737,7 @@ def test_pooled_join_with_ignored_invite_delta_falls_back_to_ambiguous(tmp_path)
             assert record["attribution_status"] == "ambiguous"
         assert await cog.db.get_user(123, 100) is None
         assert cog.shop_db.transactions == []
+        await cog.db.close()
 
     asyncio.run(scenario())
 
@@ -762,6 +770,7 @@ def test_pooled_join_self_invite_in_batch_falls_back_to_ambiguous(tmp_path):
         for record in (record_a, record_b):
             assert record["attribution_status"] == "ambiguous"
         assert cog.shop_db.transactions == []
+        await cog.db.close()
 
     asyncio.run(scenario())
 
@@ -802,6 +811,7 @@ def test_pooled_join_rolled_back_when_batch_member_already_locked(tmp_path):
         assert await cog.db.get_user(123, 100) is None
         assert await cog.db.get_user(123, 101) is None
         assert cog.shop_db.transactions == []
+        await cog.db.close()
 
     asyncio.run(scenario())
 
@@ -839,6 +849,7 @@ def test_pooled_attribution_disabled_falls_back_to_ambiguous(tmp_path):
         assert await cog.db.get_user(123, 100) is None
         assert await cog.db.get_user(123, 101) is None
         assert cog.shop_db.transactions == []
+        await cog.db.close()
 
     asyncio.run(scenario())
 
@@ -910,6 +921,7 @@ def test_reward_notification_dm_sent_with_panel_and_image(tmp_path):
             assert button["label"] == "查看排行榜"
         finally:
             _close_sent_files(inviter_user)
+        await cog.db.close()
 
     asyncio.run(scenario())
 
@@ -941,6 +953,7 @@ def test_reward_notification_skipped_without_valid_panel(tmp_path):
         joined = await cog.db.get_user(123, 200)
         assert joined["attribution_status"] == "attributed"
         assert len(cog.shop_db.transactions) == 1
+        await cog.db.close()
 
     asyncio.run(scenario())
 
@@ -971,6 +984,7 @@ def test_reward_notification_disabled_by_config(tmp_path):
         joined = await cog.db.get_user(123, 200)
         assert joined["attribution_status"] == "attributed"
         assert len(cog.shop_db.transactions) == 1
+        await cog.db.close()
 
     asyncio.run(scenario())
 
@@ -1025,6 +1039,7 @@ def test_reward_notification_pooled_sends_body_pooled_to_each_inviter(tmp_path):
         finally:
             _close_sent_files(user_a)
             _close_sent_files(user_b)
+        await cog.db.close()
 
     asyncio.run(scenario())
 
@@ -1060,6 +1075,7 @@ def test_reward_notification_forbidden_does_not_affect_attribution_or_points(tmp
         assert joined["attribution_status"] == "attributed"
         assert inviter_record["invited_count"] == 1
         assert len(cog.shop_db.transactions) == 1
+        await cog.db.close()
 
     asyncio.run(scenario())
 
@@ -1090,6 +1106,7 @@ def test_reward_notification_not_sent_when_points_disabled(tmp_path):
         assert inviter_user.sent == []
         joined = await cog.db.get_user(123, 200)
         assert joined["attribution_status"] == "attributed"
+        await cog.db.close()
 
     asyncio.run(scenario())
 
@@ -1147,6 +1164,7 @@ def test_reward_notification_order_attribution_points_then_dm(tmp_path):
             assert events == ["db_attribute", "points", "dm"]
         finally:
             _close_sent_files(inviter_user)
+        await cog.db.close()
 
     asyncio.run(scenario())
 
@@ -1174,6 +1192,7 @@ def test_invite_check_user_output_includes_pooled_count(monkeypatch, tmp_path):
         assert events[0] == ("defer", True, True)
         summary_text = events[1][1]
         assert "pooled_count: 2" in summary_text
+        await cog.db.close()
 
     asyncio.run(scenario())
 
@@ -1210,6 +1229,7 @@ def test_lock_serialization_settlement_blocks_concurrent_sync(tmp_path):
         await settlement_task
         await asyncio.wait_for(sync_task, timeout=1)
         assert sync_task.done()
+        await cog.db.close()
 
     asyncio.run(scenario())
 
@@ -1267,6 +1287,7 @@ def test_member_joining_during_settlement_is_settled_by_same_task_loop(tmp_path)
         assert record_b["invited_by_user_id"] == 100
         assert fetch_calls == 2
         assert len(cog.shop_db.transactions) == 2
+        await cog.db.close()
 
     asyncio.run(scenario())
 
@@ -1286,6 +1307,7 @@ def test_initialize_invite_cache_then_sync_invite_links_does_not_deadlock(tmp_pa
             timeout=1,
         )
         assert summary_sync is not None
+        await cog.db.close()
 
     asyncio.run(scenario())
 
@@ -1339,6 +1361,7 @@ def test_invite_sync_refreshes_configured_message(monkeypatch, tmp_path):
         assert container["components"][4]["content"] == (
             "-# 每个新成员只会被第一次有效普通邀请计入一次，退出后重新加入不会重复计数。"
         )
+        await cog.db.close()
 
     asyncio.run(scenario())
 
@@ -1369,5 +1392,6 @@ def test_invite_create_embed_creates_new_runtime_panel(monkeypatch, tmp_path):
         assert channel.sent_messages[0]["view"].has_components_v2() is True
         assert cog._runtime_leaderboard_channel_id == 555
         assert cog._runtime_leaderboard_message_id == 999
+        await cog.db.close()
 
     asyncio.run(scenario())
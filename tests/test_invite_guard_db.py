@@ -54,6 +54,7 @@ def test_invite_links_sync_and_mark_inactive(tmp_path):
         assert summary.marked_inactive == 1
         assert link["active"] == 0
         assert link["deleted_at"] == LATER
+        await db.close()
 
     asyncio.run(scenario())
 
@@ -82,6 +83,7 @@ def test_invite_user_attribution_locks_and_counts_once(tmp_path):
         left = await db.get_user(1, 200)
         assert left["leave_count"] == 1
         assert (await db.get_user(1, 100))["invited_count"] == 1
+        await db.close()
 
     asyncio.run(scenario())
 
@@ -111,6 +113,7 @@ def test_ignored_or_unknown_status_can_be_reattributed_later(tmp_path):
         assert attributed["attribution_status"] == "attributed"
         assert attributed["attribution_locked"] == 1
         assert inviter["invited_count"] == 1
+        await db.close()
 
     asyncio.run(scenario())
 
@@ -125,6 +128,7 @@ def test_repair_detects_count_mismatch(tmp_path):
 
         mismatches = await db.find_count_mismatches(1)
         assert mismatches == []
+        await db.close()
 
     asyncio.run(scenario())
 
@@ -159,6 +163,7 @@ def test_pool_attribute_members_locks_members_and_credits_inviters(tmp_path):
         assert inviter_a["pooled_count"] == 1
         assert inviter_a["invited_count"] == 0
         assert inviter_b["pooled_count"] == 1
+        await db.close()
 
     asyncio.run(scenario())
 
@@ -186,6 +191,7 @@ def test_pool_attribute_members_rolls_back_when_member_already_locked(tmp_path):
         assert member_a["attribution_locked"] == 0
         inviter_a = await db.get_user(1, 100)
         assert inviter_a is None
+        await db.close()
 
     asyncio.run(scenario())
 
@@ -213,6 +219,7 @@ def test_get_leaderboard_orders_by_invited_plus_pooled_count(tmp_path):
         assert rows[0]["pooled_count"] == 2
         assert rows[0]["invited_count"] == 0
         assert rows[1]["total_count"] == 1
+        await db.close()
 
     asyncio.run(scenario())
 
@@ -233,5 +240,6 @@ def test_get_user_includes_pooled_count_for_invite_check_user(tmp_path):
         member = await db.get_user(1, 200)
         assert member["pooled_count"] == 0
         assert member["attribution_status"] == "pooled"
+        await db.close()
 
     asyncio.run(scenario())
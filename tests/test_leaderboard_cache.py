@@ -0,0 +1,62 @@
+from bot.utils import leaderboard_cache
+from bot.utils.leaderboard_cache import RankIndex, TopNLeaderboard, TTLCache
+
+
+def test_board_admits_users_that_beat_the_lowest_entry():
+    board = TopNLeaderboard(3)
+    board.update(1, 10)
+    assert board.top(3) == []  # Nothing is served before the first load.
+
+    board.load([(1, 10), (2, 8), (3, 5)])
+    board.update(4, 5)
+    assert board.top(3) == [(1, 10), (2, 8), (3, 5)]
+    board.update(4, 6)
+    assert board.top(3) == [(1, 10), (2, 8), (4, 6)]
+    board.update(2, 12)
+    assert board.top(2) == [(2, 12), (1, 10)]
+
+
+def test_board_handles_decreases_without_losing_exactness():
+    partial = TopNLeaderboard(3)
+    partial.load([(1, 10), (2, 8)])
+    partial.update(2, 0)
+    partial.update(1, 4)
+    assert partial.top(3) == [(1, 4)]
+    assert partial.stale is False
+
+    full = TopNLeaderboard(2)
+    full.load([(1, 10), (2, 8), (3, 7)])
+    assert full.top(5) == [(1, 10), (2, 8)]
+    full.update(3, 6)  # Outside the board: no effect.
+    assert full.stale is False
+    full.update(2, 1)  # User 3 may now belong on the board.
+    assert full.stale is True
+    assert full.top(2) == []
+
+
+def test_rank_index_counts_users_ahead_with_binary_search():
+    index = RankIndex()
+    index.load([(1, 10), (2, 8), (3, 8), (4, 0)])
+    assert index.total == 3
+    assert index.count_above(index.value(2)) == 1
+    assert index.count_above(index.value(4)) == 3
+
+    index.update(3, 11)
+    index.update(5, 9)
+    index.update(1, 0)
+    assert index.total == 3
+    assert [index.count_above(index.value(user_id)) + 1 for user_id in (3, 5, 2)] == [1, 2, 3]
+
+
+def test_ttl_cache_expires_entries_and_drops_the_oldest_when_full(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(leaderboard_cache.time, "monotonic", lambda: clock[0])
+    cache = TTLCache(30, max_entries=2)
+
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.put("c", 3)
+    assert (cache.get("a"), cache.get("b"), cache.get("c")) == (None, 2, 3)
+
+    clock[0] += 30
+    assert cache.get("b") is None
@@ -63,5 +63,6 @@ def test_privateroom_config_shop_and_room_state_round_trip(tmp_path):
         await db.reset_privateroom_system()
         assert await db.get_category_id() is None
         assert await db.get_active_rooms_count() == 0
+        await db.close()
 
     asyncio.run(scenario())
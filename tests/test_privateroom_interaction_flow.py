@@ -312,3 +312,19 @@ def test_setup_shop_sends_components_v2_panel_without_embed(monkeypatch):
         assert interaction.followup.messages[-1]["content"] == "setup in <#777>"
 
     asyncio.run(scenario())
+
+
+def test_last_month_voice_hours_read_the_member_profile_of_last_month(monkeypatch):
+    monkeypatch.setattr(privateroom_cog, "datetime", FrozenDatetime)
+    calls = []
+
+    class FakeAchievementDB:
+        async def get_user_profile(self, user_id, year=None, month=None):
+            calls.append((user_id, year, month))
+            return {"total": {"time_spent": 9000}, "monthly": {"time_spent": 5400}}
+
+    cog = object.__new__(PrivateRoomCog)
+    cog.bot = SimpleNamespace(get_cog={"AchievementCog": SimpleNamespace(db=FakeAchievementDB())}.get)
+
+    assert asyncio.run(cog.get_last_month_voice_hours(123)) == 1.5
+    assert calls == [(123, 2026, 3)]
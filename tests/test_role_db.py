@@ -56,5 +56,6 @@ def test_role_views_and_signature_state_round_trip(tmp_path):
         cleared = await db.get_user_signature(42)
         assert cleared["signature"] is None
         assert cleared["change_time1"] is None
+        await db.close()
 
     asyncio.run(scenario())
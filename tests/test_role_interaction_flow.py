@@ -134,13 +134,8 @@ class FakeMember:
 
 
 class FakeRoleDB:
-    def __init__(self, events, *, progress=0):
+    def __init__(self, events):
         self.events = events
-        self.progress = progress
-
-    async def get_user_achievement_progress(self, user_id, achievement_type):
-        self.events.append(("db_progress", user_id, achievement_type))
-        return self.progress
 
 
 class FakeSignatureDB:
@@ -166,14 +161,27 @@ class FakeSignatureDB:
         return 2
 
 
+class FakeAchievementDB:
+    def __init__(self, events, counts):
+        self.events = events
+        self.counts = counts
+
+    async def get_user_profile(self, user_id, year=None, month=None):
+        self.events.append(("profile", user_id))
+        return {"total": self.counts}
+
+
 class FakeBot:
-    def __init__(self, role_cog):
+    def __init__(self, role_cog, achievement_cog=None):
         self.role_cog = role_cog
+        self.achievement_cog = achievement_cog
         self.guilds = []
 
     def get_cog(self, name):
         if name == "RoleCog":
             return self.role_cog
+        if name == "AchievementCog":
+            return self.achievement_cog
         return None
 
 
@@ -257,7 +265,7 @@ def _install_role_config(monkeypatch, role_db):
 def test_achievement_role_button_adds_start_role_then_highest_eligible_role(monkeypatch):
     async def scenario():
         events = []
-        role_db = FakeRoleDB(events, progress=60)
+        role_db = FakeRoleDB(events)
         _install_role_config(monkeypatch, role_db)
         roles = [
             FakeRole(10, "Chatter", 10),
@@ -266,7 +274,8 @@ def test_achievement_role_button_adds_start_role_then_highest_eligible_role(monk
         ]
         guild = FakeGuild(roles)
         member = FakeMember(123, "User", "user", "<@123>", guild, events)
-        bot = FakeBot(role_cog=None)
+        achievement_db = FakeAchievementDB(events, {"message_count": 60})
+        bot = FakeBot(role_cog=None, achievement_cog=SimpleNamespace(db=achievement_db))
         view = AchievementRoleView(bot)
         interaction = FakeInteraction(
             user=member,
@@ -281,7 +290,7 @@ def test_achievement_role_button_adds_start_role_then_highest_eligible_role(monk
         assert event_names == [
             "defer",
             "add_roles",
-            "db_progress",
+            "profile",
             "add_roles",
             "followup",
         ]
@@ -296,9 +305,60 @@ def test_achievement_role_button_adds_start_role_then_highest_eligible_role(monk
     asyncio.run(scenario())
 
 
+def test_achievement_role_button_reads_progress_from_achievement_profile(monkeypatch):
+    async def scenario():
+        events = []
+        _install_role_config(monkeypatch, FakeRoleDB(events))
+        roles = [FakeRole(10, "Chatter", 10), FakeRole(20, "Veteran", 20), FakeRole(30, "Starter", 5)]
+        guild = FakeGuild(roles)
+        member = FakeMember(123, "User", "user", "<@123>", guild, events)
+        achievement_db = FakeAchievementDB(events, {"message_count": 12, "time_spent": 3600})
+        bot = FakeBot(role_cog=None, achievement_cog=SimpleNamespace(db=achievement_db))
+        view = AchievementRoleView(bot)
+        interaction = FakeInteraction(
+            user=member,
+            guild=guild,
+            data={"custom_id": "message"},
+            events=events,
+        )
+
+        await view.on_button_click(interaction)
+
+        assert [event[0] for event in events] == ["defer", "add_roles", "profile", "add_roles", "followup"]
+        assert events[3] == ("add_roles", [10], "Adding achievement role")
+        # Voice time is compared in minutes.
+        assert await view.get_user_progress(123, "time_spent") == 60
+
+    asyncio.run(scenario())
+
+
+def test_achievement_role_button_reports_no_progress_for_uncounted_members(monkeypatch):
+    async def scenario():
+        events = []
+        _install_role_config(monkeypatch, FakeRoleDB(events))
+        guild = FakeGuild([FakeRole(10, "Chatter", 10), FakeRole(30, "Starter", 5)])
+        member = FakeMember(123, "User", "user", "<@123>", guild, events)
+        counts = {"message_count": 0, "reaction_count": 0, "time_spent": 0, "giveaway_count": 0}
+        achievement_db = FakeAchievementDB(events, counts)
+        bot = FakeBot(role_cog=None, achievement_cog=SimpleNamespace(db=achievement_db))
+        view = AchievementRoleView(bot)
+        interaction = FakeInteraction(
+            user=member,
+            guild=guild,
+            data={"custom_id": "message"},
+            events=events,
+        )
+
+        await view.on_button_click(interaction)
+
+        assert interaction.followup.messages[0] == {"content": "no progress", "ephemeral": True}
+
+    asyncio.run(scenario())
+
+
 def test_achievement_role_view_hides_disabled_feature_role_types(monkeypatch):
     events = []
-    role_db = FakeRoleDB(events, progress=60)
+    role_db = FakeRoleDB(events)
     _install_role_config(monkeypatch, role_db)
 
     view = AchievementRoleView(FakeBot(role_cog=None))
@@ -84,3 +84,23 @@ def test_shop_balance_checkin_makeup_and_embed_state(tmp_path):
             await db.close()
 
     asyncio.run(scenario())
+
+
+def test_checkin_records_are_indexed_by_date(tmp_path):
+    async def scenario():
+        db = ShopDatabaseManager(str(tmp_path / "shop.db"))
+        await db.initialize_database()
+        try:
+            async with db._read_connection() as conn:
+                cursor = await conn.execute(
+                    "EXPLAIN QUERY PLAN SELECT COUNT(*) FROM shop_checkin_records "
+                    "WHERE checkin_date >= ? AND checkin_date < ?",
+                    ("2026-04", "2026-05"),
+                )
+                plan = " ".join(row[-1] for row in await cursor.fetchall())
+                await cursor.close()
+            assert "idx_shop_checkin_records_date" in plan
+        finally:
+            await db.close()
+
+    asyncio.run(scenario())
@@ -32,6 +32,7 @@ def test_ticket_type_crud_round_trips_json_payload(tmp_path):
 
     assert run(db.remove_ticket_type("urgent")) is True
     assert run(db.list_ticket_types()) == {}
+    run(db.close())
 
 
 def test_ticket_config_uses_latest_updated_row(tmp_path):
@@ -53,6 +54,7 @@ def test_ticket_config_uses_latest_updated_row(tmp_path):
         "info_channel_id": 55,
         "main_message_id": None,
     }
+    run(db.close())
 
 
 def test_ticket_lifecycle_members_stats_and_history(tmp_path):
@@ -112,5 +114,6 @@ def test_ticket_lifecycle_members_stats_and_history(tmp_path):
         assert stats["active"] == 0
         assert stats["closed"] == 1
         assert await db.get_ticket_number() == 2
+        await db.close()
 
     run(scenario())
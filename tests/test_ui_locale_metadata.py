@@ -11,6 +11,8 @@ from bot.utils import achievement_visibility
 
 ACHIEVEMENT_RANK_TEXT = {
     "achievements.rank.all_button_label": "🟣 All rankings",
+    "achievements.rank.previous_page_label": "Previous",
+    "achievements.rank.next_page_label": "Next",
     "achievements.rank.type_button_labels.reaction": "🔴 Reactions",
     "achievements.rank.type_button_labels.message": "🟡 Messages",
     "achievements.rank.type_button_labels.time_spent": "🔵 Voice",
@@ -128,12 +130,13 @@ def test_achievement_rank_buttons_come_from_locale(monkeypatch):
     )
     bot = SimpleNamespace(get_cog=lambda name: achievement_cog)
 
-    view = RankView(bot=bot, year=None, month=None, all_rankings={})
+    view = RankView(bot=bot, year=None, month=None)
 
     assert view.all_button.label == "All rankings"
     assert str(view.all_button.emoji) == "🟣"
     assert view.type_buttons[0].label == "Reactions"
     assert str(view.type_buttons[0].emoji) == "🔴"
+    assert [view.previous_button.label, view.next_button.label] == ["Previous", "Next"]
 
 
 def test_modal_text_inputs_use_discord_27_label_wrappers():
@@ -0,0 +1,126 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from bot.utils.db_connect import (
+    DB_KEY_ENV,
+    DB_KEY_FILE_ENV,
+    DB_REQUIRE_ENCRYPTION_ENV,
+    DEFAULT_CONNECTION_PROFILE,
+    configure_connection_profile,
+    connect_database_sync,
+)
+from bot.utils.wal_archive import WalArchiveGapError, WalArchiver, list_generations, restore_point_in_time
+
+
+@pytest.fixture
+def archiving_profile(monkeypatch):
+    monkeypatch.delenv(DB_KEY_ENV, raising=False)
+    monkeypatch.delenv(DB_KEY_FILE_ENV, raising=False)
+    monkeypatch.delenv(DB_REQUIRE_ENCRYPTION_ENV, raising=False)
+    configure_connection_profile({"wal_autocheckpoint": 0})
+    yield
+    configure_connection_profile(DEFAULT_CONNECTION_PROFILE)
+
+
+def _rows(db_path):
+    connection = connect_database_sync(db_path)
+    try:
+        return connection.execute("SELECT id, length(payload) FROM sample ORDER BY id").fetchall()
+    finally:
+        connection.close()
+
+
+@pytest.mark.parametrize("encrypted", [False, True])
+def test_restore_replays_archived_wal_segments_to_a_point_in_time(tmp_path, monkeypatch, archiving_profile, encrypted):
+    if encrypted:
+        pytest.importorskip("sqlcipher3")
+        monkeypatch.setenv(DB_KEY_ENV, "wal-archive-test-key")
+    db_path = tmp_path / "bot.db"
+    archive_dir = tmp_path / "wal_archive"
+    start = datetime(2024, 6, 26, 12, 0, 0)
+
+    # The bot keeps its writer open, so the WAL survives between passes.
+    writer = connect_database_sync(db_path)
+    writer.execute("CREATE TABLE sample (id INTEGER PRIMARY KEY, payload BLOB)")
+    writer.executemany("INSERT INTO sample(id, payload) VALUES (?, randomblob(3000))", [(i,) for i in range(1, 6)])
+    writer.commit()
+
+    archiver = WalArchiver(db_path, archive_dir, compression="gzip")
+    try:
+        archiver.start_generation(start)
+
+        writer.executemany("INSERT INTO sample(id, payload) VALUES (?, randomblob(3000))", [(i,) for i in range(6, 41)])
+        writer.commit()
+        assert archiver.archive(start + timedelta(minutes=1)) is not None
+        after_first = _rows(db_path)
+
+        # The archiver checkpointed everything, so this write restarts the WAL.
+        writer.execute("DELETE FROM sample WHERE id > 10")
+        writer.execute("UPDATE sample SET payload = randomblob(10) WHERE id = 1")
+        writer.commit()
+        writer.execute("VACUUM")
+        assert archiver.archive(start + timedelta(minutes=2)) is not None
+        after_second = _rows(db_path)
+
+        writer.execute("INSERT INTO sample(id, payload) VALUES (100, randomblob(50))")
+        writer.commit()
+        archiver.archive(start + timedelta(minutes=3))
+        latest = _rows(db_path)
+    finally:
+        archiver.close()
+        writer.close()
+
+    base = restore_point_in_time(archive_dir, tmp_path / "base.db", until=start + timedelta(seconds=30))
+    assert base.segments == 0
+    assert len(_rows(base.path)) == 5
+
+    first = restore_point_in_time(archive_dir, tmp_path / "first.db", until=start + timedelta(minutes=1, seconds=59))
+    assert first.segments == 1
+    assert first.restored_to == start + timedelta(minutes=1)
+    assert _rows(first.path) == after_first
+
+    second = restore_point_in_time(archive_dir, tmp_path / "second.db", until=start + timedelta(minutes=2))
+    assert _rows(second.path) == after_second
+
+    newest = restore_point_in_time(archive_dir, tmp_path / "newest.db")
+    assert newest.segments == 3
+    assert _rows(newest.path) == latest
+
+    if encrypted:
+        # Frames were replayed as ciphertext onto a base with the same salt.
+        assert not (tmp_path / "newest.db").read_bytes().startswith(b"SQLite format 3")
+
+    with pytest.raises(FileExistsError):
+        restore_point_in_time(archive_dir, tmp_path / "newest.db")
+
+
+def test_archive_detects_wal_reset_outside_the_archiver(tmp_path, archiving_profile):
+    db_path = tmp_path / "bot.db"
+    writer = connect_database_sync(db_path)
+    writer.execute("CREATE TABLE sample (id INTEGER PRIMARY KEY, payload BLOB)")
+    writer.commit()
+
+    archiver = WalArchiver(db_path, tmp_path / "wal_archive", keep_generations=2)
+    try:
+        archiver.start_generation(datetime(2024, 6, 26, 12, 0, 0))
+        writer.execute("INSERT INTO sample(payload) VALUES (randomblob(100))")
+        writer.commit()
+        # A checkpoint the archiver did not run lets SQLite reuse the WAL
+        # before its frames were shipped.
+        writer.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        writer.execute("INSERT INTO sample(payload) VALUES (randomblob(100))")
+        writer.commit()
+        with pytest.raises(WalArchiveGapError):
+            archiver.archive(datetime(2024, 6, 26, 12, 1, 0))
+
+        for day in (27, 28):
+            archiver.start_generation(datetime(2024, 6, day, 12, 0, 0))
+    finally:
+        archiver.close()
+        writer.close()
+
+    assert [path.name for path in list_generations(tmp_path / "wal_archive")] == [
+        "20240627_120000",
+        "20240628_120000",
+    ]
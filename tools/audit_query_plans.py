@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""Audit the query plans of every statement the DB managers issue.
+
+Runs the test suite in-process and records each statement template the bot's
+code sends through :func:`bot.utils.db_connect.connect_database`, with the
+parameters and the call site of its first use. It then builds a throwaway
+database with the schema of every DB manager, fills each table with
+``--rows`` synthetic rows and runs ``ANALYZE``, so the planner sees realistic
+table statistics. Finally it runs ``EXPLAIN QUERY PLAN`` on each statement and
+reports the plan steps that need a look:
+
+  - ``SCAN <table>``: a full table scan, usually a filter or join on a column
+    without a usable index (``SCAN ... USING COVERING INDEX`` is reported too,
+    as a full index scan);
+  - ``USE TEMP B-TREE``: a sort or grouping that no index provides.
+
+Statements that cannot be explained against the seeded schema (tables that
+only exist in tests, DDL, PRAGMA) are counted as skipped.
+
+Usage::
+
+    python tools/audit_query_plans.py
+    python tools/audit_query_plans.py --rows 20000 --strict
+    python tools/audit_query_plans.py -- tests/test_shop_checkin_flow.py
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from bot.utils import (  # noqa: E402
+    AchievementDatabaseManager,
+    BanDatabaseManager,
+    CheckStatusDatabaseManager,
+    GiveawayDatabaseManager,
+    InviteGuardDatabaseManager,
+    PrivateRoomDatabaseManager,
+    RoleDatabaseManager,
+    ShopDatabaseManager,
+    TicketsDatabaseManager,
+    VoiceChannelDatabaseManager,
+)
+from bot.utils.db_metrics import add_statement_listener, normalize_sql, remove_statement_listener  # noqa: E402
+from bot.utils.teamup_display_manager import TeamupDisplayManager  # noqa: E402
+
+_EXPLAINABLE = ('SELECT', 'INSERT', 'UPDATE', 'DELETE', 'REPLACE', 'WITH')
+
+
+@dataclass
+class CapturedStatement:
+    sql: str
+    parameters: Any
+    origin: Optional[str]
+    calls: int = 0
+
+
+@dataclass
+class PlanAudit:
+    template: str
+    origin: Optional[str]
+    calls: int
+    plan: List[str] = field(default_factory=list)
+    scans: List[str] = field(default_factory=list)
+    temp_btrees: List[str] = field(default_factory=list)
+    skipped: Optional[str] = None
+
+
+def collect_statements(pytest_args: List[str]) -> Dict[str, CapturedStatement]:
+    """Run pytest in-process and capture every statement by template."""
+    import pytest
+
+    captured: Dict[str, CapturedStatement] = {}
+
+    def listener(sql: str, parameters: Any, origin: Optional[str]) -> None:
+        template = normalize_sql(sql)
+        statement = captured.get(template)
+        if statement is None:
+            statement = captured[template] = CapturedStatement(sql, parameters, origin)
+        statement.calls += 1
+
+    add_statement_listener(listener)
+    try:
+        exit_code = pytest.main(['-q', '-p', 'no:cacheprovider', *pytest_args])
+    finally:
+        remove_statement_listener(listener)
+    if exit_code not in (pytest.ExitCode.OK, pytest.ExitCode.TESTS_FAILED):
+        raise RuntimeError(f"pytest did not run the suite (exit code {int(exit_code)})")
+    return captured
+
+
+async def _create_schema(db_path: str) -> None:
+    managers = [
+        AchievementDatabaseManager(db_path),
+        BanDatabaseManager(db_path),
+        CheckStatusDatabaseManager(db_path),
+        GiveawayDatabaseManager(db_path),
+        InviteGuardDatabaseManager(db_path),
+        PrivateRoomDatabaseManager(db_path),
+        RoleDatabaseManager(db_path),
+        ShopDatabaseManager(db_path),
+        TicketsDatabaseManager(db_path),
+        VoiceChannelDatabaseManager(db_path),
+    ]
+    teamup = TeamupDisplayManager(db_path)
+    try:
+        for manager in managers:
+            await manager.initialize_database()
+        await teamup.init_tables()
+    finally:
+        for manager in [*managers, teamup]:
+            await manager.close()
+
+
+def _synthetic_value(column: str, declared_type: str, index: int, rows: int, rng: random.Random) -> Any:
+    name = column.lower()
+    declared_type = declared_type.upper()
+    now = datetime(2024, 6, 26, 12, 0, 0)
+    if 'INT' in declared_type or name.endswith('_id') or name.startswith('is_'):
+        if name.startswith('is_') or name in ('active', 'enabled', 'status'):
+            return rng.randint(0, 1)
+        if name.endswith('_id') or name == 'id':
+            # A fifth as many distinct IDs as rows, like repeat users.
+            return rng.randint(1, max(1, rows // 5))
+        return rng.randint(0, 10_000)
+    if 'REAL' in declared_type or 'FLOA' in declared_type or 'DOUB' in declared_type:
+        return rng.random() * 1000
+    if 'BLOB' in declared_type:
+        return rng.randbytes(16)
+    moment = now - timedelta(minutes=rng.randint(0, 365 * 24 * 60))
+    if 'date' in name and 'time' not in name:
+        return moment.strftime('%Y-%m-%d')
+    if any(part in name for part in ('time', 'timestamp', '_at', 'expire', 'until', 'date')):
+        return moment.strftime('%Y-%m-%d %H:%M:%S')
+    return f"{name}-{index}-{rng.randint(0, 999)}"
+
+
+def seed_database(db_path: str, rows: int, *, seed: int = 0) -> Dict[str, int]:
+    """Create every manager's schema in ``db_path`` and fill each table."""
+    asyncio.run(_create_schema(db_path))
+    rng = random.Random(seed)
+    counts: Dict[str, int] = {}
+    connection = sqlite3.connect(db_path)
+    try:
+        tables = [
+            row[0] for row in connection.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%' ORDER BY name"
+            )
+        ]
+        for table in tables:
+            columns = connection.execute(f'PRAGMA table_info("{table}")').fetchall()
+            names = [column[1] for column in columns]
+            placeholders = ', '.join('?' for _ in names)
+            quoted = ', '.join(f'"{name}"' for name in names)
+
+            def row_values(index: int) -> list:
+                values = []
+                for _cid, name, declared_type, _notnull, _default, pk in columns:
+                    if pk == 1 and 'INT' in (declared_type or '').upper() and sum(c[5] > 0 for c in columns) == 1:
+                        values.append(None)
+                    else:
+                        values.append(_synthetic_value(name, declared_type or '', index, rows, rng))
+                return values
+
+            connection.executemany(
+                f'INSERT OR IGNORE INTO "{table}" ({quoted}) VALUES ({placeholders})',
+                (row_values(index) for index in range(rows)),
+            )
+            counts[table] = connection.execute(f'SELECT count(*) FROM "{table}"').fetchone()[0]
+        connection.commit()
+        connection.execute("ANALYZE")
+        connection.commit()
+    finally:
+        connection.close()
+    return counts
+
+
+def explain_statement(connection: sqlite3.Connection, statement: CapturedStatement) -> PlanAudit:
+    template = normalize_sql(statement.sql)
+    audit = PlanAudit(template=template, origin=statement.origin, calls=statement.calls)
+    keyword = statement.sql.lstrip().split(None, 1)[0].upper() if statement.sql.strip() else ''
+    if keyword not in _EXPLAINABLE:
+        audit.skipped = f"{keyword or 'empty'} statement"
+        return audit
+    if statement.parameters is None:
+        audit.skipped = "parameters unavailable"
+        return audit
+    try:
+        rows = connection.execute(f"EXPLAIN QUERY PLAN {statement.sql}", statement.parameters).fetchall()
+    except sqlite3.Error as e:
+        audit.skipped = str(e)
+        return audit
+    for row in rows:
+        detail = str(row[-1])
+        audit.plan.append(detail)
+        if detail.startswith('SCAN '):
+            audit.scans.append(detail)
+        if 'TEMP B-TREE' in detail:
+            audit.temp_btrees.append(detail)
+    return audit
+
+
+def audit_statements(db_path: str, statements: Dict[str, CapturedStatement]) -> List[PlanAudit]:
+    connection = sqlite3.connect(db_path)
+    try:
+        return [explain_statement(connection, statement) for statement in statements.values()]
+    finally:
+        connection.close()
+
+
+def format_report(audits: List[PlanAudit], *, rows: int, verbose: bool = False) -> str:
+    flagged = sorted(
+        (audit for audit in audits if audit.scans or audit.temp_btrees),
+        key=lambda audit: (audit.origin or '', audit.template),
+    )
+    explained = [audit for audit in audits if audit.skipped is None]
+    skipped = [audit for audit in audits if audit.skipped is not None]
+
+    lines = [
+        f"Explained {len(explained)} of {len(audits)} statement templates against a seeded database "
+        f"({rows} rows per table).",
+        '',
+    ]
+    for audit in flagged:
+        tags = []
+        if audit.scans:
+            tags.append('SCAN')
+        if audit.temp_btrees:
+            tags.append('TEMP B-TREE')
+        lines.append(f"[{' + '.join(tags)}] {audit.origin or '<unknown caller>'} ({audit.calls} calls in tests)")
+        lines.append(f"    {audit.template}")
+        for detail in audit.plan:
+            marker = '!' if detail in audit.scans or detail in audit.temp_btrees else ' '
+            lines.append(f"    {marker} {detail}")
+        lines.append('')
+
+    if verbose and skipped:
+        lines.append("Skipped:")
+        for audit in sorted(skipped, key=lambda audit: audit.template):
+            lines.append(f"    {audit.template[:120]}  ({audit.skipped})")
+        lines.append('')
+
+    lines.append(
+        f"{sum(bool(audit.scans) for audit in audits)} statements with full scans, "
+        f"{sum(bool(audit.temp_btrees) for audit in audits)} with temp B-trees, "
+        f"{len(skipped)} skipped."
+    )
+    return '\n'.join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Flag full scans and temp B-trees in the DB managers' query plans.")
+    parser.add_argument("--rows", type=int, default=5000, help="Synthetic rows per table (default: 5000)")
+    parser.add_argument("--keep-db", type=Path, help="Write the seeded database here instead of a temp file")
+    parser.add_argument("--strict", action="store_true", help="Exit with status 1 when anything is flagged")
+    parser.add_argument("--verbose", action="store_true", help="Also list skipped statements")
+    parser.add_argument("pytest_args", nargs="*", help="Arguments for pytest after --, default: the tests/ folder")
+    args = parser.parse_args(argv)
+
+    # The suite has to see the same environment as a normal test run.
+    os.chdir(REPO_ROOT)
+    statements = collect_statements(args.pytest_args or [str(REPO_ROOT / 'tests')])
+
+    with tempfile.TemporaryDirectory(prefix='bird-bot-plans-') as tmp:
+        db_path = str(args.keep_db or Path(tmp) / 'audit.db')
+        if args.keep_db and args.keep_db.exists():
+            raise FileExistsError(f"{args.keep_db} already exists")
+        seed_database(db_path, max(1, args.rows))
+        audits = audit_statements(db_path, statements)
+
+    print()
+    print(format_report(audits, rows=max(1, args.rows), verbose=args.verbose))
+    flagged = any(audit.scans or audit.temp_btrees for audit in audits)
+    return 1 if args.strict and flagged else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
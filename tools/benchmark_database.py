@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""Benchmark the SQLite connection profile and SQLCipher against the DB managers.
+
+Runs the same workload on throwaway databases three times: with SQLite's
+stock settings (rollback journal, ``synchronous=FULL``, small cache, no
+mmap), with the profile from ``main.database`` in ``bot/config/main.yaml``
+(or the built-in defaults when that file is missing), and with that profile
+on a SQLCipher database using the ``main.database.sqlcipher`` settings. The
+workload goes through the managers the bot uses, so pool and transaction
+overhead is included:
+
+  - connection opens: open a connection and read the schema (KDF cost);
+  - counter increments: one committed achievement counter write each;
+  - leaderboard reads: top-10 message leaderboard;
+  - mixed: per-user achievement reads running concurrently with counter writes;
+  - ticket CRUD: create, add member, accept, close and fetch one ticket.
+
+The SQLCipher run uses ``DCGSH_DB_KEY`` / ``DCGSH_DB_KEY_FILE`` when set and a
+throwaway key otherwise; the key is never printed.
+
+Usage::
+
+    python tools/benchmark_database.py --iterations 500
+    python tools/benchmark_database.py --skip-sqlcipher
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import importlib.util
+import os
+import secrets
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from bot.utils.achievement_db import AchievementDatabaseManager  # noqa: E402
+from bot.utils.config import config  # noqa: E402
+from bot.utils.db_connect import (  # noqa: E402
+    DB_KEY_ENV,
+    DB_KEY_FILE_ENV,
+    DB_REQUIRE_ENCRYPTION_ENV,
+    configure_connection_profile,
+    connect_database,
+    get_connection_profile,
+    get_database_key,
+    read_connection_profile,
+)
+from bot.utils.shop_db import ShopDatabaseManager  # noqa: E402
+from bot.utils.tickets_db import TicketsDatabaseManager  # noqa: E402
+
+# What a connection gets when no PRAGMA is issued at all.
+SQLITE_DEFAULT_PROFILE: Dict[str, Any] = {
+    'journal_mode': 'DELETE',
+    'synchronous': 'FULL',
+    'cache_size': -2000,
+    'mmap_size': 0,
+    'temp_store': 'DEFAULT',
+    'busy_timeout': 5000,
+}
+
+# max_pending=1 flushes on every increment, so each write is one commit.
+UNBUFFERED_COUNTERS = {'counter_flush': {'max_pending': 1}}
+
+
+async def _timed(operation: Callable[[], Awaitable[Any]], samples: List[float]) -> None:
+    started = time.perf_counter()
+    await operation()
+    samples.append(time.perf_counter() - started)
+
+
+async def _run_workload(db_path: str, iterations: int, users: int) -> Dict[str, List[float]]:
+    results: Dict[str, List[float]] = {
+        'connection opens': [],
+        'counter increments': [],
+        'leaderboard reads': [],
+        'mixed writes': [],
+        'mixed reads': [],
+        'ticket CRUD': [],
+    }
+
+    achievements = AchievementDatabaseManager(db_path, UNBUFFERED_COUNTERS)
+    tickets = TicketsDatabaseManager(db_path)
+    # Per-user achievement reads join the shop check-in tables.
+    shop = ShopDatabaseManager(db_path)
+    try:
+        await achievements.initialize_database()
+        await tickets.initialize_database()
+        await shop.initialize_database()
+
+        async def open_connection():
+            async with connect_database(db_path) as db:
+                await db.execute("SELECT count(*) FROM sqlite_master")
+
+        for _ in range(min(iterations, 20)):
+            await _timed(open_connection, results['connection opens'])
+
+        for i in range(iterations):
+            await _timed(
+                lambda: achievements.update_achievement_count(i % users, 'message', 1),
+                results['counter increments'],
+            )
+
+        # Pooled readers open lazily; keep the first open (and its KDF cost,
+        # already measured above) out of the read latencies.
+        await achievements.get_leaderboard('message', 10)
+        for _ in range(iterations):
+            await _timed(
+                lambda: achievements.get_leaderboard('message', 10),
+                results['leaderboard reads'],
+            )
+
+        async def mixed_writes():
+            for i in range(iterations):
+                await _timed(
+                    lambda: achievements.update_achievement_count(i % users, 'reaction', 1),
+                    results['mixed writes'],
+                )
+
+        async def mixed_reads():
+            for _ in range(iterations):
+                await _timed(
+                    lambda: achievements.get_user_achievements(iterations % users),
+                    results['mixed reads'],
+                )
+
+        await asyncio.gather(mixed_writes(), mixed_reads())
+
+        async def ticket_cycle(thread_id: int):
+            await tickets.create_ticket(thread_id, thread_id, 1, 'benchmark', 1, thread_id)
+            await tickets.add_ticket_member(thread_id, 2, 1)
+            await tickets.accept_ticket(thread_id, 3)
+            await tickets.close_ticket(thread_id, 3, 'benchmark')
+            await tickets.fetch_ticket(thread_id)
+
+        for i in range(iterations):
+            await _timed(lambda: ticket_cycle(i + 1), results['ticket CRUD'])
+    finally:
+        await achievements.close()
+        await tickets.close()
+        await shop.close()
+
+    return results
+
+
+async def benchmark_profile(
+    label: str,
+    settings: Dict[str, Any],
+    *,
+    key: str | None,
+    iterations: int,
+    users: int,
+) -> Dict[str, Any]:
+    configure_connection_profile(settings)
+    saved_env = {name: os.environ.pop(name, None) for name in _KEY_ENV_NAMES}
+    if key:
+        os.environ[DB_KEY_ENV] = key
+    try:
+        with tempfile.TemporaryDirectory(prefix='bird-bot-bench-') as tmp:
+            db_path = str(Path(tmp) / 'benchmark.db')
+            effective = await read_connection_profile(db_path)
+            started = time.perf_counter()
+            results = await _run_workload(db_path, iterations, users)
+            total = time.perf_counter() - started
+    finally:
+        for name, value in saved_env.items():
+            os.environ.pop(name, None)
+            if value is not None:
+                os.environ[name] = value
+    return {'label': label, 'profile': effective, 'results': results, 'total': total}
+
+
+_KEY_ENV_NAMES = (DB_KEY_ENV, DB_KEY_FILE_ENV, DB_REQUIRE_ENCRYPTION_ENV)
+
+
+def _benchmark_key(settings: Dict[str, Any]) -> str:
+    configure_connection_profile(settings)
+    key = get_database_key()
+    if key:
+        return key
+    raw_key = bool((settings.get('sqlcipher') or {}).get('raw_key'))
+    return secrets.token_hex(32) if raw_key else secrets.token_urlsafe(64)
+
+
+def _percentile(samples: List[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def format_report(runs: List[Dict[str, Any]]) -> str:
+    lines = []
+    for run in runs:
+        profile = ', '.join(f"{name}={value}" for name, value in run['profile'].items())
+        lines.append(f"[{run['label']}] {profile}")
+        lines.append(f"  {'workload':<20} {'mean ms':>9} {'p95 ms':>9} {'ops/s':>9}")
+        for name, samples in run['results'].items():
+            mean = statistics.fmean(samples)
+            lines.append(
+                f"  {name:<20} {mean * 1000:>9.3f} {_percentile(samples, 0.95) * 1000:>9.3f}"
+                f" {1 / mean if mean else 0:>9.0f}"
+            )
+        lines.append(f"  total {run['total']:.2f}s")
+        lines.append('')
+
+    for baseline, candidate in zip(runs, runs[1:]):
+        lines.append(f"Mean latency, {candidate['label']} vs {baseline['label']}:")
+        for name, samples in candidate['results'].items():
+            before = statistics.fmean(baseline['results'][name])
+            after = statistics.fmean(samples)
+            lines.append(f"  {name:<20} {after / before:>6.2f}x")
+        lines.append('')
+    return '\n'.join(lines).rstrip()
+
+
+async def run(iterations: int, users: int, *, sqlcipher: bool = True) -> int:
+    configured = dict(config.get_config('main', silent=True).get('database') or {})
+    original = get_connection_profile()
+    options = {'iterations': iterations, 'users': users}
+    try:
+        runs = [
+            await benchmark_profile('sqlite defaults', SQLITE_DEFAULT_PROFILE, key=None, **options),
+            await benchmark_profile('main.database', configured, key=None, **options),
+        ]
+        if sqlcipher and importlib.util.find_spec('sqlcipher3') is None:
+            print("sqlcipher3 is not installed; skipping the SQLCipher run.", file=sys.stderr)
+        elif sqlcipher:
+            key = _benchmark_key(configured)
+            runs.append(await benchmark_profile('main.database + SQLCipher', configured, key=key, **options))
+    finally:
+        configure_connection_profile(original)
+
+    print(format_report(runs))
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark SQLite profiles and SQLCipher on the bot's DB managers.")
+    parser.add_argument("--iterations", type=int, default=500, help="Operations per workload (default: 500)")
+    parser.add_argument("--users", type=int, default=200, help="Distinct user IDs for counter writes (default: 200)")
+    parser.add_argument("--skip-sqlcipher", action="store_true", help="Only compare plain SQLite profiles")
+    args = parser.parse_args(argv)
+    return asyncio.run(run(max(1, args.iterations), max(1, args.users), sqlcipher=not args.skip_sqlcipher))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -1,7 +1,10 @@
 """Encrypt an existing SQLite database with SQLCipher.
 
 The key is read from ``DCGSH_DB_KEY`` or ``DCGSH_DB_KEY_FILE``. The key is
-never printed and should not be stored in YAML or committed files.
+never printed and should not be stored in YAML or committed files. The
+encrypted copy is written with the ``main.database.sqlcipher`` settings from
+``bot/config/main.yaml`` (KDF iterations, page size, raw key), so the bot can
+open it with the same configuration.
 """
 
 from __future__ import annotations
@@ -12,9 +15,8 @@ import sqlite3
 import sys
 from pathlib import Path
 
-import sqlcipher3
-
-from bot.utils.db_connect import get_database_key
+from bot.utils.config import config
+from bot.utils.db_connect import configure_connection_profile, connect_database_sync, get_database_key
 
 
 def _sql_literal(value: str) -> str:
@@ -47,22 +49,17 @@ def encrypt_database(source: Path, destination: Path, *, overwrite: bool = False
     finally:
         plain.close()
 
-    connection = sqlcipher3.connect(str(source))
+    # Create the destination through the bot's own connection path so it
+    # gets the configured cipher settings, then pull the plaintext in.
+    connection = connect_database_sync(destination)
     try:
-        connection.execute(
-            f"ATTACH DATABASE {_sql_literal(str(destination))} AS encrypted KEY {_sql_literal(key)}"
-        )
-        connection.execute("SELECT sqlcipher_export('encrypted')")
-        connection.execute("DETACH DATABASE encrypted")
+        connection.execute(f"ATTACH DATABASE {_sql_literal(str(source))} AS plaintext KEY ''")
+        connection.execute("SELECT sqlcipher_export('main', 'plaintext')")
+        connection.execute("DETACH DATABASE plaintext")
     finally:
         connection.close()
 
-    encrypted = sqlcipher3.connect(str(destination))
-    try:
-        encrypted.execute(f"PRAGMA key = {_sql_literal(key)}")
-        encrypted.execute("SELECT count(*) FROM sqlite_master").fetchone()
-    finally:
-        encrypted.close()
+    connect_database_sync(destination).close()
 
 
 def main(argv: list[str] | None = None) -> int:
@@ -73,6 +70,8 @@ def main(argv: list[str] | None = None) -> int:
     parser.add_argument("--backup-source", type=Path, help="Optional plaintext backup copy path before encryption")
     args = parser.parse_args(argv)
 
+    configure_connection_profile(config.get_config('main', silent=True).get('database'))
+
     if args.backup_source:
         backup_path = args.backup_source.resolve()
         backup_path.parent.mkdir(parents=True, exist_ok=True)
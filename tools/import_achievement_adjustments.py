@@ -0,0 +1,77 @@
+"""Apply a bulk achievement adjustment CSV to the bot database.
+
+Same format and validation as ``/import_achievements`` (see
+``bot/utils/achievement_import.py``). Every row is checked before anything is
+written; the rows are then applied in one transaction and logged as a single
+``bulk_increase`` / ``bulk_decrease`` operation under ``--operator``. Stop the
+bot first: it caches leaderboards and user stats in memory and would not see
+the change until restarted.
+
+    python -m tools.import_achievement_adjustments adjustments.csv --operator 123456789012345678
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+from bot.utils.achievement_db import AchievementDatabaseManager
+from bot.utils.achievement_import import AdjustmentImportError, parse_adjustments
+from bot.utils.config import config
+from bot.utils.db_connect import configure_connection_profile
+
+
+async def import_adjustments(db_path: str, adjustments, operator_id: int, operation: str) -> str | None:
+    db = AchievementDatabaseManager(db_path)
+    try:
+        await db.initialize_database()
+        return await db.apply_bulk_changes(operator_id, adjustments, operation)
+    finally:
+        await db.close()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Apply a bulk achievement adjustment CSV to the bot database.")
+    parser.add_argument("csv_file", type=Path, help="CSV with user_id and messages, reactions or time_spent columns")
+    parser.add_argument("--operator", type=int, required=True, help="Discord user ID recorded as the operator")
+    parser.add_argument("--decrease", action="store_true", help="Subtract the amounts instead of adding them")
+    parser.add_argument("--db", help="Database path (default: main.db_path)")
+    parser.add_argument("--dry-run", action="store_true", help="Validate the file and print the totals only")
+    args = parser.parse_args(argv)
+
+    try:
+        adjustments = parse_adjustments(args.csv_file.read_text(encoding="utf-8-sig"))
+    except AdjustmentImportError as e:
+        print(f"Nothing was imported:\n{e}", file=sys.stderr)
+        return 1
+
+    operation = "decrease" if args.decrease else "increase"
+    totals = {
+        column: sum(changes[column] for _, changes in adjustments)
+        for column in ("message_count", "reaction_count", "time_spent")
+    }
+    print(f"{operation} for {len(adjustments)} members: {totals}")
+    if args.dry_run:
+        return 0
+
+    main_config = config.get_config("main", silent=True)
+    configure_connection_profile(main_config.get("database"))
+    db_path = args.db or main_config.get("db_path")
+    if not db_path:
+        print("main.db_path is empty; pass --db.", file=sys.stderr)
+        return 1
+
+    started = time.perf_counter()
+    batch_id = asyncio.run(import_adjustments(db_path, adjustments, args.operator, operation))
+    if batch_id is None:
+        print("Import failed; nothing was applied. See the log for details.", file=sys.stderr)
+        return 1
+    print(f"Applied batch {batch_id} in {time.perf_counter() - started:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -0,0 +1,78 @@
+"""Restore the database from a backup file or the continuous WAL archive.
+
+With ``--backup`` the chosen file from ``backup/db_backup`` or
+``backup/db_backup_manual`` is streamed (decompressed when it ends in ``.gz``
+or ``.zst``) into a file next to ``destination``, checked with
+``PRAGMA quick_check`` and renamed into place, so a failed restore never
+leaves a half-written database behind.
+
+Otherwise the newest base snapshot in ``backup/wal_archive`` taken at or
+before ``--until`` is used, and the archived WAL segments up to that time are
+replayed onto it. Without ``--until`` the latest archived state is restored.
+Segments are shipped every ``main.backup.continuous.interval_seconds``, so
+the restore point is the last archive pass at or before ``--until``.
+
+Encrypted backups need the same ``DCGSH_DB_KEY`` / ``DCGSH_DB_KEY_FILE`` and
+``main.database.sqlcipher`` settings as the bot; the restored file stays
+encrypted. Stop the bot before restoring over ``data/bot.db``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from bot.utils.config import config
+from bot.utils.db_backup import format_size, restore_backup
+from bot.utils.db_connect import configure_connection_profile
+from bot.utils.paths import project_path
+from bot.utils.wal_archive import restore_point_in_time
+
+
+def _parse_until(value: str) -> datetime:
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(f"expected a local time like 2024-06-26T12:30:00, got {value!r}") from exc
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Restore the database from a backup file or the WAL archive.")
+    parser.add_argument("destination", type=Path, help="Restored database path, for example data/bot.db")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--backup", type=Path, help="Backup file to restore, for example backup/db_backup/database_20240626_120000.db.gz")
+    source.add_argument("--until", type=_parse_until, help="Local time to restore to from the WAL archive (default: latest archived state)")
+    parser.add_argument(
+        "--archive",
+        type=Path,
+        default=project_path('backup', 'wal_archive'),
+        help="WAL archive directory (default: backup/wal_archive)",
+    )
+    parser.add_argument("--overwrite", action="store_true", help="Replace destination if it already exists")
+    parser.add_argument("--no-verify", action="store_true", help="Skip PRAGMA quick_check on a restored backup file")
+    args = parser.parse_args(argv)
+
+    configure_connection_profile(config.get_config('main', silent=True).get('database'))
+
+    if args.backup:
+        result = restore_backup(args.backup, args.destination, overwrite=args.overwrite, verify=not args.no_verify)
+        checked = "" if result.verification is None else ", quick_check: ok"
+        print(
+            f"Restored {result.path} from {args.backup} "
+            f"({format_size(result.size_bytes)}, {result.duration_seconds:.2f}s{checked})"
+        )
+        return 0
+
+    result = restore_point_in_time(args.archive, args.destination, until=args.until, overwrite=args.overwrite)
+    print(
+        f"Restored {result.path} to {result.restored_to:%Y-%m-%d %H:%M:%S} "
+        f"from {result.generation.name} ({result.segments} segments, {result.transactions} transactions, "
+        f"{result.duration_seconds:.2f}s)"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))